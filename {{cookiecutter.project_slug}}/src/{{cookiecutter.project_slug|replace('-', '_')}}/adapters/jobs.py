@@ -0,0 +1,362 @@
+"""Job stores - persistence for background jobs.
+
+A store keeps each job's status and progress, the input items it works
+through, and cancellation requests. ``claim`` gives one process at a time
+the right to run a job, so several server workers sharing a store never
+run the same job twice.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import sys
+from collections.abc import Mapping, Sequence
+from datetime import datetime
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Any, Protocol
+from uuid import UUID
+
+from ..domain.jobs import Job, JobItemError
+
+if TYPE_CHECKING:
+    from ..infrastructure.config import Settings
+
+
+class JobStore(Protocol):
+    """Protocol defining the persistence contract for jobs."""
+
+    async def open(self) -> None:
+        """Acquire resources before first use."""
+        ...
+
+    async def close(self) -> None:
+        """Release resources and any claims held."""
+        ...
+
+    async def create(self, job: Job, items: Sequence[Mapping[str, str]]) -> None:
+        """Persist a new job together with its input items."""
+        ...
+
+    async def save(self, job: Job) -> None:
+        """Persist a job's status and progress; a finished job's items are dropped."""
+        ...
+
+    async def get(self, job_id: UUID) -> Job | None:
+        """Retrieve a job by ID."""
+        ...
+
+    async def items(self, job_id: UUID) -> list[dict[str, str]]:
+        """Load the input items of an unfinished job."""
+        ...
+
+    async def unfinished(self) -> list[Job]:
+        """List the jobs that are queued or running, oldest first."""
+        ...
+
+    async def prune(self, finished_before: datetime) -> int:
+        """Delete the jobs that finished before ``finished_before``. Returns how many."""
+        ...
+
+    async def claim(self, job_id: UUID) -> bool:
+        """Take exclusive ownership of a job. Returns False if another owner holds it.
+
+        A claim lasts until ``release``, or until the owning process exits.
+        """
+        ...
+
+    async def release(self, job_id: UUID) -> None:
+        """Give up ownership of a claimed job."""
+        ...
+
+    async def request_cancel(self, job_id: UUID) -> None:
+        """Ask whoever runs a job to stop it."""
+        ...
+
+    async def cancel_requested(self, job_id: UUID) -> bool:
+        """Whether a job has been asked to stop."""
+        ...
+
+
+class InMemoryJobStore:
+    """In-memory JobStore; jobs last as long as the process."""
+
+    def __init__(self) -> None:
+        self._jobs: dict[UUID, Job] = {}
+        self._items: dict[UUID, list[dict[str, str]]] = {}
+        self._claimed: set[UUID] = set()
+        self._cancelled: set[UUID] = set()
+
+    async def open(self) -> None:
+        """Nothing to acquire for in-memory storage."""
+
+    async def close(self) -> None:
+        """Drop all claims."""
+        self._claimed.clear()
+
+    async def create(self, job: Job, items: Sequence[Mapping[str, str]]) -> None:
+        """Store a new job and its items."""
+        self._jobs[job.id] = job
+        self._items[job.id] = [dict(item) for item in items]
+
+    async def save(self, job: Job) -> None:
+        """Replace a job's stored state."""
+        self._jobs[job.id] = job
+        if job.finished:
+            self._items.pop(job.id, None)
+            self._cancelled.discard(job.id)
+
+    async def get(self, job_id: UUID) -> Job | None:
+        """Retrieve a job."""
+        return self._jobs.get(job_id)
+
+    async def items(self, job_id: UUID) -> list[dict[str, str]]:
+        """Return a job's items."""
+        return self._items.get(job_id, [])
+
+    async def unfinished(self) -> list[Job]:
+        """List queued and running jobs."""
+        return sorted(
+            (job for job in self._jobs.values() if not job.finished), key=lambda job: job.created_at
+        )
+
+    async def prune(self, finished_before: datetime) -> int:
+        """Drop finished jobs last updated before the cutoff."""
+        expired = [job.id for job in self._jobs.values() if _finished_before(job, finished_before)]
+        for job_id in expired:
+            del self._jobs[job_id]
+        return len(expired)
+
+    async def claim(self, job_id: UUID) -> bool:
+        """Claim a job unless it is already claimed."""
+        if job_id in self._claimed:
+            return False
+        self._claimed.add(job_id)
+        return True
+
+    async def release(self, job_id: UUID) -> None:
+        """Release a claim."""
+        self._claimed.discard(job_id)
+
+    async def request_cancel(self, job_id: UUID) -> None:
+        """Flag a job for cancellation."""
+        self._cancelled.add(job_id)
+
+    async def cancel_requested(self, job_id: UUID) -> bool:
+        """Check the cancellation flag."""
+        return job_id in self._cancelled
+
+
+def _finished_before(job: Job, cutoff: datetime) -> bool:
+    """Whether a job finished, that is was last updated, before ``cutoff``."""
+    return job.finished and (job.updated_at or job.created_at) < cutoff
+
+
+def _job_to_json(job: Job) -> dict[str, Any]:
+    return {
+        "id": str(job.id),
+        "kind": job.kind,
+        "status": job.status,
+        "total": job.total,
+        "processed": job.processed,
+        "succeeded": job.succeeded,
+        "failed": job.failed,
+        "errors": [[error.index, error.error] for error in job.errors],
+        "error": job.error,
+        "created_at": job.created_at.isoformat(),
+        "updated_at": job.updated_at.isoformat() if job.updated_at else None,
+    }
+
+
+def _job_from_json(data: dict[str, Any]) -> Job:
+    return Job(
+        id=UUID(data["id"]),
+        kind=data["kind"],
+        status=data["status"],
+        total=data["total"],
+        processed=data["processed"],
+        succeeded=data["succeeded"],
+        failed=data["failed"],
+        errors=tuple(JobItemError(index, error) for index, error in data["errors"]),
+        error=data["error"],
+        created_at=datetime.fromisoformat(data["created_at"]),
+        updated_at=datetime.fromisoformat(data["updated_at"]) if data["updated_at"] else None,
+    )
+
+
+def _write_atomically(path: Path, data: Any) -> None:
+    """Replace ``path`` with ``data`` as JSON, never leaving a partial file."""
+    temporary = path.with_name(f"{path.name}.tmp")
+    with temporary.open("w", encoding="utf-8") as file:
+        json.dump(data, file, separators=(",", ":"))
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temporary, path)
+
+
+class FileJobStore:
+    """JobStore keeping each job as JSON files in a directory.
+
+    A job ``<id>`` is stored as ``<id>.job.json``, rewritten atomically on
+    every save, with its input items in ``<id>.items.json`` until it
+    finishes. A cancellation request is an empty ``<id>.cancel`` file, so a
+    job can be cancelled from any process sharing the directory. Claims are
+    exclusive ``flock`` locks on ``<id>.lock``, which the operating system
+    releases when a process dies; on Windows, claims always succeed. The
+    lock file is deleted when a claim on a finished job is released, and
+    ``prune`` deletes the job file itself.
+
+    Args:
+        directory: Where jobs are kept; created if missing
+    """
+
+    def __init__(self, directory: Path) -> None:
+        self._directory = directory
+        self._locks: dict[UUID, IO[bytes]] = {}
+
+    def _path(self, job_id: UUID, suffix: str) -> Path:
+        return self._directory / f"{job_id}.{suffix}"
+
+    async def open(self) -> None:
+        """Create the directory if needed."""
+        await asyncio.to_thread(self._directory.mkdir, parents=True, exist_ok=True)
+
+    async def close(self) -> None:
+        """Release every claim held by this store."""
+        for job_id in list(self._locks):
+            await self.release(job_id)
+
+    async def create(self, job: Job, items: Sequence[Mapping[str, str]]) -> None:
+        """Write the items, then the job, so a listed job always has its items."""
+        await asyncio.to_thread(
+            _write_atomically, self._path(job.id, "items.json"), [dict(item) for item in items]
+        )
+        await self.save(job)
+
+    async def save(self, job: Job) -> None:
+        """Rewrite a job's file; a finished job's items and cancel flag are deleted."""
+
+        def write() -> None:
+            _write_atomically(self._path(job.id, "job.json"), _job_to_json(job))
+            if job.finished:
+                self._path(job.id, "items.json").unlink(missing_ok=True)
+                self._path(job.id, "cancel").unlink(missing_ok=True)
+
+        await asyncio.to_thread(write)
+
+    async def get(self, job_id: UUID) -> Job | None:
+        """Read a job's file."""
+
+        def read() -> Job | None:
+            try:
+                return _job_from_json(json.loads(self._path(job_id, "job.json").read_bytes()))
+            except FileNotFoundError:
+                return None
+
+        return await asyncio.to_thread(read)
+
+    async def items(self, job_id: UUID) -> list[dict[str, str]]:
+        """Read a job's items."""
+
+        def read() -> list[dict[str, str]]:
+            try:
+                items: list[dict[str, str]] = json.loads(
+                    self._path(job_id, "items.json").read_bytes()
+                )
+            except FileNotFoundError:
+                return []
+            return items
+
+        return await asyncio.to_thread(read)
+
+    async def unfinished(self) -> list[Job]:
+        """Read every job file and keep the queued and running jobs."""
+
+        def scan() -> list[Job]:
+            jobs = [
+                _job_from_json(json.loads(path.read_bytes()))
+                for path in self._directory.glob("*.job.json")
+            ]
+            return sorted((job for job in jobs if not job.finished), key=lambda job: job.created_at)
+
+        return await asyncio.to_thread(scan)
+
+    async def prune(self, finished_before: datetime) -> int:
+        """Delete the files of finished jobs last updated before the cutoff."""
+
+        def sweep() -> int:
+            pruned = 0
+            for path in self._directory.glob("*.job.json"):
+                try:
+                    job = _job_from_json(json.loads(path.read_bytes()))
+                except FileNotFoundError:
+                    continue
+                if not _finished_before(job, finished_before) or job.id in self._locks:
+                    continue
+                path.unlink(missing_ok=True)
+                for suffix in ("items.json", "cancel", "lock"):
+                    self._path(job.id, suffix).unlink(missing_ok=True)
+                pruned += 1
+            return pruned
+
+        return await asyncio.to_thread(sweep)
+
+    async def claim(self, job_id: UUID) -> bool:
+        """Lock the job's lock file without waiting."""
+        if job_id in self._locks:
+            return False
+
+        def lock() -> IO[bytes] | None:
+            file = self._path(job_id, "lock").open("wb")
+            if sys.platform != "win32":
+                import fcntl
+
+                try:
+                    fcntl.flock(file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    file.close()
+                    return None
+            return file
+
+        file = await asyncio.to_thread(lock)
+        if file is None:
+            return False
+        if job_id in self._locks:
+            # Claimed by this store while the lock was being taken
+            await asyncio.to_thread(file.close)
+            return False
+        self._locks[job_id] = file
+        return True
+
+    async def release(self, job_id: UUID) -> None:
+        """Unlock the job's lock file, deleting it if the job has finished.
+
+        The file is deleted while still locked. A process that opened it
+        just before can still lock the deleted file, but only to find the
+        job finished, so nothing runs twice.
+        """
+        file = self._locks.pop(job_id, None)
+        if file is None:
+            return
+        try:
+            job = await self.get(job_id)
+            if job is None or job.finished:
+                await asyncio.to_thread(self._path(job_id, "lock").unlink, missing_ok=True)
+        finally:
+            await asyncio.to_thread(file.close)
+
+    async def request_cancel(self, job_id: UUID) -> None:
+        """Create the job's cancel flag file."""
+        await asyncio.to_thread(self._path(job_id, "cancel").touch)
+
+    async def cancel_requested(self, job_id: UUID) -> bool:
+        """Check for the job's cancel flag file."""
+        return await asyncio.to_thread(self._path(job_id, "cancel").exists)
+
+
+def create_job_store(settings: Settings) -> JobStore:
+    """Build the job store selected by ``job_store_dir``: files there, else memory."""
+    if settings.job_store_dir is not None:
+        return FileJobStore(settings.job_store_dir)
+    return InMemoryJobStore()
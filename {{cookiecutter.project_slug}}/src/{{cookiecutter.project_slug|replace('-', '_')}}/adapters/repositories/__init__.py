@@ -6,11 +6,26 @@ domain objects and storage formats.
 
 from __future__ import annotations
 
+from bisect import bisect_left, bisect_right, insort
+from collections.abc import AsyncIterator, Sequence
+from datetime import datetime
 from typing import TYPE_CHECKING, Protocol
 from uuid import UUID
 
+from .cached import CachedExampleRepository, CacheStats
+from .coalescing import CoalescingExampleRepository, CoalescingStats, SingleFlight
+from .columnar import ColumnarExampleRepository
+from .file import FileExampleRepository, FileStoreStats
+from .forwarding import ForwardingExampleRepository, find_layer
+from .instrumented import InstrumentedExampleRepository
+from .paging import iterate_pages
+from .search import InvertedIndex, SearchIndexedExampleRepository, SearchIndexStats
+from .sharded import ShardedExampleRepository
+from .write_behind import WriteBehindExampleRepository, WriteBufferStats
+
 if TYPE_CHECKING:
-    from ..domain.entities import ExampleEntity
+    from ...domain.entities import ExampleEntity
+    from ...infrastructure.config import Settings
 
 
 class ExampleRepository(Protocol):
@@ -19,10 +34,26 @@ class ExampleRepository(Protocol):
     Implementations should handle actual persistence (database, file, memory).
     """
 
+    async def open(self) -> None:
+        """Acquire resources (connection pools, schema) before first use."""
+        ...
+
+    async def close(self) -> None:
+        """Release resources acquired by ``open``."""
+        ...
+
     async def get_by_id(self, entity_id: UUID) -> ExampleEntity | None:
         """Retrieve an entity by its unique identifier."""
         ...
 
+    async def get_version(self, entity_id: UUID) -> datetime | None:
+        """Return an entity's ``version`` without loading the whole entity.
+
+        Lets callers check whether an entity changed (e.g. to answer a
+        conditional HTTP request) more cheaply than ``get_by_id``.
+        """
+        ...
+
     async def save(self, entity: ExampleEntity) -> ExampleEntity:
         """Persist an entity, creating or updating as needed."""
         ...
@@ -31,25 +62,307 @@ class ExampleRepository(Protocol):
         """Remove an entity by its identifier. Returns True if deleted."""
         ...
 
+    async def compare_and_save(self, entity: ExampleEntity, expected_version: datetime) -> bool:
+        """Save ``entity`` only if the stored one is still at ``expected_version``.
+
+        The comparison and the write are one atomic step, so a change made
+        by someone else in between is never overwritten. Returns whether
+        the entity was saved: False if it has changed or no longer exists.
+        """
+        ...
+
+    async def compare_and_delete(self, entity_id: UUID, expected_version: datetime) -> bool:
+        """Delete an entity only if it is still at ``expected_version``.
+
+        Atomic like ``compare_and_save``. Returns whether the entity was deleted.
+        """
+        ...
+
+    async def get_many(self, entity_ids: Sequence[UUID]) -> dict[UUID, ExampleEntity]:
+        """Retrieve several entities at once. Unknown IDs are omitted."""
+        ...
+
+    async def save_many(self, entities: Sequence[ExampleEntity]) -> list[ExampleEntity]:
+        """Persist several entities in as few round trips as possible."""
+        ...
+
+    async def delete_many(self, entity_ids: Sequence[UUID]) -> set[UUID]:
+        """Remove several entities. Returns the IDs that were deleted."""
+        ...
+
+    async def list_page(
+        self, limit: int, after: tuple[datetime, UUID] | None = None
+    ) -> list[ExampleEntity]:
+        """List up to ``limit`` entities ordered by ``(created_at, id)``.
+
+        Only entities strictly after the ``after`` key are returned, so pages
+        are fetched by seeking rather than by offset.
+        """
+        ...
+
+    async def list_page_by_id(self, limit: int, after: UUID | None = None) -> list[ExampleEntity]:
+        """List up to ``limit`` entities ordered by ID alone, after ``after``.
+
+        With time-ordered (UUIDv7) IDs this is creation order without a
+        separate timestamp index, and ``after=min_uuid7(when)`` scans from a
+        point in time.
+        """
+        ...
+
+    def iterate(self, batch_size: int = 1000) -> AsyncIterator[ExampleEntity]:
+        """Yield every entity in ``(created_at, id)`` order.
+
+        Entities are fetched ``batch_size`` at a time, so memory use stays
+        constant regardless of how many are stored.
+        """
+        ...
+
 
 class InMemoryExampleRepository:
-    """In-memory implementation of ExampleRepository for development/testing."""
+    """In-memory implementation of ExampleRepository for development/testing.
+
+    Alongside the ID lookup table it keeps ``(created_at, id)`` keys and the
+    IDs themselves in sorted lists, so a page costs a binary search plus the
+    page itself.
+    """
 
     def __init__(self) -> None:
         self._storage: dict[UUID, ExampleEntity] = {}
+        self._order: list[tuple[datetime, UUID]] = []
+        self._ids: list[UUID] = []
+
+    async def open(self) -> None:
+        """Nothing to acquire for in-memory storage."""
+
+    async def close(self) -> None:
+        """Nothing to release for in-memory storage."""
 
     async def get_by_id(self, entity_id: UUID) -> ExampleEntity | None:
         """Retrieve entity from memory."""
         return self._storage.get(entity_id)
 
+    async def get_version(self, entity_id: UUID) -> datetime | None:
+        """Return the stored entity's version."""
+        entity = self._storage.get(entity_id)
+        return entity.version if entity is not None else None
+
     async def save(self, entity: ExampleEntity) -> ExampleEntity:
         """Store entity in memory."""
-        self._storage[entity.id] = entity
+        self._store(entity)
         return entity
 
     async def delete(self, entity_id: UUID) -> bool:
         """Remove entity from memory."""
-        if entity_id in self._storage:
-            del self._storage[entity_id]
-            return True
+        return self._remove(entity_id)
+
+    async def compare_and_save(self, entity: ExampleEntity, expected_version: datetime) -> bool:
+        """Store entity in memory if the stored one is at ``expected_version``."""
+        current = self._storage.get(entity.id)
+        if current is None or current.version != expected_version:
+            return False
+        self._store(entity)
+        return True
+
+    async def compare_and_delete(self, entity_id: UUID, expected_version: datetime) -> bool:
+        """Remove entity from memory if it is at ``expected_version``."""
+        current = self._storage.get(entity_id)
+        if current is None or current.version != expected_version:
+            return False
+        return self._remove(entity_id)
+
+    async def get_many(self, entity_ids: Sequence[UUID]) -> dict[UUID, ExampleEntity]:
+        """Retrieve entities from memory."""
+        storage = self._storage
+        return {entity_id: storage[entity_id] for entity_id in entity_ids if entity_id in storage}
+
+    async def save_many(self, entities: Sequence[ExampleEntity]) -> list[ExampleEntity]:
+        """Store entities in memory."""
+        for entity in entities:
+            self._store(entity)
+        return list(entities)
+
+    async def delete_many(self, entity_ids: Sequence[UUID]) -> set[UUID]:
+        """Remove entities from memory."""
+        return {entity_id for entity_id in entity_ids if self._remove(entity_id)}
+
+    async def list_page(
+        self, limit: int, after: tuple[datetime, UUID] | None = None
+    ) -> list[ExampleEntity]:
+        """List entities from the sorted index."""
+        start = bisect_right(self._order, after) if after is not None else 0
+        storage = self._storage
+        return [storage[entity_id] for _, entity_id in self._order[start : start + limit]]
+
+    async def list_page_by_id(self, limit: int, after: UUID | None = None) -> list[ExampleEntity]:
+        """List entities from the sorted IDs."""
+        start = bisect_right(self._ids, after) if after is not None else 0
+        storage = self._storage
+        return [storage[entity_id] for entity_id in self._ids[start : start + limit]]
+
+    async def iterate(self, batch_size: int = 1000) -> AsyncIterator[ExampleEntity]:
+        """Yield entities from the sorted index, one batch at a time."""
+        async for entity in iterate_pages(self.list_page, batch_size):
+            yield entity
+
+    def _store(self, entity: ExampleEntity) -> None:
+        """Insert or replace an entity, keeping the sorted indexes in step."""
+        previous = self._storage.get(entity.id)
+        if previous is None:
+            # Time-ordered IDs are appended; random ones land anywhere
+            if not self._ids or self._ids[-1] < entity.id:
+                self._ids.append(entity.id)
+            else:
+                insort(self._ids, entity.id)
+        if previous is None or previous.created_at != entity.created_at:
+            if previous is not None:
+                self._unindex(previous)
+            key = (entity.created_at, entity.id)
+            # Entities mostly arrive in creation order, which is a plain append
+            if not self._order or self._order[-1] < key:
+                self._order.append(key)
+            else:
+                insort(self._order, key)
+        self._storage[entity.id] = entity
+
+    def _remove(self, entity_id: UUID) -> bool:
+        """Remove an entity and its index key. Returns True if it existed."""
+        entity = self._storage.pop(entity_id, None)
+        if entity is None:
+            return False
+        self._unindex(entity)
+        del self._ids[bisect_left(self._ids, entity_id)]
+        return True
+
+    def _unindex(self, entity: ExampleEntity) -> None:
+        """Drop an entity's key from the sorted index."""
+        key = (entity.created_at, entity.id)
+        position = bisect_left(self._order, key)
+        if position < len(self._order) and self._order[position] == key:
+            del self._order[position]
+
+
+def create_repository(settings: Settings) -> ExampleRepository:
+    """Build the repository selected by ``settings``.
+
+    The backend is chosen by the ``DATABASE_URL`` scheme: no URL (or
+    ``memory://``) selects in-memory storage, laid out as entity objects,
+    as columns or as lock-striped shards depending on ``memory_layout``;
+    ``file://<directory>`` selects the durable log-and-snapshot store;
+    ``postgresql://`` and ``sqlite://`` select the pooled SQL repository.
+
+    Optional layers then wrap the backend, innermost first:
+
+    - With ``coalesce_reads``, concurrent reads of the same entity from a
+      database share one query. In-memory and file backends answer without
+      waiting, so nothing could coalesce there.
+    - With ``write_behind_enabled``, writes are acknowledged once buffered
+      and flushed in batches.
+    - With ``search_enabled``, a full-text index is built by the first
+      search and kept up to date by writes. It only sees this process's
+      writes, so it is left out when several workers serve the same storage.
+    - Unless disabled, a read-through cache. When several workers serve the
+      same storage, a cache could return entities another worker has since
+      changed, so it is only used if ``cache_ttl_seconds`` bounds that
+      staleness.
+    - With ``metrics_enabled``, an outermost instrumentation layer that
+      times every call.
+
+    Raises:
+        ValueError: If the URL scheme is not supported
+    """
+    repository = _create_backend(settings)
+    if settings.coalesce_reads and not isinstance(
+        repository,
+        InMemoryExampleRepository
+        | ColumnarExampleRepository
+        | ShardedExampleRepository
+        | FileExampleRepository,
+    ):
+        repository = CoalescingExampleRepository(repository)
+    if settings.write_behind_enabled:
+        repository = WriteBehindExampleRepository(
+            repository,
+            flush_size=settings.write_behind_flush_size,
+            flush_interval=settings.write_behind_flush_interval,
+            max_pending=settings.write_behind_max_pending,
+        )
+    multiprocess = settings.workers is not None and settings.workers > 1
+    if settings.search_enabled and not multiprocess:
+        repository = SearchIndexedExampleRepository(repository)
+    if settings.cache_enabled and (not multiprocess or settings.cache_ttl_seconds is not None):
+        repository = CachedExampleRepository(
+            repository,
+            max_entries=settings.cache_max_entries,
+            ttl=settings.cache_ttl_seconds,
+            negative_ttl=settings.cache_negative_ttl_seconds,
+        )
+    if settings.metrics_enabled:
+        repository = InstrumentedExampleRepository(repository)
+    return repository
+
+
+def is_process_shared(settings: Settings) -> bool:
+    """Whether the storage selected by ``settings`` is shared between processes.
+
+    In-memory repositories and in-memory SQLite belong to a single process,
+    so every worker would serve its own dataset, and a ``file://`` directory
+    is locked by the process that opens it; databases and SQLite files
+    are seen identically by all of them.
+    """
+    if not settings.database_url or settings.database_url.startswith(("memory://", "file://")):
         return False
+
+    from ...infrastructure.database import is_memory_database
+
+    return not is_memory_database(settings.database_url)
+
+
+def _create_backend(settings: Settings) -> ExampleRepository:
+    """Build the storage backend selected by the ``DATABASE_URL`` scheme."""
+    if not settings.database_url or settings.database_url.startswith("memory://"):
+        if settings.memory_layout == "columnar":
+            return ColumnarExampleRepository()
+        if settings.memory_layout == "sharded":
+            return ShardedExampleRepository(settings.memory_shards)
+        return InMemoryExampleRepository()
+    if settings.database_url.startswith("file://"):
+        return FileExampleRepository(
+            settings.database_url.removeprefix("file://"),
+            fsync=settings.file_fsync,
+            commit_delay=settings.file_commit_delay,
+            compact_bytes=settings.file_compact_bytes,
+        )
+
+    from ...infrastructure.database import ASYNC_DRIVERS, create_engine, url_scheme
+
+    if url_scheme(settings.database_url) in ASYNC_DRIVERS:
+        from .sql import SqlExampleRepository
+
+        return SqlExampleRepository(create_engine(settings))
+
+    raise ValueError(f"Unsupported database URL scheme: {url_scheme(settings.database_url)!r}")
+
+
+__all__ = [
+    "CacheStats",
+    "CachedExampleRepository",
+    "CoalescingExampleRepository",
+    "CoalescingStats",
+    "ColumnarExampleRepository",
+    "ExampleRepository",
+    "FileExampleRepository",
+    "FileStoreStats",
+    "ForwardingExampleRepository",
+    "InMemoryExampleRepository",
+    "InstrumentedExampleRepository",
+    "InvertedIndex",
+    "SearchIndexStats",
+    "SearchIndexedExampleRepository",
+    "ShardedExampleRepository",
+    "SingleFlight",
+    "WriteBehindExampleRepository",
+    "WriteBufferStats",
+    "create_repository",
+    "find_layer",
+    "is_process_shared",
+]
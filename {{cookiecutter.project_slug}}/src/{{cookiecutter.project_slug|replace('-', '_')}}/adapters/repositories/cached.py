@@ -0,0 +1,212 @@
+"""Read-through cache in front of any ExampleRepository.
+
+Entities are kept in a bounded LRU map with optional expiry. Misses can be
+cached too (negative caching), so floods of lookups for unknown IDs are
+answered without touching the store.
+"""
+
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import datetime
+from typing import TYPE_CHECKING
+from uuid import UUID
+
+from .forwarding import ForwardingExampleRepository
+
+if TYPE_CHECKING:
+    from ...domain.entities import ExampleEntity
+    from . import ExampleRepository
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    """Point-in-time counters for a CachedExampleRepository."""
+
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    max_entries: int
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups answered from the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class CachedExampleRepository(ForwardingExampleRepository):
+    """Bounded LRU/TTL read-through cache for ExampleRepository.
+
+    Writes go to the wrapped repository first and then refresh or invalidate
+    the cached entry, so reads never observe a value older than the last
+    write made through this cache.
+
+    Args:
+        inner: Repository being cached
+        max_entries: Entries kept before the least recently used is evicted
+        ttl: Seconds an entity stays cached, or None to keep it until evicted
+        negative_ttl: Seconds a miss stays cached; 0 disables negative caching
+    """
+
+    def __init__(
+        self,
+        inner: ExampleRepository,
+        max_entries: int = 10_000,
+        ttl: float | None = None,
+        negative_ttl: float = 5.0,
+    ) -> None:
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        super().__init__(inner)
+        self._max_entries = max_entries
+        self._ttl = ttl
+        self._negative_ttl = negative_ttl
+        # entity ID -> (entity or None for a cached miss, expiry deadline)
+        self._entries: OrderedDict[UUID, tuple[ExampleEntity | None, float | None]] = OrderedDict()
+        # Bumped on every write so a slow read cannot cache a stale result
+        self._epoch = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def stats(self) -> CacheStats:
+        """Return the current cache counters."""
+        return CacheStats(
+            hits=self._hits,
+            misses=self._misses,
+            evictions=self._evictions,
+            size=len(self._entries),
+            max_entries=self._max_entries,
+        )
+
+    def clear(self) -> None:
+        """Drop every cached entry."""
+        self._entries.clear()
+        self._epoch += 1
+
+    async def get_by_id(self, entity_id: UUID) -> ExampleEntity | None:
+        """Retrieve an entity, from the cache when possible."""
+        entry = self._lookup(entity_id)
+        if entry is not None:
+            self._hits += 1
+            return entry[0]
+
+        self._misses += 1
+        epoch = self._epoch
+        entity = await self._inner.get_by_id(entity_id)
+        if epoch == self._epoch:
+            self._put(entity_id, entity)
+        return entity
+
+    async def get_version(self, entity_id: UUID) -> datetime | None:
+        """Return an entity's version, from the cache when possible.
+
+        A miss asks the wrapped repository for the version alone and caches
+        nothing, so version checks never fill the cache with entities.
+        """
+        entry = self._lookup(entity_id)
+        if entry is not None:
+            self._hits += 1
+            return entry[0].version if entry[0] is not None else None
+        self._misses += 1
+        return await self._inner.get_version(entity_id)
+
+    async def get_many(self, entity_ids: Sequence[UUID]) -> dict[UUID, ExampleEntity]:
+        """Retrieve entities, fetching only the uncached ones."""
+        found: dict[UUID, ExampleEntity] = {}
+        missing: list[UUID] = []
+        for entity_id in entity_ids:
+            entry = self._lookup(entity_id)
+            if entry is None:
+                missing.append(entity_id)
+                continue
+            if entry[0] is not None:
+                found[entity_id] = entry[0]
+        self._hits += len(entity_ids) - len(missing)
+        self._misses += len(missing)
+
+        if missing:
+            epoch = self._epoch
+            fetched = await self._inner.get_many(missing)
+            found.update(fetched)
+            if epoch == self._epoch:
+                for entity_id in missing:
+                    self._put(entity_id, fetched.get(entity_id))
+        return found
+
+    async def save(self, entity: ExampleEntity) -> ExampleEntity:
+        """Persist an entity and refresh its cache entry."""
+        saved = await self._inner.save(entity)
+        self._epoch += 1
+        self._put(saved.id, saved)
+        return saved
+
+    async def save_many(self, entities: Sequence[ExampleEntity]) -> list[ExampleEntity]:
+        """Persist entities and refresh their cache entries."""
+        saved = await self._inner.save_many(entities)
+        self._epoch += 1
+        for entity in saved:
+            self._put(entity.id, entity)
+        return saved
+
+    async def delete(self, entity_id: UUID) -> bool:
+        """Remove an entity and invalidate its cache entry."""
+        deleted = await self._inner.delete(entity_id)
+        self._epoch += 1
+        self._entries.pop(entity_id, None)
+        return deleted
+
+    async def compare_and_save(self, entity: ExampleEntity, expected_version: datetime) -> bool:
+        """Conditionally persist an entity; refresh its entry, or drop it if stale."""
+        saved = await self._inner.compare_and_save(entity, expected_version)
+        self._epoch += 1
+        if saved:
+            self._put(entity.id, entity)
+        else:
+            self._entries.pop(entity.id, None)
+        return saved
+
+    async def compare_and_delete(self, entity_id: UUID, expected_version: datetime) -> bool:
+        """Conditionally remove an entity and invalidate its cache entry."""
+        deleted = await self._inner.compare_and_delete(entity_id, expected_version)
+        self._epoch += 1
+        self._entries.pop(entity_id, None)
+        return deleted
+
+    async def delete_many(self, entity_ids: Sequence[UUID]) -> set[UUID]:
+        """Remove entities and invalidate their cache entries."""
+        deleted = await self._inner.delete_many(entity_ids)
+        self._epoch += 1
+        for entity_id in entity_ids:
+            self._entries.pop(entity_id, None)
+        return deleted
+
+    def _lookup(self, entity_id: UUID) -> tuple[ExampleEntity | None, float | None] | None:
+        """Return a live cache entry, dropping it if it has expired."""
+        entry = self._entries.get(entity_id)
+        if entry is None:
+            return None
+        expires_at = entry[1]
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._entries[entity_id]
+            return None
+        self._entries.move_to_end(entity_id)
+        return entry
+
+    def _put(self, entity_id: UUID, entity: ExampleEntity | None) -> None:
+        """Cache an entity (or a miss), evicting the LRU entry when full."""
+        ttl = self._ttl if entity is not None else self._negative_ttl
+        if entity is None and not ttl:
+            self._entries.pop(entity_id, None)
+            return
+
+        self._entries[entity_id] = (entity, time.monotonic() + ttl if ttl is not None else None)
+        self._entries.move_to_end(entity_id)
+        if len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+            self._evictions += 1
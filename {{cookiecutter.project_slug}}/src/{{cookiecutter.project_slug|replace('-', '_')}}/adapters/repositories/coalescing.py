@@ -0,0 +1,184 @@
+"""Request coalescing (single flight) in front of any ExampleRepository.
+
+Concurrent ``get_by_id`` calls for the same ID share one call to the wrapped
+repository: the first caller (the leader) makes the call and every caller
+that arrives while it is in flight waits for the same result. A burst of
+reads for a hot entity then costs one storage round trip instead of one per
+request.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable, Sequence
+from dataclasses import dataclass
+from datetime import datetime
+from typing import TYPE_CHECKING
+from uuid import UUID
+
+from ...infrastructure.metrics import REGISTRY, MetricsRegistry
+from .forwarding import ForwardingExampleRepository
+
+if TYPE_CHECKING:
+    from ...domain.entities import ExampleEntity
+    from . import ExampleRepository
+
+
+class _LeaderCancelled(Exception):
+    """The shared call was abandoned because its leader was cancelled."""
+
+
+class SingleFlight[K: Hashable, V]:
+    """Deduplicates concurrent calls with the same key.
+
+    Outcomes are shared exactly: when the call raises, every waiter sees
+    the same exception. Waiters are independent for cancellation. A
+    cancelled waiter stops waiting without affecting the others, and if the
+    leader itself is cancelled, the remaining waiters start the call again
+    rather than being cancelled with it.
+
+    Args:
+        on_coalesced: Called whenever a caller receives a shared outcome
+
+    Example:
+        >>> flight = SingleFlight[UUID, ExampleEntity | None]()
+        >>> entity = await flight.do(entity_id, lambda: repository.get_by_id(entity_id))
+    """
+
+    def __init__(self, on_coalesced: Callable[[], object] | None = None) -> None:
+        self._calls: dict[K, asyncio.Future[V]] = {}
+        self._on_coalesced = on_coalesced
+        self.calls = 0
+        self.coalesced = 0
+
+    def in_flight(self) -> int:
+        """Number of keys with a call in progress."""
+        return len(self._calls)
+
+    def forget(self, key: K) -> None:
+        """Make later callers for ``key`` start a new call.
+
+        Callers already waiting still receive the in-flight result.
+        """
+        self._calls.pop(key, None)
+
+    async def do(self, key: K, call: Callable[[], Awaitable[V]]) -> V:
+        """Return the result of ``call``, shared with concurrent callers for ``key``."""
+        while (shared := self._calls.get(key)) is not None:
+            try:
+                # Shielded so that one waiter's cancellation leaves the
+                # shared future intact for the others
+                result = await asyncio.shield(shared)
+            except _LeaderCancelled:
+                continue
+            except Exception:
+                self._coalesce()
+                raise
+            self._coalesce()
+            return result
+
+        future: asyncio.Future[V] = asyncio.get_running_loop().create_future()
+        self._calls[key] = future
+        self.calls += 1
+        try:
+            result = await call()
+        except asyncio.CancelledError:
+            future.set_exception(_LeaderCancelled())
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            if self._calls.get(key) is future:
+                del self._calls[key]
+            # Mark the outcome as retrieved, so an exception nobody else
+            # waited for is not logged as "never retrieved"
+            future.exception()
+
+    def _coalesce(self) -> None:
+        self.coalesced += 1
+        if self._on_coalesced is not None:
+            self._on_coalesced()
+
+
+@dataclass(frozen=True)
+class CoalescingStats:
+    """Point-in-time counters for a CoalescingExampleRepository."""
+
+    calls: int
+    coalesced: int
+    in_flight: int
+
+    @property
+    def coalesced_rate(self) -> float:
+        """Fraction of completed lookups that shared another lookup's call."""
+        lookups = self.calls + self.coalesced
+        return self.coalesced / lookups if lookups else 0.0
+
+
+class CoalescingExampleRepository(ForwardingExampleRepository):
+    """ExampleRepository wrapper sharing concurrent reads of the same entity.
+
+    Writes through this wrapper forget the in-flight read of the entities
+    they touch, so a read that starts after a write never joins a call that
+    began before it.
+
+    Args:
+        inner: Repository whose reads are coalesced
+        registry: Registry receiving the coalesced-call counter
+    """
+
+    def __init__(self, inner: ExampleRepository, registry: MetricsRegistry = REGISTRY) -> None:
+        super().__init__(inner)
+        coalesced = registry.counter(
+            "repository_coalesced_reads_total",
+            "Entity reads answered by another read's in-flight call.",
+        )
+        self._flight = SingleFlight[UUID, "ExampleEntity | None"](on_coalesced=coalesced.inc)
+
+    def stats(self) -> CoalescingStats:
+        """Return the current coalescing counters."""
+        return CoalescingStats(
+            calls=self._flight.calls,
+            coalesced=self._flight.coalesced,
+            in_flight=self._flight.in_flight(),
+        )
+
+    async def get_by_id(self, entity_id: UUID) -> ExampleEntity | None:
+        """Retrieve an entity, sharing the call with concurrent readers."""
+        return await self._flight.do(entity_id, lambda: self._inner.get_by_id(entity_id))
+
+    async def save(self, entity: ExampleEntity) -> ExampleEntity:
+        """Persist an entity and forget any in-flight read of it."""
+        self._flight.forget(entity.id)
+        return await self._inner.save(entity)
+
+    async def delete(self, entity_id: UUID) -> bool:
+        """Remove an entity and forget any in-flight read of it."""
+        self._flight.forget(entity_id)
+        return await self._inner.delete(entity_id)
+
+    async def compare_and_save(self, entity: ExampleEntity, expected_version: datetime) -> bool:
+        """Conditionally persist an entity and forget any in-flight read of it."""
+        self._flight.forget(entity.id)
+        return await self._inner.compare_and_save(entity, expected_version)
+
+    async def compare_and_delete(self, entity_id: UUID, expected_version: datetime) -> bool:
+        """Conditionally remove an entity and forget any in-flight read of it."""
+        self._flight.forget(entity_id)
+        return await self._inner.compare_and_delete(entity_id, expected_version)
+
+    async def save_many(self, entities: Sequence[ExampleEntity]) -> list[ExampleEntity]:
+        """Persist entities and forget any in-flight reads of them."""
+        for entity in entities:
+            self._flight.forget(entity.id)
+        return await self._inner.save_many(entities)
+
+    async def delete_many(self, entity_ids: Sequence[UUID]) -> set[UUID]:
+        """Remove entities and forget any in-flight reads of them."""
+        for entity_id in entity_ids:
+            self._flight.forget(entity_id)
+        return await self._inner.delete_many(entity_ids)
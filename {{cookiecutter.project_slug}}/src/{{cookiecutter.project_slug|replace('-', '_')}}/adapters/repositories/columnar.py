@@ -0,0 +1,252 @@
+"""Columnar in-memory implementation of ExampleRepository.
+
+Instead of one entity object per row, fields are held in parallel columns:
+IDs as 128-bit ints, timestamps as epoch microseconds in typed arrays and
+names shared through a reference-counted table so repeated values are stored
+once. Entity objects are only built when rows are read, which keeps very large
+datasets compact.
+"""
+
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from collections.abc import AsyncIterator, Sequence
+from datetime import datetime
+from uuid import UUID
+
+from ...domain.entities import ExampleEntity
+from .paging import iterate_pages
+from .timestamps import NULL_TIME, from_micros, to_micros
+
+
+class _InternTable:
+    """Canonical copies of strings held by rows, with a count of holders.
+
+    Unlike ``sys.intern``, a string is dropped as soon as no row holds it, so
+    deleting or renaming entities gives the memory back.
+    """
+
+    __slots__ = ("_counts", "_strings")
+
+    def __init__(self) -> None:
+        self._strings: dict[str, str] = {}
+        self._counts: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._strings)
+
+    def acquire(self, value: str) -> str:
+        """Return the canonical copy of ``value`` and count one more holder."""
+        canonical = self._strings.setdefault(value, value)
+        self._counts[canonical] = self._counts.get(canonical, 0) + 1
+        return canonical
+
+    def release(self, value: str) -> None:
+        """Count one holder fewer, dropping ``value`` when none are left."""
+        remaining = self._counts[value] - 1
+        if remaining:
+            self._counts[value] = remaining
+        else:
+            del self._counts[value]
+            del self._strings[value]
+
+
+class ColumnarExampleRepository:
+    """Array-backed in-memory implementation of ExampleRepository.
+
+    Rows stay densely packed: deleting a row moves the last row into its
+    slot. ``(created_at, id)`` order is kept as a list of ID ints sorted by
+    that key, and ID order as a sorted list of the same ints; both share the
+    int objects already held by the row map, so each index costs one
+    pointer per entity.
+
+    Names repeat across entities and go through an intern table owned by the
+    repository; free-text descriptions are rarely shared and are stored as
+    given.
+    """
+
+    def __init__(self) -> None:
+        self._rows: dict[int, int] = {}
+        self._ids: list[int] = []
+        self._created = array("q")
+        self._updated = array("q")
+        self._names: list[str] = []
+        self._interned = _InternTable()
+        self._descriptions: list[str] = []
+        self._order: list[int] = []
+        self._by_id: list[int] = []
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    async def open(self) -> None:
+        """Nothing to acquire for in-memory storage."""
+
+    async def close(self) -> None:
+        """Nothing to release for in-memory storage."""
+
+    async def get_by_id(self, entity_id: UUID) -> ExampleEntity | None:
+        """Build the entity stored for an ID."""
+        row = self._rows.get(entity_id.int)
+        return self._entity(row) if row is not None else None
+
+    async def get_version(self, entity_id: UUID) -> datetime | None:
+        """Read an entity's version from the timestamp columns alone."""
+        row = self._rows.get(entity_id.int)
+        if row is None:
+            return None
+        updated = self._updated[row]
+        return from_micros(updated if updated != NULL_TIME else self._created[row])
+
+    async def save(self, entity: ExampleEntity) -> ExampleEntity:
+        """Store entity fields in the columns."""
+        self._store(entity)
+        return entity
+
+    async def delete(self, entity_id: UUID) -> bool:
+        """Remove an entity's row."""
+        return self._remove(entity_id.int)
+
+    async def compare_and_save(self, entity: ExampleEntity, expected_version: datetime) -> bool:
+        """Store entity fields if the stored row is at ``expected_version``."""
+        if await self.get_version(entity.id) != expected_version:
+            return False
+        self._store(entity)
+        return True
+
+    async def compare_and_delete(self, entity_id: UUID, expected_version: datetime) -> bool:
+        """Remove an entity's row if it is at ``expected_version``."""
+        if await self.get_version(entity_id) != expected_version:
+            return False
+        return self._remove(entity_id.int)
+
+    async def get_many(self, entity_ids: Sequence[UUID]) -> dict[UUID, ExampleEntity]:
+        """Build the entities stored for several IDs."""
+        rows = self._rows
+        return {
+            entity_id: self._entity(rows[entity_id.int])
+            for entity_id in entity_ids
+            if entity_id.int in rows
+        }
+
+    async def save_many(self, entities: Sequence[ExampleEntity]) -> list[ExampleEntity]:
+        """Store several entities in the columns."""
+        for entity in entities:
+            self._store(entity)
+        return list(entities)
+
+    async def delete_many(self, entity_ids: Sequence[UUID]) -> set[UUID]:
+        """Remove several entities' rows."""
+        return {entity_id for entity_id in entity_ids if self._remove(entity_id.int)}
+
+    async def list_page(
+        self, limit: int, after: tuple[datetime, UUID] | None = None
+    ) -> list[ExampleEntity]:
+        """List entities from the sorted index."""
+        start = 0
+        if after is not None:
+            start = bisect_right(self._order, (to_micros(after[0]), after[1].int), key=self._key)
+        rows = self._rows
+        return [self._entity(rows[id_int]) for id_int in self._order[start : start + limit]]
+
+    async def list_page_by_id(self, limit: int, after: UUID | None = None) -> list[ExampleEntity]:
+        """List entities from the sorted ID ints."""
+        start = bisect_right(self._by_id, after.int) if after is not None else 0
+        rows = self._rows
+        return [self._entity(rows[id_int]) for id_int in self._by_id[start : start + limit]]
+
+    async def iterate(self, batch_size: int = 1000) -> AsyncIterator[ExampleEntity]:
+        """Yield entities from the sorted index, one batch at a time."""
+        async for entity in iterate_pages(self.list_page, batch_size):
+            yield entity
+
+    def _key(self, id_int: int) -> tuple[int, int]:
+        """Sort key of a stored ID: ``(created_at micros, id)``."""
+        return self._created[self._rows[id_int]], id_int
+
+    def _entity(self, row: int) -> ExampleEntity:
+        """Materialise the entity stored in ``row``."""
+        updated = self._updated[row]
+        return ExampleEntity(
+            id=UUID(int=self._ids[row]),
+            created_at=from_micros(self._created[row]),
+            updated_at=from_micros(updated) if updated != NULL_TIME else None,
+            name=self._names[row],
+            description=self._descriptions[row],
+        )
+
+    def _store(self, entity: ExampleEntity) -> None:
+        """Insert or overwrite the row for ``entity``."""
+        id_int = entity.id.int
+        created = to_micros(entity.created_at)
+        updated = to_micros(entity.updated_at) if entity.updated_at else NULL_TIME
+        name = self._interned.acquire(entity.name)
+        description = entity.description
+
+        row = self._rows.get(id_int)
+        if row is None:
+            self._rows[id_int] = len(self._ids)
+            self._ids.append(id_int)
+            self._created.append(created)
+            self._updated.append(updated)
+            self._names.append(name)
+            self._descriptions.append(description)
+            # Time-ordered IDs are appended; random ones land anywhere
+            if not self._by_id or self._by_id[-1] < id_int:
+                self._by_id.append(id_int)
+            else:
+                insort(self._by_id, id_int)
+        else:
+            self._updated[row] = updated
+            self._interned.release(self._names[row])
+            self._names[row] = name
+            self._descriptions[row] = description
+            if self._created[row] == created:
+                return
+            self._unindex(self._created[row], id_int)
+            self._created[row] = created
+            # Reuse the int object held by the row map
+            id_int = self._ids[row]
+
+        # Entities mostly arrive in creation order, which is a plain append
+        if not self._order or self._key(self._order[-1]) < (created, id_int):
+            self._order.append(id_int)
+        else:
+            insort(self._order, id_int, key=self._key)
+
+    def _remove(self, id_int: int) -> bool:
+        """Delete a row by moving the last row into its slot."""
+        row = self._rows.get(id_int)
+        if row is None:
+            return False
+        self._unindex(self._created[row], id_int)
+        self._interned.release(self._names[row])
+        del self._rows[id_int]
+        del self._by_id[bisect_left(self._by_id, id_int)]
+
+        last = len(self._ids) - 1
+        if row != last:
+            moved = self._ids[last]
+            self._ids[row] = moved
+            self._created[row] = self._created[last]
+            self._updated[row] = self._updated[last]
+            self._names[row] = self._names[last]
+            self._descriptions[row] = self._descriptions[last]
+            self._rows[moved] = row
+        self._ids.pop()
+        self._created.pop()
+        self._updated.pop()
+        self._names.pop()
+        self._descriptions.pop()
+        return True
+
+    def _unindex(self, created: int, id_int: int) -> None:
+        """Drop a stored ID from the sorted index.
+
+        Must run while the row still holds ``created``, as index keys are
+        read from the columns.
+        """
+        position = bisect_left(self._order, (created, id_int), key=self._key)
+        if position < len(self._order) and self._order[position] == id_int:
+            del self._order[position]
@@ -0,0 +1,697 @@
+"""Durable file-backed implementation of ExampleRepository.
+
+Entities are served from memory and persisted in a directory holding two
+files:
+
+- ``log``: every save and delete, appended as a length-prefixed, checksummed
+  record. A write is acknowledged once its record has been fsynced. Writes
+  that arrive while a sync is in progress are committed together by the
+  next one (group commit), so under load one fsync covers many writes.
+- ``snapshot``: every entity as of the last compaction, laid out to be read
+  in place through mmap: entity records in ``(created_at, id)`` order, an
+  index of that order and an index sorted by ID. Opening maps the file and
+  binary-searches it on demand, so startup decodes nothing however many
+  entities it holds; only the log written since the last compaction is
+  replayed.
+
+Once the log outgrows ``compact_bytes`` it is compacted: the log is set
+aside, a new snapshot with its changes merged in is written in a thread
+and atomically swapped in, and the old log is deleted. A crash can leave a
+partial record at the end of the log; the next start detects it by its
+length or checksum and truncates it, losing only a write that was never
+acknowledged.
+
+A directory belongs to one process at a time; a second process opening it
+fails rather than corrupting the log.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import heapq
+import logging
+import mmap
+import os
+import struct
+import sys
+import zlib
+from bisect import bisect_left, bisect_right
+from collections.abc import AsyncIterator, Iterable, Iterator, Sequence
+from dataclasses import dataclass
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+from typing import IO, Any
+from uuid import UUID
+
+from ...domain.entities import ExampleEntity
+from .paging import iterate_pages
+from .sharded import ShardedExampleRepository
+from .timestamps import NULL_TIME, from_micros, to_micros
+
+logger = logging.getLogger(__name__)
+
+_SNAPSHOT = "snapshot"
+_LOG = "log"
+# The log being folded into a new snapshot by a compaction
+_OLD_LOG = "log.old"
+_LOCK = "lock"
+
+_MAGIC = b"EXSNAP01"
+# Magic, entity count, offset of the order index
+_SNAPSHOT_HEADER = struct.Struct("<8sQQ")
+# ID, created_at, updated_at, then the byte lengths of name and description
+_ENTITY = struct.Struct("<16sqqII")
+# created_at, ID, record offset
+_ORDER_ENTRY = struct.Struct("<q16sQ")
+# ID, record offset
+_ID_ENTRY = struct.Struct("<16sQ")
+# Payload length, CRC-32 of the payload
+_RECORD_HEADER = struct.Struct("<II")
+_SAVE = 1
+_DELETE = 2
+
+type Change = tuple[UUID, ExampleEntity | None]
+
+
+def _encode_entity(entity: ExampleEntity) -> bytes:
+    name = entity.name.encode()
+    description = entity.description.encode()
+    updated = to_micros(entity.updated_at) if entity.updated_at is not None else NULL_TIME
+    header = _ENTITY.pack(
+        entity.id.bytes, to_micros(entity.created_at), updated, len(name), len(description)
+    )
+    return header + name + description
+
+
+def _decode_entity(buffer: bytes | mmap.mmap, offset: int) -> ExampleEntity:
+    raw_id, created, updated, name_length, description_length = _ENTITY.unpack_from(buffer, offset)
+    start = offset + _ENTITY.size
+    middle = start + name_length
+    return ExampleEntity(
+        id=UUID(bytes=raw_id),
+        created_at=from_micros(created),
+        updated_at=from_micros(updated) if updated != NULL_TIME else None,
+        name=buffer[start:middle].decode(),
+        description=buffer[middle : middle + description_length].decode(),
+    )
+
+
+def _encode_change(entity_id: UUID, entity: ExampleEntity | None) -> bytes:
+    """Encode a save (or, with ``entity=None``, a delete) as a log record."""
+    if entity is None:
+        payload = bytes([_DELETE]) + entity_id.bytes
+    else:
+        payload = bytes([_SAVE]) + _encode_entity(entity)
+    return _RECORD_HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+
+
+def _decode_log(data: bytes) -> tuple[list[Change], int]:
+    """Decode the complete records at the start of a log.
+
+    Returns:
+        The changes, and the length of the intact prefix they were read
+        from; anything after it is a torn or corrupt write
+    """
+    changes: list[Change] = []
+    offset = 0
+    while offset + _RECORD_HEADER.size <= len(data):
+        length, checksum = _RECORD_HEADER.unpack_from(data, offset)
+        start = offset + _RECORD_HEADER.size
+        end = start + length
+        if length == 0 or end > len(data):
+            break
+        payload = data[start:end]
+        if zlib.crc32(payload) != checksum:
+            break
+        if payload[0] == _SAVE:
+            entity = _decode_entity(payload, 1)
+            changes.append((entity.id, entity))
+        elif payload[0] == _DELETE:
+            changes.append((UUID(bytes=payload[1:17]), None))
+        else:
+            break
+        offset = end
+    return changes, offset
+
+
+def _order_key(entity: ExampleEntity) -> tuple[datetime, UUID]:
+    return entity.created_at, entity.id
+
+
+def _fsync_directory(directory: Path) -> None:
+    """Make renames and deletions in ``directory`` durable."""
+    if sys.platform == "win32":
+        return
+    descriptor = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(descriptor)
+    finally:
+        os.close(descriptor)
+
+
+class _Entries:
+    """Fixed-size index entries in a mapped snapshot, as a sequence for bisect."""
+
+    def __init__(self, buffer: mmap.mmap, offset: int, count: int, entry: struct.Struct) -> None:
+        self._buffer = buffer
+        self._offset = offset
+        self._count = count
+        self._entry = entry
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index: int) -> tuple[Any, ...]:
+        return self._entry.unpack_from(self._buffer, self._offset + index * self._entry.size)
+
+
+class _Snapshot:
+    """Read-only view of a snapshot file through mmap."""
+
+    def __init__(self, buffer: mmap.mmap | None = None) -> None:
+        self._buffer = buffer
+        self._count = 0
+        if buffer is None:
+            return
+        magic, count, order_offset = _SNAPSHOT_HEADER.unpack_from(buffer)
+        id_offset = order_offset + count * _ORDER_ENTRY.size
+        if magic != _MAGIC or id_offset + count * _ID_ENTRY.size != len(buffer):
+            buffer.close()
+            raise ValueError("Not a valid snapshot file")
+        self._count = count
+        self._order = _Entries(buffer, order_offset, count, _ORDER_ENTRY)
+        self._ids = _Entries(buffer, id_offset, count, _ID_ENTRY)
+
+    @classmethod
+    def load(cls, path: Path) -> _Snapshot:
+        """Map a snapshot file; a missing file is an empty snapshot."""
+        try:
+            with path.open("rb") as file:
+                return cls(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
+        except FileNotFoundError:
+            return cls()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def close(self) -> None:
+        if self._buffer is not None:
+            self._buffer.close()
+
+    def get(self, entity_id: UUID) -> ExampleEntity | None:
+        """Binary-search the ID index and decode the entity's record."""
+        offset = self._offset(entity_id)
+        if offset is None:
+            return None
+        assert self._buffer is not None
+        return _decode_entity(self._buffer, offset)
+
+    def version(self, entity_id: UUID) -> datetime | None:
+        """Read an entity's version from its record header alone."""
+        offset = self._offset(entity_id)
+        if offset is None:
+            return None
+        assert self._buffer is not None
+        _, created, updated, _, _ = _ENTITY.unpack_from(self._buffer, offset)
+        return from_micros(updated if updated != NULL_TIME else created)
+
+    def _offset(self, entity_id: UUID) -> int | None:
+        """Binary-search the ID index for an entity's record offset."""
+        if self._buffer is None:
+            return None
+        key = entity_id.bytes
+        index = bisect_left(self._ids, key, key=lambda entry: entry[0])
+        if index == self._count:
+            return None
+        found, offset = self._ids[index]
+        return offset if found == key else None
+
+    def entities(self, after: tuple[datetime, UUID] | None = None) -> Iterator[ExampleEntity]:
+        """Decode entities in ``(created_at, id)`` order, starting after ``after``."""
+        if self._buffer is None:
+            return
+        start = 0
+        if after is not None:
+            start = bisect_right(
+                self._order, (to_micros(after[0]), after[1].bytes), key=lambda entry: entry[:2]
+            )
+        for index in range(start, self._count):
+            yield _decode_entity(self._buffer, self._order[index][2])
+
+    def entities_by_id(self, after: UUID | None = None) -> Iterator[ExampleEntity]:
+        """Decode entities in ID order, starting after ``after``."""
+        if self._buffer is None:
+            return
+        start = 0
+        if after is not None:
+            start = bisect_right(self._ids, after.bytes, key=lambda entry: entry[0])
+        for index in range(start, self._count):
+            yield _decode_entity(self._buffer, self._ids[index][1])
+
+    @staticmethod
+    def write(path: Path, entities: Iterable[ExampleEntity], fsync: bool) -> None:
+        """Write a snapshot of ``entities``, which must be in ``(created_at, id)`` order."""
+        order = bytearray()
+        ids: list[tuple[bytes, int]] = []
+        with path.open("wb") as file:
+            # Rewritten with the real counts once the records are written
+            file.write(_SNAPSHOT_HEADER.pack(_MAGIC, 0, 0))
+            offset = _SNAPSHOT_HEADER.size
+            for entity in entities:
+                record = _encode_entity(entity)
+                file.write(record)
+                order += _ORDER_ENTRY.pack(to_micros(entity.created_at), entity.id.bytes, offset)
+                ids.append((entity.id.bytes, offset))
+                offset += len(record)
+            ids.sort()
+            file.write(order)
+            file.write(b"".join(_ID_ENTRY.pack(*entry) for entry in ids))
+            file.seek(0)
+            file.write(_SNAPSHOT_HEADER.pack(_MAGIC, len(ids), offset))
+            file.flush()
+            if fsync:
+                os.fsync(file.fileno())
+
+
+def _merge(
+    snapshot: _Snapshot, changes: dict[UUID, ExampleEntity | None]
+) -> Iterator[ExampleEntity]:
+    """Every entity of ``snapshot`` with ``changes`` applied, in order."""
+    kept = (entity for entity in snapshot.entities() if entity.id not in changes)
+    changed = sorted((entity for entity in changes.values() if entity is not None), key=_order_key)
+    return heapq.merge(kept, changed, key=_order_key)
+
+
+@dataclass(frozen=True)
+class FileStoreStats:
+    """Point-in-time counters for a FileExampleRepository."""
+
+    entities: int
+    log_bytes: int
+    commits: int
+    records: int
+    compactions: int
+
+    @property
+    def records_per_commit(self) -> float:
+        """Average writes made durable by one fsync."""
+        return self.records / self.commits if self.commits else 0.0
+
+
+class FileExampleRepository:
+    """ExampleRepository persisted to a log and an mmap-loaded snapshot.
+
+    Reads never touch the disk beyond the mapped snapshot: changes since the
+    last compaction are held in memory and take precedence over the
+    snapshot. Writes become visible once they are durable, when ``save``
+    and ``delete`` return. If writing the log fails, the writes of that
+    commit raise and are not applied.
+
+    Args:
+        directory: Directory holding the log and snapshot; created if missing
+        fsync: Sync every commit to disk. Without it, acknowledged writes
+            survive a process crash but not a power loss
+        commit_delay: Seconds a commit waits for more writes to share its
+            fsync; 0 commits as soon as the previous commit finishes
+        compact_bytes: Log size that triggers a compaction
+    """
+
+    def __init__(
+        self,
+        directory: Path | str,
+        fsync: bool = True,
+        commit_delay: float = 0.0,
+        compact_bytes: int = 64 * 1024 * 1024,
+    ) -> None:
+        if commit_delay < 0:
+            raise ValueError("commit_delay must not be negative")
+        if compact_bytes < 1:
+            raise ValueError("compact_bytes must be positive")
+        self._directory = Path(directory)
+        self._fsync = fsync
+        self._commit_delay = commit_delay
+        self._compact_bytes = compact_bytes
+        self._snapshot = _Snapshot()
+        # Changes since the snapshot: the entity, or None once deleted
+        self._changes: dict[UUID, ExampleEntity | None] = {}
+        # The changed entities that exist, in listing order
+        self._recent = ShardedExampleRepository(shards=1)
+        self._size = 0
+        self._lock_file: IO[bytes] | None = None
+        self._log: IO[bytes] | None = None
+        self._log_bytes = 0
+        self._pending: list[Change] = []
+        # Changes being written by the commit in progress, not yet applied
+        self._committing: list[Change] = []
+        self._batch: asyncio.Future[None] | None = None
+        self._commit_lock = asyncio.Lock()
+        self._compaction_lock = asyncio.Lock()
+        self._wakeup = asyncio.Event()
+        self._closing = False
+        self._committer: asyncio.Task[None] | None = None
+        self._compaction: asyncio.Task[None] | None = None
+        self._commits = 0
+        self._records = 0
+        self._compactions = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def stats(self) -> FileStoreStats:
+        """Return the current storage counters."""
+        return FileStoreStats(
+            entities=self._size,
+            log_bytes=self._log_bytes,
+            commits=self._commits,
+            records=self._records,
+            compactions=self._compactions,
+        )
+
+    async def open(self) -> None:
+        """Lock the directory, map the snapshot and replay the log.
+
+        Raises:
+            RuntimeError: If another process has the directory open
+        """
+        if self._log is not None:
+            return
+        self._directory.mkdir(parents=True, exist_ok=True)
+        self._lock_file = self._lock_directory()
+        self._snapshot = _Snapshot.load(self._directory / _SNAPSHOT)
+        self._changes = {}
+        self._recent = ShardedExampleRepository(shards=1)
+        self._size = len(self._snapshot)
+        for name in (_OLD_LOG, _LOG):
+            self._replay(self._directory / name)
+
+        old_log = self._directory / _OLD_LOG
+        if old_log.exists():
+            # A compaction was interrupted; finish it before taking writes
+            await self._rewrite_snapshot(dict(self._changes))
+            # Older records first: replaying the newer log alone stays correct
+            old_log.unlink()
+            (self._directory / _LOG).unlink(missing_ok=True)
+            self._sync_directory()
+
+        self._log = (self._directory / _LOG).open("ab")
+        self._log_bytes = self._log.tell()
+        self._closing = False
+        self._committer = asyncio.create_task(self._commit_continuously())
+
+    async def close(self) -> None:
+        """Commit outstanding writes, then release the files."""
+        if self._log is None:
+            return
+        self._closing = True
+        self._wakeup.set()
+        if self._committer is not None:
+            await self._committer
+            self._committer = None
+        if self._compaction is not None:
+            await self._compaction
+            self._compaction = None
+        await self._commit()
+        self._log.close()
+        self._log = None
+        self._snapshot.close()
+        self._snapshot = _Snapshot()
+        if self._lock_file is not None:
+            self._lock_file.close()
+            self._lock_file = None
+
+    async def compact(self) -> None:
+        """Fold the changes logged so far into a new snapshot."""
+        async with self._compaction_lock:
+            async with self._commit_lock:
+                # No commit in progress: the changes match the log exactly
+                changes = dict(self._changes)
+                if not changes or self._log is None:
+                    return
+                self._set_log_aside()
+            await self._rewrite_snapshot(changes)
+            (self._directory / _OLD_LOG).unlink()
+            self._sync_directory()
+            self._compactions += 1
+
+    async def get_by_id(self, entity_id: UUID) -> ExampleEntity | None:
+        """Retrieve an entity from the recent changes or the snapshot."""
+        return self._lookup(entity_id)
+
+    async def get_version(self, entity_id: UUID) -> datetime | None:
+        """Return an entity's version without decoding a snapshot record's strings."""
+        if entity_id in self._changes:
+            entity = self._changes[entity_id]
+            return entity.version if entity is not None else None
+        return self._snapshot.version(entity_id)
+
+    async def save(self, entity: ExampleEntity) -> ExampleEntity:
+        """Log an entity and return once it is durable."""
+        await self._write([(entity.id, entity)])
+        return entity
+
+    async def delete(self, entity_id: UUID) -> bool:
+        """Log a delete and return once it is durable.
+
+        Whether the entity existed is judged against uncommitted writes too,
+        in the order they will be logged, so of two concurrent deletes only
+        the first reports it.
+        """
+        existed = self._latest(entity_id) is not None
+        await self._write([(entity_id, None)])
+        return existed
+
+    async def compare_and_save(self, entity: ExampleEntity, expected_version: datetime) -> bool:
+        """Log an entity if it is at ``expected_version``, counting uncommitted writes."""
+        current = self._latest(entity.id)
+        if current is None or current.version != expected_version:
+            return False
+        await self._write([(entity.id, entity)])
+        return True
+
+    async def compare_and_delete(self, entity_id: UUID, expected_version: datetime) -> bool:
+        """Log a delete if the entity is at ``expected_version``, counting uncommitted writes."""
+        current = self._latest(entity_id)
+        if current is None or current.version != expected_version:
+            return False
+        await self._write([(entity_id, None)])
+        return True
+
+    async def get_many(self, entity_ids: Sequence[UUID]) -> dict[UUID, ExampleEntity]:
+        """Retrieve entities from the recent changes or the snapshot."""
+        found: dict[UUID, ExampleEntity] = {}
+        for entity_id in entity_ids:
+            entity = self._lookup(entity_id)
+            if entity is not None:
+                found[entity_id] = entity
+        return found
+
+    async def save_many(self, entities: Sequence[ExampleEntity]) -> list[ExampleEntity]:
+        """Log entities in one commit and return once they are durable."""
+        await self._write([(entity.id, entity) for entity in entities])
+        return list(entities)
+
+    async def delete_many(self, entity_ids: Sequence[UUID]) -> set[UUID]:
+        """Log deletes in one commit and return the IDs that existed, as ``delete`` does."""
+        existing = {entity_id for entity_id in entity_ids if self._latest(entity_id) is not None}
+        await self._write([(entity_id, None) for entity_id in entity_ids])
+        return existing
+
+    async def list_page(
+        self, limit: int, after: tuple[datetime, UUID] | None = None
+    ) -> list[ExampleEntity]:
+        """Merge the snapshot's order index with the recent changes."""
+        changes = self._changes
+        snapshot = (entity for entity in self._snapshot.entities(after) if entity.id not in changes)
+        recent = self._recent.list_sync(limit, after)
+        return list(islice(heapq.merge(snapshot, recent, key=_order_key), limit))
+
+    async def list_page_by_id(self, limit: int, after: UUID | None = None) -> list[ExampleEntity]:
+        """Merge the snapshot's ID index with the recent changes."""
+        changes = self._changes
+        snapshot = (
+            entity for entity in self._snapshot.entities_by_id(after) if entity.id not in changes
+        )
+        recent = self._recent.list_by_id_sync(limit, after)
+        return list(islice(heapq.merge(snapshot, recent, key=lambda entity: entity.id), limit))
+
+    async def iterate(self, batch_size: int = 1000) -> AsyncIterator[ExampleEntity]:
+        """Yield entities in order, one batch at a time."""
+        async for entity in iterate_pages(self.list_page, batch_size):
+            yield entity
+
+    def _lookup(self, entity_id: UUID) -> ExampleEntity | None:
+        if entity_id in self._changes:
+            return self._changes[entity_id]
+        return self._snapshot.get(entity_id)
+
+    def _latest(self, entity_id: UUID) -> ExampleEntity | None:
+        """Look an entity up as it will be once queued writes are committed."""
+        for changes in (self._pending, self._committing):
+            for changed_id, entity in reversed(changes):
+                if changed_id == entity_id:
+                    return entity
+        return self._lookup(entity_id)
+
+    def _apply(self, entity_id: UUID, entity: ExampleEntity | None) -> None:
+        """Make a durable change visible."""
+        existed = self._lookup(entity_id) is not None
+        self._changes[entity_id] = entity
+        if entity is None:
+            self._recent.delete_sync(entity_id)
+            self._size -= existed
+        else:
+            self._recent.save_sync(entity)
+            self._size += not existed
+
+    def _replay(self, path: Path) -> None:
+        """Apply a log's intact records and cut off a torn tail."""
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            return
+        changes, intact = _decode_log(data)
+        for entity_id, entity in changes:
+            self._apply(entity_id, entity)
+        if intact < len(data):
+            logger.warning(
+                "Discarding %d bytes of incomplete records at the end of %s",
+                len(data) - intact,
+                path,
+            )
+            with path.open("r+b") as file:
+                file.truncate(intact)
+                if self._fsync:
+                    os.fsync(file.fileno())
+
+    async def _write(self, changes: list[Change]) -> None:
+        """Queue changes for the next commit and wait until they are durable."""
+        if self._log is None or self._closing:
+            raise RuntimeError("Repository is not open")
+        if self._batch is None:
+            self._batch = asyncio.get_running_loop().create_future()
+        batch = self._batch
+        self._pending.extend(changes)
+        self._wakeup.set()
+        # Shielded so that a cancelled writer leaves the batch to the others
+        await asyncio.shield(batch)
+
+    async def _commit_continuously(self) -> None:
+        """Commit queued writes, one group at a time, until closing."""
+        while not self._closing:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            if self._commit_delay:
+                await asyncio.sleep(self._commit_delay)
+            try:
+                await self._commit()
+            except Exception:
+                logger.exception("Writing the log failed")
+
+    async def _commit(self) -> None:
+        """Append every queued write to the log with one fsync, then apply them."""
+        async with self._commit_lock:
+            if not self._pending or self._log is None:
+                return
+            changes, batch = self._pending, self._batch
+            self._pending, self._batch = [], None
+            assert batch is not None
+            self._committing = changes
+            try:
+                written = await asyncio.to_thread(self._append, changes)
+            except BaseException as e:
+                self._committing = []
+                batch.set_exception(e)
+                # Retrieved, so a batch nobody waits for anymore is not logged
+                batch.exception()
+                raise
+            self._log_bytes += written
+            for entity_id, entity in changes:
+                self._apply(entity_id, entity)
+            self._committing = []
+            self._commits += 1
+            self._records += len(changes)
+            batch.set_result(None)
+        if (
+            self._log_bytes >= self._compact_bytes
+            and self._compaction is None
+            and not self._closing
+        ):
+            self._compaction = asyncio.create_task(self._compact_in_background())
+
+    def _append(self, changes: list[Change]) -> int:
+        """Write and sync records; runs in a worker thread."""
+        assert self._log is not None
+        data = b"".join(_encode_change(entity_id, entity) for entity_id, entity in changes)
+        try:
+            self._log.write(data)
+            self._log.flush()
+            if self._fsync:
+                os.fsync(self._log.fileno())
+        except BaseException:
+            # Leave no partial record for later records to be appended after
+            with contextlib.suppress(OSError):
+                self._log.truncate(self._log_bytes)
+            raise
+        return len(data)
+
+    async def _compact_in_background(self) -> None:
+        try:
+            await self.compact()
+        except Exception:
+            logger.exception("Compaction failed; the log keeps growing until the next one")
+        finally:
+            self._compaction = None
+
+    def _set_log_aside(self) -> None:
+        """Move the log to ``log.old`` for compaction and start a new one."""
+        assert self._log is not None
+        self._log.close()
+        log, old_log = self._directory / _LOG, self._directory / _OLD_LOG
+        if old_log.exists():
+            # An earlier compaction failed: keep its records ahead of newer ones
+            with old_log.open("ab") as file:
+                file.write(log.read_bytes())
+                file.flush()
+                if self._fsync:
+                    os.fsync(file.fileno())
+            log.unlink()
+        else:
+            log.replace(old_log)
+        self._sync_directory()
+        self._log = log.open("ab")
+        self._log_bytes = 0
+
+    async def _rewrite_snapshot(self, changes: dict[UUID, ExampleEntity | None]) -> None:
+        """Write the snapshot with ``changes`` merged in and swap it in."""
+        previous = self._snapshot
+        path = self._directory / _SNAPSHOT
+        staging = path.with_suffix(".tmp")
+        await asyncio.to_thread(_Snapshot.write, staging, _merge(previous, changes), self._fsync)
+        staging.replace(path)
+        self._sync_directory()
+        self._snapshot = _Snapshot.load(path)
+        previous.close()
+        # Forget the changes the snapshot now holds, unless they changed again
+        for entity_id, entity in changes.items():
+            if entity_id in self._changes and self._changes[entity_id] is entity:
+                del self._changes[entity_id]
+                self._recent.delete_sync(entity_id)
+
+    def _sync_directory(self) -> None:
+        if self._fsync:
+            _fsync_directory(self._directory)
+
+    def _lock_directory(self) -> IO[bytes]:
+        """Take an exclusive lock on the directory for this process."""
+        file = (self._directory / _LOCK).open("wb")
+        if sys.platform != "win32":
+            import fcntl
+
+            try:
+                fcntl.flock(file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                file.close()
+                raise RuntimeError(f"{self._directory} is in use by another process") from None
+        return file
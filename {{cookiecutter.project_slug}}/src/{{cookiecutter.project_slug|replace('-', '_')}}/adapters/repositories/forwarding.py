@@ -0,0 +1,101 @@
+"""Base class for repositories that wrap another repository.
+
+Cross-cutting layers (caching, instrumentation, ...) subclass
+``ForwardingExampleRepository`` and override only the operations they change;
+everything else is passed straight through to the wrapped repository.
+"""
+
+from __future__ import annotations
+
+from collections.abc import AsyncIterator, Sequence
+from datetime import datetime
+from typing import TYPE_CHECKING
+from uuid import UUID
+
+if TYPE_CHECKING:
+    from ...domain.entities import ExampleEntity
+    from . import ExampleRepository
+
+
+class ForwardingExampleRepository:
+    """ExampleRepository that delegates every operation to ``inner``."""
+
+    def __init__(self, inner: ExampleRepository) -> None:
+        self._inner = inner
+
+    @property
+    def inner(self) -> ExampleRepository:
+        """The wrapped repository."""
+        return self._inner
+
+    async def open(self) -> None:
+        """Open the wrapped repository."""
+        await self._inner.open()
+
+    async def close(self) -> None:
+        """Close the wrapped repository."""
+        await self._inner.close()
+
+    async def get_by_id(self, entity_id: UUID) -> ExampleEntity | None:
+        """Retrieve an entity from the wrapped repository."""
+        return await self._inner.get_by_id(entity_id)
+
+    async def get_version(self, entity_id: UUID) -> datetime | None:
+        """Return an entity's version from the wrapped repository."""
+        return await self._inner.get_version(entity_id)
+
+    async def save(self, entity: ExampleEntity) -> ExampleEntity:
+        """Persist an entity in the wrapped repository."""
+        return await self._inner.save(entity)
+
+    async def delete(self, entity_id: UUID) -> bool:
+        """Remove an entity from the wrapped repository."""
+        return await self._inner.delete(entity_id)
+
+    async def compare_and_save(self, entity: ExampleEntity, expected_version: datetime) -> bool:
+        """Conditionally persist an entity in the wrapped repository."""
+        return await self._inner.compare_and_save(entity, expected_version)
+
+    async def compare_and_delete(self, entity_id: UUID, expected_version: datetime) -> bool:
+        """Conditionally remove an entity from the wrapped repository."""
+        return await self._inner.compare_and_delete(entity_id, expected_version)
+
+    async def get_many(self, entity_ids: Sequence[UUID]) -> dict[UUID, ExampleEntity]:
+        """Retrieve entities from the wrapped repository."""
+        return await self._inner.get_many(entity_ids)
+
+    async def save_many(self, entities: Sequence[ExampleEntity]) -> list[ExampleEntity]:
+        """Persist entities in the wrapped repository."""
+        return await self._inner.save_many(entities)
+
+    async def delete_many(self, entity_ids: Sequence[UUID]) -> set[UUID]:
+        """Remove entities from the wrapped repository."""
+        return await self._inner.delete_many(entity_ids)
+
+    async def list_page(
+        self, limit: int, after: tuple[datetime, UUID] | None = None
+    ) -> list[ExampleEntity]:
+        """List entities from the wrapped repository."""
+        return await self._inner.list_page(limit, after)
+
+    async def list_page_by_id(self, limit: int, after: UUID | None = None) -> list[ExampleEntity]:
+        """List entities by ID from the wrapped repository."""
+        return await self._inner.list_page_by_id(limit, after)
+
+    def iterate(self, batch_size: int = 1000) -> AsyncIterator[ExampleEntity]:
+        """Iterate over the wrapped repository."""
+        return self._inner.iterate(batch_size)
+
+
+def find_layer[R](repository: ExampleRepository, layer: type[R]) -> R | None:
+    """Find the first repository of type ``layer`` in a chain of wrappers.
+
+    Example:
+        >>> cache = find_layer(repository, CachedExampleRepository)
+    """
+    current: ExampleRepository | None = repository
+    while current is not None:
+        if isinstance(current, layer):
+            return current
+        current = current.inner if isinstance(current, ForwardingExampleRepository) else None
+    return None
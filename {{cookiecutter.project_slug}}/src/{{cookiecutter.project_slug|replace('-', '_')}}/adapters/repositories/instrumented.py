@@ -0,0 +1,158 @@
+"""Latency and error metrics for any ExampleRepository.
+
+``InstrumentedExampleRepository`` times every call it forwards into a
+per-operation histogram and counts the calls that raise. The same timing is
+recorded as a ``repository.<operation>`` span of the current request's
+trace. It wraps whatever repository ``create_repository`` builds, so every
+backend is measured the same way.
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import AsyncIterator, Awaitable, Sequence
+from datetime import datetime
+from typing import TYPE_CHECKING
+from uuid import UUID
+
+from ...infrastructure.metrics import OPERATION_BUCKETS, REGISTRY, MetricsRegistry
+from ...infrastructure.tracing import current_trace
+from .forwarding import ForwardingExampleRepository
+
+if TYPE_CHECKING:
+    from ...domain.entities import ExampleEntity
+    from . import ExampleRepository
+
+OPERATIONS = (
+    "get_by_id",
+    "get_version",
+    "save",
+    "delete",
+    "compare_and_save",
+    "compare_and_delete",
+    "get_many",
+    "save_many",
+    "delete_many",
+    "list_page",
+    "list_page_by_id",
+    "iterate",
+)
+
+
+class InstrumentedExampleRepository(ForwardingExampleRepository):
+    """ExampleRepository wrapper recording per-operation latency.
+
+    Args:
+        inner: Repository being measured
+        registry: Registry receiving the metrics
+    """
+
+    def __init__(self, inner: ExampleRepository, registry: MetricsRegistry = REGISTRY) -> None:
+        super().__init__(inner)
+        latency = registry.histogram(
+            "repository_operation_duration_seconds",
+            "Latency of repository operations.",
+            ["operation"],
+            buckets=OPERATION_BUCKETS,
+        )
+        self._errors = registry.counter(
+            "repository_operation_errors_total",
+            "Repository operations that raised.",
+            ["operation"],
+        )
+        self._latency = {operation: latency.labels(operation) for operation in OPERATIONS}
+        self._span_names = {operation: f"repository.{operation}" for operation in OPERATIONS}
+
+    async def _timed[T](self, operation: str, call: Awaitable[T]) -> T:
+        """Await ``call``, recording its latency and span under ``operation``."""
+        started = time.perf_counter()
+        try:
+            return await call
+        except Exception:
+            self._errors.inc(operation)
+            raise
+        finally:
+            self._record(operation, started, time.perf_counter())
+
+    def _record(self, operation: str, started: float, ended: float) -> None:
+        """Observe a call's latency and add its span to the current trace."""
+        self._latency[operation].observe(ended - started)
+        trace = current_trace()
+        if trace is not None:
+            trace.add(self._span_names[operation], started, ended)
+
+    async def get_by_id(self, entity_id: UUID) -> ExampleEntity | None:
+        """Retrieve an entity, timing the call."""
+        return await self._timed("get_by_id", self._inner.get_by_id(entity_id))
+
+    async def get_version(self, entity_id: UUID) -> datetime | None:
+        """Return an entity's version, timing the call."""
+        return await self._timed("get_version", self._inner.get_version(entity_id))
+
+    async def save(self, entity: ExampleEntity) -> ExampleEntity:
+        """Persist an entity, timing the call."""
+        return await self._timed("save", self._inner.save(entity))
+
+    async def delete(self, entity_id: UUID) -> bool:
+        """Remove an entity, timing the call."""
+        return await self._timed("delete", self._inner.delete(entity_id))
+
+    async def compare_and_save(self, entity: ExampleEntity, expected_version: datetime) -> bool:
+        """Conditionally persist an entity, timing the call."""
+        return await self._timed(
+            "compare_and_save", self._inner.compare_and_save(entity, expected_version)
+        )
+
+    async def compare_and_delete(self, entity_id: UUID, expected_version: datetime) -> bool:
+        """Conditionally remove an entity, timing the call."""
+        return await self._timed(
+            "compare_and_delete", self._inner.compare_and_delete(entity_id, expected_version)
+        )
+
+    async def get_many(self, entity_ids: Sequence[UUID]) -> dict[UUID, ExampleEntity]:
+        """Retrieve entities, timing the call."""
+        return await self._timed("get_many", self._inner.get_many(entity_ids))
+
+    async def save_many(self, entities: Sequence[ExampleEntity]) -> list[ExampleEntity]:
+        """Persist entities, timing the call."""
+        return await self._timed("save_many", self._inner.save_many(entities))
+
+    async def delete_many(self, entity_ids: Sequence[UUID]) -> set[UUID]:
+        """Remove entities, timing the call."""
+        return await self._timed("delete_many", self._inner.delete_many(entity_ids))
+
+    async def list_page(
+        self, limit: int, after: tuple[datetime, UUID] | None = None
+    ) -> list[ExampleEntity]:
+        """List entities, timing the call."""
+        return await self._timed("list_page", self._inner.list_page(limit, after))
+
+    async def list_page_by_id(self, limit: int, after: UUID | None = None) -> list[ExampleEntity]:
+        """List entities by ID, timing the call."""
+        return await self._timed("list_page_by_id", self._inner.list_page_by_id(limit, after))
+
+    async def iterate(self, batch_size: int = 1000) -> AsyncIterator[ExampleEntity]:
+        """Yield every entity, timing the waits on the wrapped repository.
+
+        Time the caller spends between entities (writing an export, say) is
+        not counted, so one observation records the storage's share of the
+        whole iteration.
+        """
+        started = time.perf_counter()
+        busy = 0.0
+        entities = self._inner.iterate(batch_size)
+        try:
+            while True:
+                waited = time.perf_counter()
+                try:
+                    entity = await anext(entities)
+                except StopAsyncIteration:
+                    break
+                finally:
+                    busy += time.perf_counter() - waited
+                yield entity
+        except Exception:
+            self._errors.inc("iterate")
+            raise
+        finally:
+            self._record("iterate", started, started + busy)
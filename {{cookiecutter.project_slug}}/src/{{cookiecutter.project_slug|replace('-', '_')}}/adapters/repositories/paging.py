@@ -0,0 +1,33 @@
+"""Helpers for walking a repository in keyset order."""
+
+from __future__ import annotations
+
+from collections.abc import AsyncIterator, Awaitable, Callable
+from datetime import datetime
+from typing import TYPE_CHECKING
+from uuid import UUID
+
+if TYPE_CHECKING:
+    from ...domain.entities import ExampleEntity
+
+ListPage = Callable[[int, tuple[datetime, UUID] | None], Awaitable[list["ExampleEntity"]]]
+
+
+async def iterate_pages(list_page: ListPage, batch_size: int) -> AsyncIterator[ExampleEntity]:
+    """Yield every entity by fetching ``batch_size`` rows at a time.
+
+    Each batch seeks past the last key of the previous one, so at most one
+    batch is held in memory and no long-lived cursor or transaction is kept
+    open between batches.
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size must be at least 1")
+    after: tuple[datetime, UUID] | None = None
+    while True:
+        batch = await list_page(batch_size, after)
+        for entity in batch:
+            yield entity
+        if len(batch) < batch_size:
+            return
+        last = batch[-1]
+        after = (last.created_at, last.id)
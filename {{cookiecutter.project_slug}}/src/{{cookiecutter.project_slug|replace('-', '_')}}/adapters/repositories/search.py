@@ -0,0 +1,386 @@
+"""Full-text search over entity names and descriptions.
+
+``InvertedIndex`` maps every word of an entity's name and description to
+the entities containing it, so a query only visits the entities that
+contain its words instead of scanning the whole store.
+``SearchIndexedExampleRepository`` keeps an index in step with the
+repository it wraps.
+
+Queries are lists of words that must all match (AND). A word ending in
+``*`` matches every indexed word it starts. Matches are ranked by a
+TF-IDF-style score: each query word contributes the inverse document
+frequency of the word it matched, doubled when it matched in the name.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import math
+import re
+from array import array
+from bisect import bisect_left, insort
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import datetime
+from typing import TYPE_CHECKING
+from uuid import UUID
+
+from .forwarding import ForwardingExampleRepository
+
+if TYPE_CHECKING:
+    from ...domain.entities import ExampleEntity
+    from . import ExampleRepository
+
+_WORD = re.compile(r"\w+")
+_QUERY_WORD = re.compile(r"(\w+)(\*?)")
+# Score multiplier for words found in the name rather than the description
+NAME_BOOST = 2.0
+# Indexed words a prefix expands to at most; the most common ones are kept
+MAX_EXPANSIONS = 100
+# Removed entities tolerated before postings are rewritten without them
+_COMPACT_MIN_DEAD = 1024
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into case-folded words."""
+    return _WORD.findall(text.casefold())
+
+
+@dataclass(frozen=True)
+class QueryTerm:
+    """One word of a search query."""
+
+    word: str
+    prefix: bool = False
+
+
+def parse_query(query: str) -> list[QueryTerm]:
+    """Parse a query into the terms that must all match.
+
+    Example:
+        >>> parse_query("Blue wid*")
+        [QueryTerm(word='blue', prefix=False), QueryTerm(word='wid', prefix=True)]
+
+    Raises:
+        ValueError: If the query contains no words
+    """
+    terms = [QueryTerm(word, bool(star)) for word, star in _QUERY_WORD.findall(query.casefold())]
+    if not terms:
+        raise ValueError("Query must contain at least one word")
+    return list(dict.fromkeys(terms))
+
+
+class InvertedIndex:
+    """Incrementally maintained word -> entities index.
+
+    Entities are numbered as they are added, and each word's postings are a
+    compact array of ``number << 1 | found_in_name``. Removing an entity
+    only marks its number dead; once dead numbers outnumber live ones, the
+    postings are rewritten without them. Updating an entity removes and
+    re-adds it.
+    """
+
+    def __init__(self) -> None:
+        self._numbers: dict[UUID, int] = {}
+        # Entity ID of each number as an int, which ranks ties cheaply
+        self._keys: list[int] = []
+        # Numbers of removed entities, still present in postings
+        self._dead: set[int] = set()
+        self._postings: dict[str, array[int]] = {}
+        # Every indexed word, sorted, for prefix lookups
+        self._words: list[str] = []
+
+    def __len__(self) -> int:
+        return len(self._numbers)
+
+    @property
+    def words(self) -> int:
+        """Distinct indexed words."""
+        return len(self._postings)
+
+    def add(self, entity: ExampleEntity) -> None:
+        """Index an entity, replacing what was indexed for its ID."""
+        self.remove(entity.id)
+        number = len(self._keys)
+        self._keys.append(entity.id.int)
+        self._numbers[entity.id] = number
+        in_name = set(tokenize(entity.name))
+        for word in in_name.union(tokenize(entity.description)):
+            postings = self._postings.get(word)
+            if postings is None:
+                postings = self._postings[word] = array("L")
+                insort(self._words, word)
+            postings.append(number << 1 | (word in in_name))
+
+    def remove(self, entity_id: UUID) -> bool:
+        """Drop an entity from the index. Returns True if it was indexed."""
+        number = self._numbers.pop(entity_id, None)
+        if number is None:
+            return False
+        self._dead.add(number)
+        if len(self._dead) >= _COMPACT_MIN_DEAD and len(self._dead) > len(self._numbers):
+            self._compact()
+        return True
+
+    def search(
+        self, query: str, limit: int, after: tuple[float, UUID] | None = None
+    ) -> list[tuple[float, UUID]]:
+        """Rank the entities matching every term of ``query``.
+
+        Args:
+            query: Words to match; ``word*`` matches as a prefix
+            limit: Maximum number of results
+            after: ``(score, id)`` of the last result of the previous page
+
+        Returns:
+            ``(score, entity ID)`` pairs, best first; equal scores in ID order
+
+        Raises:
+            ValueError: If the query contains no words
+        """
+        expansions = [self._expand(term) for term in parse_query(query)]
+        if not all(expansions):
+            return []
+        # Start from the rarest term so later terms only score survivors
+        expansions.sort(key=lambda words: sum(len(self._postings[word]) for word in words))
+
+        scores = self._match(expansions[0], None)
+        for words in expansions[1:]:
+            if not scores:
+                return []
+            matched = self._match(words, scores)
+            scores = {number: scores[number] + score for number, score in matched.items()}
+
+        dead = self._dead
+        if len(dead) < len(scores):
+            removed = [number for number in dead if number in scores]
+        else:
+            removed = [number for number in scores if number in dead]
+        for number in removed:
+            del scores[number]
+        keys = self._keys
+        if after is not None:
+            last_score, last_key = after[0], after[1].int
+            scores = {
+                number: score
+                for number, score in scores.items()
+                if score < last_score or (score == last_score and keys[number] > last_key)
+            }
+        return self._top(scores, limit)
+
+    def _match(self, words: list[str], candidates: dict[int, float] | None) -> dict[int, float]:
+        """Score the numbers containing any of ``words``, best word per number.
+
+        Only numbers in ``candidates`` are scored, unless it is None.
+        """
+        indexed = len(self._numbers)
+        matched: dict[int, float] = {}
+        for word in words:
+            postings = self._postings[word]
+            weight = math.log(1 + indexed / len(postings))
+            boosted = weight * NAME_BOOST
+            if len(words) == 1:
+                # A number occurs once per postings list: no best-of to keep
+                if candidates is None:
+                    return {entry >> 1: boosted if entry & 1 else weight for entry in postings}
+                return {
+                    entry >> 1: boosted if entry & 1 else weight
+                    for entry in postings
+                    if entry >> 1 in candidates
+                }
+            for entry in postings:
+                number = entry >> 1
+                if candidates is not None and number not in candidates:
+                    continue
+                score = boosted if entry & 1 else weight
+                if score > matched.get(number, 0.0):
+                    matched[number] = score
+        return matched
+
+    def _top(self, scores: dict[int, float], limit: int) -> list[tuple[float, UUID]]:
+        """The ``limit`` best ``(score, entity ID)`` pairs of scored numbers.
+
+        Common words match a large share of the index, so rather than sorting
+        every match, the cut-off score is found among the bare floats and
+        only the matches tied at it are ranked by ID.
+        """
+        if not scores or limit < 1:
+            return []
+        threshold = heapq.nlargest(limit, scores.values())[-1]
+        keys = self._keys
+        above = sorted(
+            (-score, keys[number]) for number, score in scores.items() if score > threshold
+        )
+        tied = [number for number, score in scores.items() if score == threshold]
+        best_tied = heapq.nsmallest(limit - len(above), map(keys.__getitem__, tied))
+        return [(-negated, UUID(int=key)) for negated, key in above] + [
+            (threshold, UUID(int=key)) for key in best_tied
+        ]
+
+    def _expand(self, term: QueryTerm) -> list[str]:
+        """The indexed words a query term matches."""
+        if not term.prefix:
+            return [term.word] if term.word in self._postings else []
+        words: list[str] = []
+        vocabulary = self._words
+        for index in range(bisect_left(vocabulary, term.word), len(vocabulary)):
+            if not vocabulary[index].startswith(term.word):
+                break
+            words.append(vocabulary[index])
+        if len(words) > MAX_EXPANSIONS:
+            words = heapq.nlargest(
+                MAX_EXPANSIONS, words, key=lambda word: len(self._postings[word])
+            )
+        return words
+
+    def _compact(self) -> None:
+        """Renumber live entities densely and drop dead postings."""
+        renumbered = [-1] * len(self._keys)
+        live: list[int] = []
+        for number, key in enumerate(self._keys):
+            if number not in self._dead:
+                renumbered[number] = len(live)
+                live.append(key)
+        postings: dict[str, array[int]] = {}
+        for word, entries in self._postings.items():
+            kept = array(
+                "L",
+                (
+                    renumbered[entry >> 1] << 1 | entry & 1
+                    for entry in entries
+                    if renumbered[entry >> 1] >= 0
+                ),
+            )
+            if kept:
+                postings[word] = kept
+        self._keys = live
+        self._numbers = {UUID(int=key): number for number, key in enumerate(live)}
+        self._dead = set()
+        self._postings = postings
+        self._words = sorted(postings)
+
+
+@dataclass(frozen=True)
+class SearchIndexStats:
+    """Point-in-time size of a SearchIndexedExampleRepository's index."""
+
+    entities: int
+    words: int
+
+
+class SearchIndexedExampleRepository(ForwardingExampleRepository):
+    """ExampleRepository wrapper maintaining a full-text index.
+
+    The index is built from every stored entity by the first search, so
+    opening the repository, and processes that never search such as CLI
+    commands, do not pay for reading the whole store. Once built, every
+    write through this wrapper updates it; writes made while it is being
+    built are applied when the build finishes. The index lives in process
+    memory, so it only reflects writes made by this process.
+
+    Args:
+        inner: Repository whose entities are indexed
+    """
+
+    def __init__(self, inner: ExampleRepository) -> None:
+        super().__init__(inner)
+        self._index: InvertedIndex | None = None
+        self._build_lock = asyncio.Lock()
+        # Entities saved (or IDs deleted) while the index is being built
+        self._pending: list[ExampleEntity | UUID] | None = None
+
+    def stats(self) -> SearchIndexStats:
+        """Return the current index size; empty until the first search builds it."""
+        if self._index is None:
+            return SearchIndexStats(entities=0, words=0)
+        return SearchIndexStats(entities=len(self._index), words=self._index.words)
+
+    async def _built_index(self) -> InvertedIndex:
+        """Return the index, building it from the stored entities on first use."""
+        if self._index is not None:
+            return self._index
+        async with self._build_lock:
+            if self._index is None:
+                self._pending = []
+                index = InvertedIndex()
+                try:
+                    async for entity in self._inner.iterate():
+                        index.add(entity)
+                    for change in self._pending:
+                        if isinstance(change, UUID):
+                            index.remove(change)
+                        else:
+                            index.add(change)
+                finally:
+                    self._pending = None
+                self._index = index
+            return self._index
+
+    def _indexed(self, entity: ExampleEntity) -> None:
+        if self._index is not None:
+            self._index.add(entity)
+        elif self._pending is not None:
+            self._pending.append(entity)
+
+    def _unindexed(self, entity_id: UUID) -> None:
+        if self._index is not None:
+            self._index.remove(entity_id)
+        elif self._pending is not None:
+            self._pending.append(entity_id)
+
+    async def search(
+        self, query: str, limit: int, after: tuple[float, UUID] | None = None
+    ) -> list[tuple[float, ExampleEntity]]:
+        """Find the best-ranked entities matching every term of ``query``.
+
+        Returns:
+            ``(score, entity)`` pairs, best first
+
+        Raises:
+            ValueError: If the query contains no words
+        """
+        index = await self._built_index()
+        hits = index.search(query, limit, after)
+        found = await self._inner.get_many([entity_id for _, entity_id in hits])
+        return [(score, found[entity_id]) for score, entity_id in hits if entity_id in found]
+
+    async def save(self, entity: ExampleEntity) -> ExampleEntity:
+        """Persist an entity and index it."""
+        saved = await self._inner.save(entity)
+        self._indexed(saved)
+        return saved
+
+    async def delete(self, entity_id: UUID) -> bool:
+        """Remove an entity and drop it from the index."""
+        deleted = await self._inner.delete(entity_id)
+        self._unindexed(entity_id)
+        return deleted
+
+    async def compare_and_save(self, entity: ExampleEntity, expected_version: datetime) -> bool:
+        """Conditionally persist an entity, indexing it if saved."""
+        saved = await self._inner.compare_and_save(entity, expected_version)
+        if saved:
+            self._indexed(entity)
+        return saved
+
+    async def compare_and_delete(self, entity_id: UUID, expected_version: datetime) -> bool:
+        """Conditionally remove an entity, dropping it from the index if deleted."""
+        deleted = await self._inner.compare_and_delete(entity_id, expected_version)
+        if deleted:
+            self._unindexed(entity_id)
+        return deleted
+
+    async def save_many(self, entities: Sequence[ExampleEntity]) -> list[ExampleEntity]:
+        """Persist entities and index them."""
+        saved = await self._inner.save_many(entities)
+        for entity in saved:
+            self._indexed(entity)
+        return saved
+
+    async def delete_many(self, entity_ids: Sequence[UUID]) -> set[UUID]:
+        """Remove entities and drop them from the index."""
+        deleted = await self._inner.delete_many(entity_ids)
+        for entity_id in entity_ids:
+            self._unindexed(entity_id)
+        return deleted
@@ -0,0 +1,258 @@
+"""Lock-striped, thread-safe in-memory implementation of ExampleRepository.
+
+Entities are spread over a fixed number of shards by ID. Each shard is a
+dict plus sorted ``(created_at, id)`` and ID indexes guarded by its own lock, so
+threads working on different entities rarely contend, and every
+read-modify-write on one entity is atomic. This matters when sync endpoints
+run in FastAPI's threadpool, or on free-threaded CPython where dict
+operations from several threads really do run in parallel.
+
+Besides the async repository interface, the store offers synchronous
+operations, including compare-and-save and compare-and-delete for
+optimistic updates, that threads can call directly.
+"""
+
+from __future__ import annotations
+
+import heapq
+import threading
+from bisect import bisect_left, bisect_right, insort
+from collections.abc import AsyncIterator, Iterator, Sequence
+from datetime import datetime
+from itertools import islice
+from typing import TYPE_CHECKING
+from uuid import UUID
+
+from .paging import iterate_pages
+
+if TYPE_CHECKING:
+    from ...domain.entities import ExampleEntity
+
+
+class _Shard:
+    """One lock-guarded partition of the store."""
+
+    __slots__ = ("by_id", "entities", "lock", "order")
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.entities: dict[UUID, ExampleEntity] = {}
+        self.order: list[tuple[datetime, UUID]] = []
+        self.by_id: list[UUID] = []
+
+    def put(self, entity: ExampleEntity) -> None:
+        """Insert or replace an entity; the caller holds the lock."""
+        previous = self.entities.get(entity.id)
+        if previous is None:
+            if not self.by_id or self.by_id[-1] < entity.id:
+                self.by_id.append(entity.id)
+            else:
+                insort(self.by_id, entity.id)
+        if previous is None or previous.created_at != entity.created_at:
+            if previous is not None:
+                self.unindex(previous)
+            key = (entity.created_at, entity.id)
+            if not self.order or self.order[-1] < key:
+                self.order.append(key)
+            else:
+                insort(self.order, key)
+        self.entities[entity.id] = entity
+
+    def pop(self, entity_id: UUID) -> ExampleEntity | None:
+        """Remove an entity; the caller holds the lock."""
+        entity = self.entities.pop(entity_id, None)
+        if entity is not None:
+            self.unindex(entity)
+            del self.by_id[bisect_left(self.by_id, entity_id)]
+        return entity
+
+    def unindex(self, entity: ExampleEntity) -> None:
+        key = (entity.created_at, entity.id)
+        position = bisect_left(self.order, key)
+        if position < len(self.order) and self.order[position] == key:
+            del self.order[position]
+
+    def page(self, limit: int, after: tuple[datetime, UUID] | None) -> list[ExampleEntity]:
+        """Up to ``limit`` entities after ``after``, in order."""
+        with self.lock:
+            start = bisect_right(self.order, after) if after is not None else 0
+            return [self.entities[entity_id] for _, entity_id in self.order[start : start + limit]]
+
+    def page_by_id(self, limit: int, after: UUID | None) -> list[ExampleEntity]:
+        """Up to ``limit`` entities with IDs after ``after``, in ID order."""
+        with self.lock:
+            start = bisect_right(self.by_id, after) if after is not None else 0
+            return [self.entities[entity_id] for entity_id in self.by_id[start : start + limit]]
+
+
+class ShardedExampleRepository:
+    """In-memory ExampleRepository safe to use from many threads.
+
+    Single-entity operations are atomic. Batch operations and listings lock
+    one shard at a time, so they are atomic per entity but not a snapshot
+    of the whole store.
+
+    Args:
+        shards: Number of lock stripes; rounded up to a power of two
+    """
+
+    def __init__(self, shards: int = 16) -> None:
+        if shards < 1:
+            raise ValueError("shards must be at least 1")
+        count = 1 << (shards - 1).bit_length()
+        self._mask = count - 1
+        self._shards = [_Shard() for _ in range(count)]
+
+    @property
+    def shard_count(self) -> int:
+        """Number of shards."""
+        return len(self._shards)
+
+    def __len__(self) -> int:
+        return sum(len(shard.entities) for shard in self._shards)
+
+    def _shard(self, entity_id: UUID) -> _Shard:
+        # The low bits of both random (v4) and time-ordered (v7) UUIDs are random
+        return self._shards[entity_id.int & self._mask]
+
+    # Synchronous operations, callable from any thread
+
+    def get_sync(self, entity_id: UUID) -> ExampleEntity | None:
+        """Retrieve an entity."""
+        shard = self._shard(entity_id)
+        with shard.lock:
+            return shard.entities.get(entity_id)
+
+    def save_sync(self, entity: ExampleEntity) -> ExampleEntity:
+        """Insert or replace an entity."""
+        shard = self._shard(entity.id)
+        with shard.lock:
+            shard.put(entity)
+        return entity
+
+    def delete_sync(self, entity_id: UUID) -> bool:
+        """Remove an entity. Returns True if it existed."""
+        shard = self._shard(entity_id)
+        with shard.lock:
+            return shard.pop(entity_id) is not None
+
+    def compare_and_save_sync(self, entity: ExampleEntity, expected: ExampleEntity | None) -> bool:
+        """Save ``entity`` only if the stored version still equals ``expected``.
+
+        With ``expected=None`` the entity is saved only if its ID is not
+        stored yet. Returns whether the entity was saved; on False, re-read
+        and retry.
+        """
+        shard = self._shard(entity.id)
+        with shard.lock:
+            if shard.entities.get(entity.id) != expected:
+                return False
+            shard.put(entity)
+            return True
+
+    def compare_and_delete_sync(self, expected: ExampleEntity) -> bool:
+        """Delete an entity only if the stored version still equals ``expected``.
+
+        Returns whether the entity was deleted.
+        """
+        shard = self._shard(expected.id)
+        with shard.lock:
+            if shard.entities.get(expected.id) != expected:
+                return False
+            shard.pop(expected.id)
+            return True
+
+    def list_sync(
+        self, limit: int, after: tuple[datetime, UUID] | None = None
+    ) -> list[ExampleEntity]:
+        """List up to ``limit`` entities ordered by ``(created_at, id)``."""
+        pages = [shard.page(limit, after) for shard in self._shards]
+        merged: Iterator[ExampleEntity] = heapq.merge(
+            *pages, key=lambda entity: (entity.created_at, entity.id)
+        )
+        return list(islice(merged, limit))
+
+    def list_by_id_sync(self, limit: int, after: UUID | None = None) -> list[ExampleEntity]:
+        """List up to ``limit`` entities ordered by ID."""
+        pages = [shard.page_by_id(limit, after) for shard in self._shards]
+        merged: Iterator[ExampleEntity] = heapq.merge(*pages, key=lambda entity: entity.id)
+        return list(islice(merged, limit))
+
+    # ExampleRepository interface
+
+    async def open(self) -> None:
+        """Nothing to acquire for in-memory storage."""
+
+    async def close(self) -> None:
+        """Nothing to release for in-memory storage."""
+
+    async def get_by_id(self, entity_id: UUID) -> ExampleEntity | None:
+        """Retrieve an entity."""
+        return self.get_sync(entity_id)
+
+    async def get_version(self, entity_id: UUID) -> datetime | None:
+        """Return the stored entity's version."""
+        entity = self.get_sync(entity_id)
+        return entity.version if entity is not None else None
+
+    async def save(self, entity: ExampleEntity) -> ExampleEntity:
+        """Insert or replace an entity."""
+        return self.save_sync(entity)
+
+    async def delete(self, entity_id: UUID) -> bool:
+        """Remove an entity."""
+        return self.delete_sync(entity_id)
+
+    async def compare_and_save(self, entity: ExampleEntity, expected_version: datetime) -> bool:
+        """Replace an entity if the stored one is at ``expected_version``."""
+        shard = self._shard(entity.id)
+        with shard.lock:
+            current = shard.entities.get(entity.id)
+            if current is None or current.version != expected_version:
+                return False
+            shard.put(entity)
+            return True
+
+    async def compare_and_delete(self, entity_id: UUID, expected_version: datetime) -> bool:
+        """Remove an entity if it is at ``expected_version``."""
+        shard = self._shard(entity_id)
+        with shard.lock:
+            current = shard.entities.get(entity_id)
+            if current is None or current.version != expected_version:
+                return False
+            shard.pop(entity_id)
+            return True
+
+    async def get_many(self, entity_ids: Sequence[UUID]) -> dict[UUID, ExampleEntity]:
+        """Retrieve entities. Unknown IDs are omitted."""
+        found: dict[UUID, ExampleEntity] = {}
+        for entity_id in entity_ids:
+            entity = self.get_sync(entity_id)
+            if entity is not None:
+                found[entity_id] = entity
+        return found
+
+    async def save_many(self, entities: Sequence[ExampleEntity]) -> list[ExampleEntity]:
+        """Insert or replace entities."""
+        for entity in entities:
+            self.save_sync(entity)
+        return list(entities)
+
+    async def delete_many(self, entity_ids: Sequence[UUID]) -> set[UUID]:
+        """Remove entities. Returns the IDs that existed."""
+        return {entity_id for entity_id in entity_ids if self.delete_sync(entity_id)}
+
+    async def list_page(
+        self, limit: int, after: tuple[datetime, UUID] | None = None
+    ) -> list[ExampleEntity]:
+        """List entities by merging the shards' sorted indexes."""
+        return self.list_sync(limit, after)
+
+    async def list_page_by_id(self, limit: int, after: UUID | None = None) -> list[ExampleEntity]:
+        """List entities by merging the shards' sorted IDs."""
+        return self.list_by_id_sync(limit, after)
+
+    async def iterate(self, batch_size: int = 1000) -> AsyncIterator[ExampleEntity]:
+        """Yield entities in order, one batch at a time."""
+        async for entity in iterate_pages(self.list_page, batch_size):
+            yield entity
@@ -0,0 +1,323 @@
+"""SQL implementation of ExampleRepository.
+
+Works against any backend with an async SQLAlchemy driver. PostgreSQL is the
+production target; a local SQLite file stands in for it in development and
+tests.
+"""
+
+from __future__ import annotations
+
+from collections.abc import AsyncIterator, Sequence
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING, Any
+from uuid import UUID
+
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Index,
+    MetaData,
+    String,
+    Table,
+    Uuid,
+    bindparam,
+    delete,
+    func,
+    select,
+    tuple_,
+    update,
+)
+
+from ...domain.entities import ExampleEntity
+from .paging import iterate_pages
+
+if TYPE_CHECKING:
+    from sqlalchemy.engine import Row
+    from sqlalchemy.ext.asyncio import AsyncEngine
+    from sqlalchemy.sql.dml import Insert
+
+metadata = MetaData()
+
+example_entities = Table(
+    "example_entities",
+    metadata,
+    Column("id", Uuid, primary_key=True),
+    Column("name", String, nullable=False),
+    Column("description", String, nullable=False),
+    Column("created_at", DateTime(timezone=True), nullable=False),
+    Column("updated_at", DateTime(timezone=True), nullable=True),
+    # Serves keyset pagination in (created_at, id) order
+    Index("ix_example_entities_created_at_id", "created_at", "id"),
+)
+
+# Statements are built once at import time; SQLAlchemy caches their compiled
+# form and asyncpg keeps a per-connection cache of the prepared statements.
+_SELECT_BY_ID = select(example_entities).where(example_entities.c.id == bindparam("entity_id"))
+# Only the timestamps, for checking whether an entity changed
+_SELECT_VERSION = select(example_entities.c.created_at, example_entities.c.updated_at).where(
+    example_entities.c.id == bindparam("entity_id")
+)
+_DELETE_BY_ID = delete(example_entities).where(example_entities.c.id == bindparam("entity_id"))
+# Conditional writes, matching only a row still at the expected version
+_AT_VERSION = (example_entities.c.id == bindparam("entity_id")) & (
+    func.coalesce(example_entities.c.updated_at, example_entities.c.created_at)
+    == bindparam("expected_version", type_=DateTime(timezone=True))
+)
+_UPDATE_AT_VERSION = (
+    update(example_entities)
+    .where(_AT_VERSION)
+    .values(
+        name=bindparam("new_name"),
+        description=bindparam("new_description"),
+        created_at=bindparam("new_created_at", type_=DateTime(timezone=True)),
+        updated_at=bindparam("new_updated_at", type_=DateTime(timezone=True)),
+    )
+)
+_DELETE_AT_VERSION = delete(example_entities).where(_AT_VERSION)
+_SELECT_MANY = select(example_entities).where(
+    example_entities.c.id.in_(bindparam("entity_ids", expanding=True))
+)
+_DELETE_MANY = (
+    delete(example_entities)
+    .where(example_entities.c.id.in_(bindparam("entity_ids", expanding=True)))
+    .returning(example_entities.c.id)
+)
+
+_ORDER = (example_entities.c.created_at, example_entities.c.id)
+_SELECT_FIRST_PAGE = select(example_entities).order_by(*_ORDER).limit(bindparam("limit"))
+_SELECT_PAGE_AFTER = (
+    select(example_entities)
+    .where(
+        tuple_(*_ORDER)
+        > tuple_(
+            bindparam("after_created_at", type_=DateTime(timezone=True)),
+            bindparam("after_id", type_=Uuid),
+        )
+    )
+    .order_by(*_ORDER)
+    .limit(bindparam("limit"))
+)
+# ID order walks the primary key index
+_SELECT_FIRST_PAGE_BY_ID = (
+    select(example_entities).order_by(example_entities.c.id).limit(bindparam("limit"))
+)
+_SELECT_PAGE_AFTER_ID = (
+    select(example_entities)
+    .where(example_entities.c.id > bindparam("after_id", type_=Uuid))
+    .order_by(example_entities.c.id)
+    .limit(bindparam("limit"))
+)
+
+# Rows per multi-row statement, keeping bound parameters well below the
+# limits of SQLite (32766) and PostgreSQL (32767)
+BATCH_ROWS = 500
+
+
+def _chunks[T](items: Sequence[T], size: int = BATCH_ROWS) -> list[Sequence[T]]:
+    """Split ``items`` into consecutive slices of at most ``size``."""
+    return [items[start : start + size] for start in range(0, len(items), size)]
+
+
+def _upsert_statement(dialect_name: str, rows: list[dict[str, Any]] | None = None) -> Insert:
+    """Build an insert-or-update statement for the given dialect.
+
+    With ``rows`` the statement inserts all of them as one multi-row VALUES
+    clause; without, it takes its values from bound parameters.
+    """
+    from sqlalchemy.dialects import postgresql, sqlite
+
+    statement: postgresql.Insert | sqlite.Insert
+    if dialect_name == "postgresql":
+        statement = postgresql.insert(example_entities)
+    elif dialect_name == "sqlite":
+        statement = sqlite.insert(example_entities)
+    else:
+        raise ValueError(f"Unsupported SQL dialect: {dialect_name!r}")
+    if rows is not None:
+        statement = statement.values(rows)
+
+    return statement.on_conflict_do_update(
+        index_elements=[example_entities.c.id],
+        set_={
+            "name": statement.excluded.name,
+            "description": statement.excluded.description,
+            "updated_at": statement.excluded.updated_at,
+        },
+    )
+
+
+def _as_utc(value: datetime) -> datetime:
+    """Normalise a timestamp to UTC (SQLite returns naive values)."""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=UTC)
+    return value.astimezone(UTC)
+
+
+def _to_row(entity: ExampleEntity) -> dict[str, Any]:
+    """Map an entity onto statement parameters."""
+    return {
+        "id": entity.id,
+        "name": entity.name,
+        "description": entity.description,
+        "created_at": _as_utc(entity.created_at),
+        "updated_at": _as_utc(entity.updated_at) if entity.updated_at else None,
+    }
+
+
+def _to_entity(row: Row[Any]) -> ExampleEntity:
+    """Map a result row back onto a domain entity."""
+    return ExampleEntity(
+        id=row.id,
+        name=row.name,
+        description=row.description,
+        created_at=_as_utc(row.created_at),
+        updated_at=_as_utc(row.updated_at) if row.updated_at else None,
+    )
+
+
+class SqlExampleRepository:
+    """SQL implementation of ExampleRepository on a pooled async engine.
+
+    The repository owns the engine: ``open`` creates the schema and ``close``
+    disposes of the connection pool.
+
+    Example:
+        >>> repo = SqlExampleRepository(create_engine(settings))
+        >>> await repo.open()
+        >>> await repo.save(ExampleEntity(name="Test"))
+    """
+
+    def __init__(self, engine: AsyncEngine) -> None:
+        self._engine = engine
+        self._upsert = _upsert_statement(engine.dialect.name)
+
+    @property
+    def engine(self) -> AsyncEngine:
+        """The engine holding the connection pool."""
+        return self._engine
+
+    async def open(self) -> None:
+        """Create the schema if it does not exist yet."""
+        async with self._engine.begin() as conn:
+            await conn.run_sync(metadata.create_all)
+
+    async def close(self) -> None:
+        """Dispose of the connection pool."""
+        await self._engine.dispose()
+
+    async def get_by_id(self, entity_id: UUID) -> ExampleEntity | None:
+        """Retrieve entity from the database."""
+        async with self._engine.connect() as conn:
+            result = await conn.execute(_SELECT_BY_ID, {"entity_id": entity_id})
+            row = result.first()
+        return _to_entity(row) if row is not None else None
+
+    async def get_version(self, entity_id: UUID) -> datetime | None:
+        """Read an entity's timestamps alone from the database."""
+        async with self._engine.connect() as conn:
+            result = await conn.execute(_SELECT_VERSION, {"entity_id": entity_id})
+            row = result.first()
+        if row is None:
+            return None
+        return _as_utc(row.updated_at or row.created_at)
+
+    async def save(self, entity: ExampleEntity) -> ExampleEntity:
+        """Insert or update entity in the database."""
+        async with self._engine.begin() as conn:
+            await conn.execute(self._upsert, _to_row(entity))
+        return entity
+
+    async def delete(self, entity_id: UUID) -> bool:
+        """Remove entity from the database."""
+        async with self._engine.begin() as conn:
+            result = await conn.execute(_DELETE_BY_ID, {"entity_id": entity_id})
+        return result.rowcount > 0
+
+    async def compare_and_save(self, entity: ExampleEntity, expected_version: datetime) -> bool:
+        """Update the row with one statement matching only ``expected_version``."""
+        row = _to_row(entity)
+        async with self._engine.begin() as conn:
+            result = await conn.execute(
+                _UPDATE_AT_VERSION,
+                {
+                    "entity_id": entity.id,
+                    "expected_version": _as_utc(expected_version),
+                    "new_name": row["name"],
+                    "new_description": row["description"],
+                    "new_created_at": row["created_at"],
+                    "new_updated_at": row["updated_at"],
+                },
+            )
+        return result.rowcount > 0
+
+    async def compare_and_delete(self, entity_id: UUID, expected_version: datetime) -> bool:
+        """Delete the row with one statement matching only ``expected_version``."""
+        async with self._engine.begin() as conn:
+            result = await conn.execute(
+                _DELETE_AT_VERSION,
+                {"entity_id": entity_id, "expected_version": _as_utc(expected_version)},
+            )
+        return result.rowcount > 0
+
+    async def get_many(self, entity_ids: Sequence[UUID]) -> dict[UUID, ExampleEntity]:
+        """Retrieve entities with one ``IN`` query per chunk of IDs."""
+        found: dict[UUID, ExampleEntity] = {}
+        async with self._engine.connect() as conn:
+            for chunk in _chunks(list(dict.fromkeys(entity_ids))):
+                result = await conn.execute(_SELECT_MANY, {"entity_ids": list(chunk)})
+                found.update((row.id, _to_entity(row)) for row in result)
+        return found
+
+    async def save_many(self, entities: Sequence[ExampleEntity]) -> list[ExampleEntity]:
+        """Upsert entities with one multi-row statement per chunk."""
+        # A multi-row upsert may not touch the same key twice; keep the last
+        latest = list({entity.id: entity for entity in entities}.values())
+        dialect_name = self._engine.dialect.name
+        async with self._engine.begin() as conn:
+            for chunk in _chunks(latest):
+                rows = [_to_row(entity) for entity in chunk]
+                await conn.execute(_upsert_statement(dialect_name, rows))
+        return list(entities)
+
+    async def delete_many(self, entity_ids: Sequence[UUID]) -> set[UUID]:
+        """Remove entities with one ``DELETE ... RETURNING`` per chunk."""
+        deleted: set[UUID] = set()
+        async with self._engine.begin() as conn:
+            for chunk in _chunks(list(dict.fromkeys(entity_ids))):
+                result = await conn.execute(_DELETE_MANY, {"entity_ids": list(chunk)})
+                deleted.update(result.scalars())
+        return deleted
+
+    async def list_page(
+        self, limit: int, after: tuple[datetime, UUID] | None = None
+    ) -> list[ExampleEntity]:
+        """List entities by seeking the ``(created_at, id)`` index."""
+        async with self._engine.connect() as conn:
+            if after is None:
+                result = await conn.execute(_SELECT_FIRST_PAGE, {"limit": limit})
+            else:
+                result = await conn.execute(
+                    _SELECT_PAGE_AFTER,
+                    {"after_created_at": _as_utc(after[0]), "after_id": after[1], "limit": limit},
+                )
+            return [_to_entity(row) for row in result]
+
+    async def list_page_by_id(self, limit: int, after: UUID | None = None) -> list[ExampleEntity]:
+        """List entities by seeking the primary key index."""
+        async with self._engine.connect() as conn:
+            if after is None:
+                result = await conn.execute(_SELECT_FIRST_PAGE_BY_ID, {"limit": limit})
+            else:
+                result = await conn.execute(
+                    _SELECT_PAGE_AFTER_ID, {"after_id": after, "limit": limit}
+                )
+            return [_to_entity(row) for row in result]
+
+    async def iterate(self, batch_size: int = 1000) -> AsyncIterator[ExampleEntity]:
+        """Yield entities by seeking the index one batch at a time.
+
+        Each batch uses its own pooled connection, so an export never pins a
+        connection or transaction for its whole duration.
+        """
+        async for entity in iterate_pages(self.list_page, batch_size):
+            yield entity
@@ -0,0 +1,25 @@
+"""Timestamps as integer microseconds, for repositories that pack them.
+
+Columns and on-disk records store datetimes as signed 64-bit microseconds
+since the Unix epoch, with ``NULL_TIME`` standing in for a missing value.
+"""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+_MICROSECOND = timedelta(microseconds=1)
+
+# Marks "no value", e.g. an entity that was never updated
+NULL_TIME = -(2**63)
+
+
+def to_micros(value: datetime) -> int:
+    """Convert an aware datetime to microseconds since the epoch."""
+    return (value - _EPOCH) // _MICROSECOND
+
+
+def from_micros(micros: int) -> datetime:
+    """Convert microseconds since the epoch to an aware UTC datetime."""
+    return _EPOCH + timedelta(microseconds=micros)
@@ -0,0 +1,294 @@
+"""Write-behind buffering in front of any ExampleRepository.
+
+Saves and deletes are acknowledged as soon as they are recorded in an
+in-process buffer, and written to the wrapped repository in batches: when
+the buffer reaches ``flush_size`` entities, or every ``flush_interval``
+seconds, whichever comes first. Each entity is buffered once, holding its
+latest state, so repeated saves of the same entity cost one write.
+
+Acknowledged writes live only in this process until they are flushed.
+``close`` drains the buffer, so a graceful shutdown loses nothing, but a
+crash loses up to one interval's worth of writes, and other processes see
+writes only once they are flushed.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+from collections.abc import AsyncIterator, Sequence
+from dataclasses import dataclass
+from datetime import datetime
+from typing import TYPE_CHECKING
+from uuid import UUID
+
+from ...infrastructure.metrics import REGISTRY, MetricsRegistry
+from .forwarding import ForwardingExampleRepository
+
+if TYPE_CHECKING:
+    from ...domain.entities import ExampleEntity
+    from . import ExampleRepository
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class WriteBufferStats:
+    """Point-in-time counters for a WriteBehindExampleRepository."""
+
+    depth: int
+    flushes: int
+    flushed: int
+    errors: int
+
+
+class WriteBehindExampleRepository(ForwardingExampleRepository):
+    """ExampleRepository wrapper that acknowledges writes before storing them.
+
+    Reads see buffered writes: ``get_by_id`` and ``get_many`` answer from
+    the buffer first, and ``list_page`` and ``iterate`` flush it before
+    reading so listings include every acknowledged write. A failed flush
+    puts its batch back into the buffer, under any newer writes, to be
+    retried on the next flush.
+
+    When the buffer holds ``max_pending`` entities, writers wait for a
+    flush instead of growing it further.
+
+    Args:
+        inner: Repository the buffered writes are flushed to
+        flush_size: Buffered entities that trigger a flush
+        flush_interval: Seconds between flushes of a non-empty buffer
+        max_pending: Buffered entities beyond which writers wait
+        registry: Registry receiving the buffer metrics
+    """
+
+    def __init__(
+        self,
+        inner: ExampleRepository,
+        flush_size: int = 500,
+        flush_interval: float = 0.05,
+        max_pending: int = 10_000,
+        registry: MetricsRegistry = REGISTRY,
+    ) -> None:
+        if flush_size < 1 or max_pending < flush_size:
+            raise ValueError("Need 1 <= flush_size <= max_pending")
+        if flush_interval <= 0:
+            raise ValueError("flush_interval must be positive")
+        super().__init__(inner)
+        self._flush_size = flush_size
+        self._flush_interval = flush_interval
+        self._max_pending = max_pending
+        # Latest buffered state per entity: the entity, or None for a delete
+        self._pending: dict[UUID, ExampleEntity | None] = {}
+        # The batch currently being written, still visible to reads
+        self._flushing: dict[UUID, ExampleEntity | None] = {}
+        self._flush_lock = asyncio.Lock()
+        self._wakeup = asyncio.Event()
+        self._flusher: asyncio.Task[None] | None = None
+        self._flushes = 0
+        self._flushed = 0
+        self._errors = 0
+        self._depth = registry.gauge(
+            "repository_write_buffer_depth",
+            "Writes acknowledged but not yet flushed to storage.",
+        )
+        self._flush_errors = registry.counter(
+            "repository_write_buffer_flush_errors_total",
+            "Write-behind flushes that failed and were retried.",
+        )
+
+    def stats(self) -> WriteBufferStats:
+        """Return the current buffer counters."""
+        return WriteBufferStats(
+            depth=self.depth(),
+            flushes=self._flushes,
+            flushed=self._flushed,
+            errors=self._errors,
+        )
+
+    def depth(self) -> int:
+        """Writes acknowledged but not yet stored."""
+        return len(self._pending) + len(self._flushing)
+
+    async def open(self) -> None:
+        """Open the wrapped repository and start flushing in the background."""
+        await self._inner.open()
+        if self._flusher is None:
+            self._flusher = asyncio.create_task(self._flush_periodically())
+
+    async def close(self) -> None:
+        """Drain the buffer, then close the wrapped repository."""
+        if self._flusher is not None:
+            self._flusher.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._flusher
+            self._flusher = None
+        try:
+            await self.flush()
+        finally:
+            await self._inner.close()
+
+    async def flush(self) -> None:
+        """Write every buffered change to the wrapped repository.
+
+        Raises:
+            Exception: Whatever the wrapped repository raised; the batch
+                stays buffered
+        """
+        async with self._flush_lock:
+            if not self._pending:
+                return
+            self._flushing, self._pending = self._pending, {}
+            saves = [entity for entity in self._flushing.values() if entity is not None]
+            deletes = [entity_id for entity_id, entity in self._flushing.items() if entity is None]
+            try:
+                if saves:
+                    await self._inner.save_many(saves)
+                if deletes:
+                    await self._inner.delete_many(deletes)
+            except BaseException:
+                self._errors += 1
+                self._flush_errors.inc()
+                # Newer writes made during the flush take precedence
+                self._pending = {**self._flushing, **self._pending}
+                raise
+            else:
+                self._flushes += 1
+                self._flushed += len(self._flushing)
+            finally:
+                self._flushing = {}
+                self._depth.set(value=self.depth())
+
+    async def get_by_id(self, entity_id: UUID) -> ExampleEntity | None:
+        """Retrieve an entity, including buffered changes."""
+        found, entity = self._buffered(entity_id)
+        if found:
+            return entity
+        return await self._inner.get_by_id(entity_id)
+
+    async def get_version(self, entity_id: UUID) -> datetime | None:
+        """Return an entity's version, including buffered changes."""
+        found, entity = self._buffered(entity_id)
+        if found:
+            return entity.version if entity is not None else None
+        return await self._inner.get_version(entity_id)
+
+    async def get_many(self, entity_ids: Sequence[UUID]) -> dict[UUID, ExampleEntity]:
+        """Retrieve entities, including buffered changes."""
+        found: dict[UUID, ExampleEntity] = {}
+        missing: list[UUID] = []
+        for entity_id in entity_ids:
+            buffered, entity = self._buffered(entity_id)
+            if not buffered:
+                missing.append(entity_id)
+            elif entity is not None:
+                found[entity_id] = entity
+        if missing:
+            found.update(await self._inner.get_many(missing))
+        return found
+
+    async def save(self, entity: ExampleEntity) -> ExampleEntity:
+        """Buffer an entity for the next flush."""
+        await self._enqueue({entity.id: entity})
+        return entity
+
+    async def save_many(self, entities: Sequence[ExampleEntity]) -> list[ExampleEntity]:
+        """Buffer entities for the next flush."""
+        await self._enqueue({entity.id: entity for entity in entities})
+        return list(entities)
+
+    async def delete(self, entity_id: UUID) -> bool:
+        """Buffer a delete for the next flush. Returns whether the entity existed."""
+        existed = await self.get_by_id(entity_id) is not None
+        await self._enqueue({entity_id: None})
+        return existed
+
+    async def compare_and_save(self, entity: ExampleEntity, expected_version: datetime) -> bool:
+        """Buffer an entity if it is at ``expected_version``.
+
+        An entity with no buffered change is compared and written by the
+        wrapped repository directly, which makes the check atomic there.
+        """
+        await self._make_room()
+        found, current = self._buffered(entity.id)
+        if not found:
+            return await self._inner.compare_and_save(entity, expected_version)
+        if current is None or current.version != expected_version:
+            return False
+        self._record({entity.id: entity})
+        return True
+
+    async def compare_and_delete(self, entity_id: UUID, expected_version: datetime) -> bool:
+        """Buffer a delete if the entity is at ``expected_version``.
+
+        Like ``compare_and_save``, unbuffered entities go straight to the
+        wrapped repository.
+        """
+        await self._make_room()
+        found, current = self._buffered(entity_id)
+        if not found:
+            return await self._inner.compare_and_delete(entity_id, expected_version)
+        if current is None or current.version != expected_version:
+            return False
+        self._record({entity_id: None})
+        return True
+
+    async def delete_many(self, entity_ids: Sequence[UUID]) -> set[UUID]:
+        """Buffer deletes for the next flush. Returns the IDs that existed."""
+        existing = set(await self.get_many(entity_ids))
+        await self._enqueue(dict.fromkeys(entity_ids))
+        return existing
+
+    async def list_page(
+        self, limit: int, after: tuple[datetime, UUID] | None = None
+    ) -> list[ExampleEntity]:
+        """Flush buffered changes, then list entities."""
+        await self.flush()
+        return await self._inner.list_page(limit, after)
+
+    async def list_page_by_id(self, limit: int, after: UUID | None = None) -> list[ExampleEntity]:
+        """Flush buffered changes, then list entities by ID."""
+        await self.flush()
+        return await self._inner.list_page_by_id(limit, after)
+
+    async def iterate(self, batch_size: int = 1000) -> AsyncIterator[ExampleEntity]:
+        """Flush buffered changes, then iterate over every entity."""
+        await self.flush()
+        async for entity in self._inner.iterate(batch_size):
+            yield entity
+
+    def _buffered(self, entity_id: UUID) -> tuple[bool, ExampleEntity | None]:
+        """Look an entity up in the buffer: (found, entity or None if deleted)."""
+        for layer in (self._pending, self._flushing):
+            if entity_id in layer:
+                return True, layer[entity_id]
+        return False, None
+
+    async def _enqueue(self, changes: dict[UUID, ExampleEntity | None]) -> None:
+        """Record changes, applying backpressure and waking the flusher."""
+        await self._make_room()
+        self._record(changes)
+
+    async def _make_room(self) -> None:
+        """Flush until the buffer has room for more changes."""
+        while len(self._pending) >= self._max_pending:
+            await self.flush()
+
+    def _record(self, changes: dict[UUID, ExampleEntity | None]) -> None:
+        """Buffer changes, waking the flusher once enough are pending."""
+        self._pending.update(changes)
+        self._depth.set(value=self.depth())
+        if len(self._pending) >= self._flush_size:
+            self._wakeup.set()
+
+    async def _flush_periodically(self) -> None:
+        """Flush on every interval, or sooner when the buffer fills up."""
+        while True:
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(self._wakeup.wait(), self._flush_interval)
+            self._wakeup.clear()
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("Write-behind flush failed; retrying on the next interval")
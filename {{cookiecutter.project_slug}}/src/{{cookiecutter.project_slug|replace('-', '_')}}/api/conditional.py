@@ -0,0 +1,64 @@
+"""ETags and conditional request headers for entity endpoints.
+
+An entity's ETag is derived from its ID and version (``updated_at``, or
+``created_at`` if it was never updated), so it can be computed from a
+version lookup without loading or serialising the entity. Every update
+moves the version forward, which makes the ETag strong: equal tags mean
+byte-identical representations.
+
+``If-None-Match`` uses weak comparison, so ``W/"..."`` tags sent back by
+intermediaries still match; ``If-Match`` uses strong comparison
+(RFC 9110, section 13.1).
+"""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from uuid import UUID
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def entity_etag(entity_id: UUID, version: datetime) -> str:
+    """Build the strong ETag of an entity at ``version``, quotes included."""
+    return f'"{entity_id.hex}-{(version - _EPOCH) // _MICROSECOND:x}"'
+
+
+def etag_matches(header: str, etag: str, *, weak: bool) -> bool:
+    """Check whether an ``If-Match``/``If-None-Match`` header lists ``etag``.
+
+    Args:
+        header: Header value: ``*`` or a comma-separated list of entity tags
+        etag: The current strong ETag
+        weak: Use weak comparison, ignoring ``W/`` prefixes; strong
+            comparison never matches a weak tag
+
+    Returns:
+        True if the header is ``*`` or names ``etag``
+    """
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            if not weak:
+                continue
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def cache_control(max_age: int) -> str:
+    """``Cache-Control`` value for an entity response.
+
+    With ``max_age=0`` clients may store the entity but must revalidate it
+    with ``If-None-Match`` before every reuse.
+    """
+    if max_age == 0:
+        return "no-cache"
+    return f"max-age={max_age}, must-revalidate"
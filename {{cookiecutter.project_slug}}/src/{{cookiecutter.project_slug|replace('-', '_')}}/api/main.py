@@ -5,17 +5,57 @@ REST API presentation layer that delegates to services.
 
 from __future__ import annotations
 
-from collections.abc import AsyncGenerator
+import logging
+from collections.abc import AsyncGenerator, Callable
 from contextlib import asynccontextmanager
-from typing import Annotated, Any
+from datetime import datetime
+from typing import TYPE_CHECKING, Annotated
 from uuid import UUID
 
-from fastapi import Depends, FastAPI, HTTPException
-from pydantic import BaseModel, ConfigDict
-
-from ..adapters.repositories import InMemoryExampleRepository
+from fastapi import Depends, FastAPI, Header, HTTPException, Query
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
+from pydantic import BaseModel, ConfigDict, Field
+
+from ..adapters.jobs import create_job_store
+from ..adapters.repositories import (
+    CachedExampleRepository,
+    ExampleRepository,
+    InMemoryExampleRepository,
+    InstrumentedExampleRepository,
+    create_repository,
+    find_layer,
+)
+from ..domain.entities import ID_FACTORIES, set_id_factory
+from ..domain.jobs import JobKind
 from ..infrastructure.config import Settings, get_settings
-from ..services import ExampleService
+from ..infrastructure.logging import configure_logging
+from ..infrastructure.metrics import CONTENT_TYPE, REGISTRY
+from ..infrastructure.profiling import ProfileStore
+from ..infrastructure.tracing import TraceBuffer
+from ..services import (
+    MAX_PAGE_SIZE,
+    ExampleService,
+    ListOrder,
+    SearchUnavailableError,
+    VersionConflictError,
+)
+from ..services.jobs import JobQueueFullError, JobRunner
+from ..services.ndjson import encode_ndjson
+from .conditional import cache_control, entity_etag, etag_matches
+from .middleware import (
+    AdmissionControlMiddleware,
+    MetricsMiddleware,
+    ProfilingMiddleware,
+    RequestLoggingMiddleware,
+    TracingMiddleware,
+)
+from .responses import FastJSONResponse, entity_payload, job_payload
+from .tracing import TracedRoute
+
+if TYPE_CHECKING:
+    from ..domain.entities import ExampleEntity
+
+logger = logging.getLogger(__name__)
 
 
 # Request/Response schemas
@@ -26,6 +66,13 @@ class CreateEntityRequest(BaseModel):
     description: str = ""
 
 
+class UpdateEntityRequest(BaseModel):
+    """Request schema for replacing an entity's fields."""
+
+    name: str
+    description: str = ""
+
+
 class EntityResponse(BaseModel):
     """Response schema for entity data."""
 
@@ -36,6 +83,92 @@ class EntityResponse(BaseModel):
     description: str
 
 
+class EntityPageResponse(BaseModel):
+    """Response schema for one page of entities."""
+
+    items: list[EntityResponse]
+    next_cursor: str | None
+
+
+# Upper bound on items per batch request
+MAX_BATCH_SIZE = 1000
+
+
+class BatchCreateRequest(BaseModel):
+    """Request schema for creating several entities at once."""
+
+    items: list[CreateEntityRequest] = Field(max_length=MAX_BATCH_SIZE)
+
+
+class BatchItemErrorResponse(BaseModel):
+    """A rejected item, identified by its position in the request."""
+
+    index: int
+    detail: str
+
+
+class BatchCreateResponse(BaseModel):
+    """Response schema for a batch create."""
+
+    created: list[EntityResponse]
+    errors: list[BatchItemErrorResponse]
+
+
+class BatchIdsRequest(BaseModel):
+    """Request schema for batch operations addressed by ID."""
+
+    ids: list[UUID] = Field(max_length=MAX_BATCH_SIZE)
+
+
+class BatchGetResponse(BaseModel):
+    """Response schema for a batch get."""
+
+    entities: list[EntityResponse]
+    missing: list[UUID]
+
+
+class BatchDeleteResponse(BaseModel):
+    """Response schema for a batch delete."""
+
+    deleted: list[UUID]
+    missing: list[UUID]
+
+
+# Upper bound on items per job
+MAX_JOB_ITEMS = 100_000
+
+
+class SubmitJobRequest(BaseModel):
+    """Request schema for a background job: ``items`` to create, or ``ids`` to delete."""
+
+    kind: JobKind
+    items: list[CreateEntityRequest] = Field(default_factory=list, max_length=MAX_JOB_ITEMS)
+    ids: list[UUID] = Field(default_factory=list, max_length=MAX_JOB_ITEMS)
+
+
+class JobItemErrorResponse(BaseModel):
+    """An item a job could not process, by its position in the job's input."""
+
+    index: int
+    detail: str
+
+
+class JobResponse(BaseModel):
+    """Response schema for a job and its progress."""
+
+    id: UUID
+    kind: JobKind
+    status: str
+    total: int
+    processed: int
+    succeeded: int
+    failed: int
+    errors: list[JobItemErrorResponse]
+    error: str | None
+    created_at: datetime
+    updated_at: datetime | None
+
+
 class HealthResponse(BaseModel):
     """Health check response."""
 
@@ -44,8 +177,48 @@ class HealthResponse(BaseModel):
     database: str | None
 
 
+class CacheStatsResponse(BaseModel):
+    """Entity cache counters."""
+
+    enabled: bool
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    size: int = 0
+    max_entries: int = 0
+    hit_rate: float = 0.0
+
+
+class SpanResponse(BaseModel):
+    """A span of a trace, timed in milliseconds from the start of the request."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    name: str
+    start_ms: float
+    duration_ms: float
+
+
+class TraceResponse(BaseModel):
+    """A sampled request trace; ``trace_id`` is the request's ``X-Request-ID``."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    trace_id: str
+    method: str
+    path: str
+    route: str
+    status: int
+    started_at: datetime
+    duration_ms: float
+    spans: list[SpanResponse]
+
+
 # Dependency injection
-_repository = InMemoryExampleRepository()
+# Replaced in ``lifespan`` by the repository selected from DATABASE_URL
+_repository: ExampleRepository = InstrumentedExampleRepository(InMemoryExampleRepository())
+# Started in ``lifespan``
+_jobs: JobRunner | None = None
 
 
 def get_example_service() -> ExampleService:
@@ -53,18 +226,68 @@ def get_example_service() -> ExampleService:
     return ExampleService(_repository)
 
 
+def get_job_runner() -> JobRunner:
+    """Dependency for the JobRunner; 503 until it has started, or if jobs are disabled."""
+    if _jobs is None:
+        raise HTTPException(status_code=503, detail="Jobs are not running")
+    return _jobs
+
+
 # Type aliases for dependency injection (B008 fix)
 SettingsDep = Annotated[Settings, Depends(get_settings)]
 ServiceDep = Annotated[ExampleService, Depends(get_example_service)]
+JobsDep = Annotated[JobRunner, Depends(get_job_runner)]
+IfMatchHeader = Annotated[
+    str | None, Header(description="Only act if the entity still has this ETag")
+]
+IfNoneMatchHeader = Annotated[
+    str | None, Header(description="Answer 304 if the entity still has this ETag")
+]
 
 
 # Application lifecycle
 @asynccontextmanager
 async def lifespan(_app: FastAPI) -> AsyncGenerator[None, None]:
-    """Application lifespan manager."""
+    """Application lifespan manager.
+
+    Starts the log writer, opens the configured repository (and its
+    connection pool) and starts the job workers on startup; stops them,
+    closes it and flushes the logs on shutdown.
+    """
+    global _repository, _jobs
+
     # Startup
-    yield
-    # Shutdown
+    settings = get_settings()
+    log_writer = configure_logging(settings)
+    set_id_factory(ID_FACTORIES[settings.id_version])
+    repository = create_repository(settings)
+    await repository.open()
+    _repository = repository
+    # In memory, each worker would only see the jobs it accepted itself
+    multiprocess = settings.workers is not None and settings.workers > 1
+    jobs: JobRunner | None = None
+    if settings.job_store_dir is not None or not multiprocess:
+        jobs = JobRunner(
+            ExampleService(repository),
+            create_job_store(settings),
+            workers=settings.job_workers,
+            max_queued=settings.job_queue_size,
+            chunk_size=settings.job_chunk_size,
+            retention=settings.job_retention_seconds,
+        )
+        await jobs.start()
+    else:
+        logger.warning("Background jobs are disabled: several workers need JOB_STORE_DIR")
+    _jobs = jobs
+    try:
+        yield
+    finally:
+        # Shutdown: running jobs stop and resume on the next start
+        _jobs = None
+        if jobs is not None:
+            await jobs.stop()
+        await repository.close()
+        log_writer.close()
 
 
 # FastAPI app
@@ -74,9 +297,91 @@ app = FastAPI(
     version="0.1.0",
     lifespan=lifespan,
 )
+_startup_settings = get_settings()
+# Sampled request traces served by /debug/traces
+_traces = TraceBuffer(_startup_settings.trace_buffer_size)
+if _startup_settings.tracing_enabled:
+    # Routes declared from here on record their handler as a span
+    app.router.route_class = TracedRoute
+# Health checks and metric scrapes must answer even when the app is saturated
+ADMISSION_EXEMPT_PATHS = ("/health", "/metrics")
+if _startup_settings.admission_max_concurrency > 0:
+    app.add_middleware(
+        AdmissionControlMiddleware,
+        max_concurrency=_startup_settings.admission_max_concurrency,
+        max_queue=_startup_settings.admission_max_queue,
+        queue_timeout=_startup_settings.admission_queue_timeout,
+        retry_after=_startup_settings.admission_retry_after,
+        exempt_paths=ADMISSION_EXEMPT_PATHS,
+        registry=REGISTRY,
+    )
+# Wraps admission control, so Server-Timing totals include queueing
+if _startup_settings.tracing_enabled:
+    app.add_middleware(
+        TracingMiddleware, buffer=_traces, sample_rate=_startup_settings.trace_sample_rate
+    )
+# Wraps admission control, so its latencies include queueing and it counts shed 503s
+if _startup_settings.metrics_enabled:
+    app.add_middleware(MetricsMiddleware, registry=REGISTRY)
+# Wraps the above, so logged latencies include queueing and shed requests carry an ID
+if _startup_settings.log_requests:
+    app.add_middleware(
+        RequestLoggingMiddleware,
+        sample_rate=_startup_settings.log_sample_rate,
+        route_sample_rates=_startup_settings.log_route_sample_rates,
+        slow_seconds=_startup_settings.log_slow_seconds,
+    )
+# Added last so it is outermost and its profiles include the other middleware
+if _startup_settings.profile_token or _startup_settings.profile_sample_rate > 0:
+    app.add_middleware(
+        ProfilingMiddleware,
+        store=ProfileStore(_startup_settings.profile_dir, _startup_settings.profile_max_files),
+        token=_startup_settings.profile_token,
+        sample_rate=_startup_settings.profile_sample_rate,
+    )
+
+
+def entity_headers(entity_id: UUID, version: datetime, settings: Settings) -> dict[str, str]:
+    """ETag and caching headers for a representation of an entity."""
+    return {
+        "ETag": entity_etag(entity_id, version),
+        "Cache-Control": cache_control(settings.http_cache_max_age),
+    }
+
+
+def entity_response(
+    entity: ExampleEntity, settings: Settings, status_code: int = 200
+) -> FastJSONResponse:
+    """An entity's JSON representation, with its ETag."""
+    return FastJSONResponse(
+        entity_payload(entity),
+        status_code=status_code,
+        headers=entity_headers(entity.id, entity.version, settings),
+    )
+
+
+def if_match_precondition(
+    entity_id: UUID, if_match: str | None
+) -> Callable[[datetime], bool] | None:
+    """Turn an ``If-Match`` header into a check of the entity's version.
+
+    The service applies the check to the version it reads and only writes
+    while the entity is still at that version, so a stale ETag gives 412
+    even if the entity changes between the check and the write.
+
+    Returns:
+        A predicate accepting the versions whose ETag the header lists;
+        None without a header
+    """
+    if if_match is None:
+        return None
+    return lambda version: etag_matches(if_match, entity_etag(entity_id, version), weak=False)
 
 
 # Routes
+#
+# Entity routes declare ``response_model`` for the OpenAPI schema and return a
+# FastJSONResponse built from the entities, skipping response re-validation.
 @app.get("/", response_model=dict[str, str])
 def root() -> dict[str, str]:
     """Root endpoint."""
@@ -93,50 +398,278 @@ def health(settings: SettingsDep) -> HealthResponse:
     )
 
 
+@app.get("/cache/stats", response_model=CacheStatsResponse)
+def cache_stats() -> CacheStatsResponse:
+    """Entity cache hit/miss/eviction counters."""
+    cache = find_layer(_repository, CachedExampleRepository)
+    if cache is None:
+        return CacheStatsResponse(enabled=False)
+    stats = cache.stats()
+    return CacheStatsResponse(
+        enabled=True,
+        hits=stats.hits,
+        misses=stats.misses,
+        evictions=stats.evictions,
+        size=stats.size,
+        max_entries=stats.max_entries,
+        hit_rate=stats.hit_rate,
+    )
+
+
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def metrics() -> PlainTextResponse:
+    """Request and repository metrics in the Prometheus text format."""
+    return PlainTextResponse(REGISTRY.render(), media_type=CONTENT_TYPE)
+
+
+@app.get("/debug/traces", response_model=list[TraceResponse])
+def recent_traces(limit: Annotated[int, Query(ge=1, le=1000)] = 50) -> list[TraceResponse]:
+    """The most recent sampled request traces, newest first."""
+    if not _startup_settings.tracing_enabled:
+        raise HTTPException(status_code=404, detail="Tracing is disabled")
+    return [TraceResponse.model_validate(trace) for trace in _traces.recent(limit)]
+
+
 @app.post("/entities", response_model=EntityResponse, status_code=201)
 async def create_entity(
     request: CreateEntityRequest,
     service: ServiceDep,
-) -> Any:
+    settings: SettingsDep,
+) -> FastJSONResponse:
     """Create a new entity."""
     try:
         entity = await service.create(request.name, request.description)
-        return EntityResponse(
-            id=entity.id,
-            name=entity.name,
-            description=entity.description,
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    return entity_response(entity, settings, status_code=201)
+
+
+@app.get("/entities", response_model=EntityPageResponse)
+async def list_entities(
+    service: ServiceDep,
+    limit: Annotated[int, Query(ge=1, le=MAX_PAGE_SIZE)] = 50,
+    cursor: Annotated[str | None, Query(description="next_cursor of the previous page")] = None,
+    order: Annotated[
+        ListOrder, Query(description="created: creation order; id: ID order")
+    ] = "created",
+    q: Annotated[
+        str | None,
+        Query(
+            min_length=1,
+            max_length=500,
+            description="Full-text query: every word must match; word* matches a prefix",
+        ),
+    ] = None,
+) -> FastJSONResponse:
+    """List entities in creation or ID order, or search them with ``q``.
+
+    All page with an opaque cursor; search results come best match first.
+    """
+    try:
+        page = await (
+            service.search(q, limit, cursor)
+            if q is not None
+            else service.list_page(limit, cursor, order)
         )
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e)) from e
+    except SearchUnavailableError as e:
+        raise HTTPException(status_code=503, detail=str(e)) from e
+    return FastJSONResponse(
+        {
+            "items": [entity_payload(entity) for entity in page.items],
+            "next_cursor": page.next_cursor,
+        }
+    )
+
+
+@app.post("/entities:batchCreate", response_model=BatchCreateResponse)
+async def batch_create_entities(
+    request: BatchCreateRequest,
+    service: ServiceDep,
+) -> FastJSONResponse:
+    """Create several entities; invalid items are reported, not fatal."""
+    result = await service.create_many([(item.name, item.description) for item in request.items])
+    return FastJSONResponse(
+        {
+            "created": [entity_payload(entity) for entity in result.created],
+            "errors": [{"index": error.index, "detail": error.error} for error in result.errors],
+        }
+    )
+
+
+@app.post("/entities:batchGet", response_model=BatchGetResponse)
+async def batch_get_entities(
+    request: BatchIdsRequest,
+    service: ServiceDep,
+) -> FastJSONResponse:
+    """Get several entities by ID, in request order."""
+    ids = list(dict.fromkeys(request.ids))
+    found = await service.get_many(ids)
+    return FastJSONResponse(
+        {
+            "entities": [entity_payload(found[i]) for i in ids if i in found],
+            "missing": [i for i in ids if i not in found],
+        }
+    )
 
 
-@app.get("/entities/{entity_id}", response_model=EntityResponse)
+@app.post("/entities:batchDelete", response_model=BatchDeleteResponse)
+async def batch_delete_entities(
+    request: BatchIdsRequest,
+    service: ServiceDep,
+) -> FastJSONResponse:
+    """Delete several entities by ID."""
+    ids = list(dict.fromkeys(request.ids))
+    deleted = await service.delete_many(ids)
+    return FastJSONResponse(
+        {
+            "deleted": [i for i in ids if i in deleted],
+            "missing": [i for i in ids if i not in deleted],
+        }
+    )
+
+
+@app.get(
+    "/entities/export",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"application/x-ndjson": {}}}},
+)
+def export_entities(
+    service: ServiceDep,
+    batch_size: Annotated[int, Query(ge=1, le=MAX_PAGE_SIZE)] = 1000,
+) -> StreamingResponse:
+    """Stream every entity as newline-delimited JSON.
+
+    Rows are read from the repository one batch at a time and sent in
+    chunks; each chunk waits for the client to accept the previous one, so
+    memory use stays flat however large the dataset is.
+    """
+    return StreamingResponse(
+        encode_ndjson(service.iterate(batch_size)),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="entities.ndjson"'},
+    )
+
+
+@app.get(
+    "/entities/{entity_id}",
+    response_model=EntityResponse,
+    responses={304: {"description": "Not Modified"}},
+)
 async def get_entity(
     entity_id: UUID,
     service: ServiceDep,
-) -> Any:
-    """Get an entity by ID."""
+    settings: SettingsDep,
+    if_none_match: IfNoneMatchHeader = None,
+) -> Response:
+    """Get an entity by ID.
+
+    With ``If-None-Match``, the entity's version is looked up first; if the
+    client's copy is current the answer is an empty 304, and the entity is
+    never loaded or serialised.
+    """
+    if if_none_match is not None:
+        version = await service.get_version(entity_id)
+        if version is None:
+            raise HTTPException(status_code=404, detail="Entity not found")
+        if etag_matches(if_none_match, entity_etag(entity_id, version), weak=True):
+            return Response(status_code=304, headers=entity_headers(entity_id, version, settings))
     entity = await service.get_by_id(entity_id)
     if not entity:
         raise HTTPException(status_code=404, detail="Entity not found")
-    return EntityResponse(
-        id=entity.id,
-        name=entity.name,
-        description=entity.description,
-    )
+    return entity_response(entity, settings)
 
 
-@app.delete("/entities/{entity_id}", status_code=204)
+@app.put(
+    "/entities/{entity_id}",
+    response_model=EntityResponse,
+    responses={412: {"description": "Entity has changed"}},
+)
+async def update_entity(
+    entity_id: UUID,
+    request: UpdateEntityRequest,
+    service: ServiceDep,
+    settings: SettingsDep,
+    if_match: IfMatchHeader = None,
+) -> FastJSONResponse:
+    """Replace an entity's name and description.
+
+    Send the ETag last read in ``If-Match`` to avoid overwriting a
+    concurrent change: the update is refused with 412 if the entity has
+    moved on.
+    """
+    precondition = if_match_precondition(entity_id, if_match)
+    try:
+        entity = await service.update(entity_id, request.name, request.description, precondition)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    except VersionConflictError as e:
+        raise HTTPException(status_code=412, detail="Entity has changed") from e
+    if entity is None:
+        raise HTTPException(status_code=404, detail="Entity not found")
+    return entity_response(entity, settings)
+
+
+@app.delete(
+    "/entities/{entity_id}", status_code=204, responses={412: {"description": "Entity has changed"}}
+)
 async def delete_entity(
     entity_id: UUID,
     service: ServiceDep,
+    if_match: IfMatchHeader = None,
 ) -> None:
-    """Delete an entity by ID."""
-    deleted = await service.delete(entity_id)
+    """Delete an entity by ID, optionally only at the ETag in ``If-Match``."""
+    precondition = if_match_precondition(entity_id, if_match)
+    try:
+        deleted = await service.delete(entity_id, precondition)
+    except VersionConflictError as e:
+        raise HTTPException(status_code=412, detail="Entity has changed") from e
     if not deleted:
         raise HTTPException(status_code=404, detail="Entity not found")
 
 
+@app.post("/jobs", response_model=JobResponse, status_code=202)
+async def submit_job(request: SubmitJobRequest, jobs: JobsDep) -> FastJSONResponse:
+    """Queue a bulk create or delete and return at once.
+
+    Poll ``GET /jobs/{job_id}`` (also sent as ``Location``) for progress.
+    """
+    if request.kind == "create":
+        if request.ids or not request.items:
+            raise HTTPException(status_code=400, detail="A create job takes items, not ids")
+        items = [{"name": item.name, "description": item.description} for item in request.items]
+    else:
+        if request.items or not request.ids:
+            raise HTTPException(status_code=400, detail="A delete job takes ids, not items")
+        items = [{"id": str(entity_id)} for entity_id in request.ids]
+    try:
+        job = await jobs.submit(request.kind, items)
+    except JobQueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"}) from e
+    return FastJSONResponse(
+        job_payload(job), status_code=202, headers={"Location": f"/jobs/{job.id}"}
+    )
+
+
+@app.get("/jobs/{job_id}", response_model=JobResponse)
+async def get_job(job_id: UUID, jobs: JobsDep) -> FastJSONResponse:
+    """Get a job's status and progress."""
+    job = await jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return FastJSONResponse(job_payload(job))
+
+
+@app.post("/jobs/{job_id}:cancel", response_model=JobResponse, status_code=202)
+async def cancel_job(job_id: UUID, jobs: JobsDep) -> FastJSONResponse:
+    """Cancel a job: at once if queued, after its current chunk if running."""
+    job = await jobs.cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return FastJSONResponse(job_payload(job), status_code=202)
+
+
 if __name__ == "__main__":
     import uvicorn
 
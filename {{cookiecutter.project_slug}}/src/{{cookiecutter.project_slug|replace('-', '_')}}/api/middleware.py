@@ -0,0 +1,458 @@
+"""ASGI middleware for the REST API.
+
+Middleware here is written against the raw ASGI interface rather than
+Starlette's ``BaseHTTPMiddleware``, which adds a task and a memory stream to
+every request.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import cProfile
+import hmac
+import random
+import secrets
+import time
+from collections import deque
+from collections.abc import Collection, Mapping
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING
+
+import structlog
+
+from ..infrastructure.metrics import REGISTRY, MetricsRegistry
+from ..infrastructure.profiling import profile_name
+from ..infrastructure.tracing import Trace, end_trace, start_trace
+
+if TYPE_CHECKING:
+    from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+    from ..infrastructure.profiling import ProfileStore
+    from ..infrastructure.tracing import TraceBuffer
+
+# Route label for requests that matched no route, so that arbitrary
+# unknown paths cannot create unbounded numbers of series
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class MetricsMiddleware:
+    """Record request latency, in-flight requests and status codes.
+
+    Requests are labelled by route template (``/entities/{entity_id}``) rather
+    than by raw path, keeping the number of series bounded.
+
+    Args:
+        app: The wrapped ASGI application
+        registry: Registry receiving the metrics
+    """
+
+    def __init__(self, app: ASGIApp, registry: MetricsRegistry = REGISTRY) -> None:
+        self.app = app
+        self._latency = registry.histogram(
+            "http_request_duration_seconds",
+            "HTTP request latency by route template.",
+            ["method", "route"],
+        )
+        self._requests = registry.counter(
+            "http_requests_total",
+            "HTTP requests by route template and status code.",
+            ["method", "route", "status"],
+        )
+        self._in_flight = registry.gauge(
+            "http_requests_in_progress",
+            "HTTP requests currently being served.",
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        self._in_flight.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            self._in_flight.dec()
+            # The router stores the matched route in the scope
+            route = scope.get("route")
+            template = getattr(route, "path", UNMATCHED_ROUTE)
+            method = scope["method"]
+            self._latency.labels(method, template).observe(elapsed)
+            self._requests.inc(method, template, str(status))
+
+
+# Body of the response to shed requests
+_OVERLOADED_BODY = b'{"detail":"Server overloaded, retry later"}'
+
+
+class AdmissionControlMiddleware:
+    """Bound the requests served at once, queueing a few and shedding the rest.
+
+    Up to ``max_concurrency`` requests run at a time. Later requests wait
+    in a first-in first-out queue of at most ``max_queue`` entries for at
+    most ``queue_timeout`` seconds. A request arriving to a full queue, or
+    still waiting at its deadline, is answered 503 with ``Retry-After``
+    straight away. Without the bound, every request slows down once
+    traffic exceeds capacity; with it, the admitted requests keep their
+    latency and the rest fail fast and can retry elsewhere.
+
+    Args:
+        app: The wrapped ASGI application
+        max_concurrency: Requests served at once
+        max_queue: Requests waiting for a slot; 0 sheds as soon as all slots are busy
+        queue_timeout: Seconds a request may wait for a slot
+        retry_after: Seconds clients are told to wait before retrying
+        exempt_paths: Paths that bypass admission, such as health checks
+        registry: Registry receiving the shedding and queueing metrics
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        max_concurrency: int,
+        max_queue: int = 0,
+        queue_timeout: float = 1.0,
+        retry_after: int = 1,
+        exempt_paths: Collection[str] = (),
+        registry: MetricsRegistry = REGISTRY,
+    ) -> None:
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.app = app
+        self._max_concurrency = max_concurrency
+        self._max_queue = max_queue
+        self._queue_timeout = queue_timeout
+        self._exempt = frozenset(exempt_paths)
+        self._headers = [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(_OVERLOADED_BODY)).encode()),
+            (b"retry-after", str(retry_after).encode()),
+        ]
+        self._active = 0
+        # Queued requests; a slot is handed over by resolving the first one
+        self._waiters: deque[asyncio.Future[None]] = deque()
+        self._queue_time = registry.histogram(
+            "http_admission_queue_seconds",
+            "Time requests waited for an admission slot.",
+        )
+        self._queued = registry.gauge(
+            "http_admission_queue_depth",
+            "Requests waiting for an admission slot.",
+        )
+        self._shed = registry.counter(
+            "http_requests_shed_total",
+            "Requests rejected with 503 by admission control, by reason.",
+            ["reason"],
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in self._exempt:
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        shed_reason = await self._admit()
+        self._queue_time.observe(time.perf_counter() - started)
+        if shed_reason is not None:
+            self._shed.inc(shed_reason)
+            await send({"type": "http.response.start", "status": 503, "headers": self._headers})
+            await send({"type": "http.response.body", "body": _OVERLOADED_BODY})
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self._release()
+
+    async def _admit(self) -> str | None:
+        """Take a slot, waiting in the queue if needed.
+
+        Returns:
+            None once admitted, else why the request was shed:
+            ``queue_full`` or ``timeout``
+        """
+        if self._active < self._max_concurrency and not self._waiters:
+            self._active += 1
+            return None
+        if len(self._waiters) >= self._max_queue:
+            return "queue_full"
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self._queued.inc()
+        try:
+            async with asyncio.timeout(self._queue_timeout):
+                await waiter
+        except BaseException as e:
+            handed_over = waiter.done() and not waiter.cancelled()
+            if not handed_over:
+                waiter.cancel()
+                # A release may already have skipped past the cancelled waiter
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+            if isinstance(e, TimeoutError):
+                # A slot handed over just as the deadline passed is still used
+                return None if handed_over else "timeout"
+            if handed_over:
+                self._release()
+            raise
+        finally:
+            self._queued.dec()
+        return None
+
+    def _release(self) -> None:
+        """Hand the slot to the oldest waiting request, or free it."""
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self._active -= 1
+
+
+# Request and response header carrying the request ID
+REQUEST_ID_HEADER = b"x-request-id"
+# Longest client-supplied request ID echoed back; longer ones are replaced
+_MAX_REQUEST_ID_LENGTH = 128
+
+
+class RequestLoggingMiddleware:
+    """Log one structured event per request, sampling the successful ones.
+
+    The request ID (the client's ``X-Request-ID``, or a generated one) is
+    bound to the logging context for the duration of the request, so
+    everything logged while serving it carries it. The ID is echoed in the
+    ``X-Request-ID`` response header.
+
+    When the request ends, a ``request`` event with its method, path,
+    route template, status and latency is logged for every server error (status 500 and
+    above, or an exception) and every request slower than ``slow_seconds``.
+    Other requests are logged at their route's sample rate, so busy,
+    healthy routes cost little log volume while failures are never lost.
+
+    Args:
+        app: The wrapped ASGI application
+        sample_rate: Fraction of other requests logged
+        route_sample_rates: Per route template overrides of ``sample_rate``
+        slow_seconds: Latency from which requests are always logged
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        sample_rate: float = 1.0,
+        route_sample_rates: Mapping[str, float] | None = None,
+        slow_seconds: float = 1.0,
+    ) -> None:
+        self.app = app
+        self._sample_rate = sample_rate
+        self._route_sample_rates = dict(route_sample_rates or {})
+        self._slow_seconds = slow_seconds
+        self._logger = structlog.get_logger(__name__)
+
+    @staticmethod
+    def _request_id(scope: Scope) -> str:
+        for name, value in scope["headers"]:
+            if name == REQUEST_ID_HEADER:
+                request_id: str = value.decode("latin-1")
+                if (
+                    0 < len(request_id) <= _MAX_REQUEST_ID_LENGTH
+                    and request_id.isascii()
+                    and request_id.isprintable()
+                ):
+                    return request_id
+                break
+        return secrets.token_hex(16)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = self._request_id(scope)
+        status = 500
+
+        async def send_with_id(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = [*message.get("headers", []), (REQUEST_ID_HEADER, request_id.encode())]
+                message = {**message, "headers": headers}
+            await send(message)
+
+        tokens = structlog.contextvars.bind_contextvars(request_id=request_id)
+        error: Exception | None = None
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_id)
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            template = getattr(scope.get("route"), "path", UNMATCHED_ROUTE)
+            slow = elapsed >= self._slow_seconds
+            if status >= 500 or error is not None:
+                self._logger.error(
+                    "request",
+                    method=scope["method"],
+                    path=scope["path"],
+                    route=template,
+                    status=status,
+                    duration_ms=elapsed * 1000,
+                    exc_info=error,
+                )
+            elif slow or random.random() < self._route_sample_rates.get(
+                template, self._sample_rate
+            ):
+                log = self._logger.warning if slow else self._logger.info
+                log(
+                    "request",
+                    method=scope["method"],
+                    path=scope["path"],
+                    route=template,
+                    status=status,
+                    duration_ms=elapsed * 1000,
+                )
+            structlog.contextvars.reset_contextvars(**tokens)
+
+
+SERVER_TIMING_HEADER = b"server-timing"
+
+
+class TracingMiddleware:
+    """Trace each request and report where its time went in ``Server-Timing``.
+
+    A ``Trace`` is current while the request is served, collecting the
+    ``api``, ``service`` and ``repository`` spans recorded beneath it. The
+    response's ``Server-Timing`` header gives the total time until the
+    response started and the time spent in each layer, for example
+    ``total;dur=2.310, api;dur=1.905, service;dur=1.210, repository;dur=0.875``.
+
+    Whether a request's trace is kept is decided when it starts (head-based
+    sampling): a ``sample_rate`` fraction of traces, with every span, go to
+    ``buffer`` under the request ID of the logging context.
+
+    Args:
+        app: The wrapped ASGI application
+        buffer: Where sampled traces are kept; None keeps none
+        sample_rate: Fraction of requests whose traces are kept
+    """
+
+    def __init__(
+        self, app: ASGIApp, buffer: TraceBuffer | None = None, sample_rate: float = 0.0
+    ) -> None:
+        self.app = app
+        self._buffer = buffer
+        self._sample_rate = sample_rate if buffer is not None else 0.0
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        sampled = self._sample_rate > 0 and random.random() < self._sample_rate
+        trace = Trace(scope["method"], scope["path"], sampled)
+        status = 500
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                timing = trace.server_timing(time.perf_counter()).encode()
+                message = {
+                    **message,
+                    "headers": [*message.get("headers", []), (SERVER_TIMING_HEADER, timing)],
+                }
+            await send(message)
+
+        token = start_trace(trace)
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            end_trace(token)
+            if sampled and self._buffer is not None:
+                request_id = structlog.contextvars.get_contextvars().get(
+                    "request_id"
+                ) or secrets.token_hex(16)
+                template = getattr(scope.get("route"), "path", UNMATCHED_ROUTE)
+                self._buffer.add(trace, request_id, template, status, time.perf_counter())
+
+
+# Request header carrying the profiling token, and the response header
+# naming the profile that was written
+PROFILE_HEADER = b"x-profile"
+PROFILE_ID_HEADER = b"x-profile-id"
+
+
+class ProfilingMiddleware:
+    """Profile selected requests with cProfile and save the results.
+
+    A request is profiled when it sends ``X-Profile: <token>`` with the
+    configured token, or when it is drawn by the sampling rate. The saved
+    profile's file name, without the ``.prof`` suffix, is returned in the
+    ``X-Profile-Id`` response header.
+
+    Only one request is profiled at a time, since the profiler covers the
+    whole event loop thread: while it runs, other requests interleaved on
+    the loop show up in the profile too.
+
+    Args:
+        app: The wrapped ASGI application
+        store: Where profiles are saved
+        token: Secret that requests present to be profiled; None disables it
+        sample_rate: Fraction of requests profiled at random
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        store: ProfileStore,
+        token: str | None = None,
+        sample_rate: float = 0.0,
+    ) -> None:
+        self.app = app
+        self._store = store
+        self._token = token.encode() if token else None
+        self._sample_rate = sample_rate
+        self._active = False
+
+    def _wants_profile(self, scope: Scope) -> bool:
+        if self._token is not None:
+            for name, value in scope["headers"]:
+                if name == PROFILE_HEADER:
+                    return hmac.compare_digest(value, self._token)
+        return self._sample_rate > 0 and random.random() < self._sample_rate
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or self._active or not self._wants_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        started = datetime.now(UTC)
+        profile_id = profile_name(f"{started:%Y%m%dT%H%M%S%f}-{scope['method']}{scope['path']}")
+
+        async def send_with_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = [*message.get("headers", []), (PROFILE_ID_HEADER, profile_id.encode())]
+                message = {**message, "headers": headers}
+            await send(message)
+
+        profile = cProfile.Profile()
+        self._active = True
+        profile.enable()
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            profile.disable()
+            self._active = False
+            await asyncio.to_thread(self._store.save, profile, profile_id)
@@ -0,0 +1,55 @@
+"""Fast JSON responses for entity endpoints.
+
+Entity routes keep declaring a Pydantic ``response_model`` so the OpenAPI
+schema documents them, but return a ``FastJSONResponse`` built straight from
+the domain entities. FastAPI sends a returned ``Response`` as-is, so the
+payload is not validated against the model a second time and is encoded once
+by pydantic-core's Rust serialiser rather than the standard-library encoder.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from pydantic_core import to_json
+from starlette.responses import Response
+
+if TYPE_CHECKING:
+    from ..domain.entities import ExampleEntity
+    from ..domain.jobs import Job
+
+
+class FastJSONResponse(Response):
+    """JSON response encoded by pydantic-core.
+
+    Encodes UUIDs and datetimes natively, so payloads need no conversion
+    before rendering.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        """Encode ``content`` as compact JSON bytes."""
+        return to_json(content)
+
+
+def entity_payload(entity: ExampleEntity) -> dict[str, Any]:
+    """Map an entity onto the ``EntityResponse`` JSON shape."""
+    return {"id": entity.id, "name": entity.name, "description": entity.description}
+
+
+def job_payload(job: Job) -> dict[str, Any]:
+    """Map a job onto the ``JobResponse`` JSON shape."""
+    return {
+        "id": job.id,
+        "kind": job.kind,
+        "status": job.status,
+        "total": job.total,
+        "processed": job.processed,
+        "succeeded": job.succeeded,
+        "failed": job.failed,
+        "errors": [{"index": error.index, "detail": error.error} for error in job.errors],
+        "error": job.error,
+        "created_at": job.created_at,
+        "updated_at": job.updated_at,
+    }
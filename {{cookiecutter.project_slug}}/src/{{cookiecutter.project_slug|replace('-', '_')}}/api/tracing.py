@@ -0,0 +1,33 @@
+"""Route handler spans for request tracing.
+
+``TracedRoute`` is installed as the router's route class, so every endpoint
+is recorded as an ``api.<endpoint name>`` span without decorating each one.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from fastapi.routing import APIRoute
+
+from ..infrastructure.tracing import traced
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Coroutine
+
+    from starlette.requests import Request
+    from starlette.responses import Response
+
+
+class TracedRoute(APIRoute):
+    """APIRoute recording its handler as a span of the request's trace.
+
+    The span covers what FastAPI does for the route: parsing and validating
+    the request, resolving dependencies, running the endpoint and
+    serialising its result. The ``service`` and ``repository`` spans nest
+    inside it, so what remains of it is validation and serialisation.
+    """
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        """Wrap FastAPI's handler for this route in an ``api.<name>`` span."""
+        return traced(f"api.{self.name}")(super().get_route_handler())
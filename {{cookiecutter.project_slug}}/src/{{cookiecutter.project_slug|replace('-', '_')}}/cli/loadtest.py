@@ -0,0 +1,304 @@
+"""HTTP load generator behind the ``loadtest`` command.
+
+Drives a weighted mix of create, get and delete requests against a running
+server in one of two modes:
+
+- **closed loop**: a fixed number of users, each sending its next request as
+  soon as the previous one completes. Throughput adapts to the server.
+- **open loop**: requests start on a fixed schedule, whether or not earlier
+  ones have completed, the way independent clients arrive.
+
+Both modes correct for coordinated omission. A load generator that waits
+for a slow response before sending the next request never sends the
+requests that would have queued up behind it, so it under-reports tail
+latency. In open loop, each request's response time is measured from when
+it was scheduled to start rather than from when it was actually sent. In
+closed loop, every latency longer than the expected interval between
+requests is backfilled with the samples the stall suppressed, as
+HdrHistogram's ``recordValueWithExpectedInterval`` does.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import random
+import time
+from collections import Counter
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Literal, cast, get_args
+
+if TYPE_CHECKING:
+    import httpx
+
+Operation = Literal["create", "get", "delete"]
+
+DEFAULT_MIX: dict[Operation, float] = {"create": 1.0, "get": 8.0, "delete": 1.0}
+# Percentiles reported by the command
+PERCENTILES = (50.0, 95.0, 99.0, 99.9)
+
+
+def parse_mix(spec: str) -> dict[Operation, float]:
+    """Parse a request mix such as ``create=1,get=8,delete=1``.
+
+    Raises:
+        ValueError: If an operation is unknown or a weight is not a
+            non-negative number, or if every weight is zero
+    """
+    mix: dict[Operation, float] = {}
+    for part in spec.split(","):
+        name, _, weight = part.strip().partition("=")
+        if name not in get_args(Operation):
+            raise ValueError(f"Unknown operation {name!r}; expected create, get or delete")
+        try:
+            value = float(weight)
+        except ValueError:
+            raise ValueError(f"Invalid weight for {name}: {weight!r}") from None
+        if value < 0 or not math.isfinite(value):
+            raise ValueError(f"Invalid weight for {name}: {weight!r}")
+        mix[cast(Operation, name)] = value
+    if not any(mix.values()):
+        raise ValueError("At least one operation needs a positive weight")
+    return mix
+
+
+class LatencyHistogram:
+    """Latency sample counts at three significant digits.
+
+    Values are kept as microseconds rounded up to three significant digits,
+    so memory stays bounded however many samples are recorded while
+    percentiles stay within 1% of the exact value.
+    """
+
+    def __init__(self) -> None:
+        self._counts: Counter[int] = Counter()
+        self.count = 0
+
+    @staticmethod
+    def _bucket(seconds: float) -> int:
+        micros = max(round(seconds * 1_000_000), 1)
+        step = int(10 ** max(len(str(micros)) - 3, 0))
+        return -(-micros // step) * step
+
+    def record(self, seconds: float, count: int = 1) -> None:
+        """Record ``count`` samples of ``seconds``."""
+        self._counts[self._bucket(seconds)] += count
+        self.count += count
+
+    def record_corrected(self, seconds: float, expected_interval: float, count: int = 1) -> None:
+        """Record samples plus the samples a stall of that length suppressed.
+
+        A closed-loop sender that waited ``seconds`` for a response, instead
+        of sending every ``expected_interval``, missed requests that would
+        have seen latencies of ``seconds - expected_interval``,
+        ``seconds - 2 * expected_interval`` and so on.
+        """
+        self.record(seconds, count)
+        if expected_interval <= 0:
+            return
+        missing = seconds - expected_interval
+        while missing >= expected_interval:
+            self.record(missing, count)
+            missing -= expected_interval
+
+    def corrected(self, expected_interval: float) -> LatencyHistogram:
+        """Copy of this histogram with coordinated omission corrected."""
+        copy = LatencyHistogram()
+        for micros, count in self._counts.items():
+            copy.record_corrected(micros / 1_000_000, expected_interval, count)
+        return copy
+
+    def percentile(self, percent: float) -> float:
+        """Latency in seconds at or below which ``percent`` of samples fall."""
+        if not self.count:
+            return 0.0
+        rank = max(math.ceil(percent * self.count / 100), 1)
+        seen = 0
+        for micros in sorted(self._counts):
+            seen += self._counts[micros]
+            if seen >= rank:
+                return micros / 1_000_000
+        return max(self._counts) / 1_000_000
+
+
+@dataclass
+class LoadReport:
+    """Outcome of a load test.
+
+    ``service_time`` is measured from sending a request to its response.
+    ``response_time`` additionally includes the time a request should have
+    been waiting to be sent, correcting for coordinated omission.
+    """
+
+    mode: Literal["closed", "open"]
+    elapsed: float = 0.0
+    errors: int = 0
+    operations: Counter[str] = field(default_factory=Counter)
+    statuses: Counter[int] = field(default_factory=Counter)
+    service_time: LatencyHistogram = field(default_factory=LatencyHistogram)
+    response_time: LatencyHistogram = field(default_factory=LatencyHistogram)
+
+    @property
+    def requests(self) -> int:
+        """Requests completed, successfully or not."""
+        return self.service_time.count
+
+    @property
+    def throughput(self) -> float:
+        """Completed requests per second."""
+        return self.requests / self.elapsed if self.elapsed else 0.0
+
+
+class LoadGenerator:
+    """Sends a weighted mix of entity requests through an HTTP client.
+
+    Entities created by the load are remembered so that gets and deletes
+    target real IDs; when none are left, the request becomes a create.
+
+    Args:
+        client: Client with the server's ``base_url`` and a connection pool
+        mix: Relative weight of each operation
+        rng: Random source, for reproducible runs
+    """
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        mix: Mapping[Operation, float] = DEFAULT_MIX,
+        rng: random.Random | None = None,
+    ) -> None:
+        self._client = client
+        self._operations: list[Operation] = [name for name, weight in mix.items() if weight > 0]
+        self._weights = [mix[name] for name in self._operations]
+        self._rng = rng or random.Random()
+        self._ids: list[str] = []
+
+    async def seed(self, entities: int) -> None:
+        """Create entities for gets and deletes to target, before measuring."""
+        for index in range(entities):
+            response = await self._client.post("/entities", json={"name": f"seed-{index}"})
+            response.raise_for_status()
+            self._ids.append(response.json()["id"])
+
+    def _take_id(self, remove: bool) -> str:
+        index = self._rng.randrange(len(self._ids))
+        if not remove:
+            return self._ids[index]
+        # Swap-remove, so concurrent deletes never pick the same entity
+        self._ids[index], self._ids[-1] = self._ids[-1], self._ids[index]
+        return self._ids.pop()
+
+    async def send(self, report: LoadReport, scheduled: float | None = None) -> float:
+        """Send one request and record it in ``report``.
+
+        Args:
+            report: Report receiving the outcome
+            scheduled: When the request was due to start, for open-loop
+                response times; defaults to when it is actually sent
+
+        Returns:
+            The request's service time in seconds
+        """
+        operation = self._rng.choices(self._operations, self._weights)[0]
+        if operation != "create" and not self._ids:
+            operation = "create"
+        started = time.perf_counter()
+        status = 0
+        try:
+            if operation == "create":
+                response = await self._client.post("/entities", json={"name": "loadtest"})
+                if response.status_code == 201:
+                    self._ids.append(response.json()["id"])
+            elif operation == "get":
+                response = await self._client.get(f"/entities/{self._take_id(remove=False)}")
+            else:
+                response = await self._client.delete(f"/entities/{self._take_id(remove=True)}")
+            status = response.status_code
+        except Exception:
+            report.errors += 1
+        finally:
+            finished = time.perf_counter()
+            report.operations[operation] += 1
+            report.statuses[status] += 1
+            if status >= 500:
+                report.errors += 1
+            report.service_time.record(finished - started)
+            if scheduled is not None:
+                report.response_time.record(finished - scheduled)
+        return finished - started
+
+
+async def run_closed_loop(
+    generator: LoadGenerator,
+    users: int,
+    duration: float,
+    expected_interval: float | None = None,
+) -> LoadReport:
+    """Run ``users`` concurrent users for ``duration`` seconds.
+
+    Args:
+        generator: Request source
+        users: Concurrent users, each with one request in flight
+        duration: Seconds to run
+        expected_interval: Interval at which each user would ideally send
+            requests, for coordinated-omission correction; defaults to the
+            run's median service time
+    """
+    report = LoadReport(mode="closed")
+    deadline = time.perf_counter() + duration
+
+    async def user() -> None:
+        while time.perf_counter() < deadline:
+            await generator.send(report)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(user() for _ in range(users)))
+    report.elapsed = time.perf_counter() - started
+    interval = (
+        expected_interval if expected_interval is not None else report.service_time.percentile(50)
+    )
+    report.response_time = report.service_time.corrected(interval)
+    return report
+
+
+async def run_open_loop(
+    generator: LoadGenerator,
+    rate: float,
+    duration: float,
+    max_in_flight: int = 1000,
+) -> LoadReport:
+    """Start ``rate`` requests per second for ``duration`` seconds.
+
+    Requests start on schedule regardless of how many are still running,
+    up to ``max_in_flight``; beyond that they wait for a free slot, and the
+    wait counts towards their response time.
+
+    Args:
+        generator: Request source
+        rate: Requests started per second
+        duration: Seconds over which requests are started
+        max_in_flight: Upper bound on concurrently running requests
+    """
+    if rate <= 0:
+        raise ValueError("rate must be positive")
+    report = LoadReport(mode="open")
+    slots = asyncio.Semaphore(max_in_flight)
+    tasks: set[asyncio.Task[float]] = set()
+
+    async def send(scheduled: float) -> float:
+        async with slots:
+            return await generator.send(report, scheduled)
+
+    started = time.perf_counter()
+    for index in range(int(rate * duration)):
+        scheduled = started + index / rate
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        task = asyncio.create_task(send(scheduled))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+    await asyncio.gather(*tasks)
+    report.elapsed = time.perf_counter() - started
+    return report
@@ -1,37 +1,74 @@
 """CLI application entry point.
 
 Command-line interface using Typer that delegates to services.
+
+Commands import what they need when they run, so that cheap commands such as
+``version`` never pay for loading Rich, the adapters or the web stack.
 """
 
 from __future__ import annotations
 
-import asyncio
-from typing import Annotated
+import sys
+from contextlib import nullcontext
+from functools import cache
+from pathlib import Path
+from typing import TYPE_CHECKING, Annotated, Any, cast, get_args
 from uuid import UUID
 
 import typer
-from rich.console import Console
-from rich.table import Table
 
-from ..adapters.repositories import InMemoryExampleRepository
-from ..infrastructure.config import get_settings
-from ..services import ExampleService
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Awaitable, Callable, Coroutine
+
+    from rich.console import Console
+
+    from ..domain.entities import ExampleEntity
+    from ..services import ExampleService
 
 app = typer.Typer(
     name="{{ cookiecutter.project_slug }}",
     help="{{ cookiecutter.project_description }}",
     add_completion=False,
 )
-console = Console()
 
-# Service instance (in real app, use proper dependency injection)
-_repository = InMemoryExampleRepository()
-_service = ExampleService(_repository)
 
+@cache
+def get_console(stderr: bool = False) -> Console:
+    """Get the shared Rich console for stdout (or stderr)."""
+    from rich.console import Console
+
+    return Console(stderr=stderr)
+
+
+def run_async[T](coro: Coroutine[Any, Any, T]) -> T:
+    """Run a coroutine to completion on a fresh event loop."""
+    import asyncio
+
+    return asyncio.run(coro)
+
+
+def with_service[T](operation: Callable[[ExampleService], Awaitable[T]]) -> T:
+    """Run an operation against a service on the configured repository.
+
+    The repository is opened for the duration of the call and closed again,
+    so connection pools never outlive the command.
+    """
+    from ..adapters.repositories import create_repository
+    from ..domain.entities import ID_FACTORIES, set_id_factory
+    from ..infrastructure.config import get_settings
+    from ..services import ExampleService
+
+    async def runner() -> T:
+        settings = get_settings()
+        set_id_factory(ID_FACTORIES[settings.id_version])
+        repository = create_repository(settings)
+        await repository.open()
+        try:
+            return await operation(ExampleService(repository))
+        finally:
+            await repository.close()
 
-def run_async(coro):
-    """Helper to run async functions from sync CLI."""
-    return asyncio.get_event_loop().run_until_complete(coro)
+    return run_async(runner())
 
 
 @app.command()
@@ -39,12 +76,17 @@ def version() -> None:
     """Show version information."""
     from .. import __version__
 
-    console.print(f"{{ cookiecutter.project_name }} v{__version__}")
+    typer.echo(f"{{ cookiecutter.project_name }} v{__version__}")
 
 
 @app.command()
 def config() -> None:
     """Show current configuration."""
+    from rich.table import Table
+
+    from ..infrastructure.config import get_settings
+
+    console = get_console()
     settings = get_settings()
 
     table = Table(title="Configuration")
@@ -66,8 +108,9 @@ def create(
     description: str = typer.Option("", "--description", "-d", help="Entity description"),
 ) -> None:
     """Create a new entity."""
+    console = get_console()
     try:
-        entity = run_async(_service.create(name, description))
+        entity = with_service(lambda service: service.create(name, description))
         console.print(f"[green]Created entity:[/green] {entity.id}")
         console.print(f"  Name: {entity.name}")
         if entity.description:
@@ -82,7 +125,10 @@ def get(
     entity_id: Annotated[UUID, typer.Argument(help="Entity UUID")],
 ) -> None:
     """Get an entity by ID."""
-    entity = run_async(_service.get_by_id(entity_id))
+    from rich.table import Table
+
+    console = get_console()
+    entity = with_service(lambda service: service.get_by_id(entity_id))
     if not entity:
         console.print(f"[red]Entity not found:[/red] {entity_id}")
         raise typer.Exit(1)
@@ -99,21 +145,395 @@ def get(
     console.print(table)
 
 
+@app.command("list")
+def list_entities(
+    limit: int = typer.Option(50, "--limit", "-n", help="Entities per page"),
+    cursor: str | None = typer.Option(None, "--cursor", "-c", help="Cursor from a previous page"),
+    by_id: bool = typer.Option(False, "--by-id", help="Order by ID instead of creation time"),
+) -> None:
+    """List entities in creation order."""
+    console = get_console()
+    try:
+        page = with_service(
+            lambda service: service.list_page(limit, cursor, "id" if by_id else "created")
+        )
+    except ValueError as e:
+        console.print(f"[red]Error:[/red] {e}")
+        raise typer.Exit(1) from None
+
+    from rich.table import Table
+
+    table = Table(title="Entities")
+    table.add_column("ID", style="cyan")
+    table.add_column("Name", style="green")
+    table.add_column("Created")
+
+    for entity in page.items:
+        table.add_row(str(entity.id), entity.name, str(entity.created_at))
+
+    console.print(table)
+    if page.next_cursor:
+        console.print(f"Next page: --cursor {page.next_cursor}")
+
+
+@app.command()
+def search(
+    query: str = typer.Argument(..., help="Words to match; word* matches a prefix"),
+    limit: int = typer.Option(20, "--limit", "-n", help="Results per page"),
+    cursor: str | None = typer.Option(None, "--cursor", "-c", help="Cursor from a previous page"),
+) -> None:
+    """Search entity names and descriptions, best matches first."""
+    from ..services import SearchUnavailableError
+
+    console = get_console()
+    try:
+        page = with_service(lambda service: service.search(query, limit, cursor))
+    except (ValueError, SearchUnavailableError) as e:
+        console.print(f"[red]Error:[/red] {e}")
+        raise typer.Exit(1) from None
+
+    from rich.table import Table
+
+    table = Table(title=f"Results for {query!r}")
+    table.add_column("ID", style="cyan")
+    table.add_column("Name", style="green")
+    table.add_column("Description")
+
+    for entity in page.items:
+        table.add_row(str(entity.id), entity.name, entity.description or "-")
+
+    console.print(table)
+    if page.next_cursor:
+        console.print(f"Next page: --cursor {page.next_cursor}")
+
+
+@app.command()
+def export(
+    output: Annotated[
+        Path | None, typer.Option("--output", "-o", help="File to write (default: stdout)")
+    ] = None,
+    batch_size: int = typer.Option(1000, "--batch-size", help="Entities read per batch"),
+) -> None:
+    """Export every entity as newline-delimited JSON."""
+    from ..services.ndjson import encode_ndjson
+
+    async def write_all(service: ExampleService) -> int:
+        rows = 0
+
+        async def counted() -> AsyncIterator[ExampleEntity]:
+            nonlocal rows
+            async for entity in service.iterate(batch_size):
+                rows += 1
+                yield entity
+
+        with open(output, "wb") if output else nullcontext(sys.stdout.buffer) as stream:
+            async for chunk in encode_ndjson(counted()):
+                stream.write(chunk)
+        return rows
+
+    rows = with_service(write_all)
+    get_console(stderr=True).print(f"[green]Exported {rows} entities[/green]")
+
+
+@app.command("import")
+def import_entities(
+    source: Annotated[str, typer.Argument(help="NDJSON or CSV file, or - for stdin")],
+    fmt: Annotated[
+        str | None, typer.Option("--format", "-f", help="ndjson or csv (default: from extension)")
+    ] = None,
+    batch_size: int = typer.Option(1000, "--batch-size", help="Records written per batch"),
+    concurrency: int = typer.Option(4, "--concurrency", help="Batches in flight at once"),
+    skip: int = typer.Option(0, "--skip", help="Rows to skip, e.g. a previous checkpoint"),
+    rejects: Annotated[
+        Path | None, typer.Option("--rejects", help="Write rejected rows here as NDJSON")
+    ] = None,
+) -> None:
+    """Bulk import entities from newline-delimited JSON or CSV."""
+    import json
+
+    from ..services.bulk_import import (
+        ImportFormat,
+        ImportReject,
+        ImportReport,
+        bulk_import,
+        read_rows,
+    )
+
+    console = get_console()
+    fmt = fmt or ("csv" if source.lower().endswith(".csv") else "ndjson")
+    if fmt not in get_args(ImportFormat):
+        console.print(f"[red]Error:[/red] Unsupported format: {fmt}")
+        raise typer.Exit(1)
+
+    status = get_console(stderr=True)
+    latest = ImportReport(checkpoint=skip)
+    reject_log = open(rejects, "w", encoding="utf-8") if rejects else nullcontext(None)  # noqa: SIM115
+    stream = (
+        nullcontext(sys.stdin) if source == "-" else open(source, encoding="utf-8", newline="")  # noqa: SIM115
+    )
+
+    with stream as text, reject_log as reject_file:
+
+        def on_reject(reject: ImportReject) -> None:
+            if reject_file is not None:
+                reject_file.write(json.dumps({"row": reject.row, "error": reject.error}) + "\n")
+
+        def on_progress(report: ImportReport) -> None:
+            nonlocal latest
+            latest = report
+            if not status.is_terminal:
+                return
+            status.print(
+                f"{report.read} read, {report.imported} imported, {report.rejected} rejected "
+                f"({report.rows_per_second:,.0f} rows/s)",
+                end="\r",
+            )
+
+        try:
+            report = with_service(
+                lambda service: bulk_import(
+                    service,
+                    read_rows(text, cast(ImportFormat, fmt)),
+                    batch_size=batch_size,
+                    concurrency=concurrency,
+                    skip=skip,
+                    on_reject=on_reject,
+                    on_progress=on_progress,
+                )
+            )
+        except ValueError as e:
+            console.print(f"[red]Error:[/red] {e}")
+            raise typer.Exit(1) from None
+        except (Exception, KeyboardInterrupt) as e:
+            status.print(f"[red]Import interrupted:[/red] {e!r}")
+            status.print(f"Resume with: --skip {latest.checkpoint}")
+            raise typer.Exit(1) from None
+
+    status.print(
+        f"[green]Imported {report.imported} entities[/green] from {report.read} rows in "
+        f"{report.elapsed:.2f}s ({report.rows_per_second:,.0f} rows/s), "
+        f"{report.rejected} rejected, checkpoint {report.checkpoint}"
+    )
+
+
+@app.command(context_settings={"allow_extra_args": True, "ignore_unknown_options": True})
+def profile(
+    ctx: typer.Context,
+    entities: int = typer.Option(
+        1000, "--entities", "-e", min=1, help="Entities in the synthetic workload"
+    ),
+    limit: int = typer.Option(25, "--limit", "-n", min=1, help="Functions to show"),
+    sort: str = typer.Option("cumulative", "--sort", "-s", help="cumulative, tottime or calls"),
+    output: Annotated[
+        Path | None, typer.Option("--output", "-o", help="Also save the profile here")
+    ] = None,
+    load: Annotated[
+        Path | None, typer.Option("--load", help="Show a saved profile instead of running")
+    ] = None,
+) -> None:
+    """Profile a command, or a synthetic workload, and show the hottest functions.
+
+    Without arguments, runs a create/get/list/delete workload against the
+    configured repository. Arguments after ``--`` run that command instead,
+    e.g. ``profile -- import data.ndjson``.
+    """
+    from ..infrastructure.profiling import SortKey, format_top
+
+    console = get_console()
+    if sort not in get_args(SortKey):
+        console.print(f"[red]Error:[/red] Unsupported sort: {sort}")
+        raise typer.Exit(1)
+    sort_key = cast(SortKey, sort)
+
+    if load is not None:
+        typer.echo(format_top(load, limit, sort_key))
+        return
+
+    import cProfile
+
+    from ..services.workload import run_workload
+
+    profiler = cProfile.Profile()
+    if ctx.args:
+        command = " ".join(ctx.args)
+        with profiler:
+            app(ctx.args, standalone_mode=False)
+    else:
+        command = f"workload ({entities} entities)"
+        # A one-entity warm-up keeps lazy imports out of the profile
+        with_service(lambda service: run_workload(service, 1))
+        with profiler:
+            report = with_service(lambda service: run_workload(service, entities))
+        console.print(
+            f"Workload: {report.created} created, {report.read} read, "
+            f"{report.listed} listed, {report.deleted} deleted"
+        )
+
+    if output is not None:
+        profiler.dump_stats(output)
+    console.print(f"[bold]Profile of {command}[/bold]")
+    typer.echo(format_top(profiler, limit, sort_key))
+
+
+@app.command()
+def loadtest(
+    url: Annotated[
+        str | None,
+        typer.Option("--url", help="Server to load (default: the configured port on localhost)"),
+    ] = None,
+    users: int = typer.Option(10, "--users", "-u", min=1, help="Closed loop: concurrent users"),
+    rate: Annotated[
+        float | None,
+        typer.Option("--rate", "-r", min=0.001, help="Open loop: requests started per second"),
+    ] = None,
+    duration: float = typer.Option(10.0, "--duration", "-d", min=0.1, help="Seconds to run"),
+    mix: str = typer.Option("create=1,get=8,delete=1", "--mix", help="Relative operation weights"),
+    connections: int = typer.Option(
+        100, "--connections", "-c", min=1, help="HTTP connection pool size"
+    ),
+    seed: int = typer.Option(100, "--seed", min=0, help="Entities created before measuring"),
+    expected_interval: Annotated[
+        float | None,
+        typer.Option(
+            "--expected-interval",
+            help="Closed loop: ms between a user's requests (default: median service time)",
+        ),
+    ] = None,
+    timeout: float = typer.Option(30.0, "--timeout", help="Request timeout in seconds"),
+) -> None:
+    """Load a running server with a mix of create, get and delete requests.
+
+    Runs closed loop (a fixed number of users) by default, or open loop (a
+    fixed arrival rate) with ``--rate``. Latency percentiles are corrected
+    for coordinated omission.
+    """
+    import httpx
+
+    from .loadtest import (
+        PERCENTILES,
+        LoadGenerator,
+        LoadReport,
+        parse_mix,
+        run_closed_loop,
+        run_open_loop,
+    )
+
+    console = get_console()
+    try:
+        weights = parse_mix(mix)
+    except ValueError as e:
+        console.print(f"[red]Error:[/red] {e}")
+        raise typer.Exit(1) from None
+
+    if url is None:
+        from ..infrastructure.config import get_settings
+
+        url = f"http://127.0.0.1:{get_settings().port}"
+
+    async def run() -> LoadReport:
+        limits = httpx.Limits(max_connections=connections, max_keepalive_connections=connections)
+        async with httpx.AsyncClient(base_url=url, limits=limits, timeout=timeout) as client:
+            generator = LoadGenerator(client, weights)
+            await generator.seed(seed)
+            if rate is not None:
+                return await run_open_loop(generator, rate, duration, max_in_flight=connections)
+            interval = expected_interval / 1000 if expected_interval is not None else None
+            return await run_closed_loop(generator, users, duration, interval)
+
+    mode = f"open loop at {rate:g} req/s" if rate is not None else f"closed loop with {users} users"
+    console.print(f"Loading {url} for {duration:g}s, {mode}")
+    try:
+        report = run_async(run())
+    except httpx.HTTPError as e:
+        console.print(f"[red]Error:[/red] Cannot load {url}: {e!r}")
+        raise typer.Exit(1) from None
+
+    from rich.table import Table
+
+    table = Table(title=f"Latency (ms), {report.requests} requests")
+    table.add_column("Percentile", style="cyan")
+    table.add_column("Service time", justify="right")
+    table.add_column("Response time (CO-corrected)", justify="right", style="green")
+    for percent in PERCENTILES:
+        table.add_row(
+            f"p{percent:g}",
+            f"{report.service_time.percentile(percent) * 1000:.2f}",
+            f"{report.response_time.percentile(percent) * 1000:.2f}",
+        )
+
+    console.print(table)
+    console.print(f"Throughput: {report.throughput:,.0f} req/s over {report.elapsed:.1f}s")
+    console.print(
+        "Operations: "
+        + ", ".join(f"{name} {count}" for name, count in sorted(report.operations.items()))
+    )
+    console.print(
+        "Statuses: "
+        + ", ".join(
+            f"{status or 'failed'} {count}" for status, count in sorted(report.statuses.items())
+        )
+    )
+    if report.errors:
+        console.print(f"[red]{report.errors} requests failed[/red]")
+
+
 @app.command()
 def serve(
     host: str | None = typer.Option(None, "--host", "-h", help="Host to bind to"),
     port: int | None = typer.Option(None, "--port", "-p", help="Port to bind to"),
+    workers: int | None = typer.Option(
+        None,
+        "--workers",
+        "-w",
+        min=1,
+        help="Worker processes (default: one per CPU with shared storage, else 1)",
+    ),
 ) -> None:
-    """Start the API server."""
+    """Start the API server.
+
+    With more than one worker the server preforks: a supervisor process owns
+    the listening socket, replaces workers that die and, on SIGHUP, restarts
+    them one at a time without dropping connections.
+    """
+    import os
+
     import uvicorn
 
-    from ..api.main import app as api_app
+    from ..adapters.repositories import create_repository, is_process_shared
+    from ..infrastructure.config import get_settings
 
     settings = get_settings()
+    shared = is_process_shared(settings)
+    workers = workers or settings.workers or ((os.cpu_count() or 1) if shared else 1)
+    if workers > 1 and not shared:
+        get_console().print(
+            "[red]Error:[/red] Multiple workers need storage shared between processes; "
+            "set DATABASE_URL to a SQLite file or PostgreSQL"
+        )
+        raise typer.Exit(1)
+
+    # Workers are fresh interpreters that read their settings from the
+    # environment; the worker count also tells them not to cache without a TTL
+    os.environ["WORKERS"] = str(workers)
+    get_settings.cache_clear()
+
+    if workers > 1:
+        # Create the schema once up front rather than racing in every worker
+        async def prepare() -> None:
+            repository = create_repository(get_settings())
+            await repository.open()
+            await repository.close()
+
+        run_async(prepare())
+
     uvicorn.run(
-        api_app,
+        "{{ cookiecutter.project_slug|replace('-', '_') }}.api.main:app",
         host=host or settings.host,
         port=port or settings.port,
+        workers=workers,
+        timeout_graceful_shutdown=settings.graceful_timeout,
+        # The app logs each request itself, as JSON with its request ID
+        access_log=not settings.log_requests,
     )
 
 
@@ -6,27 +6,128 @@ domain model, independent of persistence or presentation concerns.
 
 from __future__ import annotations
 
+import os
+import threading
+import time
+from collections.abc import Callable
 from dataclasses import dataclass, field
-from datetime import UTC, datetime
+from datetime import UTC, datetime, timedelta
+from typing import Literal
 from uuid import UUID, uuid4
 
+type IdFactory = Callable[[], UUID]
 
-@dataclass(frozen=True, kw_only=True)
+# Version and variant bits of a UUIDv7, laid over the timestamp and counter
+_UUID7_MARKERS = 0x7 << 76 | 0b10 << 62
+_COUNTER_MAX = 0xFFF
+# Counters start below this so a millisecond always has 2048 IDs to spare
+_COUNTER_SEED_MAX = 0x7FF
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+_MILLISECOND = timedelta(milliseconds=1)
+
+
+class _Uuid7Clock:
+    """State of ``uuid7``: the last millisecond used and its counter."""
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.millis = 0
+        self.counter = 0
+
+
+_clock = _Uuid7Clock()
+
+
+def uuid7() -> UUID:
+    """Generate a time-ordered UUID (version 7, RFC 9562).
+
+    The first 48 bits are the Unix time in milliseconds, so IDs sort by
+    creation time and new keys land at the right-hand edge of an index
+    instead of anywhere in it. The next 12 bits are a counter, randomly
+    seeded each millisecond and incremented for every further ID within it,
+    which keeps IDs from one process strictly increasing even within a
+    millisecond or when the system clock steps back. The last 62 bits are
+    random.
+
+    Example:
+        >>> first, second = uuid7(), uuid7()
+        >>> first < second, first.version
+        (True, 7)
+    """
+    random = int.from_bytes(os.urandom(10))
+    now = time.time_ns() // 1_000_000
+    with _clock.lock:
+        if now > _clock.millis:
+            _clock.millis = now
+            _clock.counter = random >> 64 & _COUNTER_SEED_MAX
+        elif _clock.counter < _COUNTER_MAX:
+            _clock.counter += 1
+        else:
+            # Counter exhausted: borrow the next millisecond
+            _clock.millis += 1
+            _clock.counter = random >> 64 & _COUNTER_SEED_MAX
+        millis, counter = _clock.millis, _clock.counter
+    return UUID(int=millis << 80 | counter << 64 | random & (2**62 - 1) | _UUID7_MARKERS)
+
+
+def min_uuid7(when: datetime) -> UUID:
+    """The UUID sorting just before every ``uuid7`` generated from ``when`` on.
+
+    Used as the exclusive lower bound of an ID range scan, it selects the
+    entities created at or after ``when`` (to the millisecond).
+    """
+    return UUID(int=(when.astimezone(UTC) - _EPOCH) // _MILLISECOND << 80)
+
+
+# UUID versions that new entity IDs can be generated with
+ID_FACTORIES: dict[Literal[4, 7], IdFactory] = {4: uuid4, 7: uuid7}
+
+_id_factory: IdFactory = uuid7
+
+
+def new_id() -> UUID:
+    """Generate an entity ID with the configured factory (``uuid7`` by default)."""
+    return _id_factory()
+
+
+def set_id_factory(factory: IdFactory) -> IdFactory:
+    """Make ``factory`` generate new entity IDs. Returns the previous factory.
+
+    Example:
+        >>> previous = set_id_factory(ID_FACTORIES[4])
+    """
+    global _id_factory
+    previous, _id_factory = _id_factory, factory
+    return previous
+
+
+@dataclass(frozen=True, kw_only=True, slots=True)
 class EntityBase:
-    """Base class for domain entities with identity tracking."""
+    """Base class for domain entities with identity tracking.
 
-    id: UUID = field(default_factory=uuid4)
+    Entities use ``__slots__`` rather than a per-instance ``__dict__`` to keep
+    their footprint down when millions are held in memory. New IDs come from
+    ``new_id``, time-ordered unless configured otherwise.
+    """
+
+    id: UUID = field(default_factory=new_id)
     created_at: datetime = field(default_factory=lambda: datetime.now(UTC))
     updated_at: datetime | None = None
 
+    @property
+    def version(self) -> datetime:
+        """When the entity last changed: ``updated_at``, or ``created_at`` if never updated."""
+        return self.updated_at or self.created_at
+
 
 # Example entity - replace with your domain entities
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ExampleEntity(EntityBase):
     """Example domain entity.
 
     Replace this with your actual domain entities. Each entity should:
     - Be immutable (frozen=True)
+    - Use __slots__ (slots=True) to stay compact
     - Have a unique identity (id)
     - Contain business logic methods
     - Be independent of infrastructure
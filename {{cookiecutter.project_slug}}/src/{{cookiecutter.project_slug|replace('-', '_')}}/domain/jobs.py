@@ -0,0 +1,58 @@
+"""Background jobs - bulk operations run apart from the request submitting them.
+
+A job records what was asked (its kind and item count) and how far it got,
+so a client can poll it and a restarted process can resume it.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Literal
+
+from .entities import EntityBase
+
+# Bulk operations a job can run
+type JobKind = Literal["create", "delete"]
+
+# queued -> running -> succeeded | failed | cancelled; queued jobs can be cancelled too
+type JobStatus = Literal["queued", "running", "succeeded", "failed", "cancelled"]
+
+FINISHED_STATUSES: frozenset[JobStatus] = frozenset({"succeeded", "failed", "cancelled"})
+
+
+@dataclass(frozen=True, slots=True)
+class JobItemError:
+    """An item a job could not process, by its position in the job's input."""
+
+    index: int
+    error: str
+
+
+@dataclass(frozen=True, kw_only=True, slots=True)
+class Job(EntityBase):
+    """A bulk create or delete and its progress.
+
+    ``processed`` counts the leading input items that are done, so a resumed
+    job continues after them. ``errors`` keeps the first few item errors;
+    ``failed`` counts all of them.
+
+    Example:
+        >>> job = Job(kind="delete", total=3)
+        >>> job.status, job.finished
+        ('queued', False)
+    """
+
+    kind: JobKind
+    total: int
+    status: JobStatus = "queued"
+    processed: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    errors: tuple[JobItemError, ...] = ()
+    # Why the job failed as a whole
+    error: str | None = None
+
+    @property
+    def finished(self) -> bool:
+        """Whether the job has stopped for good."""
+        return self.status in FINISHED_STATUSES
@@ -6,7 +6,10 @@ Environment variables and configuration management following 12-factor app princ
 from __future__ import annotations
 
 from functools import lru_cache
+from pathlib import Path
+from typing import Annotated, Literal
 
+from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -34,9 +37,104 @@ class Settings(BaseSettings):
     # Server
     host: str = "0.0.0.0"
     port: int = {{ cookiecutter.app_port }}
+    # Worker processes; unset means one per CPU when storage is shared
+    workers: int | None = None
+    # Seconds in-flight requests get to finish on shutdown or restart
+    graceful_timeout: int = 30
+    # Seconds clients may reuse an entity without revalidating its ETag; 0 always revalidates
+    http_cache_max_age: int = Field(default=0, ge=0)
+
+    # Entity IDs: 7 is time-ordered (index-friendly, sortable), 4 is random
+    id_version: Literal[4, 7] = 7
 
     # Database
     database_url: str | None = None
+    database_pool_size: int = 5
+    database_max_overflow: int = 10
+    database_pool_timeout: float = 30.0
+    database_pool_recycle: int = 1800
+    # In-memory storage (no DATABASE_URL): entity objects, compact columns,
+    # or lock-striped shards safe to share between threads
+    memory_layout: Literal["objects", "columnar", "sharded"] = "objects"
+    # Lock stripes of the sharded layout, rounded up to a power of two
+    memory_shards: int = Field(default=16, ge=1)
+    # File storage (DATABASE_URL=file://<directory>)
+    # fsync each commit; without it, writes survive a process crash but not power loss
+    file_fsync: bool = True
+    # Seconds a commit waits for more writes to share its fsync
+    file_commit_delay: float = Field(default=0.0, ge=0)
+    # Log size in bytes that triggers compaction into the snapshot
+    file_compact_bytes: int = Field(default=64 * 1024 * 1024, ge=1)
+
+    # Entity cache
+    cache_enabled: bool = True
+    cache_max_entries: int = 10_000
+    cache_ttl_seconds: float | None = None
+    cache_negative_ttl_seconds: float = 5.0
+    # Share one database read between concurrent lookups of the same entity
+    coalesce_reads: bool = True
+
+    # Full-text search index, built by the first search (single-worker deployments)
+    search_enabled: bool = True
+
+    # Write-behind buffering: acknowledge writes before they reach storage
+    write_behind_enabled: bool = False
+    # Buffered entities that trigger a flush
+    write_behind_flush_size: int = Field(default=500, ge=1)
+    # Seconds between flushes of a non-empty buffer
+    write_behind_flush_interval: float = Field(default=0.05, gt=0)
+    # Buffered entities beyond which writers wait for a flush
+    write_behind_max_pending: int = Field(default=10_000, ge=1)
+
+    # Background jobs (POST /jobs): jobs run at once by the worker pool
+    job_workers: int = Field(default=2, ge=1)
+    # Jobs waiting for a worker beyond which submissions get 503
+    job_queue_size: int = Field(default=100, ge=1)
+    # Items per service call; progress is saved after each chunk
+    job_chunk_size: int = Field(default=500, ge=1)
+    # Directory keeping jobs so they resume after a restart; unset keeps them in memory,
+    # which leaves jobs disabled with several workers (each would only see its own)
+    job_store_dir: Path | None = None
+    # Seconds a finished job stays readable before it is deleted
+    job_retention_seconds: float = Field(default=86_400.0, gt=0)
+
+    # Admission control: requests served at once per process; 0 disables shedding
+    admission_max_concurrency: int = Field(default=100, ge=0)
+    # Requests that may wait for a slot before new arrivals are shed
+    admission_max_queue: int = Field(default=100, ge=0)
+    # Seconds a request may wait for a slot before it is shed
+    admission_queue_timeout: float = Field(default=1.0, gt=0)
+    # Retry-After seconds sent with shed (503) responses
+    admission_retry_after: int = Field(default=1, ge=0)
+
+    # Observability
+    metrics_enabled: bool = True
+    # Tracing: time route handlers, service and repository calls, reported in Server-Timing;
+    # repository calls are timed by the metrics layer, so only with metrics_enabled
+    tracing_enabled: bool = True
+    # Fraction of requests, chosen as they start, whose traces are kept for /debug/traces
+    trace_sample_rate: float = Field(default=0.01, ge=0.0, le=1.0)
+    # Sampled traces kept before the oldest are overwritten
+    trace_buffer_size: int = Field(default=1000, ge=1)
+    # JSON log events buffered for the writer thread; further events are dropped, never waited on
+    log_queue_size: int = Field(default=10_000, ge=1)
+    # One ``request`` log event per request; server errors and slow requests are always logged
+    log_requests: bool = True
+    # Fraction of other requests logged
+    log_sample_rate: float = Field(default=1.0, ge=0.0, le=1.0)
+    # Per route template overrides of log_sample_rate, as JSON: {"/health": 0}
+    log_route_sample_rates: dict[str, Annotated[float, Field(ge=0.0, le=1.0)]] = {}
+    # Seconds from which a request counts as slow and is always logged
+    log_slow_seconds: float = Field(default=1.0, ge=0.0)
+
+    # Profiling (off unless a token or a sample rate is set)
+    # Requests sending ``X-Profile: <token>`` are profiled
+    profile_token: str | None = None
+    # Fraction of requests profiled at random
+    profile_sample_rate: float = Field(default=0.0, ge=0.0, le=1.0)
+    profile_dir: Path = Path("profiles")
+    # Saved profiles kept before the oldest are deleted
+    profile_max_files: int = Field(default=100, ge=1)
 
     @property
     def is_production(self) -> bool:
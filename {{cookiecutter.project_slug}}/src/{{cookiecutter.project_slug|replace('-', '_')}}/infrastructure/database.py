@@ -0,0 +1,106 @@
+"""Database connectivity using SQLAlchemy's async engine.
+
+The engine owns the connection pool shared by every repository call. It is
+created from ``Settings`` and disposed of when the application shuts down.
+
+File-backed SQLite databases are switched to write-ahead logging, so several
+server processes can share one database file: readers never block the single
+writer, and writers wait for each other instead of failing.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+if TYPE_CHECKING:
+    from .config import Settings
+
+# Plain URL schemes mapped onto the async driver used to serve them
+ASYNC_DRIVERS = {
+    "postgres": "postgresql+asyncpg",
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+# Milliseconds a SQLite connection waits for another process's write lock
+SQLITE_BUSY_TIMEOUT_MS = 5000
+
+
+def url_scheme(database_url: str) -> str:
+    """Return the backend part of a database URL scheme.
+
+    Example:
+        >>> url_scheme("postgresql+asyncpg://db/app")
+        'postgresql'
+    """
+    return database_url.split("://", 1)[0].split("+", 1)[0].lower()
+
+
+def async_database_url(database_url: str) -> str:
+    """Rewrite a database URL to use an async driver.
+
+    URLs that already name a driver (``postgresql+asyncpg://``) are left as-is.
+
+    Raises:
+        ValueError: If the URL scheme has no known async driver
+    """
+    scheme, _, rest = database_url.partition("://")
+    if "+" in scheme:
+        return database_url
+    driver = ASYNC_DRIVERS.get(scheme.lower())
+    if driver is None:
+        raise ValueError(f"Unsupported database URL scheme: {scheme!r}")
+    return f"{driver}://{rest}"
+
+
+def _is_memory_sqlite(url: URL) -> bool:
+    """Whether ``url`` names an in-memory SQLite database."""
+    return url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
+
+
+def is_memory_database(database_url: str) -> bool:
+    """Whether ``database_url`` names a database private to one process.
+
+    Example:
+        >>> is_memory_database("sqlite://")
+        True
+    """
+    return _is_memory_sqlite(make_url(async_database_url(database_url)))
+
+
+def _configure_sqlite(dbapi_connection: Any, _connection_record: Any) -> None:
+    """Enable WAL and lock waiting on every new SQLite connection."""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+    cursor.close()
+
+
+def create_engine(settings: Settings) -> AsyncEngine:
+    """Create the pooled async engine described by ``settings``.
+
+    Raises:
+        ValueError: If ``database_url`` is not configured or unsupported
+    """
+    if not settings.database_url:
+        raise ValueError("DATABASE_URL is not configured")
+
+    url = make_url(async_database_url(settings.database_url))
+    options: dict[str, Any] = {"pool_pre_ping": True}
+    # In-memory SQLite lives inside a single connection, so it cannot be pooled
+    if not _is_memory_sqlite(url):
+        options.update(
+            pool_size=settings.database_pool_size,
+            max_overflow=settings.database_max_overflow,
+            pool_timeout=settings.database_pool_timeout,
+            pool_recycle=settings.database_pool_recycle,
+        )
+    engine = create_async_engine(url, **options)
+    if url.get_backend_name() == "sqlite" and not _is_memory_sqlite(url):
+        event.listen(engine.sync_engine, "connect", _configure_sqlite)
+    return engine
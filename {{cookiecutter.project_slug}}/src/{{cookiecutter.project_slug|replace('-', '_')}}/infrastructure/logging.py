@@ -0,0 +1,188 @@
+"""Structured JSON logging with structlog, written off the event loop.
+
+``configure_logging`` points structlog, and the standard library's root
+logger, at a ``LogWriter``: a bounded queue drained by one background
+thread that renders each event as a JSON line and writes it out. Logging
+call sites only run a few cheap processors and enqueue a dict, so a slow
+or blocked stdout never stalls the event loop; when the queue is full,
+events are dropped and counted rather than waited on.
+
+Context bound with ``structlog.contextvars.bind_contextvars`` (the request
+ID, for instance) is added to every event logged in that context, from
+structlog and standard library loggers alike.
+"""
+
+from __future__ import annotations
+
+import logging
+import queue
+import sys
+import threading
+import time
+from collections.abc import MutableMapping
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING, Any, TextIO
+
+import structlog
+from pydantic_core import to_json
+
+if TYPE_CHECKING:
+    from .config import Settings
+
+
+class LogWriter:
+    """Background thread writing queued log events as JSON lines.
+
+    Args:
+        stream: Where lines are written
+        max_queued: Events buffered before further ones are dropped
+    """
+
+    def __init__(self, stream: TextIO | None = None, max_queued: int = 10_000) -> None:
+        if max_queued < 1:
+            raise ValueError("max_queued must be at least 1")
+        self._stream = stream if stream is not None else sys.stdout
+        self._queue: queue.Queue[dict[str, Any] | None] = queue.Queue(max_queued)
+        # Events lost to a full queue
+        self.dropped = 0
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._thread.start()
+
+    def put(self, event: dict[str, Any]) -> None:
+        """Queue an event for writing without ever blocking."""
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Write the events already queued, then stop the thread."""
+        if not self._thread.is_alive():
+            return
+        try:
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            return
+        self._thread.join(timeout)
+
+    def _run(self) -> None:
+        while True:
+            event = self._queue.get()
+            lines: list[bytes] = []
+            # Drain whatever else is queued so that a burst costs one write
+            while event is not None:
+                lines.append(render(event))
+                try:
+                    event = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            if lines:
+                try:
+                    self._stream.write(b"".join(lines).decode())
+                    self._stream.flush()
+                except (OSError, ValueError):
+                    # A closed or broken stream loses these lines; keep draining
+                    pass
+            if event is None:
+                return
+
+
+def render(event: dict[str, Any]) -> bytes:
+    """Render an event as a JSON line, its epoch ``timestamp`` as ISO 8601.
+
+    Values JSON has no type for are written as their ``str``.
+    """
+    timestamp = event.get("timestamp")
+    if isinstance(timestamp, float):
+        event["timestamp"] = datetime.fromtimestamp(timestamp, UTC)
+    return to_json(event, fallback=str) + b"\n"
+
+
+class QueueLogger:
+    """structlog logger handing event dicts to a ``LogWriter``."""
+
+    def __init__(self, writer: LogWriter) -> None:
+        self._writer = writer
+
+    def msg(self, **event: Any) -> None:
+        """Queue the event."""
+        self._writer.put(event)
+
+    debug = info = warning = warn = error = critical = exception = fatal = log = msg
+
+
+class QueueHandler(logging.Handler):
+    """Standard library handler sending records to a ``LogWriter`` as events."""
+
+    def __init__(self, writer: LogWriter) -> None:
+        super().__init__()
+        self._writer = writer
+        self._formatter = logging.Formatter()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """Queue the record with the current context."""
+        try:
+            event: dict[str, Any] = {
+                **structlog.contextvars.get_contextvars(),
+                "event": record.getMessage(),
+                "level": record.levelname.lower(),
+                "logger": record.name,
+                "timestamp": record.created,
+            }
+            if record.exc_info:
+                event["exception"] = self._formatter.formatException(record.exc_info)
+            self._writer.put(event)
+        except Exception:
+            self.handleError(record)
+
+
+def _add_timestamp(
+    _logger: Any, _method: str, event_dict: MutableMapping[str, Any]
+) -> MutableMapping[str, Any]:
+    """Stamp the event with epoch seconds; ``render`` formats it on the writer thread."""
+    event_dict["timestamp"] = time.time()
+    return event_dict
+
+
+def _to_dict(_logger: Any, _method: str, event_dict: MutableMapping[str, Any]) -> dict[str, Any]:
+    """Pass the event to the logger as keyword arguments, unrendered."""
+    return dict(event_dict)
+
+
+def configure_logging(settings: Settings, stream: TextIO | None = None) -> LogWriter:
+    """Route structlog and standard library logging through a new ``LogWriter``.
+
+    Events below ``settings.log_level`` are discarded at the call site.
+
+    Args:
+        settings: Supplies ``log_level`` and ``log_queue_size``
+        stream: Where lines are written; defaults to stdout
+
+    Returns:
+        The started writer; ``close`` it on shutdown to flush it
+    """
+    level = logging.getLevelNamesMapping().get(settings.log_level.upper())
+    if level is None:
+        raise ValueError(f"Unknown log level: {settings.log_level}")
+    writer = LogWriter(stream, settings.log_queue_size)
+    sink = QueueLogger(writer)
+    structlog.configure(
+        processors=[
+            structlog.contextvars.merge_contextvars,
+            structlog.processors.add_log_level,
+            _add_timestamp,
+            structlog.processors.format_exc_info,
+            _to_dict,
+        ],
+        wrapper_class=structlog.make_filtering_bound_logger(level),
+        logger_factory=lambda *_args: sink,
+        # Loggers resolve their configuration on first use, so configure before logging
+        cache_logger_on_first_use=True,
+    )
+    root = logging.getLogger()
+    # Replace the handler of an earlier call, keeping any others installed
+    for handler in [handler for handler in root.handlers if isinstance(handler, QueueHandler)]:
+        root.removeHandler(handler)
+    root.addHandler(QueueHandler(writer))
+    root.setLevel(level)
+    return writer
@@ -0,0 +1,238 @@
+"""In-process metrics with Prometheus text exposition.
+
+A deliberately small counterpart to ``prometheus_client``: counters, gauges
+and histograms with fixed label names, rendered in the Prometheus text format
+(version 0.0.4). Label lookups are cached per label combination, so
+recording an observation is a dict lookup plus a few integer updates.
+
+Metrics are per process. Recording is meant to happen on the event loop
+thread, where updates cannot interleave.
+"""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from collections.abc import Sequence
+
+# Latency buckets in seconds for HTTP requests (the Prometheus defaults)
+REQUEST_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Finer latency buckets in seconds for storage calls
+OPERATION_BUCKETS = (
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: str) -> str:
+    """Escape a label value for the text format."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    """Render ``{name="value",...}``, or nothing when there are no labels."""
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values, strict=True)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    """Render a sample value; integral floats lose their trailing ``.0``."""
+    if value == float("inf"):
+        return "+Inf"
+    return str(int(value)) if float(value).is_integer() else repr(value)
+
+
+class _Metric(ABC):
+    """Shared naming and label handling."""
+
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def _header(self) -> list[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+    @abstractmethod
+    def render(self) -> list[str]:
+        """Render the metric's exposition lines."""
+
+
+class Counter(_Metric):
+    """Monotonically increasing count, per label combination."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        """Add ``amount`` to the series for ``labels``."""
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, *labels: str) -> float:
+        """Current value of the series for ``labels``."""
+        return self._values.get(labels, 0.0)
+
+    def render(self) -> list[str]:
+        lines = self._header()
+        for labels, value in sorted(self._values.items()):
+            lines.append(
+                f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+            )
+        return lines
+
+
+class Gauge(Counter):
+    """Value that can go up and down, per label combination."""
+
+    kind = "gauge"
+
+    def dec(self, *labels: str, amount: float = 1.0) -> None:
+        """Subtract ``amount`` from the series for ``labels``."""
+        self.inc(*labels, amount=-amount)
+
+    def set(self, *labels: str, value: float) -> None:
+        """Set the series for ``labels`` to ``value``."""
+        self._values[labels] = value
+
+
+class HistogramChild:
+    """Bucket counts of one label combination of a Histogram."""
+
+    __slots__ = ("_bounds", "count", "counts", "sum")
+
+    def __init__(self, bounds: tuple[float, ...]) -> None:
+        self._bounds = bounds
+        # Non-cumulative: counts[i] holds observations in (bounds[i-1], bounds[i]]
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        """Record one observation."""
+        self.counts[bisect_left(self._bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class Histogram(_Metric):
+    """Distribution of observations in cumulative buckets.
+
+    Hot paths should resolve a series once with ``labels`` and keep the
+    returned child, rather than passing labels on every observation.
+    """
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = REQUEST_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._children: dict[tuple[str, ...], HistogramChild] = {}
+
+    def labels(self, *labels: str) -> HistogramChild:
+        """Get (creating on first use) the series for ``labels``."""
+        child = self._children.get(labels)
+        if child is None:
+            if len(labels) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}")
+            child = self._children[labels] = HistogramChild(self.buckets)
+        return child
+
+    def observe(self, value: float, *labels: str) -> None:
+        """Record one observation in the series for ``labels``."""
+        self.labels(*labels).observe(value)
+
+    def render(self) -> list[str]:
+        lines = self._header()
+        bounds = [*self.buckets, float("inf")]
+        for labels, child in sorted(self._children.items()):
+            cumulative = 0
+            for bound, count in zip(bounds, child.counts, strict=True):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(
+                    f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}"
+                )
+            suffix = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{suffix} {_format_value(child.sum)}")
+            lines.append(f"{self.name}_count{suffix} {child.count}")
+        return lines
+
+
+class MetricsRegistry:
+    """Collection of metrics rendered together.
+
+    Registering a name twice returns the existing metric, so modules can
+    declare the metrics they record without coordinating.
+
+    Example:
+        >>> requests = registry.counter("jobs_total", "Jobs run.", ["status"])
+        >>> requests.inc("ok")
+        >>> registry.render()
+    """
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        """Register (or get) a counter."""
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        """Register (or get) a gauge."""
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = REQUEST_BUCKETS,
+    ) -> Histogram:
+        """Register (or get) a histogram."""
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text format."""
+        lines: list[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def _register[M: _Metric](self, metric: M) -> M:
+        existing = self._metrics.get(metric.name)
+        if existing is None:
+            self._metrics[metric.name] = metric
+            return metric
+        if type(existing) is not type(metric) or existing.labelnames != metric.labelnames:
+            raise ValueError(f"Metric {metric.name!r} is already registered differently")
+        return existing
+
+
+# Process-wide registry served at /metrics
+REGISTRY = MetricsRegistry()
@@ -0,0 +1,73 @@
+"""cProfile helpers shared by the API profiling hook and the CLI.
+
+Profiles are written in the standard ``pstats`` format, so besides the CLI's
+``profile --load`` they open in any pstats-compatible viewer (snakeviz,
+tuna, ``python -m pstats``).
+"""
+
+from __future__ import annotations
+
+import io
+import pstats
+import re
+from pathlib import Path
+from typing import TYPE_CHECKING, Literal
+
+if TYPE_CHECKING:
+    import cProfile
+
+SortKey = Literal["cumulative", "tottime", "calls"]
+
+
+def profile_name(name: str) -> str:
+    """Make ``name`` safe to use as a file name, replacing unsafe characters."""
+    return re.sub(r"[^A-Za-z0-9_.-]+", "_", name).strip("_")
+
+
+class ProfileStore:
+    """Directory of saved profiles, keeping only the most recent ones.
+
+    Args:
+        directory: Where profiles are written; created on first save
+        max_files: Profiles kept before the oldest are deleted
+    """
+
+    def __init__(self, directory: Path, max_files: int = 100) -> None:
+        if max_files < 1:
+            raise ValueError("max_files must be at least 1")
+        self.directory = directory
+        self.max_files = max_files
+
+    def save(self, profile: cProfile.Profile, name: str) -> Path:
+        """Write ``profile`` as ``<name>.prof`` and enforce the retention cap.
+
+        ``name`` is passed through ``profile_name`` first.
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.directory / f"{profile_name(name)}.prof"
+        profile.dump_stats(path)
+        self.prune()
+        return path
+
+    def prune(self) -> None:
+        """Delete the oldest profiles beyond ``max_files``."""
+        profiles = sorted(self.directory.glob("*.prof"), key=lambda path: path.stat().st_mtime)
+        for path in profiles[: -self.max_files]:
+            path.unlink(missing_ok=True)
+
+
+def format_top(
+    source: cProfile.Profile | Path, limit: int = 20, sort: SortKey = "cumulative"
+) -> str:
+    """Render the ``limit`` hottest functions of a profile as text.
+
+    Args:
+        source: A finished profiler, or the path of a saved profile
+        limit: Number of functions to list
+        sort: ``cumulative`` (time including callees), ``tottime`` (own time)
+            or ``calls``
+    """
+    stream = io.StringIO()
+    stats = pstats.Stats(str(source) if isinstance(source, Path) else source, stream=stream)
+    stats.strip_dirs().sort_stats(sort).print_stats(limit)
+    return stream.getvalue()
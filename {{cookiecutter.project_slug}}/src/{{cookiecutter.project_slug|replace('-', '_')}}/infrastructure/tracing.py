@@ -0,0 +1,192 @@
+"""In-process span tracing of requests across the API, service and repository.
+
+A ``Trace`` is started for each request and held in a context variable, so
+code running for the request, however deep, records its spans into it
+without the trace being passed around. Recording a span is two
+``perf_counter`` calls and a list append; outside a request (background
+jobs, the CLI) there is no trace and recording is a context variable read.
+
+Span names are ``<layer>.<operation>`` (``service.create``,
+``repository.save``). A trace sums its spans by layer for the
+``Server-Timing`` header, and sampled traces are kept whole in a
+``TraceBuffer`` for inspection. No collector or exporter is involved.
+"""
+
+from __future__ import annotations
+
+import functools
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable, Coroutine
+from contextvars import ContextVar, Token
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from typing import Any
+
+# Spans recorded per trace; later ones still count towards the layer totals
+MAX_SPANS = 256
+# Layers from outermost to innermost, the order Server-Timing lists them in
+LAYERS = ("api", "service", "repository")
+
+
+@dataclass(slots=True)
+class Trace:
+    """Spans recorded while serving one request.
+
+    Spans are ``(name, start, end)`` tuples of ``perf_counter`` readings.
+    """
+
+    method: str
+    path: str
+    sampled: bool
+    started: float = field(default_factory=time.perf_counter)
+    spans: list[tuple[str, float, float]] = field(default_factory=list)
+    # Seconds spent per layer
+    layers: dict[str, float] = field(default_factory=dict)
+    finished: bool = False
+
+    def add(self, name: str, started: float, ended: float) -> None:
+        """Record a span; spans ending after the request finished are ignored."""
+        if self.finished:
+            return
+        layer = name.partition(".")[0]
+        self.layers[layer] = self.layers.get(layer, 0.0) + ended - started
+        if self.sampled and len(self.spans) < MAX_SPANS:
+            self.spans.append((name, started, ended))
+
+    def server_timing(self, now: float) -> str:
+        """Render the ``Server-Timing`` header value: the total so far, then each layer.
+
+        Layers nest, so each layer's duration includes the layers it calls.
+        ``LAYERS`` come first, outermost first; other layers follow.
+        """
+        metrics = [f"total;dur={(now - self.started) * 1000:.3f}"]
+        for layer in LAYERS:
+            seconds = self.layers.get(layer)
+            if seconds is not None:
+                metrics.append(f"{layer};dur={seconds * 1000:.3f}")
+        if len(metrics) <= len(self.layers):
+            metrics.extend(
+                f"{layer};dur={seconds * 1000:.3f}"
+                for layer, seconds in self.layers.items()
+                if layer not in LAYERS
+            )
+        return ", ".join(metrics)
+
+
+_current: ContextVar[Trace | None] = ContextVar("trace", default=None)
+
+
+def start_trace(trace: Trace) -> Token[Trace | None]:
+    """Make ``trace`` the current trace; pass the token to ``end_trace``."""
+    return _current.set(trace)
+
+
+def end_trace(token: Token[Trace | None]) -> None:
+    """Close the current trace to further spans and restore the previous one."""
+    trace = _current.get()
+    if trace is not None:
+        trace.finished = True
+    _current.reset(token)
+
+
+def current_trace() -> Trace | None:
+    """The trace of the request being served, if any."""
+    return _current.get()
+
+
+def traced[**P, R](
+    name: str,
+) -> Callable[[Callable[P, Awaitable[R]]], Callable[P, Coroutine[Any, Any, R]]]:
+    """Decorate a coroutine function to record each call as the span ``name``."""
+
+    def decorate(function: Callable[P, Awaitable[R]]) -> Callable[P, Coroutine[Any, Any, R]]:
+        @functools.wraps(function)
+        async def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+            trace = _current.get()
+            if trace is None:
+                return await function(*args, **kwargs)
+            started = time.perf_counter()
+            try:
+                return await function(*args, **kwargs)
+            finally:
+                trace.add(name, started, time.perf_counter())
+
+        return wrapper
+
+    return decorate
+
+
+@dataclass(frozen=True, slots=True)
+class Span:
+    """A finished span, timed in milliseconds from the start of its trace."""
+
+    name: str
+    start_ms: float
+    duration_ms: float
+
+
+@dataclass(frozen=True, slots=True)
+class TraceRecord:
+    """A finished, sampled trace as kept in a ``TraceBuffer``."""
+
+    trace_id: str
+    method: str
+    path: str
+    route: str
+    status: int
+    started_at: datetime
+    duration_ms: float
+    spans: tuple[Span, ...]
+
+
+class TraceBuffer:
+    """Ring buffer of the most recent sampled traces.
+
+    Traces are kept as recorded and only converted to ``TraceRecord`` when
+    read, keeping ``add`` cheap for the request that pays for it.
+
+    Args:
+        max_traces: Traces kept before the oldest are overwritten
+    """
+
+    def __init__(self, max_traces: int = 1000) -> None:
+        if max_traces < 1:
+            raise ValueError("max_traces must be at least 1")
+        # (trace, trace ID, route, status, end on the perf_counter clock, end in epoch seconds)
+        self._traces: deque[tuple[Trace, str, str, int, float, float]] = deque(maxlen=max_traces)
+
+    def __len__(self) -> int:
+        return len(self._traces)
+
+    def add(self, trace: Trace, trace_id: str, route: str, status: int, ended: float) -> None:
+        """Keep a finished trace, evicting the oldest if the buffer is full.
+
+        ``ended`` is a ``perf_counter`` reading taken as the request finished.
+        """
+        self._traces.append((trace, trace_id, route, status, ended, time.time()))
+
+    def recent(self, limit: int | None = None) -> list[TraceRecord]:
+        """The kept traces, newest first, at most ``limit`` of them."""
+        kept = list(reversed(self._traces))
+        return [_to_record(*entry) for entry in (kept if limit is None else kept[:limit])]
+
+
+def _to_record(
+    trace: Trace, trace_id: str, route: str, status: int, ended: float, ended_at: float
+) -> TraceRecord:
+    """Convert a kept trace to times relative to its start."""
+    duration = ended - trace.started
+    return TraceRecord(
+        trace_id=trace_id,
+        method=trace.method,
+        path=trace.path,
+        route=route,
+        status=status,
+        started_at=datetime.fromtimestamp(ended_at - duration, UTC),
+        duration_ms=duration * 1000,
+        spans=tuple(
+            Span(name, (started - trace.started) * 1000, (span_ended - started) * 1000)
+            for name, started, span_ended in trace.spans
+        ),
+    )
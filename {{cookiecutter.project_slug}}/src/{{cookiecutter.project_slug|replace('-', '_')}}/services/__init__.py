@@ -6,14 +6,123 @@ on domain entities through repository interfaces.
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+import base64
+import binascii
+from collections.abc import AsyncIterator, Callable, Mapping, Sequence
+from dataclasses import dataclass, field, replace
+from datetime import UTC, datetime, timedelta
+from typing import TYPE_CHECKING, Any, Literal
 from uuid import UUID
 
+from ..infrastructure.tracing import traced
+
 if TYPE_CHECKING:
     from ..adapters.repositories import ExampleRepository
     from ..domain.entities import ExampleEntity
 
 
+@dataclass(frozen=True)
+class BatchItemError:
+    """A single rejected item of a batch operation."""
+
+    index: int
+    error: str
+
+
+@dataclass(frozen=True)
+class BatchCreateResult:
+    """Outcome of a batch create: what was stored and what was rejected."""
+
+    created: list[ExampleEntity] = field(default_factory=list)
+    errors: list[BatchItemError] = field(default_factory=list)
+
+
+@dataclass(frozen=True)
+class Page:
+    """One page of a keyset-paginated listing."""
+
+    items: list[ExampleEntity]
+    next_cursor: str | None = None
+
+
+# Largest page a single list call may request
+MAX_PAGE_SIZE = 1000
+
+# Smallest step between two versions of an entity
+_MICROSECOND = timedelta(microseconds=1)
+
+# Listing orders: creation time, or entity ID alone
+type ListOrder = Literal["created", "id"]
+
+
+class SearchUnavailableError(RuntimeError):
+    """The repository has no full-text index to search."""
+
+
+class VersionConflictError(RuntimeError):
+    """The entity changed since the version the caller expected."""
+
+
+def encode_cursor(entity: ExampleEntity) -> str:
+    """Encode the position just after ``entity`` as an opaque cursor."""
+    raw = f"{entity.created_at.isoformat()}|{entity.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    """Decode a cursor produced by ``encode_cursor``.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, entity_id = raw.split("|")
+        position = datetime.fromisoformat(created_at), UUID(entity_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValueError("Invalid cursor") from None
+    if position[0].tzinfo is None:
+        raise ValueError("Invalid cursor")
+    return position
+
+
+def encode_id_cursor(entity: ExampleEntity) -> str:
+    """Encode the position just after ``entity`` in ID order as an opaque cursor."""
+    return base64.urlsafe_b64encode(entity.id.bytes).decode().rstrip("=")
+
+
+def decode_id_cursor(cursor: str) -> UUID:
+    """Decode a cursor produced by ``encode_id_cursor``.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        return UUID(bytes=base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (binascii.Error, ValueError):
+        raise ValueError("Invalid cursor") from None
+
+
+def encode_search_cursor(score: float, entity: ExampleEntity) -> str:
+    """Encode the position just after a search result as an opaque cursor."""
+    raw = f"{score!r}|{entity.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_search_cursor(cursor: str) -> tuple[float, UUID]:
+    """Decode a cursor produced by ``encode_search_cursor``.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        score, entity_id = raw.split("|")
+        return float(score), UUID(entity_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValueError("Invalid cursor") from None
+
+
 class ExampleService:
     """Service implementing business logic for ExampleEntity.
 
@@ -21,6 +130,9 @@ class ExampleService:
     business rules. They are reused across all presentation interfaces
     (CLI, REST API, MCP).
 
+    Public operations are recorded as ``service.<method>`` spans of the
+    current request's trace.
+
     Example:
         >>> repo = InMemoryExampleRepository()
         >>> service = ExampleService(repo)
@@ -30,6 +142,7 @@ class ExampleService:
     def __init__(self, repository: ExampleRepository) -> None:
         self._repository = repository
 
+    @traced("service.create")
     async def create(self, name: str, description: str = "") -> ExampleEntity:
         """Create a new entity with validation.
 
@@ -43,18 +156,275 @@ class ExampleService:
         Raises:
             ValueError: If name is empty
         """
-        from ..domain.entities import ExampleEntity
+        entity = self._build(name, description)
+        return await self._repository.save(entity)
 
-        if not name.strip():
-            raise ValueError("Name cannot be empty")
+    @traced("service.create_many")
+    async def create_many(self, items: Sequence[tuple[str, str]]) -> BatchCreateResult:
+        """Create several entities, validating each one independently.
 
-        entity = ExampleEntity(name=name.strip(), description=description)
-        return await self._repository.save(entity)
+        Valid items are stored together in a single repository call; invalid
+        ones are reported by their position in ``items``.
 
+        Args:
+            items: ``(name, description)`` pairs
+
+        Returns:
+            The created entities and the per-item validation errors
+        """
+        entities: list[ExampleEntity] = []
+        errors: list[BatchItemError] = []
+        for index, (name, description) in enumerate(items):
+            try:
+                entities.append(self._build(name, description))
+            except ValueError as e:
+                errors.append(BatchItemError(index=index, error=str(e)))
+
+        created = await self._repository.save_many(entities) if entities else []
+        return BatchCreateResult(created=created, errors=errors)
+
+    @traced("service.import_records")
+    async def import_records(self, records: Sequence[Mapping[str, Any]]) -> BatchCreateResult:
+        """Validate and store records read by a bulk import.
+
+        Records carry ``name`` and optionally ``description``. Records that
+        also carry ``id``/``created_at``/``updated_at`` (as written by the
+        NDJSON export) keep that identity, so an export can be re-imported.
+
+        Args:
+            records: Parsed input rows
+
+        Returns:
+            The stored entities and the per-record validation errors
+        """
+        entities: list[ExampleEntity] = []
+        errors: list[BatchItemError] = []
+        for index, record in enumerate(records):
+            try:
+                entities.append(self._from_record(record))
+            except ValueError as e:
+                errors.append(BatchItemError(index=index, error=str(e)))
+
+        created = await self._repository.save_many(entities) if entities else []
+        return BatchCreateResult(created=created, errors=errors)
+
+    @traced("service.get_by_id")
     async def get_by_id(self, entity_id: UUID) -> ExampleEntity | None:
         """Retrieve an entity by ID."""
         return await self._repository.get_by_id(entity_id)
 
-    async def delete(self, entity_id: UUID) -> bool:
-        """Delete an entity by ID."""
-        return await self._repository.delete(entity_id)
+    @traced("service.get_version")
+    async def get_version(self, entity_id: UUID) -> datetime | None:
+        """Return an entity's version without loading it, or None if it does not exist."""
+        return await self._repository.get_version(entity_id)
+
+    @traced("service.update")
+    async def update(
+        self,
+        entity_id: UUID,
+        name: str,
+        description: str = "",
+        precondition: Callable[[datetime], bool] | None = None,
+    ) -> ExampleEntity | None:
+        """Replace an entity's name and description.
+
+        The new version is later than the previous one even if the clock
+        did not move, so every update changes the entity's ETag.
+
+        Args:
+            entity_id: The entity to update
+            name: The new name (required, non-empty)
+            description: The new description
+            precondition: Only update if this accepts the entity's current
+                version; the write then fails if the entity changes after
+                the check
+
+        Returns:
+            The updated entity, or None if it does not exist
+
+        Raises:
+            ValueError: If name is empty
+            VersionConflictError: If the precondition rejects the current
+                version, or the entity changed before the write
+        """
+        name = self._validate_name(name)
+        current = await self._repository.get_by_id(entity_id)
+        if current is None:
+            return None
+        updated_at = max(datetime.now(UTC), current.version + _MICROSECOND)
+        updated = replace(current, name=name, description=description, updated_at=updated_at)
+        if precondition is None:
+            return await self._repository.save(updated)
+        if not precondition(current.version) or not await self._repository.compare_and_save(
+            updated, current.version
+        ):
+            raise VersionConflictError(f"Entity {entity_id} has changed")
+        return updated
+
+    @traced("service.delete")
+    async def delete(
+        self, entity_id: UUID, precondition: Callable[[datetime], bool] | None = None
+    ) -> bool:
+        """Delete an entity by ID.
+
+        Args:
+            entity_id: The entity to delete
+            precondition: Only delete if this accepts the entity's current
+                version, as for ``update``
+
+        Returns:
+            True if the entity was deleted, False if it does not exist
+
+        Raises:
+            VersionConflictError: If the precondition rejects the current
+                version, or the entity changed before the delete
+        """
+        if precondition is None:
+            return await self._repository.delete(entity_id)
+        version = await self._repository.get_version(entity_id)
+        if version is None:
+            return False
+        if not precondition(version) or not await self._repository.compare_and_delete(
+            entity_id, version
+        ):
+            raise VersionConflictError(f"Entity {entity_id} has changed")
+        return True
+
+    @traced("service.get_many")
+    async def get_many(self, entity_ids: Sequence[UUID]) -> dict[UUID, ExampleEntity]:
+        """Retrieve several entities by ID. Unknown IDs are omitted."""
+        if not entity_ids:
+            return {}
+        return await self._repository.get_many(entity_ids)
+
+    @traced("service.delete_many")
+    async def delete_many(self, entity_ids: Sequence[UUID]) -> set[UUID]:
+        """Delete several entities by ID. Returns the IDs that were deleted."""
+        if not entity_ids:
+            return set()
+        return await self._repository.delete_many(entity_ids)
+
+    @traced("service.list_page")
+    async def list_page(
+        self, limit: int = 50, cursor: str | None = None, order: ListOrder = "created"
+    ) -> Page:
+        """List entities one page at a time.
+
+        Args:
+            limit: Maximum number of entities to return (1 to MAX_PAGE_SIZE)
+            cursor: ``next_cursor`` of the previous page, or None to start
+            order: ``created`` for creation order; ``id`` for ID order, which
+                is creation order too while IDs are time-ordered (UUIDv7)
+
+        Returns:
+            The page, with ``next_cursor`` set when more entities follow
+
+        Raises:
+            ValueError: If the limit is out of range or the cursor is invalid
+        """
+        if not 1 <= limit <= MAX_PAGE_SIZE:
+            raise ValueError(f"Limit must be between 1 and {MAX_PAGE_SIZE}")
+
+        # One extra row tells us whether another page follows
+        if order == "id":
+            entities = await self._repository.list_page_by_id(
+                limit + 1, decode_id_cursor(cursor) if cursor else None
+            )
+            encode = encode_id_cursor
+        else:
+            entities = await self._repository.list_page(
+                limit + 1, decode_cursor(cursor) if cursor else None
+            )
+            encode = encode_cursor
+        if len(entities) > limit:
+            return Page(items=entities[:limit], next_cursor=encode(entities[limit - 1]))
+        return Page(items=entities)
+
+    @traced("service.search")
+    async def search(self, query: str, limit: int = 50, cursor: str | None = None) -> Page:
+        """Find entities whose name or description contains every query word.
+
+        Results are ranked by relevance, best first. Cursors only page
+        consistently while the matching entities do not change.
+
+        Args:
+            query: Words to match; ``word*`` matches every word it starts
+            limit: Maximum number of entities to return (1 to MAX_PAGE_SIZE)
+            cursor: ``next_cursor`` of the previous page, or None to start
+
+        Returns:
+            The page, with ``next_cursor`` set when more results follow
+
+        Raises:
+            ValueError: If the query has no words, or the limit or cursor is invalid
+            SearchUnavailableError: If the repository has no search index
+        """
+        from ..adapters.repositories import SearchIndexedExampleRepository, find_layer
+
+        index = find_layer(self._repository, SearchIndexedExampleRepository)
+        if index is None:
+            raise SearchUnavailableError("Search is not enabled for this repository")
+        if not 1 <= limit <= MAX_PAGE_SIZE:
+            raise ValueError(f"Limit must be between 1 and {MAX_PAGE_SIZE}")
+        after = decode_search_cursor(cursor) if cursor else None
+
+        hits = await index.search(query, limit + 1, after)
+        items = [entity for _, entity in hits[:limit]]
+        if len(hits) > limit:
+            return Page(items=items, next_cursor=encode_search_cursor(*hits[limit - 1]))
+        return Page(items=items)
+
+    def iterate(self, batch_size: int = 1000) -> AsyncIterator[ExampleEntity]:
+        """Yield every entity in creation order, in constant memory."""
+        return self._repository.iterate(batch_size)
+
+    @staticmethod
+    def _build(name: str, description: str) -> ExampleEntity:
+        """Validate input and build a new entity.
+
+        Raises:
+            ValueError: If name is empty
+        """
+        from ..domain.entities import ExampleEntity
+
+        return ExampleEntity(name=ExampleService._validate_name(name), description=description)
+
+    @staticmethod
+    def _validate_name(name: str) -> str:
+        """Return ``name`` stripped of surrounding whitespace.
+
+        Raises:
+            ValueError: If name is empty
+        """
+        if not name.strip():
+            raise ValueError("Name cannot be empty")
+        return name.strip()
+
+    @classmethod
+    def _from_record(cls, record: Mapping[str, Any]) -> ExampleEntity:
+        """Validate an imported record and build its entity.
+
+        Raises:
+            ValueError: If a field is missing or malformed
+        """
+        from ..domain.entities import ExampleEntity
+
+        name = record.get("name")
+        description = record.get("description") or ""
+        if not isinstance(name, str) or not isinstance(description, str):
+            raise ValueError("Name and description must be strings")
+        entity = cls._build(name, description)
+
+        identity: dict[str, Any] = {}
+        try:
+            if record.get("id"):
+                identity["id"] = UUID(str(record["id"]))
+            for key in ("created_at", "updated_at"):
+                if record.get(key):
+                    value = datetime.fromisoformat(str(record[key]))
+                    identity[key] = value if value.tzinfo else value.replace(tzinfo=UTC)
+        except ValueError as e:
+            raise ValueError(f"Invalid identity field: {e}") from None
+        if not identity:
+            return entity
+        return ExampleEntity(name=entity.name, description=entity.description, **identity)
@@ -0,0 +1,180 @@
+"""Bulk import of entities from NDJSON or CSV streams.
+
+Input is read a batch at a time, validated through ``ExampleService`` and
+written with a bounded number of batches in flight. Only those in-flight
+batches are ever held in memory, so inputs of any size load in constant
+memory.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import csv
+import json
+import time
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from itertools import islice
+from typing import TYPE_CHECKING, Any, Literal, TextIO
+
+if TYPE_CHECKING:
+    from . import ExampleService
+
+ImportFormat = Literal["ndjson", "csv"]
+
+# A parsed row, or the reason it could not be parsed
+ParsedRow = dict[str, Any] | str
+
+
+@dataclass(frozen=True)
+class ImportReject:
+    """An input row that was not imported."""
+
+    row: int
+    error: str
+
+
+@dataclass
+class ImportReport:
+    """Progress and outcome of a bulk import.
+
+    ``checkpoint`` counts input rows (skipped ones included) that are fully
+    processed with no gaps before them; passing it as ``skip`` resumes an
+    interrupted import without loading any row twice.
+    """
+
+    read: int = 0
+    imported: int = 0
+    rejected: int = 0
+    checkpoint: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        """Throughput over the rows read so far."""
+        return self.read / self.elapsed if self.elapsed else 0.0
+
+
+def read_rows(stream: TextIO, fmt: ImportFormat) -> Iterator[ParsedRow]:
+    """Lazily parse ``stream`` into records, one per input row.
+
+    Blank NDJSON lines are skipped. Rows that fail to parse are yielded as an
+    error string so they are reported as rejects instead of aborting.
+    """
+    if fmt == "csv":
+        for record in csv.DictReader(stream):
+            yield {key: value for key, value in record.items() if key is not None}
+        return
+
+    for line in stream:
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield f"Invalid JSON: {e.msg}"
+            continue
+        yield record if isinstance(record, dict) else "Expected a JSON object"
+
+
+async def bulk_import(
+    service: ExampleService,
+    rows: Iterator[ParsedRow],
+    *,
+    batch_size: int = 1000,
+    concurrency: int = 4,
+    skip: int = 0,
+    on_reject: Callable[[ImportReject], None] | None = None,
+    on_progress: Callable[[ImportReport], None] | None = None,
+) -> ImportReport:
+    """Import ``rows`` through ``service`` in concurrent batches.
+
+    Args:
+        service: Service used to validate and store records
+        rows: Parsed input, typically from ``read_rows``
+        batch_size: Records per repository write
+        concurrency: Batches allowed in flight at once
+        skip: Leading rows to skip, e.g. a previous run's checkpoint
+        on_reject: Called for every rejected row
+        on_progress: Called after every completed batch
+
+    Returns:
+        Final counters, including the resumable checkpoint
+    """
+    if batch_size < 1 or concurrency < 1:
+        raise ValueError("batch_size and concurrency must be at least 1")
+
+    report = ImportReport(checkpoint=skip)
+    started = time.perf_counter()
+    slots = asyncio.Semaphore(concurrency)
+    # Batch start offset -> end offset, for batches finished out of order
+    finished: dict[int, int] = {}
+    tasks: set[asyncio.Task[None]] = set()
+    # The first batch failure stops reading and is re-raised at the end
+    failures: list[BaseException] = []
+
+    def reject(row: int, error: str) -> None:
+        report.rejected += 1
+        if on_reject is not None:
+            on_reject(ImportReject(row=row, error=error))
+
+    async def run_batch(start: int, batch: list[ParsedRow]) -> None:
+        try:
+            records: list[dict[str, Any]] = []
+            positions: list[int] = []
+            for offset, row in enumerate(batch):
+                if isinstance(row, str):
+                    reject(start + offset, row)
+                else:
+                    records.append(row)
+                    positions.append(start + offset)
+
+            result = await service.import_records(records)
+            report.imported += len(result.created)
+            for error in result.errors:
+                reject(positions[error.index], error.error)
+
+            finished[start] = start + len(batch)
+            while report.checkpoint in finished:
+                report.checkpoint = finished.pop(report.checkpoint)
+            report.elapsed = time.perf_counter() - started
+            if on_progress is not None:
+                on_progress(report)
+        finally:
+            slots.release()
+
+    def batch_done(task: asyncio.Task[None]) -> None:
+        tasks.discard(task)
+        error = None if task.cancelled() else task.exception()
+        if error is not None:
+            failures.append(error)
+
+    # Skip already-imported rows without holding them
+    await asyncio.to_thread(lambda: sum(1 for _ in islice(rows, skip)))
+
+    start = skip
+    try:
+        while True:
+            await slots.acquire()
+            if failures:
+                slots.release()
+                break
+            # Parsing can block on slow input, so keep it off the event loop
+            batch = await asyncio.to_thread(lambda: list(islice(rows, batch_size)))
+            if not batch:
+                slots.release()
+                break
+            report.read += len(batch)
+            task = asyncio.create_task(run_batch(start, batch))
+            tasks.add(task)
+            task.add_done_callback(batch_done)
+            start += len(batch)
+        await asyncio.gather(*tasks, return_exceptions=True)
+    finally:
+        for task in tasks:
+            task.cancel()
+        report.elapsed = time.perf_counter() - started
+
+    if failures:
+        raise failures[0]
+    return report
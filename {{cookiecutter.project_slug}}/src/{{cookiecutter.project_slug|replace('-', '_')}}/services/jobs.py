@@ -0,0 +1,242 @@
+"""Background jobs for bulk creates and deletes.
+
+``JobRunner`` accepts a job, persists it and returns at once; a fixed pool
+of worker tasks takes jobs from a bounded queue and runs them through
+``ExampleService`` one chunk of items at a time, saving progress after
+each chunk. Clients poll the job for progress and may cancel it.
+
+Jobs survive restarts when the store does: on ``start``, unfinished jobs
+are queued again and continue after their last saved chunk. Items are
+made safe to process twice: create jobs fix every entity's ID when the
+job is submitted, so a chunk repeated after a crash overwrites the same
+entities instead of duplicating them. Finished jobs are deleted from the
+store once they are older than the retention period.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Mapping, Sequence
+from dataclasses import replace
+from datetime import UTC, datetime, timedelta
+from typing import TYPE_CHECKING
+from uuid import UUID
+
+from ..domain.entities import new_id
+from ..domain.jobs import Job, JobItemError, JobKind, JobStatus
+
+if TYPE_CHECKING:
+    from ..adapters.jobs import JobStore
+    from . import ExampleService
+
+logger = logging.getLogger(__name__)
+
+# Item errors kept on a job; later ones are only counted
+MAX_REPORTED_ERRORS = 100
+# Seconds between sweeps for finished jobs past their retention
+PRUNE_INTERVAL = 600.0
+
+
+class JobQueueFullError(RuntimeError):
+    """Too many jobs are waiting for a worker to accept another."""
+
+
+class JobRunner:
+    """Queue of bulk jobs run by a pool of worker tasks.
+
+    Args:
+        service: Service the jobs' items go through
+        store: Where jobs, their items and their progress are kept
+        workers: Jobs run at once
+        max_queued: Jobs waiting for a worker before ``submit`` refuses more
+        chunk_size: Items per service call; progress is saved after each
+        retention: Seconds a finished job stays readable before it is deleted
+    """
+
+    def __init__(
+        self,
+        service: ExampleService,
+        store: JobStore,
+        workers: int = 2,
+        max_queued: int = 100,
+        chunk_size: int = 500,
+        retention: float = 86_400.0,
+    ) -> None:
+        self._service = service
+        self._store = store
+        self._worker_count = workers
+        self._max_queued = max_queued
+        self._chunk_size = chunk_size
+        self._retention = timedelta(seconds=retention)
+        # Unbounded: ``submit`` enforces ``max_queued``, so queueing never fails
+        self._queue: asyncio.Queue[UUID] = asyncio.Queue()
+        # Submissions admitted but still persisting their job
+        self._admitting = 0
+        self._tasks: list[asyncio.Task[None]] = []
+
+    async def start(self) -> None:
+        """Open the store, start the workers and queue the jobs left unfinished."""
+        await self._store.open()
+        self._tasks = [asyncio.create_task(self._work()) for _ in range(self._worker_count)]
+        self._tasks.append(asyncio.create_task(self._resume()))
+        self._tasks.append(asyncio.create_task(self._prune_periodically()))
+
+    async def stop(self) -> None:
+        """Stop the workers and close the store.
+
+        Running jobs stop mid-chunk and stay ``running`` in the store; the
+        next ``start`` resumes them from their last saved chunk.
+        """
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        await self._store.close()
+
+    async def submit(self, kind: JobKind, items: Sequence[Mapping[str, str]]) -> Job:
+        """Persist a job and queue it.
+
+        Args:
+            kind: ``create`` items carry ``name`` and ``description``;
+                ``delete`` items carry ``id``
+            items: The job's input
+
+        Returns:
+            The queued job
+
+        Raises:
+            JobQueueFullError: If ``max_queued`` jobs are already waiting
+        """
+        # Count submissions still persisting, so concurrent ones cannot overfill the queue
+        if self._queue.qsize() + self._admitting >= self._max_queued:
+            raise JobQueueFullError("Too many jobs queued, retry later")
+        self._admitting += 1
+        try:
+            if kind == "create":
+                items = [{**item, "id": str(new_id())} for item in items]
+            job = Job(kind=kind, total=len(items))
+            await self._store.create(job, items)
+        finally:
+            self._admitting -= 1
+        self._queue.put_nowait(job.id)
+        return job
+
+    async def get(self, job_id: UUID) -> Job | None:
+        """Retrieve a job and its progress."""
+        return await self._store.get(job_id)
+
+    async def cancel(self, job_id: UUID) -> Job | None:
+        """Ask for a job to stop.
+
+        A queued job is cancelled at once. A running job stops after its
+        current chunk, keeping the items already processed. Finished jobs
+        are returned unchanged.
+
+        Returns:
+            The job as it stands, or None if it does not exist
+        """
+        job = await self._store.get(job_id)
+        if job is None or job.finished:
+            return job
+        await self._store.request_cancel(job_id)
+        if job.status == "queued" and await self._store.claim(job_id):
+            try:
+                job = await self._store.get(job_id)
+                if job is not None and not job.finished:
+                    job = await self._finish(job, "cancelled")
+            finally:
+                await self._store.release(job_id)
+        return job
+
+    async def _resume(self) -> None:
+        """Queue the unfinished jobs found in the store."""
+        for job in await self._store.unfinished():
+            self._queue.put_nowait(job.id)
+
+    async def _prune_periodically(self) -> None:
+        """Delete finished jobs past their retention, every ``PRUNE_INTERVAL`` seconds."""
+        while True:
+            try:
+                pruned = await self._store.prune(datetime.now(UTC) - self._retention)
+            except Exception:
+                logger.exception("Pruning finished jobs failed")
+            else:
+                if pruned:
+                    logger.info("Deleted %d finished jobs", pruned)
+            await asyncio.sleep(min(PRUNE_INTERVAL, self._retention.total_seconds()))
+
+    async def _work(self) -> None:
+        """Run queued jobs, one at a time, until cancelled."""
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self._run(job_id)
+            except Exception:
+                logger.exception("Job %s could not be recorded", job_id)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job_id: UUID) -> None:
+        """Run a job if no one else is, recording its progress as it goes."""
+        if not await self._store.claim(job_id):
+            return
+        try:
+            job = await self._store.get(job_id)
+            if job is None or job.finished:
+                return
+            if await self._store.cancel_requested(job_id):
+                await self._finish(job, "cancelled")
+                return
+            job = await self._save(replace(job, status="running"))
+            try:
+                job = await self._process(job)
+            except Exception as e:
+                logger.exception("Job %s failed", job_id)
+                await self._finish(job, "failed", error=str(e))
+                return
+            if not job.finished:
+                await self._finish(job, "succeeded")
+        finally:
+            await self._store.release(job_id)
+
+    async def _process(self, job: Job) -> Job:
+        """Work through the job's items after those already processed."""
+        items = await self._store.items(job.id)
+        for start in range(job.processed, job.total, self._chunk_size):
+            chunk = items[start : start + self._chunk_size]
+            if job.kind == "create":
+                result = await self._service.import_records(chunk)
+                succeeded = len(result.created)
+                errors = [JobItemError(start + error.index, error.error) for error in result.errors]
+            else:
+                ids = [UUID(item["id"]) for item in chunk]
+                deleted = await self._service.delete_many(ids)
+                succeeded = len(deleted)
+                errors = [
+                    JobItemError(start + index, "Entity not found")
+                    for index, entity_id in enumerate(ids)
+                    if entity_id not in deleted
+                ]
+            job = await self._save(
+                replace(
+                    job,
+                    processed=start + len(chunk),
+                    succeeded=job.succeeded + succeeded,
+                    failed=job.failed + len(errors),
+                    errors=(*job.errors, *errors)[:MAX_REPORTED_ERRORS],
+                )
+            )
+            if await self._store.cancel_requested(job.id):
+                return await self._finish(job, "cancelled")
+        return job
+
+    async def _save(self, job: Job) -> Job:
+        """Stamp and persist a job's new state."""
+        job = replace(job, updated_at=datetime.now(UTC))
+        await self._store.save(job)
+        return job
+
+    async def _finish(self, job: Job, status: JobStatus, error: str | None = None) -> Job:
+        """Persist a job's final state."""
+        return await self._save(replace(job, status=status, error=error))
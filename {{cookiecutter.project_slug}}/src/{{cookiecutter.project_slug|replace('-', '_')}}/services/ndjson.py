@@ -0,0 +1,55 @@
+"""Newline-delimited JSON encoding of entities for export and import.
+
+Each line is one JSON object with the entity's fields. Encoding works on
+async iterables and emits bounded chunks, so arbitrarily large datasets are
+streamed in constant memory.
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import AsyncIterable, AsyncIterator
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from ..domain.entities import ExampleEntity
+
+# Lines are gathered into chunks of about this many bytes before being sent
+CHUNK_BYTES = 64 * 1024
+
+
+def entity_record(entity: ExampleEntity) -> dict[str, Any]:
+    """Map an entity onto its NDJSON record."""
+    return {
+        "id": str(entity.id),
+        "name": entity.name,
+        "description": entity.description,
+        "created_at": entity.created_at.isoformat(),
+        "updated_at": entity.updated_at.isoformat() if entity.updated_at else None,
+    }
+
+
+def encode_line(entity: ExampleEntity) -> bytes:
+    """Encode one entity as a newline-terminated JSON line."""
+    return (
+        json.dumps(entity_record(entity), ensure_ascii=False, separators=(",", ":")).encode()
+        + b"\n"
+    )
+
+
+async def encode_ndjson(
+    entities: AsyncIterable[ExampleEntity], chunk_bytes: int = CHUNK_BYTES
+) -> AsyncIterator[bytes]:
+    """Encode entities as NDJSON, yielding chunks of roughly ``chunk_bytes``."""
+    lines: list[bytes] = []
+    size = 0
+    async for entity in entities:
+        line = encode_line(entity)
+        lines.append(line)
+        size += len(line)
+        if size >= chunk_bytes:
+            yield b"".join(lines)
+            lines.clear()
+            size = 0
+    if lines:
+        yield b"".join(lines)
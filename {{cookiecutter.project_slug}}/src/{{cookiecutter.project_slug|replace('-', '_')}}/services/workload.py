@@ -0,0 +1,65 @@
+"""Synthetic workload exercising every ExampleService operation.
+
+Used to profile and benchmark the service and whichever repository backs it
+without a client or recorded traffic.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from . import ExampleService
+
+
+@dataclass(frozen=True)
+class WorkloadReport:
+    """Operations performed by one workload run."""
+
+    created: int
+    read: int
+    listed: int
+    deleted: int
+
+
+async def run_workload(
+    service: ExampleService, entities: int = 1000, page_size: int = 100
+) -> WorkloadReport:
+    """Create, read, list and delete entities through ``service``.
+
+    Creates ``entities`` one by one, reads each back individually and in
+    one batch, pages through the whole listing, then deletes half of the
+    created entities singly and the rest as a batch, leaving the repository
+    as it was found.
+
+    Args:
+        service: Service under test
+        entities: Entities created (and deleted again)
+        page_size: Page size used for the listing
+    """
+    created = [
+        await service.create(f"workload-{index}", "synthetic workload entity")
+        for index in range(entities)
+    ]
+    ids = [entity.id for entity in created]
+
+    for entity_id in ids:
+        await service.get_by_id(entity_id)
+    await service.get_many(ids)
+
+    listed = 0
+    cursor: str | None = None
+    while True:
+        page = await service.list_page(page_size, cursor)
+        listed += len(page.items)
+        if page.next_cursor is None:
+            break
+        cursor = page.next_cursor
+
+    half = len(ids) // 2
+    for entity_id in ids[:half]:
+        await service.delete(entity_id)
+    await service.delete_many(ids[half:])
+
+    return WorkloadReport(created=len(created), read=len(ids) * 2, listed=listed, deleted=len(ids))
@@ -0,0 +1,174 @@
+"""Throughput measurement against a stored baseline.
+
+Benchmarks measure operations per second through the ``bench`` fixture. Each
+result is compared with ``baseline.json`` and the benchmark fails when it
+falls more than ``--bench-threshold`` (default 25%) below its baseline.
+Results without a baseline entry are added to the file, so the first run on
+a machine records the baseline; ``--bench-update`` replaces it after an
+intended change. Baselines are only comparable on the machine that recorded
+them.
+
+Middleware benchmarks instead time a stub ASGI app called directly, with and
+without the middleware, through ``microseconds_per_call``.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from collections.abc import Awaitable, Callable, Iterator
+from pathlib import Path
+
+import pytest
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+DEFAULT_BASELINE = Path(__file__).parent / "baseline.json"
+
+
+class Baseline:
+    """Recorded throughput per benchmark name, and this run's results."""
+
+    def __init__(self, path: Path, threshold: float, update: bool) -> None:
+        self.path = path
+        self.threshold = threshold
+        self.update = update
+        self.recorded: dict[str, float] = json.loads(path.read_text()) if path.exists() else {}
+        self.results: dict[str, float] = {}
+
+    def check(self, name: str, ops_per_second: float) -> None:
+        """Record a result and fail if it regressed past the threshold."""
+        self.results[name] = ops_per_second
+        expected = self.recorded.get(name)
+        if expected is None or self.update:
+            print(f"\n  {name}: {ops_per_second:,.0f} ops/s (new baseline)")
+            return
+        change = ops_per_second / expected - 1
+        print(f"\n  {name}: {ops_per_second:,.0f} ops/s ({change:+.0%} vs {expected:,.0f})")
+        if change < -self.threshold:
+            pytest.fail(
+                f"{name} regressed {-change:.0%} below its baseline of {expected:,.0f} ops/s "
+                f"(threshold {self.threshold:.0%})"
+            )
+
+    def save(self) -> None:
+        """Write new results (all results with ``update``) to the baseline file."""
+        merged = (
+            {**self.results, **self.recorded}
+            if not self.update
+            else {**self.recorded, **self.results}
+        )
+        if merged == self.recorded:
+            return
+        rounded = {name: round(value, 1) for name, value in sorted(merged.items())}
+        self.path.write_text(json.dumps(rounded, indent=2) + "\n")
+
+
+class Bench:
+    """Measures operations per second as the best of several rounds."""
+
+    def __init__(self, baseline: Baseline, rounds: int = 5) -> None:
+        self._baseline = baseline
+        self._rounds = rounds
+
+    def run(self, name: str, operation: Callable[[], object], iterations: int) -> float:
+        """Time ``iterations`` calls of a synchronous ``operation``."""
+        best = 0.0
+        for _ in range(self._rounds):
+            started = time.perf_counter()
+            for _ in range(iterations):
+                operation()
+            best = max(best, iterations / (time.perf_counter() - started))
+        self._baseline.check(name, best)
+        return best
+
+    def run_threads(
+        self, name: str, operation: Callable[[int], object], threads: int, iterations: int
+    ) -> float:
+        """Time ``threads`` threads each making ``iterations`` calls of ``operation``.
+
+        Every call receives its thread's index. Throughput counts the calls
+        of all threads together.
+        """
+        best = 0.0
+        for _ in range(self._rounds):
+            start = threading.Barrier(threads + 1)
+
+            def worker(index: int, start: threading.Barrier = start) -> None:
+                start.wait()
+                for _ in range(iterations):
+                    operation(index)
+
+            pool = [threading.Thread(target=worker, args=(index,)) for index in range(threads)]
+            for thread in pool:
+                thread.start()
+            start.wait()
+            started = time.perf_counter()
+            for thread in pool:
+                thread.join()
+            best = max(best, threads * iterations / (time.perf_counter() - started))
+        self._baseline.check(name, best)
+        return best
+
+    async def arun(
+        self, name: str, operation: Callable[[], Awaitable[object]], iterations: int
+    ) -> float:
+        """Time ``iterations`` awaited calls of an asynchronous ``operation``."""
+        best = 0.0
+        for _ in range(self._rounds):
+            started = time.perf_counter()
+            for _ in range(iterations):
+                await operation()
+            best = max(best, iterations / (time.perf_counter() - started))
+        self._baseline.check(name, best)
+        return best
+
+
+class StubRoute:
+    """Stand-in for the route the router stores in the scope."""
+
+    path = "/entities/{entity_id}"
+
+
+async def stub_app(scope: Scope, _receive: Receive, send: Send) -> None:
+    """An ASGI app that matches ``StubRoute`` and answers an empty JSON object."""
+    scope["route"] = StubRoute
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+async def _receive() -> Message:
+    return {"type": "http.request", "body": b""}
+
+
+async def _discard(_message: Message) -> None:
+    return None
+
+
+async def microseconds_per_call(app: ASGIApp, calls: int) -> float:
+    """Time ``calls`` direct GET requests to ``app``, in microseconds per request."""
+    scope: Scope = {"type": "http", "method": "GET", "path": "/entities/1", "headers": []}
+    started = time.perf_counter()
+    for _ in range(calls):
+        await app(dict(scope), _receive, _discard)
+    return (time.perf_counter() - started) / calls * 1e6
+
+
+@pytest.fixture(scope="session")
+def baseline(request: pytest.FixtureRequest) -> Iterator[Baseline]:
+    """The throughput baseline, saved with any new results at the end of the run."""
+    config = request.config
+    path = config.getoption("--bench-baseline")
+    store = Baseline(
+        Path(path) if path else DEFAULT_BASELINE,
+        config.getoption("--bench-threshold"),
+        config.getoption("--bench-update"),
+    )
+    yield store
+    store.save()
+
+
+@pytest.fixture
+def bench(baseline: Baseline) -> Bench:
+    """Measure throughput and compare it with the baseline."""
+    return Bench(baseline)
@@ -0,0 +1,84 @@
+"""Throughput of full API round trips through ASGITransport.
+
+Requests pass through the real app, its middleware, routing, the service and
+the repository it was started with, without network I/O.
+"""
+
+from __future__ import annotations
+
+from itertools import cycle
+
+import pytest
+from httpx import AsyncClient
+
+from .conftest import Bench
+
+pytestmark = pytest.mark.benchmark
+
+REQUESTS = 2000
+
+
+async def test_create_entity(bench: Bench, client: AsyncClient) -> None:
+    """POST /entities."""
+
+    async def create() -> None:
+        response = await client.post("/entities", json={"name": "Benchmark", "description": "x"})
+        assert response.status_code == 201
+
+    await bench.arun("api.create_entity", create, iterations=REQUESTS)
+
+
+async def test_get_entity(bench: Bench, client: AsyncClient) -> None:
+    """GET /entities/{id} for existing entities."""
+    paths = []
+    for i in range(100):
+        response = await client.post("/entities", json={"name": f"Entity {i}"})
+        paths.append(f"/entities/{response.json()['id']}")
+    next_path = cycle(paths).__next__
+
+    async def get() -> None:
+        response = await client.get(next_path())
+        assert response.status_code == 200
+
+    await bench.arun("api.get_entity", get, iterations=REQUESTS)
+
+
+async def test_revalidate_entity(bench: Bench, client: AsyncClient) -> None:
+    """GET /entities/{id} with a current ETag in If-None-Match (304)."""
+    requests = []
+    for i in range(100):
+        response = await client.post(
+            "/entities", json={"name": f"Entity {i}", "description": "x" * 500}
+        )
+        requests.append(
+            (f"/entities/{response.json()['id']}", {"If-None-Match": response.headers["etag"]})
+        )
+    next_request = cycle(requests).__next__
+
+    async def revalidate() -> None:
+        path, headers = next_request()
+        response = await client.get(path, headers=headers)
+        assert response.status_code == 304
+
+    await bench.arun("api.revalidate_entity", revalidate, iterations=REQUESTS)
+
+
+async def test_create_then_delete(bench: Bench, client: AsyncClient) -> None:
+    """POST /entities followed by DELETE of the new entity."""
+
+    async def round_trip() -> None:
+        created = await client.post("/entities", json={"name": "Short-lived"})
+        response = await client.delete(f"/entities/{created.json()['id']}")
+        assert response.status_code == 204
+
+    await bench.arun("api.create_then_delete", round_trip, iterations=REQUESTS // 2)
+
+
+async def test_list_entities(bench: Bench, client: AsyncClient) -> None:
+    """GET /entities, first page."""
+
+    async def list_page() -> None:
+        response = await client.get("/entities", params={"limit": 20})
+        assert response.status_code == 200
+
+    await bench.arun("api.list_entities", list_page, iterations=REQUESTS // 2)
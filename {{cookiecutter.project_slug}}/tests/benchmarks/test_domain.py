@@ -0,0 +1,27 @@
+"""Throughput of domain entity construction."""
+
+from __future__ import annotations
+
+import pytest
+
+from {{ cookiecutter.project_slug|replace('-', '_') }}.domain.entities import ExampleEntity
+
+from .conftest import Bench
+
+pytestmark = pytest.mark.benchmark
+
+
+def test_entity_construction(bench: Bench) -> None:
+    """Building an entity generates its ID and timestamp."""
+    bench.run(
+        "domain.entity_construction",
+        lambda: ExampleEntity(name="Benchmark", description="A benchmark entity"),
+        iterations=20_000,
+    )
+
+
+def test_entity_validation(bench: Bench) -> None:
+    """Business-rule checks on an existing entity."""
+    entity = ExampleEntity(name="Benchmark")
+
+    bench.run("domain.entity_validation", entity.is_valid, iterations=100_000)
@@ -0,0 +1,84 @@
+"""Startup time and write throughput of the file-backed repository.
+
+Startup is measured with the same entities held in a compacted snapshot,
+which is mapped without decoding, and in the log alone, which is replayed
+record by record. Writes are measured one at a time, each paying its own
+fsync, and in concurrent bursts that share fsyncs through group commit.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from {{ cookiecutter.project_slug|replace('-', '_') }}.adapters.repositories import FileExampleRepository
+from {{ cookiecutter.project_slug|replace('-', '_') }}.domain.entities import ExampleEntity
+
+from .conftest import Bench
+
+pytestmark = pytest.mark.benchmark
+
+ENTITIES = 100_000
+BURST = 100
+
+
+async def populate(directory: Path, compact: bool) -> None:
+    """Store ENTITIES entities, compacted into a snapshot or left in the log."""
+    repository = FileExampleRepository(directory, fsync=False, compact_bytes=2**62)
+    await repository.open()
+    await repository.save_many([ExampleEntity(name=f"Entity {i}") for i in range(ENTITIES)])
+    if compact:
+        await repository.compact()
+    await repository.close()
+
+
+@pytest.mark.parametrize("layout", ["snapshot", "replay"])
+async def test_open(bench: Bench, tmp_path: Path, layout: str) -> None:
+    """Opening a directory holding ENTITIES entities, then reading one."""
+    await populate(tmp_path, compact=layout == "snapshot")
+    probe = ExampleEntity(name="probe").id
+
+    async def restart() -> None:
+        repository = FileExampleRepository(tmp_path)
+        await repository.open()
+        await repository.get_by_id(probe)
+        await repository.close()
+
+    per_second = await bench.arun(f"file.open.{layout}", restart, iterations=1)
+    print(f"  {1000 / per_second:,.1f} ms per start with {ENTITIES:,} entities")
+
+
+async def test_save_sequential(bench: Bench, tmp_path: Path) -> None:
+    """Saves awaited one after another, one fsync each."""
+    repository = FileExampleRepository(tmp_path)
+    await repository.open()
+    try:
+        await bench.arun(
+            "file.save.sequential",
+            lambda: repository.save(ExampleEntity(name="Benchmark")),
+            iterations=200,
+        )
+    finally:
+        await repository.close()
+
+
+async def test_save_concurrent(bench: Bench, tmp_path: Path) -> None:
+    """Bursts of concurrent saves sharing fsyncs, counted per save."""
+    repository = FileExampleRepository(tmp_path)
+    await repository.open()
+
+    async def burst() -> None:
+        await asyncio.gather(
+            *(repository.save(ExampleEntity(name="Benchmark")) for _ in range(BURST))
+        )
+
+    try:
+        per_second = await bench.arun("file.save.concurrent", burst, iterations=20)
+    finally:
+        await repository.close()
+    print(
+        f"  {per_second * BURST:,.0f} saves/s,"
+        f" {repository.stats().records_per_commit:.0f} per fsync"
+    )
@@ -0,0 +1,81 @@
+"""Insert throughput with random (v4) versus time-ordered (v7) entity IDs.
+
+Random keys land anywhere in the ID index, so once the index outgrows
+SQLite's page cache most inserts touch a different page; time-ordered keys
+always extend its right-hand edge. The in-memory repository's sorted ID
+list shows the same effect as a memmove per out-of-order insert. Each
+store is filled with PREFILL entities first, so the index is larger than
+the cache before throughput is measured.
+"""
+
+from __future__ import annotations
+
+from collections.abc import AsyncGenerator, Callable
+from pathlib import Path
+from typing import Literal
+
+import pytest
+
+from {{ cookiecutter.project_slug|replace('-', '_') }}.adapters.repositories import (
+    ExampleRepository,
+    InMemoryExampleRepository,
+    create_repository,
+)
+from {{ cookiecutter.project_slug|replace('-', '_') }}.domain.entities import ID_FACTORIES, ExampleEntity
+from {{ cookiecutter.project_slug|replace('-', '_') }}.infrastructure.config import Settings
+
+from .conftest import Bench
+
+pytestmark = pytest.mark.benchmark
+
+PREFILL = 200_000
+BATCH = 500
+# Batches saved per round; the bench keeps the best of five rounds
+ITERATIONS = 20
+
+STORES: dict[str, Callable[[Path], ExampleRepository]] = {
+    "sqlite": lambda path: create_repository(
+        Settings(
+            database_url=f"sqlite:///{path / 'bench.db'}",
+            cache_enabled=False,
+            search_enabled=False,
+            coalesce_reads=False,
+            metrics_enabled=False,
+        )
+    ),
+    "memory": lambda _path: InMemoryExampleRepository(),
+}
+
+
+@pytest.fixture(params=list(STORES))
+async def store(
+    request: pytest.FixtureRequest, tmp_path: Path
+) -> AsyncGenerator[tuple[str, ExampleRepository], None]:
+    """An opened, empty repository of each kind."""
+    repository = STORES[request.param](tmp_path)
+    await repository.open()
+    yield request.param, repository
+    await repository.close()
+
+
+@pytest.mark.parametrize("version", [4, 7])
+async def test_insert(
+    bench: Bench, store: tuple[str, ExampleRepository], version: Literal[4, 7]
+) -> None:
+    """Batches of BATCH new entities saved into a store holding PREFILL."""
+    name, repository = store
+    factory = ID_FACTORIES[version]
+
+    def batch() -> list[ExampleEntity]:
+        return [ExampleEntity(id=factory(), name="Benchmark") for _ in range(BATCH)]
+
+    for _ in range(PREFILL // BATCH):
+        await repository.save_many(batch())
+    # Built up front so only the inserts are timed
+    batches = [batch() for _ in range(5 * ITERATIONS)]
+
+    async def insert() -> None:
+        await repository.save_many(batches.pop())
+
+    per_second = await bench.arun(f"ids.{name}.v{version}", insert, iterations=ITERATIONS)
+    print(f"  {per_second * BATCH:,.0f} inserts/s with uuid{version} IDs")
@@ -0,0 +1,85 @@
+"""Memory footprint of in-memory entity storage.
+
+Reports bytes per stored entity for the pre-slots entity layout, the slotted
+entity objects and the columnar repository.
+"""
+
+from __future__ import annotations
+
+import gc
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from uuid import UUID, uuid4
+
+import pytest
+
+from {{ cookiecutter.project_slug|replace('-', '_') }}.adapters.repositories import ColumnarExampleRepository
+from {{ cookiecutter.project_slug|replace('-', '_') }}.domain.entities import ExampleEntity
+
+pytestmark = pytest.mark.benchmark
+
+ENTITIES = 50_000
+
+
+@dataclass(frozen=True, kw_only=True)
+class DictEntity:
+    """The entity layout before slots: a frozen dataclass with a __dict__."""
+
+    id: UUID = field(default_factory=uuid4)
+    created_at: datetime = field(default_factory=lambda: datetime.now(UTC))
+    updated_at: datetime | None = None
+    name: str
+    description: str = ""
+
+
+def bytes_per_entity(build: Callable[[], object]) -> float:
+    """Measure the memory retained by ``build`` per stored entity."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        retained = build()
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del retained
+    return (after - before) / ENTITIES
+
+
+def store_dict_entities() -> object:
+    return {
+        entity.id: entity
+        for entity in (DictEntity(name=f"Entity {i % 100}") for i in range(ENTITIES))
+    }
+
+
+def store_slotted_entities() -> object:
+    return {
+        entity.id: entity
+        for entity in (ExampleEntity(name=f"Entity {i % 100}") for i in range(ENTITIES))
+    }
+
+
+def store_columnar() -> object:
+    repository = ColumnarExampleRepository()
+    for i in range(ENTITIES):
+        repository._store(ExampleEntity(name=f"Entity {i % 100}"))
+    return repository
+
+
+def test_bytes_per_entity() -> None:
+    """Slots shrink entities and columnar storage shrinks them further."""
+    results = {
+        "dataclass with __dict__": bytes_per_entity(store_dict_entities),
+        "slotted dataclass": bytes_per_entity(store_slotted_entities),
+        "columnar": bytes_per_entity(store_columnar),
+    }
+
+    print()
+    for layout, size in results.items():
+        print(f"{layout:>24}: {size:7.1f} bytes/entity")
+
+    assert results["slotted dataclass"] < results["dataclass with __dict__"]
+    assert results["columnar"] < results["slotted dataclass"]
@@ -0,0 +1,57 @@
+"""Recording cost of request and repository metrics.
+
+Drives a stub ASGI app directly, with and without ``MetricsMiddleware``, so
+the difference is the middleware's own cost rather than routing or I/O.
+"""
+
+from __future__ import annotations
+
+import time
+
+import pytest
+
+from {{ cookiecutter.project_slug|replace('-', '_') }}.adapters.repositories import (
+    InMemoryExampleRepository,
+    InstrumentedExampleRepository,
+)
+from {{ cookiecutter.project_slug|replace('-', '_') }}.api.middleware import MetricsMiddleware
+from {{ cookiecutter.project_slug|replace('-', '_') }}.domain.entities import ExampleEntity
+from {{ cookiecutter.project_slug|replace('-', '_') }}.infrastructure.metrics import MetricsRegistry
+
+from .conftest import microseconds_per_call, stub_app
+
+pytestmark = pytest.mark.benchmark
+
+CALLS = 50_000
+# Budget for the added cost per request or repository call
+MAX_OVERHEAD_US = 20.0
+
+
+async def test_middleware_overhead() -> None:
+    """Metrics add only microseconds per request."""
+    bare = await microseconds_per_call(stub_app, CALLS)
+    measured = await microseconds_per_call(MetricsMiddleware(stub_app, MetricsRegistry()), CALLS)
+
+    print(f"\n  request metrics: {measured - bare:5.2f} us/request")
+    assert measured - bare < MAX_OVERHEAD_US
+
+
+async def test_repository_timing_overhead() -> None:
+    """Timing a repository call adds only microseconds."""
+    inner = InMemoryExampleRepository()
+    entity = await inner.save(ExampleEntity(name="Timed"))
+    instrumented = InstrumentedExampleRepository(inner, MetricsRegistry())
+
+    async def per_call(
+        repository: InMemoryExampleRepository | InstrumentedExampleRepository,
+    ) -> float:
+        started = time.perf_counter()
+        for _ in range(CALLS):
+            await repository.get_by_id(entity.id)
+        return (time.perf_counter() - started) / CALLS * 1e6
+
+    bare = await per_call(inner)
+    measured = await per_call(instrumented)
+
+    print(f"\n  repository timing: {measured - bare:5.2f} us/call")
+    assert measured - bare < MAX_OVERHEAD_US
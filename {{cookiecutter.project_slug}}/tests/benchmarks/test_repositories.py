@@ -0,0 +1,133 @@
+"""Throughput of every repository implementation.
+
+Each backend runs the same save, get and list operations, so results compare
+directly. SQL runs against a SQLite file; the cached and instrumented layers
+wrap the in-memory repository to show their own overhead, and the
+coalescing and write-behind layers wrap SQLite, where sharing reads and batching
+writes save real round trips.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncGenerator, Callable
+from itertools import cycle
+from pathlib import Path
+
+import pytest
+
+from {{ cookiecutter.project_slug|replace('-', '_') }}.adapters.repositories import (
+    CachedExampleRepository,
+    CoalescingExampleRepository,
+    ColumnarExampleRepository,
+    ExampleRepository,
+    InMemoryExampleRepository,
+    InstrumentedExampleRepository,
+    ShardedExampleRepository,
+    WriteBehindExampleRepository,
+    create_repository,
+)
+from {{ cookiecutter.project_slug|replace('-', '_') }}.domain.entities import ExampleEntity
+from {{ cookiecutter.project_slug|replace('-', '_') }}.infrastructure.config import Settings
+from {{ cookiecutter.project_slug|replace('-', '_') }}.infrastructure.metrics import MetricsRegistry
+
+from .conftest import Bench
+
+pytestmark = pytest.mark.benchmark
+
+# Entities stored before reads and listings are measured
+STORED = 2000
+
+
+def sqlite(path: Path) -> ExampleRepository:
+    return create_repository(
+        Settings(
+            database_url=f"sqlite:///{path}",
+            cache_enabled=False,
+            search_enabled=False,
+            coalesce_reads=False,
+            metrics_enabled=False,
+        )
+    )
+
+
+BACKENDS: dict[str, Callable[[Path], ExampleRepository]] = {
+    "memory": lambda _path: InMemoryExampleRepository(),
+    "columnar": lambda _path: ColumnarExampleRepository(),
+    "sharded": lambda _path: ShardedExampleRepository(),
+    "sqlite": lambda path: sqlite(path / "bench.db"),
+    "cached": lambda _path: CachedExampleRepository(InMemoryExampleRepository()),
+    "coalesced-sqlite": lambda path: CoalescingExampleRepository(
+        sqlite(path / "bench.db"), MetricsRegistry()
+    ),
+    "write-behind-sqlite": lambda path: WriteBehindExampleRepository(
+        sqlite(path / "bench.db"), registry=MetricsRegistry()
+    ),
+    "instrumented": lambda _path: InstrumentedExampleRepository(
+        InMemoryExampleRepository(), MetricsRegistry()
+    ),
+}
+# Per-operation iterations; SQLite round trips are far slower than memory
+ITERATIONS = {"sqlite": 500, "coalesced-sqlite": 500, "write-behind-sqlite": 500}
+DEFAULT_ITERATIONS = 10_000
+
+
+@pytest.fixture(params=list(BACKENDS))
+async def backend(
+    request: pytest.FixtureRequest, tmp_path: Path
+) -> AsyncGenerator[tuple[str, ExampleRepository], None]:
+    """An opened repository of each implementation, with STORED entities."""
+    name: str = request.param
+    repository = BACKENDS[name](tmp_path)
+    await repository.open()
+    await repository.save_many([ExampleEntity(name=f"Entity {i}") for i in range(STORED)])
+    yield name, repository
+    await repository.close()
+
+
+async def test_save(bench: Bench, backend: tuple[str, ExampleRepository]) -> None:
+    """Inserting new entities one at a time."""
+    name, repository = backend
+    await bench.arun(
+        f"repository.{name}.save",
+        lambda: repository.save(ExampleEntity(name="Benchmark")),
+        iterations=ITERATIONS.get(name, DEFAULT_ITERATIONS),
+    )
+
+
+async def test_get_by_id(bench: Bench, backend: tuple[str, ExampleRepository]) -> None:
+    """Point reads of stored entities."""
+    name, repository = backend
+    ids = cycle([entity.id for entity in await repository.list_page(STORED)])
+
+    await bench.arun(
+        f"repository.{name}.get_by_id",
+        lambda: repository.get_by_id(next(ids)),
+        iterations=ITERATIONS.get(name, DEFAULT_ITERATIONS),
+    )
+
+
+async def test_list_page(bench: Bench, backend: tuple[str, ExampleRepository]) -> None:
+    """First pages of 50 entities in creation order."""
+    name, repository = backend
+    await bench.arun(
+        f"repository.{name}.list_page",
+        lambda: repository.list_page(50),
+        iterations=ITERATIONS.get(name, DEFAULT_ITERATIONS) // 10,
+    )
+
+
+async def test_concurrent_hot_reads(bench: Bench, backend: tuple[str, ExampleRepository]) -> None:
+    """Bursts of 50 concurrent reads of the same entity, counted per read."""
+    name, repository = backend
+    (hot,) = await repository.list_page(1)
+
+    async def burst() -> None:
+        await asyncio.gather(*(repository.get_by_id(hot.id) for _ in range(50)))
+
+    per_second = await bench.arun(
+        f"repository.{name}.hot_reads",
+        burst,
+        iterations=ITERATIONS.get(name, DEFAULT_ITERATIONS) // 50,
+    )
+    print(f"  {per_second * 50:,.0f} reads/s")
@@ -0,0 +1,73 @@
+"""Query latency of the full-text index at a million entities.
+
+Entities get names and descriptions drawn from a synthetic vocabulary with a
+skewed (Zipf-like) word frequency, so queries mix rare and very common words
+as real text does. A scan testing every entity's text is measured alongside
+for contrast.
+"""
+
+from __future__ import annotations
+
+import random
+from collections.abc import Iterator
+from itertools import accumulate
+
+import pytest
+
+from {{ cookiecutter.project_slug|replace('-', '_') }}.adapters.repositories import InvertedIndex
+from {{ cookiecutter.project_slug|replace('-', '_') }}.domain.entities import ExampleEntity
+
+from .conftest import Bench
+
+pytestmark = pytest.mark.benchmark
+
+ENTITIES = 1_000_000
+VOCABULARY = [f"w{rank}" for rank in range(20_000)]
+QUERIES = {
+    "rare": "w15000",
+    "common": "w3",
+    "and": "w3 w40",
+    "prefix": "w12*",
+    "prefix_and": "w12* w7",
+}
+
+
+def synthetic_entities(count: int, seed: int = 0) -> Iterator[ExampleEntity]:
+    """Entities with 3 name words and 12 description words each."""
+    rng = random.Random(seed)
+    weights = list(accumulate(1 / (rank + 1) for rank in range(len(VOCABULARY))))
+    for _ in range(count):
+        words = rng.choices(VOCABULARY, cum_weights=weights, k=15)
+        yield ExampleEntity(name=" ".join(words[:3]), description=" ".join(words[3:]))
+
+
+@pytest.fixture(scope="module")
+def index() -> InvertedIndex:
+    """An index of ENTITIES synthetic entities, built once."""
+    index = InvertedIndex()
+    for entity in synthetic_entities(ENTITIES):
+        index.add(entity)
+    return index
+
+
+@pytest.mark.parametrize("kind", list(QUERIES))
+def test_query(bench: Bench, index: InvertedIndex, kind: str) -> None:
+    """One page of 20 results for a query."""
+    query = QUERIES[kind]
+    matches = len(index.search(query, ENTITIES))
+
+    per_second = bench.run(f"search.{kind}", lambda: index.search(query, 20), iterations=5)
+    print(f"  {1000 / per_second:,.2f} ms per query, {matches:,} of {len(index):,} entities match")
+
+
+def test_scan(bench: Bench) -> None:
+    """The same single-word lookup as a scan over every entity's text."""
+    texts = [
+        f"{entity.name} {entity.description}".split() for entity in synthetic_entities(ENTITIES)
+    ]
+
+    def scan() -> int:
+        return sum(1 for words in texts if "w15000" in words)
+
+    per_second = bench.run("search.scan", scan, iterations=1)
+    print(f"  {1000 / per_second:,.2f} ms per query")
@@ -0,0 +1,34 @@
+"""Throughput of ExampleService on the in-memory repository.
+
+The repository does almost no work, so these measure the service's own
+overhead: validation, entity construction and delegation.
+"""
+
+from __future__ import annotations
+
+from itertools import cycle
+
+import pytest
+
+from {{ cookiecutter.project_slug|replace('-', '_') }}.services import ExampleService
+
+from .conftest import Bench
+
+pytestmark = pytest.mark.benchmark
+
+
+async def test_create(bench: Bench, service: ExampleService) -> None:
+    """Validating, building and storing a new entity."""
+    await bench.arun(
+        "service.create",
+        lambda: service.create("Benchmark", "A benchmark entity"),
+        iterations=10_000,
+    )
+
+
+async def test_get_by_id(bench: Bench, service: ExampleService) -> None:
+    """Reading stored entities back by ID."""
+    created = (await service.create_many([(f"Entity {i}", "") for i in range(1000)])).created
+    ids = cycle([entity.id for entity in created])
+
+    await bench.arun("service.get_by_id", lambda: service.get_by_id(next(ids)), iterations=20_000)
@@ -0,0 +1,88 @@
+"""Multi-threaded throughput of the lock-striped repository.
+
+Threads hammer the sharded repository with a read-heavy mix of point reads
+and compare-and-save updates, at increasing thread counts, and the same
+load runs against a single shard (one global lock) for comparison. With the
+GIL only one thread runs Python at a time, so these numbers show the cost
+of lock contention rather than parallel speedup; on a free-threaded build
+with enough cores, the sharded store is expected to scale with threads.
+"""
+
+from __future__ import annotations
+
+import os
+import random
+import sys
+from collections.abc import Callable
+from dataclasses import replace
+
+import pytest
+
+from {{ cookiecutter.project_slug|replace('-', '_') }}.adapters.repositories import ShardedExampleRepository
+from {{ cookiecutter.project_slug|replace('-', '_') }}.domain.entities import ExampleEntity
+
+from .conftest import Bench
+
+pytestmark = pytest.mark.benchmark
+
+STORED = 10_000
+# Calls made by each thread per round
+ITERATIONS = 20_000
+THREAD_COUNTS = (1, 2, 4, 8)
+# One in this many calls is an update
+WRITE_EVERY = 10
+
+FREE_THREADED = not getattr(sys, "_is_gil_enabled", lambda: True)()
+
+
+def mixed_load(repository: ShardedExampleRepository, threads: int) -> Callable[[int], None]:
+    """Store entities and return the per-thread call: reads with an occasional compare-and-save."""
+    entities = [repository.save_sync(ExampleEntity(name="0")) for _ in range(STORED)]
+    ids = [entity.id for entity in entities]
+    rngs = [random.Random(index) for index in range(threads)]
+    counters = [0] * threads
+
+    def operation(index: int) -> None:
+        entity_id = ids[rngs[index].randrange(STORED)]
+        counters[index] += 1
+        current = repository.get_sync(entity_id)
+        if current is not None and counters[index] % WRITE_EVERY == 0:
+            repository.compare_and_save_sync(replace(current, name=str(counters[index])), current)
+
+    return operation
+
+
+@pytest.mark.parametrize("shards", [1, 16])
+@pytest.mark.parametrize("threads", THREAD_COUNTS)
+def test_mixed_load(bench: Bench, shards: int, threads: int) -> None:
+    """Point reads and 10% compare-and-save updates from several threads."""
+    repository = ShardedExampleRepository(shards=shards)
+
+    bench.run_threads(
+        f"sharded.shards{shards}.threads{threads}",
+        mixed_load(repository, threads),
+        threads=threads,
+        iterations=ITERATIONS // threads,
+    )
+
+
+@pytest.mark.skipif(
+    not FREE_THREADED or (os.cpu_count() or 1) < 4,
+    reason="parallel speedup needs a free-threaded build and 4+ cores",
+)
+def test_scales_with_threads(bench: Bench) -> None:
+    """On free-threaded Python, 4 threads outrun 1 by a clear margin."""
+    single = bench.run_threads(
+        "sharded.scaling.threads1",
+        mixed_load(ShardedExampleRepository(), 1),
+        threads=1,
+        iterations=ITERATIONS,
+    )
+    parallel = bench.run_threads(
+        "sharded.scaling.threads4",
+        mixed_load(ShardedExampleRepository(), 4),
+        threads=4,
+        iterations=ITERATIONS,
+    )
+
+    assert parallel > 2 * single
@@ -0,0 +1,60 @@
+"""Per-request cost of span tracing.
+
+Drives a stub ASGI app making a service call that makes a repository call,
+both traced, directly: first without ``TracingMiddleware``, so the spans
+are only the no-op check for a current trace, then with it, recording the
+spans and writing ``Server-Timing``, at head sampling rates of 0, the
+default 0.01, and 1.
+"""
+
+from __future__ import annotations
+
+import pytest
+from starlette.types import Receive, Scope, Send
+
+from {{ cookiecutter.project_slug|replace('-', '_') }}.api.middleware import TracingMiddleware
+from {{ cookiecutter.project_slug|replace('-', '_') }}.infrastructure.tracing import TraceBuffer, traced
+
+from .conftest import microseconds_per_call, stub_app
+
+pytestmark = pytest.mark.benchmark
+
+CALLS = 50_000
+# Budget for the added cost per request at the default sampling rate
+MAX_OVERHEAD_US = 20.0
+
+
+@traced("repository.get_by_id")
+async def fetch() -> None:
+    return None
+
+
+@traced("service.get_by_id")
+async def serve() -> None:
+    await fetch()
+
+
+async def traced_app(scope: Scope, receive: Receive, send: Send) -> None:
+    await serve()
+    await stub_app(scope, receive, send)
+
+
+async def test_tracing_overhead() -> None:
+    """Tracing a request adds only microseconds, cheap enough to leave on."""
+    bare = await microseconds_per_call(traced_app, CALLS)
+    unsampled = await microseconds_per_call(
+        TracingMiddleware(traced_app, TraceBuffer(), sample_rate=0.0), CALLS
+    )
+    default = await microseconds_per_call(
+        TracingMiddleware(traced_app, TraceBuffer(), sample_rate=0.01), CALLS
+    )
+    every = await microseconds_per_call(
+        TracingMiddleware(traced_app, TraceBuffer(), sample_rate=1.0), CALLS
+    )
+
+    print(f"\n  tracing.off: {bare:6.2f} us/request")
+    print(f"  tracing.on (Server-Timing only): +{unsampled - bare:5.2f} us/request")
+    print(f"  tracing.on (1% of traces kept): +{default - bare:5.2f} us/request")
+    print(f"  tracing.on (every trace kept): +{every - bare:5.2f} us/request")
+    assert unsampled - bare < MAX_OVERHEAD_US
+    assert default - bare < MAX_OVERHEAD_US
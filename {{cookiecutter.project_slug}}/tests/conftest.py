@@ -15,6 +15,27 @@ from {{ cookiecutter.project_slug|replace('-', '_') }}.api.main import app
 from {{ cookiecutter.project_slug|replace('-', '_') }}.services import ExampleService
 
 
+def pytest_addoption(parser: pytest.Parser) -> None:
+    """Options for the throughput baseline of ``tests/benchmarks``."""
+    group = parser.getgroup("benchmark")
+    group.addoption(
+        "--bench-baseline",
+        default=None,
+        help="Baseline JSON file (default: tests/benchmarks/baseline.json)",
+    )
+    group.addoption(
+        "--bench-threshold",
+        type=float,
+        default=0.25,
+        help="Fail when throughput falls more than this fraction below the baseline",
+    )
+    group.addoption(
+        "--bench-update",
+        action="store_true",
+        help="Replace the baseline with this run's results",
+    )
+
+
 @pytest.fixture
 def repository() -> InMemoryExampleRepository:
     """Provide a fresh in-memory repository for each test."""
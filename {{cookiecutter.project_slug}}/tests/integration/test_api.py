@@ -2,7 +2,13 @@
 
 from __future__ import annotations
 
+import asyncio
+from collections.abc import AsyncGenerator, Awaitable, Callable, Generator
+from pathlib import Path
+from typing import Any
+
 import pytest
+import structlog
 from httpx import AsyncClient
 
 
@@ -68,3 +74,832 @@ class TestEntityEndpoints:
 
         response = await client.delete(f"/entities/{uuid4()}")
         assert response.status_code == 404
+
+    async def test_get_entity_matches_response_model(self, client: AsyncClient) -> None:
+        """The fast response path emits exactly the documented fields."""
+        created = (await client.post("/entities", json={"name": "Shape"})).json()
+
+        response = await client.get(f"/entities/{created['id']}")
+
+        assert response.headers["content-type"] == "application/json"
+        assert response.json() == {"id": created["id"], "name": "Shape", "description": ""}
+
+    async def test_openapi_documents_entity_schema(self, client: AsyncClient) -> None:
+        """Entity routes still document their response models."""
+        schema = (await client.get("/openapi.json")).json()
+
+        content = schema["paths"]["/entities/{entity_id}"]["get"]["responses"]["200"]["content"]
+        assert content["application/json"]["schema"]["$ref"].endswith("/EntityResponse")
+
+
+class TestConditionalRequests:
+    """Tests for ETags and conditional entity requests."""
+
+    async def test_get_revalidates_with_etag(self, client: AsyncClient) -> None:
+        """A current ETag in If-None-Match gives an empty 304."""
+        created = await client.post("/entities", json={"name": "Cached"})
+        etag = created.headers["etag"]
+
+        response = await client.get(f"/entities/{created.json()['id']}")
+        assert response.headers["etag"] == etag
+        assert response.headers["cache-control"] == "no-cache"
+
+        not_modified = await client.get(
+            f"/entities/{created.json()['id']}", headers={"If-None-Match": f'"other", W/{etag}'}
+        )
+        assert not_modified.status_code == 304
+        assert not_modified.content == b""
+        assert not_modified.headers["etag"] == etag
+
+        stale = await client.get(
+            f"/entities/{created.json()['id']}", headers={"If-None-Match": '"other"'}
+        )
+        assert stale.status_code == 200
+        assert stale.json()["name"] == "Cached"
+
+    async def test_if_none_match_unknown_entity(self, client: AsyncClient) -> None:
+        """Revalidating a missing entity gives 404, not 304."""
+        from uuid import uuid4
+
+        response = await client.get(f"/entities/{uuid4()}", headers={"If-None-Match": "*"})
+        assert response.status_code == 404
+
+    async def test_put_with_if_match(self, client: AsyncClient) -> None:
+        """Updates succeed on the current ETag and give 412 on a stale one."""
+        created = await client.post("/entities", json={"name": "v1"})
+        entity_id, etag = created.json()["id"], created.headers["etag"]
+
+        updated = await client.put(
+            f"/entities/{entity_id}",
+            json={"name": "v2", "description": "d"},
+            headers={"If-Match": etag},
+        )
+        assert updated.status_code == 200
+        assert updated.json() == {"id": entity_id, "name": "v2", "description": "d"}
+        assert updated.headers["etag"] != etag
+
+        stale = await client.put(
+            f"/entities/{entity_id}", json={"name": "v3"}, headers={"If-Match": etag}
+        )
+        assert stale.status_code == 412
+        weak = await client.put(
+            f"/entities/{entity_id}",
+            json={"name": "v3"},
+            headers={"If-Match": f"W/{updated.headers['etag']}"},
+        )
+        assert weak.status_code == 412
+        assert (await client.get(f"/entities/{entity_id}")).json()["name"] == "v2"
+
+    async def test_put_without_if_match(self, client: AsyncClient) -> None:
+        """Unconditional updates overwrite; bad input and unknown IDs fail."""
+        from uuid import uuid4
+
+        entity_id = (await client.post("/entities", json={"name": "v1"})).json()["id"]
+
+        assert (await client.put(f"/entities/{entity_id}", json={"name": "v2"})).status_code == 200
+        assert (await client.put(f"/entities/{entity_id}", json={"name": " "})).status_code == 400
+        assert (await client.put(f"/entities/{uuid4()}", json={"name": "x"})).status_code == 404
+
+    async def test_delete_with_if_match(self, client: AsyncClient) -> None:
+        """Deletes are refused on a stale ETag."""
+        created = await client.post("/entities", json={"name": "v1"})
+        entity_id, etag = created.json()["id"], created.headers["etag"]
+        await client.put(f"/entities/{entity_id}", json={"name": "v2"})
+
+        assert (
+            await client.delete(f"/entities/{entity_id}", headers={"If-Match": etag})
+        ).status_code == 412
+        assert (
+            await client.delete(f"/entities/{entity_id}", headers={"If-Match": "*"})
+        ).status_code == 204
+        assert (
+            await client.delete(f"/entities/{entity_id}", headers={"If-Match": "*"})
+        ).status_code == 404
+
+
+class TestJobEndpoints:
+    """Tests for background job submission, polling and cancellation."""
+
+    @pytest.fixture
+    async def jobs(self, monkeypatch: pytest.MonkeyPatch) -> AsyncGenerator[None, None]:
+        """Run a job runner for the app, as its lifespan would."""
+        from {{ cookiecutter.project_slug|replace('-', '_') }}.adapters.jobs import InMemoryJobStore
+        from {{ cookiecutter.project_slug|replace('-', '_') }}.api import main
+        from {{ cookiecutter.project_slug|replace('-', '_') }}.services import ExampleService
+        from {{ cookiecutter.project_slug|replace('-', '_') }}.services.jobs import JobRunner
+
+        runner = JobRunner(ExampleService(main._repository), InMemoryJobStore(), chunk_size=2)
+        await runner.start()
+        monkeypatch.setattr(main, "_jobs", runner)
+        yield
+        await runner.stop()
+
+    @staticmethod
+    async def poll(client: AsyncClient, location: str) -> dict[str, Any]:
+        """Poll a job until it has finished."""
+        for _ in range(200):
+            job = (await client.get(location)).json()
+            if job["status"] in ("succeeded", "failed", "cancelled"):
+                return job
+            await asyncio.sleep(0.005)
+        raise AssertionError(f"{location} did not finish")
+
+    @pytest.mark.usefixtures("jobs")
+    async def test_create_then_delete_jobs(self, client: AsyncClient) -> None:
+        """Jobs are accepted with 202 and a Location to poll until done."""
+        response = await client.post(
+            "/jobs",
+            json={
+                "kind": "create",
+                "items": [{"name": f"Job {i}"} for i in range(5)] + [{"name": ""}],
+            },
+        )
+        assert response.status_code == 202
+        assert response.json()["status"] == "queued"
+        created = await self.poll(client, response.headers["location"])
+        assert (created["succeeded"], created["failed"]) == (5, 1)
+        assert created["errors"] == [{"index": 5, "detail": "Name cannot be empty"}]
+
+        listed = (await client.get("/entities", params={"limit": 1000})).json()["items"]
+        ids = [item["id"] for item in listed if item["name"].startswith("Job ")]
+        response = await client.post("/jobs", json={"kind": "delete", "ids": ids})
+        deleted = await self.poll(client, response.headers["location"])
+        assert (deleted["status"], deleted["succeeded"]) == ("succeeded", 5)
+
+    @pytest.mark.usefixtures("jobs")
+    async def test_invalid_and_unknown_jobs(self, client: AsyncClient) -> None:
+        """Mismatched payloads are rejected; unknown jobs are 404."""
+        from uuid import uuid4
+
+        assert (
+            await client.post("/jobs", json={"kind": "create", "ids": [str(uuid4())]})
+        ).status_code == 400
+        assert (await client.post("/jobs", json={"kind": "delete"})).status_code == 400
+        assert (await client.get(f"/jobs/{uuid4()}")).status_code == 404
+        assert (await client.post(f"/jobs/{uuid4()}:cancel")).status_code == 404
+
+    @pytest.mark.usefixtures("jobs")
+    async def test_cancel_finished_job_is_unchanged(self, client: AsyncClient) -> None:
+        """Cancelling a finished job reports it as it finished."""
+        response = await client.post("/jobs", json={"kind": "create", "items": [{"name": "quick"}]})
+        await self.poll(client, response.headers["location"])
+
+        cancelled = await client.post(f"{response.headers['location']}:cancel")
+
+        assert cancelled.status_code == 202
+        assert cancelled.json()["status"] == "succeeded"
+
+    async def test_unavailable_without_runner(self, client: AsyncClient) -> None:
+        """Without a started runner, job endpoints answer 503."""
+        response = await client.post("/jobs", json={"kind": "delete", "ids": []})
+        assert response.status_code == 503
+
+
+class TestBatchEndpoints:
+    """Tests for batch entity endpoints."""
+
+    async def test_batch_create_with_partial_failure(self, client: AsyncClient) -> None:
+        """Batch create stores valid items and reports invalid ones."""
+        response = await client.post(
+            "/entities:batchCreate",
+            json={"items": [{"name": "First"}, {"name": ""}, {"name": "Third"}]},
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert [entity["name"] for entity in data["created"]] == ["First", "Third"]
+        assert data["errors"] == [{"index": 1, "detail": "Name cannot be empty"}]
+
+    async def test_batch_get_and_delete(self, client: AsyncClient) -> None:
+        """Batch get and delete report found and missing IDs."""
+        from uuid import uuid4
+
+        created = (
+            await client.post(
+                "/entities:batchCreate",
+                json={"items": [{"name": "A"}, {"name": "B"}]},
+            )
+        ).json()["created"]
+        ids = [entity["id"] for entity in created]
+        unknown = str(uuid4())
+
+        got = (await client.post("/entities:batchGet", json={"ids": [*ids, unknown]})).json()
+        assert [entity["id"] for entity in got["entities"]] == ids
+        assert got["missing"] == [unknown]
+
+        deleted = (
+            await client.post("/entities:batchDelete", json={"ids": [ids[0], unknown]})
+        ).json()
+        assert deleted == {"deleted": [ids[0]], "missing": [unknown]}
+
+    async def test_batch_too_large_is_rejected(self, client: AsyncClient) -> None:
+        """Requests above the batch size limit fail validation."""
+        from {{ cookiecutter.project_slug|replace('-', '_') }}.api.main import MAX_BATCH_SIZE
+
+        response = await client.post(
+            "/entities:batchCreate",
+            json={"items": [{"name": "x"}] * (MAX_BATCH_SIZE + 1)},
+        )
+
+        assert response.status_code == 422
+
+
+class TestListEndpoint:
+    """Tests for the paginated listing endpoint."""
+
+    async def test_list_follows_cursor(self, client: AsyncClient) -> None:
+        """Listing returns a cursor that leads to the following page."""
+        created = (
+            await client.post(
+                "/entities:batchCreate",
+                json={"items": [{"name": "L1"}, {"name": "L2"}, {"name": "L3"}]},
+            )
+        ).json()["created"]
+        created_ids = {entity["id"] for entity in created}
+
+        listed: list[str] = []
+        cursor = None
+        while True:
+            params = {"limit": 2} | ({"cursor": cursor} if cursor else {})
+            data = (await client.get("/entities", params=params)).json()
+            listed.extend(entity["id"] for entity in data["items"])
+            cursor = data["next_cursor"]
+            if cursor is None:
+                break
+
+        assert created_ids <= set(listed)
+        assert len(listed) == len(set(listed))
+
+    async def test_list_by_id(self, client: AsyncClient) -> None:
+        """order=id pages by ID, which follows creation for new entities."""
+        created = (
+            await client.post(
+                "/entities:batchCreate", json={"items": [{"name": "I1"}, {"name": "I2"}]}
+            )
+        ).json()["created"]
+
+        data = (await client.get("/entities", params={"order": "id", "limit": 1000})).json()
+        listed = [entity["id"] for entity in data["items"]]
+
+        assert listed == sorted(listed)
+        assert listed.index(created[0]["id"]) < listed.index(created[1]["id"])
+
+    async def test_list_invalid_cursor(self, client: AsyncClient) -> None:
+        """A malformed cursor returns 400."""
+        response = await client.get("/entities", params={"cursor": "bogus"})
+
+        assert response.status_code == 400
+
+
+class TestSearchEndpoint:
+    """Tests for full-text search through the listing endpoint."""
+
+    @pytest.fixture(autouse=True)
+    def indexed(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Serve requests from an indexed repository."""
+        from {{ cookiecutter.project_slug|replace('-', '_') }}.adapters.repositories import (
+            InMemoryExampleRepository,
+            SearchIndexedExampleRepository,
+        )
+        from {{ cookiecutter.project_slug|replace('-', '_') }}.api import main
+
+        monkeypatch.setattr(
+            main, "_repository", SearchIndexedExampleRepository(InMemoryExampleRepository())
+        )
+
+    async def test_query_returns_matches(self, client: AsyncClient) -> None:
+        """Only entities containing every query word are returned."""
+        await client.post(
+            "/entities:batchCreate",
+            json={
+                "items": [
+                    {"name": "Blue widget", "description": "small"},
+                    {"name": "Blue gadget", "description": "large"},
+                ]
+            },
+        )
+
+        data = (await client.get("/entities", params={"q": "blue wid*"})).json()
+
+        assert [entity["name"] for entity in data["items"]] == ["Blue widget"]
+        assert data["next_cursor"] is None
+
+    async def test_query_without_words(self, client: AsyncClient) -> None:
+        """A query without any words returns 400."""
+        response = await client.get("/entities", params={"q": "***"})
+
+        assert response.status_code == 400
+
+    async def test_unavailable_without_index(
+        self, client: AsyncClient, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Searching a deployment without an index returns 503."""
+        from {{ cookiecutter.project_slug|replace('-', '_') }}.adapters.repositories import InMemoryExampleRepository
+        from {{ cookiecutter.project_slug|replace('-', '_') }}.api import main
+
+        monkeypatch.setattr(main, "_repository", InMemoryExampleRepository())
+
+        response = await client.get("/entities", params={"q": "blue"})
+
+        assert response.status_code == 503
+
+
+class TestCacheStatsEndpoint:
+    """Tests for the cache statistics endpoint."""
+
+    async def test_cache_stats(self, client: AsyncClient) -> None:
+        """Cache stats report whether caching is active."""
+        response = await client.get("/cache/stats")
+
+        assert response.status_code == 200
+        assert "enabled" in response.json()
+
+
+class TestExportEndpoint:
+    """Tests for the streaming NDJSON export."""
+
+    async def test_export_streams_every_entity(self, client: AsyncClient) -> None:
+        """Export emits one JSON line per entity across several batches."""
+        import json
+
+        created = (
+            await client.post(
+                "/entities:batchCreate",
+                json={"items": [{"name": f"Export {i}"} for i in range(5)]},
+            )
+        ).json()["created"]
+
+        async with client.stream("GET", "/entities/export", params={"batch_size": 2}) as response:
+            assert response.status_code == 200
+            assert response.headers["content-type"].startswith("application/x-ndjson")
+            lines = [line async for line in response.aiter_lines() if line]
+
+        records = [json.loads(line) for line in lines]
+        exported_ids = [record["id"] for record in records]
+        assert {entity["id"] for entity in created} <= set(exported_ids)
+        assert len(exported_ids) == len(set(exported_ids))
+        assert {"id", "name", "description", "created_at", "updated_at"} == set(records[0])
+
+
+class TestMetricsEndpoint:
+    """Tests for the Prometheus metrics endpoint."""
+
+    async def test_metrics_by_route_template(self, client: AsyncClient) -> None:
+        """Requests are recorded under their route template and status."""
+        from uuid import uuid4
+
+        await client.get(f"/entities/{uuid4()}")
+
+        response = await client.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        body = response.text
+        assert (
+            'http_requests_total{method="GET",route="/entities/{entity_id}",status="404"}' in body
+        )
+        assert (
+            'http_request_duration_seconds_count{method="GET",route="/entities/{entity_id}"}'
+            in body
+        )
+        assert 'repository_operation_duration_seconds_count{operation="get_by_id"}' in body
+        assert "http_requests_in_progress 1" in body
+
+
+class TestProfiling:
+    """Tests for on-demand request profiling."""
+
+    async def test_profile_header_saves_profile(self, tmp_path: Path) -> None:
+        """Requests presenting the token are profiled; others are not."""
+        from httpx import ASGITransport
+
+        from {{ cookiecutter.project_slug|replace('-', '_') }}.api.main import app
+        from {{ cookiecutter.project_slug|replace('-', '_') }}.api.middleware import ProfilingMiddleware
+        from {{ cookiecutter.project_slug|replace('-', '_') }}.infrastructure.profiling import ProfileStore
+
+        profiled = ProfilingMiddleware(app, ProfileStore(tmp_path), token="secret")
+        transport = ASGITransport(app=profiled)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            plain = await client.get("/health")
+            wrong = await client.get("/health", headers={"X-Profile": "guess"})
+            response = await client.get("/health", headers={"X-Profile": "secret"})
+
+        assert "x-profile-id" not in plain.headers
+        assert "x-profile-id" not in wrong.headers
+        assert response.status_code == 200
+        profile_id = response.headers["x-profile-id"]
+        assert profile_id.endswith("-GET_health")
+        assert [path.name for path in tmp_path.iterdir()] == [f"{profile_id}.prof"]
+
+
+class TestAdmissionControl:
+    """Tests for concurrency limiting and load shedding."""
+
+    @staticmethod
+    def gated_app(gate: asyncio.Event) -> Callable[..., Awaitable[None]]:
+        """An ASGI app whose /slow requests wait for ``gate``."""
+
+        async def app(
+            scope: dict[str, Any], _receive: Any, send: Callable[..., Awaitable[None]]
+        ) -> None:
+            if scope["path"] == "/slow":
+                await gate.wait()
+            await send({"type": "http.response.start", "status": 200, "headers": []})
+            await send({"type": "http.response.body", "body": b"ok"})
+
+        return app
+
+    async def test_sheds_beyond_queue_and_serves_queued(self) -> None:
+        """Excess requests get 503 at once; queued ones run as slots free up."""
+        from httpx import ASGITransport
+
+        from {{ cookiecutter.project_slug|replace('-', '_') }}.api.middleware import AdmissionControlMiddleware
+        from {{ cookiecutter.project_slug|replace('-', '_') }}.infrastructure.metrics import MetricsRegistry
+
+        gate = asyncio.Event()
+        registry = MetricsRegistry()
+        limited = AdmissionControlMiddleware(
+            self.gated_app(gate),
+            max_concurrency=2,
+            max_queue=1,
+            queue_timeout=5.0,
+            retry_after=3,
+            exempt_paths=["/health"],
+            registry=registry,
+        )
+        async with AsyncClient(
+            transport=ASGITransport(app=limited), base_url="http://test"
+        ) as client:
+            admitted = [asyncio.create_task(client.get("/slow")) for _ in range(3)]
+            await asyncio.sleep(0.05)
+
+            shed = await client.get("/slow")
+            health = await client.get("/health")
+            gate.set()
+            responses = await asyncio.gather(*admitted)
+
+        assert shed.status_code == 503
+        assert shed.headers["retry-after"] == "3"
+        assert health.status_code == 200
+        assert [response.status_code for response in responses] == [200, 200, 200]
+        assert 'http_requests_shed_total{reason="queue_full"} 1' in registry.render()
+        assert limited._active == 0
+
+    async def test_queue_deadline_sheds(self) -> None:
+        """A request still queued at its deadline is shed."""
+        from httpx import ASGITransport
+
+        from {{ cookiecutter.project_slug|replace('-', '_') }}.api.middleware import AdmissionControlMiddleware
+        from {{ cookiecutter.project_slug|replace('-', '_') }}.infrastructure.metrics import MetricsRegistry
+
+        gate = asyncio.Event()
+        registry = MetricsRegistry()
+        limited = AdmissionControlMiddleware(
+            self.gated_app(gate),
+            max_concurrency=1,
+            max_queue=5,
+            queue_timeout=0.05,
+            registry=registry,
+        )
+        async with AsyncClient(
+            transport=ASGITransport(app=limited), base_url="http://test"
+        ) as client:
+            running = asyncio.create_task(client.get("/slow"))
+            await asyncio.sleep(0.01)
+            late = await client.get("/fast")
+            gate.set()
+            await running
+            after = await client.get("/fast")
+
+        assert late.status_code == 503
+        assert after.status_code == 200
+        rendered = registry.render()
+        assert 'http_requests_shed_total{reason="timeout"} 1' in rendered
+        assert "http_admission_queue_depth 0" in rendered
+
+    async def test_cancelled_waiter_frees_its_place(self) -> None:
+        """A client giving up while queued leaves the queue and takes no slot."""
+        from {{ cookiecutter.project_slug|replace('-', '_') }}.api.middleware import AdmissionControlMiddleware
+        from {{ cookiecutter.project_slug|replace('-', '_') }}.infrastructure.metrics import MetricsRegistry
+
+        gate = asyncio.Event()
+        limited = AdmissionControlMiddleware(
+            self.gated_app(gate), max_concurrency=1, max_queue=1, registry=MetricsRegistry()
+        )
+        sent: list[dict[str, Any]] = []
+
+        async def send(message: dict[str, Any]) -> None:
+            sent.append(message)
+
+        def call(path: str) -> asyncio.Task[None]:
+            return asyncio.create_task(limited({"type": "http", "path": path}, None, send))
+
+        running = call("/slow")
+        await asyncio.sleep(0)
+        waiting = call("/slow")
+        await asyncio.sleep(0)
+        waiting.cancel()
+        await asyncio.sleep(0)
+        gate.set()
+        await running
+        await call("/fast")
+
+        assert [m["status"] for m in sent if m["type"] == "http.response.start"] == [200, 200]
+        assert limited._active == 0
+        assert not limited._waiters
+
+
+class TestRequestLogging:
+    """Tests for per-request log events."""
+
+    @pytest.fixture
+    def read_logs(self) -> Generator[Callable[[], list[dict[str, Any]]], None, None]:
+        """Send logs to memory; the fixture's value flushes and parses them."""
+        import io
+        import json
+        import logging
+
+        from {{ cookiecutter.project_slug|replace('-', '_') }}.infrastructure.config import Settings
+        from {{ cookiecutter.project_slug|replace('-', '_') }}.infrastructure.logging import QueueHandler, configure_logging
+
+        stream = io.StringIO()
+        writer = configure_logging(Settings(log_level="DEBUG"), stream)
+
+        def read() -> list[dict[str, Any]]:
+            writer.close()
+            return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+        yield read
+        writer.close()
+        structlog.reset_defaults()
+        root = logging.getLogger()
+        for handler in [handler for handler in root.handlers if isinstance(handler, QueueHandler)]:
+            root.removeHandler(handler)
+
+    @staticmethod
+    def routed_app(
+        status: int, route: str = "/entities/{entity_id}"
+    ) -> Callable[..., Awaitable[None]]:
+        """An ASGI app answering ``status`` from ``route``, logging as it goes."""
+
+        class Route:
+            path = route
+
+        async def app(
+            scope: dict[str, Any], _receive: Any, send: Callable[..., Awaitable[None]]
+        ) -> None:
+            scope["route"] = Route
+            structlog.get_logger().info("inside")
+            await send({"type": "http.response.start", "status": status, "headers": []})
+            await send({"type": "http.response.body", "body": b""})
+
+        return app
+
+    @staticmethod
+    async def get(app: Any, headers: dict[str, str] | None = None) -> Any:
+        """Send one request through ``app``."""
+        from httpx import ASGITransport
+
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            return await client.get("/entities/1", headers=headers)
+
+    async def test_request_event_carries_context(
+        self, read_logs: Callable[[], list[dict[str, Any]]]
+    ) -> None:
+        """Events logged while serving share the request ID, which is echoed back."""
+        import logging
+
+        from {{ cookiecutter.project_slug|replace('-', '_') }}.api.middleware import RequestLoggingMiddleware
+
+        inner = self.routed_app(200)
+
+        async def app(scope: dict[str, Any], receive: Any, send: Any) -> None:
+            logging.getLogger("stdlib").warning("also %s", "inside")
+            await inner(scope, receive, send)
+
+        response = await self.get(
+            RequestLoggingMiddleware(app), headers={"X-Request-ID": "abc-123"}
+        )
+
+        assert response.headers["x-request-id"] == "abc-123"
+        stdlib, inside, request = [log for log in read_logs() if "request_id" in log]
+        assert stdlib["request_id"] == inside["request_id"] == request["request_id"] == "abc-123"
+        assert (stdlib["event"], stdlib["logger"], stdlib["level"]) == (
+            "also inside",
+            "stdlib",
+            "warning",
+        )
+        assert (request["event"], request["route"], request["status"]) == (
+            "request",
+            "/entities/{entity_id}",
+            200,
+        )
+        assert (request["level"], request["method"], request["path"]) == (
+            "info",
+            "GET",
+            "/entities/1",
+        )
+        assert request["duration_ms"] >= 0 and request["timestamp"].endswith("Z")
+
+    async def test_unusable_request_id_is_replaced(
+        self, read_logs: Callable[[], list[dict[str, Any]]]
+    ) -> None:
+        """Request IDs that are too long are not echoed; a fresh one is generated."""
+        from {{ cookiecutter.project_slug|replace('-', '_') }}.api.middleware import RequestLoggingMiddleware
+
+        response = await self.get(
+            RequestLoggingMiddleware(self.routed_app(200)), headers={"X-Request-ID": "x" * 200}
+        )
+
+        assert len(response.headers["x-request-id"]) == 32
+        (request,) = [log for log in read_logs() if log["event"] == "request"]
+        assert request["request_id"] == response.headers["x-request-id"]
+
+    async def test_sampling_keeps_errors_and_slow_requests(
+        self, read_logs: Callable[[], list[dict[str, Any]]]
+    ) -> None:
+        """A zero sample rate silences successes, never server errors or slow requests."""
+        from {{ cookiecutter.project_slug|replace('-', '_') }}.api.middleware import RequestLoggingMiddleware
+
+        await self.get(RequestLoggingMiddleware(self.routed_app(200), sample_rate=0.0))
+        await self.get(RequestLoggingMiddleware(self.routed_app(503), sample_rate=0.0))
+        await self.get(
+            RequestLoggingMiddleware(self.routed_app(201), sample_rate=0.0, slow_seconds=0.0)
+        )
+
+        requests = [log for log in read_logs() if log["event"] == "request"]
+        assert [(log["status"], log["level"]) for log in requests] == [
+            (503, "error"),
+            (201, "warning"),
+        ]
+
+    async def test_route_sample_rate_overrides_default(
+        self, read_logs: Callable[[], list[dict[str, Any]]]
+    ) -> None:
+        """Per-route rates apply to their route template only."""
+        from {{ cookiecutter.project_slug|replace('-', '_') }}.api.middleware import RequestLoggingMiddleware
+
+        rates = {"/health": 0.0}
+        await self.get(
+            RequestLoggingMiddleware(self.routed_app(200, "/health"), route_sample_rates=rates)
+        )
+        await self.get(RequestLoggingMiddleware(self.routed_app(200), route_sample_rates=rates))
+
+        requests = [log for log in read_logs() if log["event"] == "request"]
+        assert [log["route"] for log in requests] == ["/entities/{entity_id}"]
+
+    async def test_exceptions_are_logged(
+        self, read_logs: Callable[[], list[dict[str, Any]]]
+    ) -> None:
+        """An exception escaping the app is logged as a 500 with its traceback."""
+        from {{ cookiecutter.project_slug|replace('-', '_') }}.api.middleware import RequestLoggingMiddleware
+
+        async def broken(_scope: dict[str, Any], _receive: Any, _send: Any) -> None:
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            await RequestLoggingMiddleware(broken, sample_rate=0.0)(
+                {"type": "http", "method": "GET", "path": "/x", "headers": []}, None, None
+            )
+
+        (request,) = [log for log in read_logs() if log["event"] == "request"]
+        assert (request["status"], request["route"], request["level"]) == (
+            500,
+            "<unmatched>",
+            "error",
+        )
+        assert "RuntimeError: boom" in request["exception"]
+
+
+class TestTracing:
+    """Tests for Server-Timing and the trace buffer."""
+
+    async def test_server_timing_covers_every_layer(self, client: AsyncClient) -> None:
+        """Entity reads report time spent in the handler, the service and the repository."""
+        created = await client.post("/entities", json={"name": "Timed"})
+        response = await client.get(f"/entities/{created.json()['id']}")
+
+        metrics = [metric.split(";")[0] for metric in response.headers["server-timing"].split(", ")]
+        assert metrics == ["total", "api", "service", "repository"]
+
+    async def test_debug_traces_lists_sampled_traces(
+        self, client: AsyncClient, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Kept traces are served newest first with their spans."""
+        import time
+
+        from {{ cookiecutter.project_slug|replace('-', '_') }}.api import main
+        from {{ cookiecutter.project_slug|replace('-', '_') }}.infrastructure.tracing import Trace, TraceBuffer, end_trace, start_trace
+        from {{ cookiecutter.project_slug|replace('-', '_') }}.services import ExampleService
+
+        buffer = TraceBuffer()
+        monkeypatch.setattr(main, "_traces", buffer)
+        trace = Trace("POST", "/entities", sampled=True)
+        token = start_trace(trace)
+        await ExampleService(main._repository).create("Traced")
+        end_trace(token)
+        buffer.add(trace, "req-1", "/entities", 201, time.perf_counter())
+
+        response = await client.get("/debug/traces", params={"limit": 5})
+
+        assert response.status_code == 200
+        (listed,) = response.json()
+        assert (listed["trace_id"], listed["route"], listed["status"]) == (
+            "req-1",
+            "/entities",
+            201,
+        )
+        assert [span["name"] for span in listed["spans"]] == ["repository.save", "service.create"]
+
+    async def test_middleware_keeps_sampled_traces_by_request_id(self) -> None:
+        """Sampled traces are kept under the request ID of the logging context."""
+        from httpx import ASGITransport
+
+        from {{ cookiecutter.project_slug|replace('-', '_') }}.api.middleware import RequestLoggingMiddleware, TracingMiddleware
+        from {{ cookiecutter.project_slug|replace('-', '_') }}.infrastructure.tracing import TraceBuffer, traced
+
+        @traced("service.work")
+        async def work() -> None:
+            return None
+
+        async def app(
+            _scope: dict[str, Any], _receive: Any, send: Callable[..., Awaitable[None]]
+        ) -> None:
+            await work()
+            await send({"type": "http.response.start", "status": 200, "headers": []})
+            await send({"type": "http.response.body", "body": b""})
+
+        buffer = TraceBuffer()
+        traced_app = RequestLoggingMiddleware(
+            TracingMiddleware(app, buffer, sample_rate=1.0), sample_rate=0.0
+        )
+        async with AsyncClient(
+            transport=ASGITransport(app=traced_app), base_url="http://test"
+        ) as client:
+            response = await client.get("/work", headers={"X-Request-ID": "req-2"})
+
+        assert response.headers["server-timing"].startswith("total;dur=")
+        assert "service;dur=" in response.headers["server-timing"]
+        (record,) = buffer.recent()
+        assert (record.trace_id, record.path, record.route) == ("req-2", "/work", "<unmatched>")
+        assert [span.name for span in record.spans] == ["service.work"]
+
+
+class TestWriteBehind:
+    """Tests for write-behind buffering across the app lifecycle."""
+
+    async def test_shutdown_drains_buffer(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Writes acknowledged before shutdown are in storage afterwards."""
+        from {{ cookiecutter.project_slug|replace('-', '_') }}.adapters.repositories import create_repository
+        from {{ cookiecutter.project_slug|replace('-', '_') }}.api import main
+        from {{ cookiecutter.project_slug|replace('-', '_') }}.infrastructure.config import Settings, get_settings
+
+        url = f"sqlite:///{tmp_path / 'app.db'}"
+        monkeypatch.setenv("DATABASE_URL", url)
+        monkeypatch.setenv("WRITE_BEHIND_ENABLED", "true")
+        monkeypatch.setenv("WRITE_BEHIND_FLUSH_INTERVAL", "3600")
+        get_settings.cache_clear()
+        monkeypatch.setattr(main, "_repository", main._repository)
+        try:
+            async with main.lifespan(main.app):
+                service = main.get_example_service()
+                created = [await service.create(f"Entity {i}") for i in range(20)]
+        finally:
+            get_settings.cache_clear()
+
+        storage = create_repository(Settings(database_url=url, metrics_enabled=False))
+        await storage.open()
+        try:
+            stored = await storage.get_many([entity.id for entity in created])
+        finally:
+            await storage.close()
+        assert len(stored) == 20
+
+
+class TestFileStorage:
+    """Tests for file-backed storage across app restarts."""
+
+    async def test_entities_survive_restart(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Entities created before shutdown are served after the next startup."""
+        from {{ cookiecutter.project_slug|replace('-', '_') }}.api import main
+        from {{ cookiecutter.project_slug|replace('-', '_') }}.infrastructure.config import get_settings
+
+        monkeypatch.setenv("DATABASE_URL", f"file://{tmp_path / 'data'}")
+        get_settings.cache_clear()
+        monkeypatch.setattr(main, "_repository", main._repository)
+        try:
+            async with main.lifespan(main.app):
+                service = main.get_example_service()
+                created = [await service.create(f"Entity {i}") for i in range(20)]
+                await service.delete(created[0].id)
+            async with main.lifespan(main.app):
+                service = main.get_example_service()
+                page = await service.list_page(50)
+        finally:
+            get_settings.cache_clear()
+
+        assert [entity.id for entity in page.items] == [entity.id for entity in created[1:]]
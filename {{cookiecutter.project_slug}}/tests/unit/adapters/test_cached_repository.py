@@ -0,0 +1,175 @@
+"""Tests for the read-through entity cache."""
+
+from __future__ import annotations
+
+from uuid import UUID, uuid4
+
+import pytest
+
+from {{ cookiecutter.project_slug|replace('-', '_') }}.adapters.repositories import (
+    CachedExampleRepository,
+    InMemoryExampleRepository,
+    create_repository,
+    find_layer,
+)
+from {{ cookiecutter.project_slug|replace('-', '_') }}.domain.entities import ExampleEntity
+from {{ cookiecutter.project_slug|replace('-', '_') }}.infrastructure.config import Settings
+
+
+class CountingRepository(InMemoryExampleRepository):
+    """In-memory repository that counts lookups reaching the store."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.lookups = 0
+
+    async def get_by_id(self, entity_id: UUID) -> ExampleEntity | None:
+        self.lookups += 1
+        return await super().get_by_id(entity_id)
+
+
+@pytest.fixture
+def store() -> CountingRepository:
+    """Provide the repository behind the cache."""
+    return CountingRepository()
+
+
+@pytest.fixture
+def cache(store: CountingRepository) -> CachedExampleRepository:
+    """Provide a small cache in front of the store."""
+    return CachedExampleRepository(store, max_entries=2)
+
+
+class TestCachedExampleRepository:
+    """Tests for CachedExampleRepository."""
+
+    async def test_repeated_reads_hit_cache(
+        self, store: CountingRepository, cache: CachedExampleRepository
+    ) -> None:
+        """Only the first read of an entity reaches the store."""
+        entity = await store.save(ExampleEntity(name="Hot"))
+
+        for _ in range(3):
+            assert await cache.get_by_id(entity.id) == entity
+
+        assert store.lookups == 1
+        stats = cache.stats()
+        assert (stats.hits, stats.misses) == (2, 1)
+
+    async def test_misses_are_cached(
+        self, store: CountingRepository, cache: CachedExampleRepository
+    ) -> None:
+        """Repeated lookups of an unknown ID reach the store once."""
+        unknown = uuid4()
+
+        assert await cache.get_by_id(unknown) is None
+        assert await cache.get_by_id(unknown) is None
+
+        assert store.lookups == 1
+
+    async def test_negative_caching_can_be_disabled(self, store: CountingRepository) -> None:
+        """With negative_ttl=0 every miss reaches the store."""
+        cache = CachedExampleRepository(store, negative_ttl=0)
+        unknown = uuid4()
+
+        await cache.get_by_id(unknown)
+        await cache.get_by_id(unknown)
+
+        assert store.lookups == 2
+
+    async def test_save_replaces_cached_miss(self, cache: CachedExampleRepository) -> None:
+        """Saving an entity invalidates a cached miss for its ID."""
+        entity = ExampleEntity(name="Late")
+        assert await cache.get_by_id(entity.id) is None
+
+        await cache.save(entity)
+
+        assert await cache.get_by_id(entity.id) == entity
+
+    async def test_delete_invalidates(
+        self, store: CountingRepository, cache: CachedExampleRepository
+    ) -> None:
+        """Deleted entities are not served from the cache."""
+        entity = await cache.save(ExampleEntity(name="Doomed"))
+
+        await cache.delete(entity.id)
+
+        assert await cache.get_by_id(entity.id) is None
+        assert store.lookups == 1
+
+    async def test_version_served_from_cache(
+        self, store: CountingRepository, cache: CachedExampleRepository
+    ) -> None:
+        """Cached entities answer version checks; others never fill the cache."""
+        cached = await cache.save(ExampleEntity(name="Cached"))
+        uncached = await store.save(ExampleEntity(name="Uncached"))
+
+        assert await cache.get_version(cached.id) == cached.created_at
+        assert await cache.get_version(uncached.id) == uncached.created_at
+        assert await cache.get_version(uuid4()) is None
+
+        assert store.lookups == 0
+        assert cache.stats().size == 1
+        assert (cache.stats().hits, cache.stats().misses) == (1, 2)
+
+    async def test_lru_eviction(
+        self, store: CountingRepository, cache: CachedExampleRepository
+    ) -> None:
+        """The least recently used entry is evicted when the cache is full."""
+        first, second, third = [await store.save(ExampleEntity(name=n)) for n in "ABC"]
+        await cache.get_by_id(first.id)
+        await cache.get_by_id(second.id)
+        await cache.get_by_id(first.id)  # second is now least recently used
+        await cache.get_by_id(third.id)
+
+        store.lookups = 0
+        await cache.get_by_id(first.id)
+        await cache.get_by_id(second.id)
+
+        assert store.lookups == 1
+        assert cache.stats().evictions >= 1
+
+    async def test_ttl_expiry(
+        self, store: CountingRepository, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Entries are refetched once their TTL has passed."""
+        now = [1000.0]
+        monkeypatch.setattr("time.monotonic", lambda: now[0])
+        cache = CachedExampleRepository(store, ttl=10)
+        entity = await store.save(ExampleEntity(name="Fresh"))
+
+        await cache.get_by_id(entity.id)
+        now[0] += 11
+        await cache.get_by_id(entity.id)
+
+        assert store.lookups == 2
+
+    async def test_get_many_fetches_only_uncached(
+        self, store: CountingRepository, cache: CachedExampleRepository
+    ) -> None:
+        """Batch reads combine cached and freshly fetched entities."""
+        first, second = [await store.save(ExampleEntity(name=n)) for n in "AB"]
+        await cache.get_by_id(first.id)
+
+        found = await cache.get_many([first.id, second.id])
+
+        assert found == {first.id: first, second.id: second}
+        assert cache.stats().hits == 1
+
+
+class TestCacheWiring:
+    """Tests for cache configuration through Settings."""
+
+    def test_enabled_by_default(self) -> None:
+        """create_repository wraps the backend in the cache."""
+        repository = create_repository(Settings(database_url=None, cache_max_entries=5))
+
+        cache = find_layer(repository, CachedExampleRepository)
+        assert cache is not None
+        assert cache.stats().max_entries == 5
+
+    def test_can_be_disabled(self) -> None:
+        """cache_enabled=False returns the bare backend."""
+        repository = create_repository(Settings(database_url=None, cache_enabled=False))
+
+        assert find_layer(repository, CachedExampleRepository) is None
@@ -0,0 +1,184 @@
+"""Tests for single-flight coalescing of entity reads."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Coroutine
+from pathlib import Path
+from typing import Any
+from uuid import UUID
+
+import pytest
+
+from {{ cookiecutter.project_slug|replace('-', '_') }}.adapters.repositories import (
+    CoalescingExampleRepository,
+    InMemoryExampleRepository,
+    create_repository,
+    find_layer,
+)
+from {{ cookiecutter.project_slug|replace('-', '_') }}.domain.entities import ExampleEntity
+from {{ cookiecutter.project_slug|replace('-', '_') }}.infrastructure.config import Settings
+from {{ cookiecutter.project_slug|replace('-', '_') }}.infrastructure.metrics import MetricsRegistry
+
+
+class GatedRepository(InMemoryExampleRepository):
+    """Repository whose reads block until released, counting the calls."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.gate = asyncio.Event()
+        self.reads = 0
+        self.error: Exception | None = None
+
+    async def get_by_id(self, entity_id: UUID) -> ExampleEntity | None:
+        self.reads += 1
+        await self.gate.wait()
+        if self.error is not None:
+            raise self.error
+        return await super().get_by_id(entity_id)
+
+
+@pytest.fixture
+def gated() -> GatedRepository:
+    return GatedRepository()
+
+
+@pytest.fixture
+def registry() -> MetricsRegistry:
+    return MetricsRegistry()
+
+
+@pytest.fixture
+def repository(gated: GatedRepository, registry: MetricsRegistry) -> CoalescingExampleRepository:
+    return CoalescingExampleRepository(gated, registry)
+
+
+async def started(
+    *coroutines: Coroutine[Any, Any, ExampleEntity | None],
+) -> list[asyncio.Task[ExampleEntity | None]]:
+    """Start reads as tasks and let them all reach the gate."""
+    tasks = [asyncio.create_task(coroutine) for coroutine in coroutines]
+    await asyncio.sleep(0)
+    return tasks
+
+
+class TestCoalescingExampleRepository:
+    """Tests for CoalescingExampleRepository."""
+
+    async def test_concurrent_reads_share_one_call(
+        self,
+        gated: GatedRepository,
+        repository: CoalescingExampleRepository,
+        registry: MetricsRegistry,
+    ) -> None:
+        """Ten concurrent reads of one entity reach the store once."""
+        entity = await gated.save(ExampleEntity(name="Hot"))
+        tasks = await started(*(repository.get_by_id(entity.id) for _ in range(10)))
+
+        gated.gate.set()
+
+        assert await asyncio.gather(*tasks) == [entity] * 10
+        assert gated.reads == 1
+        stats = repository.stats()
+        assert (stats.calls, stats.coalesced, stats.in_flight) == (1, 9, 0)
+        assert stats.coalesced_rate == 0.9
+        assert "repository_coalesced_reads_total 9" in registry.render()
+
+    async def test_different_ids_are_not_coalesced(
+        self, gated: GatedRepository, repository: CoalescingExampleRepository
+    ) -> None:
+        """Each entity gets its own call."""
+        first = await gated.save(ExampleEntity(name="A"))
+        second = await gated.save(ExampleEntity(name="B"))
+        tasks = await started(repository.get_by_id(first.id), repository.get_by_id(second.id))
+
+        gated.gate.set()
+
+        assert await asyncio.gather(*tasks) == [first, second]
+        assert gated.reads == 2
+
+    async def test_errors_reach_every_waiter_and_are_not_kept(
+        self, gated: GatedRepository, repository: CoalescingExampleRepository
+    ) -> None:
+        """A failed call fails all its waiters; the next read tries again."""
+        entity = await gated.save(ExampleEntity(name="Flaky"))
+        gated.error = RuntimeError("storage down")
+        tasks = await started(*(repository.get_by_id(entity.id) for _ in range(3)))
+
+        gated.gate.set()
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+
+        assert all(isinstance(result, RuntimeError) for result in results)
+        gated.error = None
+        assert await repository.get_by_id(entity.id) == entity
+        assert gated.reads == 2
+
+    async def test_cancelled_waiter_leaves_others_waiting(
+        self, gated: GatedRepository, repository: CoalescingExampleRepository
+    ) -> None:
+        """Cancelling one follower does not cancel the shared call."""
+        entity = await gated.save(ExampleEntity(name="Patient"))
+        leader, follower, other = await started(
+            *(repository.get_by_id(entity.id) for _ in range(3))
+        )
+
+        follower.cancel()
+        await asyncio.sleep(0)
+        gated.gate.set()
+
+        assert await leader == entity
+        assert await other == entity
+        assert follower.cancelled()
+        assert gated.reads == 1
+
+    async def test_cancelled_leader_hands_over(
+        self, gated: GatedRepository, repository: CoalescingExampleRepository
+    ) -> None:
+        """If the leader is cancelled, a waiter makes the call instead."""
+        entity = await gated.save(ExampleEntity(name="Handover"))
+        leader, *followers = await started(*(repository.get_by_id(entity.id) for _ in range(3)))
+
+        leader.cancel()
+        for _ in range(3):
+            await asyncio.sleep(0)
+        assert gated.reads == 2
+        gated.gate.set()
+
+        assert await asyncio.gather(*followers) == [entity, entity]
+        assert leader.cancelled()
+        assert repository.stats().coalesced == 1
+
+    async def test_reads_after_a_write_start_a_new_call(
+        self, gated: GatedRepository, repository: CoalescingExampleRepository
+    ) -> None:
+        """A read that begins after a write never joins an older read."""
+        entity = await gated.save(ExampleEntity(name="Before"))
+        (stale,) = await started(repository.get_by_id(entity.id))
+
+        updated = await repository.save(
+            ExampleEntity(id=entity.id, created_at=entity.created_at, name="After")
+        )
+        (fresh,) = await started(repository.get_by_id(entity.id))
+        gated.gate.set()
+
+        assert await fresh == updated
+        await stale
+        assert gated.reads == 2
+
+    def test_create_repository_coalesces_database_reads(self, tmp_path: Path) -> None:
+        """Database backends get coalescing; in-memory ones have nothing to share."""
+        database = create_repository(
+            Settings(database_url=f"sqlite:///{tmp_path / 'x.db'}", metrics_enabled=False)
+        )
+        memory = create_repository(Settings(metrics_enabled=False))
+        disabled = create_repository(
+            Settings(
+                database_url=f"sqlite:///{tmp_path / 'x.db'}",
+                coalesce_reads=False,
+                metrics_enabled=False,
+            )
+        )
+
+        assert find_layer(database, CoalescingExampleRepository) is not None
+        assert find_layer(memory, CoalescingExampleRepository) is None
+        assert find_layer(disabled, CoalescingExampleRepository) is None
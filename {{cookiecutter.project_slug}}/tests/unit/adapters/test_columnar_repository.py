@@ -0,0 +1,134 @@
+"""Tests for the columnar in-memory repository."""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+from uuid import uuid4
+
+import pytest
+
+from {{ cookiecutter.project_slug|replace('-', '_') }}.adapters.repositories import (
+    ColumnarExampleRepository,
+    InMemoryExampleRepository,
+    create_repository,
+)
+from {{ cookiecutter.project_slug|replace('-', '_') }}.domain.entities import ExampleEntity
+from {{ cookiecutter.project_slug|replace('-', '_') }}.infrastructure.config import Settings
+
+
+@pytest.fixture
+def columnar() -> ColumnarExampleRepository:
+    """Provide a fresh columnar repository."""
+    return ColumnarExampleRepository()
+
+
+class TestColumnarExampleRepository:
+    """Tests for ColumnarExampleRepository."""
+
+    async def test_round_trip_is_exact(self, columnar: ColumnarExampleRepository) -> None:
+        """Entities are rebuilt with identical field values."""
+        entity = ExampleEntity(
+            name="Test",
+            description="A test entity",
+            updated_at=datetime(2024, 1, 15, 10, 30, 0, 123456, tzinfo=UTC),
+        )
+        await columnar.save(entity)
+
+        assert await columnar.get_by_id(entity.id) == entity
+        assert await columnar.get_by_id(uuid4()) is None
+        assert await columnar.get_version(entity.id) == entity.updated_at
+        assert await columnar.get_version(uuid4()) is None
+
+    async def test_delete_keeps_other_rows(self, columnar: ColumnarExampleRepository) -> None:
+        """Deleting a row moves the last row without corrupting it."""
+        entities = await columnar.save_many([ExampleEntity(name=n) for n in "ABC"])
+
+        assert await columnar.delete(entities[0].id) is True
+        assert await columnar.delete(entities[0].id) is False
+
+        assert len(columnar) == 2
+        assert await columnar.get_many([e.id for e in entities]) == {e.id: e for e in entities[1:]}
+
+    async def test_names_are_shared_and_released(self, columnar: ColumnarExampleRepository) -> None:
+        """Equal names share one string, which is dropped once no row holds it."""
+        first, second = await columnar.save_many(
+            [ExampleEntity(name="".join(["Sha", "red"])) for _ in range(2)]
+        )
+        stored = [e.name for e in (await columnar.get_many([first.id, second.id])).values()]
+        assert stored[0] is stored[1]
+
+        await columnar.save(ExampleEntity(id=first.id, name="Renamed"))
+        await columnar.delete(second.id)
+
+        assert len(columnar._interned) == 1
+        await columnar.delete(first.id)
+        assert len(columnar._interned) == 0
+
+    async def test_update_reorders_listing(self, columnar: ColumnarExampleRepository) -> None:
+        """Changing created_at moves the entity in listing order."""
+        first, second = await columnar.save_many([ExampleEntity(name="A"), ExampleEntity(name="B")])
+        moved = ExampleEntity(
+            id=first.id, name="A2", created_at=second.created_at + timedelta(seconds=1)
+        )
+        await columnar.save(moved)
+
+        assert await columnar.list_page(10) == [second, moved]
+
+    async def test_listing_matches_object_layout(self, columnar: ColumnarExampleRepository) -> None:
+        """Keyset pages match the object-backed repository exactly."""
+        objects = InMemoryExampleRepository()
+        entities = [ExampleEntity(name=f"E{i}") for i in range(10)]
+        await columnar.save_many(entities)
+        await objects.save_many(entities)
+        after = (entities[3].created_at, entities[3].id)
+
+        assert await columnar.list_page(4, after) == await objects.list_page(4, after)
+
+    async def test_random_operations_match_object_layout(
+        self, columnar: ColumnarExampleRepository
+    ) -> None:
+        """A random mix of saves, moves and deletes leaves identical contents."""
+        import random
+
+        rng = random.Random(42)
+        objects = InMemoryExampleRepository()
+        base = datetime(2024, 1, 1, tzinfo=UTC)
+        live: list[ExampleEntity] = []
+        for step in range(500):
+            action = rng.random()
+            if live and action < 0.3:
+                victim = live.pop(rng.randrange(len(live)))
+                assert await columnar.delete(victim.id) == await objects.delete(victim.id)
+                continue
+            if live and action < 0.5:
+                old = live.pop(rng.randrange(len(live)))
+                entity = ExampleEntity(
+                    id=old.id,
+                    name=f"moved {step}",
+                    created_at=base + timedelta(seconds=rng.randrange(50)),
+                )
+            else:
+                entity = ExampleEntity(
+                    name=f"E{step}", created_at=base + timedelta(seconds=rng.randrange(50))
+                )
+            live.append(entity)
+            await columnar.save(entity)
+            await objects.save(entity)
+
+        assert await columnar.list_page(1000) == await objects.list_page(1000)
+        assert await columnar.list_page_by_id(1000) == await objects.list_page_by_id(1000)
+        assert len(columnar) == len(live)
+
+    def test_selected_by_settings(self) -> None:
+        """memory_layout=columnar selects the columnar backend."""
+        repository = create_repository(
+            Settings(
+                database_url=None,
+                memory_layout="columnar",
+                cache_enabled=False,
+                search_enabled=False,
+                metrics_enabled=False,
+            )
+        )
+
+        assert isinstance(repository, ColumnarExampleRepository)
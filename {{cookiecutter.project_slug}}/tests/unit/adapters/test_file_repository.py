@@ -0,0 +1,280 @@
+"""Tests for the durable log-and-snapshot repository."""
+
+from __future__ import annotations
+
+import asyncio
+import random
+from collections.abc import AsyncGenerator
+from dataclasses import replace
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from uuid import uuid4
+
+import pytest
+
+from {{ cookiecutter.project_slug|replace('-', '_') }}.adapters.repositories import (
+    FileExampleRepository,
+    InMemoryExampleRepository,
+    create_repository,
+    is_process_shared,
+)
+from {{ cookiecutter.project_slug|replace('-', '_') }}.domain.entities import ExampleEntity
+from {{ cookiecutter.project_slug|replace('-', '_') }}.infrastructure.config import Settings
+
+
+@pytest.fixture
+async def store(tmp_path: Path) -> AsyncGenerator[FileExampleRepository, None]:
+    """Provide an opened repository in a temporary directory."""
+    repository = FileExampleRepository(tmp_path / "data")
+    await repository.open()
+    yield repository
+    await repository.close()
+
+
+async def reopen(repository: FileExampleRepository) -> FileExampleRepository:
+    """Close a repository and open its directory again, as a restart would."""
+    await repository.close()
+    reopened = FileExampleRepository(repository._directory)
+    await reopened.open()
+    return reopened
+
+
+async def contents(repository: FileExampleRepository) -> list[ExampleEntity]:
+    """Every stored entity, read through paging."""
+    return [entity async for entity in repository.iterate(batch_size=7)]
+
+
+class TestFileExampleRepository:
+    """Tests for FileExampleRepository."""
+
+    async def test_survives_restart(self, store: FileExampleRepository) -> None:
+        """Saves and deletes are replayed from the log on the next open."""
+        entities = await store.save_many([ExampleEntity(name=f"E{i}") for i in range(10)])
+        renamed = await store.save(replace(entities[0], name="renamed"))
+        assert await store.delete(entities[1].id) is True
+        assert await store.delete_many([entities[2].id, uuid4()]) == {entities[2].id}
+
+        reopened = await reopen(store)
+        try:
+            assert await reopened.get_by_id(renamed.id) == renamed
+            assert await reopened.get_by_id(entities[1].id) is None
+            assert await contents(reopened) == [renamed, *entities[3:]]
+            assert len(reopened) == 8
+        finally:
+            await reopened.close()
+
+    async def test_get_version(self, store: FileExampleRepository) -> None:
+        """Versions come from the snapshot header or the unsnapshotted changes."""
+        entity = await store.save(ExampleEntity(name="E"))
+        await store.compact()
+        assert await store.get_version(entity.id) == entity.created_at
+
+        updated = await store.save(
+            replace(entity, updated_at=entity.created_at + timedelta(seconds=1))
+        )
+        assert await store.get_version(entity.id) == updated.updated_at
+        await store.delete(entity.id)
+        assert await store.get_version(entity.id) is None
+
+    async def test_compare_and_save_sees_uncommitted_writes(
+        self, store: FileExampleRepository
+    ) -> None:
+        """A conditional write compares against writes still waiting for their commit."""
+        entity = await store.save(ExampleEntity(name="v1"))
+        first = replace(entity, name="v2", updated_at=entity.created_at + timedelta(seconds=1))
+        second = replace(entity, name="v3", updated_at=entity.created_at + timedelta(seconds=2))
+
+        results = await asyncio.gather(
+            store.compare_and_save(first, entity.version),
+            store.compare_and_save(second, entity.version),
+        )
+
+        assert results == [True, False]
+        assert await store.get_by_id(entity.id) == first
+        assert await store.compare_and_delete(entity.id, entity.version) is False
+        assert await store.compare_and_delete(entity.id, first.version) is True
+
+    async def test_concurrent_deletes_report_one_removal(
+        self, store: FileExampleRepository
+    ) -> None:
+        """Of two deletes racing for one entity, only the first reports it existed."""
+        first, second = await store.save_many([ExampleEntity(name="A"), ExampleEntity(name="B")])
+
+        deleted = await asyncio.gather(
+            store.delete(first.id), store.delete(first.id), store.delete_many([first.id, second.id])
+        )
+
+        assert deleted == [True, False, {second.id}]
+        assert len(store) == 0
+
+    async def test_concurrent_writes_share_fsyncs(self, store: FileExampleRepository) -> None:
+        """Writes arriving during a commit are made durable together."""
+        await asyncio.gather(*(store.save(ExampleEntity(name=f"E{i}")) for i in range(100)))
+
+        stats = store.stats()
+        assert stats.records == 100
+        assert stats.commits < 10
+        assert stats.records_per_commit > 10
+
+    async def test_compaction_folds_log_into_snapshot(self, tmp_path: Path) -> None:
+        """A full log is compacted, and the snapshot plus log restore everything."""
+        store = FileExampleRepository(tmp_path, compact_bytes=2000)
+        await store.open()
+        try:
+            for index in range(60):
+                await store.save(ExampleEntity(name=f"E{index}"))
+            kept = await store.list_page(100)
+            await store.delete(kept[0].id)
+            kept = kept[1:]
+            await store.compact()
+
+            stats = store.stats()
+            assert stats.compactions >= 1
+            assert stats.log_bytes < 2000
+            assert (tmp_path / "snapshot").exists()
+            assert not (tmp_path / "log.old").exists()
+            assert await contents(store) == kept
+        finally:
+            store = await reopen(store)
+        try:
+            assert await contents(store) == kept
+            assert len(store) == 59
+        finally:
+            await store.close()
+
+    async def test_listing_merges_snapshot_and_changes(self, tmp_path: Path) -> None:
+        """Pages over a snapshot with later saves, moves and deletes match plain memory."""
+        rng = random.Random(3)
+        base = datetime(2024, 1, 1, tzinfo=UTC)
+        store = FileExampleRepository(tmp_path)
+        objects = InMemoryExampleRepository()
+        await store.open()
+        try:
+            entities = [
+                ExampleEntity(name=f"E{i}", created_at=base + timedelta(seconds=rng.randrange(30)))
+                for i in range(80)
+            ]
+            await store.save_many(entities)
+            await objects.save_many(entities)
+            await store.compact()
+            for entity in rng.sample(entities, 20):
+                if rng.random() < 0.5:
+                    await store.delete(entity.id)
+                    await objects.delete(entity.id)
+                else:
+                    moved = replace(entity, created_at=base + timedelta(seconds=rng.randrange(30)))
+                    await store.save(moved)
+                    await objects.save(moved)
+
+            after = None
+            while page := await objects.list_page(9, after):
+                assert await store.list_page(9, after) == page
+                after = (page[-1].created_at, page[-1].id)
+            after_id = None
+            while page := await objects.list_page_by_id(9, after_id):
+                assert await store.list_page_by_id(9, after_id) == page
+                after_id = page[-1].id
+            assert len(store) == len(await objects.list_page(1000))
+        finally:
+            await store.close()
+
+    @pytest.mark.parametrize("cut", [1, 5, 9, 30, -1])
+    async def test_recovers_from_log_truncated_mid_record(self, tmp_path: Path, cut: int) -> None:
+        """A torn final record is discarded and later writes are kept."""
+        store = FileExampleRepository(tmp_path)
+        await store.open()
+        entities = [await store.save(ExampleEntity(name=f"E{i}")) for i in range(5)]
+        await store.close()
+        log = tmp_path / "log"
+        record_size = log.stat().st_size // 5
+        # Cut inside the last record: in its header, or part way into its payload
+        intact = record_size * 4
+        with log.open("r+b") as file:
+            file.truncate(intact + cut if cut > 0 else intact + record_size + cut)
+
+        store = FileExampleRepository(tmp_path)
+        await store.open()
+        try:
+            assert await contents(store) == entities[:4]
+            assert log.stat().st_size == intact
+            survivor = await store.save(ExampleEntity(name="after recovery"))
+        finally:
+            store = await reopen(store)
+        try:
+            assert await contents(store) == [*entities[:4], survivor]
+        finally:
+            await store.close()
+
+    async def test_discards_record_with_bad_checksum(self, tmp_path: Path) -> None:
+        """A record whose bytes changed after writing is discarded."""
+        store = FileExampleRepository(tmp_path)
+        await store.open()
+        first = await store.save(ExampleEntity(name="first"))
+        await store.save(ExampleEntity(name="second"))
+        await store.close()
+        log = tmp_path / "log"
+        data = bytearray(log.read_bytes())
+        data[-1] ^= 0xFF
+        log.write_bytes(bytes(data))
+
+        store = FileExampleRepository(tmp_path)
+        await store.open()
+        try:
+            assert await contents(store) == [first]
+        finally:
+            await store.close()
+
+    async def test_finishes_interrupted_compaction(self, tmp_path: Path) -> None:
+        """A log left aside by a crashed compaction is replayed before the newer log."""
+        store = FileExampleRepository(tmp_path)
+        await store.open()
+        entity = await store.save(ExampleEntity(name="old"))
+        await store.close()
+        (tmp_path / "log").rename(tmp_path / "older")
+        store = FileExampleRepository(tmp_path)
+        await store.open()
+        updated = await store.save(replace(entity, name="new"))
+        await store.close()
+        # What a crash mid-compaction leaves: the older log set aside, a newer one
+        (tmp_path / "older").rename(tmp_path / "log.old")
+
+        store = FileExampleRepository(tmp_path)
+        await store.open()
+        try:
+            assert await contents(store) == [updated]
+            assert not (tmp_path / "log.old").exists()
+            assert (tmp_path / "snapshot").exists()
+        finally:
+            await store.close()
+
+    async def test_directory_is_locked(self, store: FileExampleRepository) -> None:
+        """A second repository cannot open a directory in use."""
+        other = FileExampleRepository(store._directory)
+
+        with pytest.raises(RuntimeError, match="in use"):
+            await other.open()
+
+    async def test_writes_after_close_fail(self, tmp_path: Path) -> None:
+        """Writing to a closed repository raises instead of losing the write."""
+        store = FileExampleRepository(tmp_path)
+        await store.open()
+        await store.close()
+
+        with pytest.raises(RuntimeError):
+            await store.save(ExampleEntity(name="late"))
+
+    def test_selected_by_settings(self, tmp_path: Path) -> None:
+        """A file:// URL selects the file backend, which one process owns."""
+        settings = Settings(
+            database_url=f"file://{tmp_path}",
+            file_compact_bytes=1024,
+            cache_enabled=False,
+            search_enabled=False,
+            metrics_enabled=False,
+        )
+
+        repository = create_repository(settings)
+
+        assert isinstance(repository, FileExampleRepository)
+        assert repository._directory == tmp_path
+        assert is_process_shared(settings) is False
@@ -0,0 +1,72 @@
+"""Tests for the repository instrumentation layer."""
+
+from __future__ import annotations
+
+from uuid import UUID, uuid4
+
+import pytest
+
+from {{ cookiecutter.project_slug|replace('-', '_') }}.adapters.repositories import (
+    InMemoryExampleRepository,
+    InstrumentedExampleRepository,
+    create_repository,
+    find_layer,
+)
+from {{ cookiecutter.project_slug|replace('-', '_') }}.domain.entities import ExampleEntity
+from {{ cookiecutter.project_slug|replace('-', '_') }}.infrastructure.config import Settings
+from {{ cookiecutter.project_slug|replace('-', '_') }}.infrastructure.metrics import MetricsRegistry
+
+
+class FailingRepository(InMemoryExampleRepository):
+    """Repository whose deletes always fail."""
+
+    async def delete(self, entity_id: UUID) -> bool:  # noqa: ARG002
+        raise RuntimeError("storage down")
+
+
+class TestInstrumentedExampleRepository:
+    """Tests for InstrumentedExampleRepository."""
+
+    async def test_times_each_operation(self) -> None:
+        """Every forwarded call lands in its operation's histogram."""
+        registry = MetricsRegistry()
+        repository = InstrumentedExampleRepository(InMemoryExampleRepository(), registry)
+
+        entity = await repository.save(ExampleEntity(name="Timed"))
+        assert await repository.get_by_id(entity.id) == entity
+        await repository.get_by_id(uuid4())
+
+        rendered = registry.render()
+        assert 'repository_operation_duration_seconds_count{operation="get_by_id"} 2' in rendered
+        assert 'repository_operation_duration_seconds_count{operation="save"} 1' in rendered
+
+    async def test_times_iteration_once(self) -> None:
+        """A whole iteration, over several batches, is one observation."""
+        registry = MetricsRegistry()
+        repository = InstrumentedExampleRepository(InMemoryExampleRepository(), registry)
+        await repository.save_many([ExampleEntity(name=name) for name in "ABC"])
+
+        assert len([entity async for entity in repository.iterate(batch_size=2)]) == 3
+
+        rendered = registry.render()
+        assert 'repository_operation_duration_seconds_count{operation="iterate"} 1' in rendered
+
+    async def test_counts_errors(self) -> None:
+        """Failing calls are timed, counted and re-raised."""
+        registry = MetricsRegistry()
+        repository = InstrumentedExampleRepository(FailingRepository(), registry)
+
+        with pytest.raises(RuntimeError):
+            await repository.delete(uuid4())
+
+        rendered = registry.render()
+        assert 'repository_operation_errors_total{operation="delete"} 1' in rendered
+        assert 'repository_operation_duration_seconds_count{operation="delete"} 1' in rendered
+
+    def test_wraps_every_backend_when_enabled(self) -> None:
+        """create_repository instruments the outermost layer unless disabled."""
+        enabled = create_repository(Settings(database_url=None))
+        disabled = create_repository(Settings(database_url=None, metrics_enabled=False))
+
+        assert isinstance(enabled, InstrumentedExampleRepository)
+        assert find_layer(disabled, InstrumentedExampleRepository) is None
@@ -0,0 +1,223 @@
+"""Tests for the full-text index and the repository layer maintaining it."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+from dataclasses import replace
+from uuid import UUID, uuid4
+
+import pytest
+
+from {{ cookiecutter.project_slug|replace('-', '_') }}.adapters.repositories import (
+    InMemoryExampleRepository,
+    InvertedIndex,
+    SearchIndexedExampleRepository,
+    create_repository,
+    find_layer,
+)
+from {{ cookiecutter.project_slug|replace('-', '_') }}.adapters.repositories.search import (
+    QueryTerm,
+    parse_query,
+    tokenize,
+)
+from {{ cookiecutter.project_slug|replace('-', '_') }}.domain.entities import ExampleEntity
+from {{ cookiecutter.project_slug|replace('-', '_') }}.infrastructure.config import Settings
+
+
+def ids(hits: list[tuple[float, UUID]]) -> list[UUID]:
+    """The entity IDs of ranked index hits, best first."""
+    return [entity_id for _, entity_id in hits]
+
+
+def entity_ids(hits: list[tuple[float, ExampleEntity]]) -> list[UUID]:
+    """The entity IDs of ranked repository hits, best first."""
+    return [entity.id for _, entity in hits]
+
+
+class TestQueryParsing:
+    """Tests for tokenizing text and parsing queries."""
+
+    def test_tokenize_folds_case_and_splits_on_non_words(self) -> None:
+        """Words are case-folded runs of word characters."""
+        assert tokenize("Blue-green WIDGET, v2 Straße") == [
+            "blue",
+            "green",
+            "widget",
+            "v2",
+            "strasse",
+        ]
+
+    def test_parse_query(self) -> None:
+        """A trailing star marks a prefix term; duplicates collapse."""
+        assert parse_query("Blue wid* blue") == [QueryTerm("blue"), QueryTerm("wid", prefix=True)]
+
+    def test_query_without_words_is_rejected(self) -> None:
+        """Queries made only of punctuation raise ValueError."""
+        with pytest.raises(ValueError, match="at least one word"):
+            parse_query("*** ??")
+
+
+class TestInvertedIndex:
+    """Tests for InvertedIndex."""
+
+    @pytest.fixture
+    def entities(self) -> dict[str, ExampleEntity]:
+        """A few entities with overlapping words."""
+        return {
+            "widget": ExampleEntity(name="Blue widget", description="A small gadget"),
+            "gadget": ExampleEntity(name="Gadget", description="Blue and widely used"),
+            "window": ExampleEntity(name="Window", description="Glass pane"),
+        }
+
+    @pytest.fixture
+    def index(self, entities: dict[str, ExampleEntity]) -> InvertedIndex:
+        """An index of ``entities``."""
+        index = InvertedIndex()
+        for entity in entities.values():
+            index.add(entity)
+        return index
+
+    def test_terms_must_all_match(
+        self, index: InvertedIndex, entities: dict[str, ExampleEntity]
+    ) -> None:
+        """Multi-word queries only return entities containing every word."""
+        assert set(ids(index.search("blue gadget", 10))) == {
+            entities["gadget"].id,
+            entities["widget"].id,
+        }
+        assert index.search("blue glass", 10) == []
+        assert index.search("nothing", 10) == []
+
+    def test_name_matches_rank_first(
+        self, index: InvertedIndex, entities: dict[str, ExampleEntity]
+    ) -> None:
+        """A word in the name outweighs the same word in the description."""
+        hits = index.search("gadget", 10)
+
+        assert ids(hits) == [entities["gadget"].id, entities["widget"].id]
+        assert hits[0][0] > hits[1][0]
+
+    def test_prefix_terms(self, index: InvertedIndex, entities: dict[str, ExampleEntity]) -> None:
+        """``wid*`` matches widget and widely; a bare prefix matches nothing."""
+        assert set(ids(index.search("wid*", 10))) == {entities["widget"].id, entities["gadget"].id}
+        assert index.search("wid", 10) == []
+        assert ids(index.search("w* pane", 10)) == [entities["window"].id]
+
+    def test_updates_and_removals(
+        self, index: InvertedIndex, entities: dict[str, ExampleEntity]
+    ) -> None:
+        """Re-adding replaces an entity's words; removing drops it."""
+        renamed = replace(entities["window"], name="Blue door", description="")
+        index.add(renamed)
+        assert index.search("window", 10) == []
+        assert entities["window"].id in ids(index.search("blue", 10))
+
+        assert index.remove(entities["widget"].id) is True
+        assert index.remove(entities["widget"].id) is False
+        assert entities["widget"].id not in ids(index.search("blue", 10))
+        assert len(index) == 2
+
+    def test_pages_continue_after_cursor(self) -> None:
+        """Results after a ``(score, id)`` position continue the ranking."""
+        index = InvertedIndex()
+        for number in range(25):
+            index.add(
+                ExampleEntity(name=f"item {number}", description="item" if number % 2 else "")
+            )
+        ranking = index.search("item", 100)
+
+        pages: list[tuple[float, UUID]] = []
+        after = None
+        while page := index.search("item", 7, after):
+            pages.extend(page)
+            after = page[-1]
+
+        assert pages == ranking
+        assert len(ranking) == 25
+
+    def test_compaction_keeps_results(self) -> None:
+        """Dropping dead postings after many removals changes no results."""
+        index = InvertedIndex()
+        keep = [ExampleEntity(name=f"keep {number}") for number in range(100)]
+        for entity in keep:
+            index.add(entity)
+        for _ in range(3):
+            churn = [ExampleEntity(name="churn keep") for _ in range(1000)]
+            for entity in churn:
+                index.add(entity)
+            for entity in churn:
+                index.remove(entity.id)
+
+        assert len(index._dead) < 1024
+        assert sorted(ids(index.search("keep", 1000))) == sorted(entity.id for entity in keep)
+        assert index.search("churn", 10) == []
+
+
+class SlowIteratingRepository(InMemoryExampleRepository):
+    """In-memory repository yielding to the event loop between iterated entities."""
+
+    async def iterate(self, batch_size: int = 1000) -> AsyncIterator[ExampleEntity]:
+        async for entity in super().iterate(batch_size):
+            await asyncio.sleep(0)
+            yield entity
+
+
+class TestSearchIndexedExampleRepository:
+    """Tests for SearchIndexedExampleRepository."""
+
+    async def test_first_search_indexes_existing_entities(self) -> None:
+        """Entities stored before open are indexed by the first search, not by open."""
+        inner = InMemoryExampleRepository()
+        stored = await inner.save(ExampleEntity(name="Existing widget"))
+        repository = SearchIndexedExampleRepository(inner)
+        await repository.open()
+
+        assert repository.stats().entities == 0
+        assert entity_ids(await repository.search("widget", 10)) == [stored.id]
+        assert repository.stats().entities == 1
+
+    async def test_writes_during_the_build_are_indexed(self) -> None:
+        """Saves and deletes made while the index is being built are not lost."""
+        inner = SlowIteratingRepository()
+        doomed = await inner.save(ExampleEntity(name="Blue doomed"))
+        await inner.save_many([ExampleEntity(name=f"Blue {n}") for n in range(50)])
+        repository = SearchIndexedExampleRepository(inner)
+        await repository.open()
+
+        async def write() -> ExampleEntity:
+            await asyncio.sleep(0)
+            await repository.delete(doomed.id)
+            return await repository.save(ExampleEntity(name="Blue latecomer"))
+
+        hits, added = await asyncio.gather(repository.search("blue", 100), write())
+
+        ids_now = set(entity_ids(await repository.search("blue", 100)))
+        assert added.id in ids_now
+        assert doomed.id not in ids_now
+        assert len(ids_now) == 51
+        assert len(hits) >= 50
+
+    async def test_writes_update_the_index(self) -> None:
+        """Saves, batch saves and deletes are reflected in results."""
+        repository = SearchIndexedExampleRepository(InMemoryExampleRepository())
+        await repository.open()
+        first = await repository.save(ExampleEntity(name="Red lamp"))
+        others = await repository.save_many(
+            [ExampleEntity(name="Red chair"), ExampleEntity(name="Red desk")]
+        )
+
+        assert len(await repository.search("red", 10)) == 3
+        assert await repository.delete(first.id) is True
+        assert await repository.delete_many([others[0].id, uuid4()]) == {others[0].id}
+        assert entity_ids(await repository.search("red", 10)) == [others[1].id]
+
+    def test_added_by_settings(self) -> None:
+        """search_enabled adds the layer, except with several workers."""
+        enabled = create_repository(Settings(database_url=None, metrics_enabled=False))
+        multiworker = create_repository(
+            Settings(database_url=None, metrics_enabled=False, workers=4)
+        )
+
+        assert find_layer(enabled, SearchIndexedExampleRepository) is not None
+        assert find_layer(multiworker, SearchIndexedExampleRepository) is None
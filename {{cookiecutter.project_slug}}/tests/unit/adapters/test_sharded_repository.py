@@ -0,0 +1,208 @@
+"""Tests for the lock-striped in-memory repository."""
+
+from __future__ import annotations
+
+import random
+import sys
+import threading
+from collections.abc import Iterator
+from dataclasses import replace
+from datetime import UTC, datetime, timedelta
+from uuid import uuid4
+
+import pytest
+
+from {{ cookiecutter.project_slug|replace('-', '_') }}.adapters.repositories import (
+    InMemoryExampleRepository,
+    ShardedExampleRepository,
+    create_repository,
+)
+from {{ cookiecutter.project_slug|replace('-', '_') }}.domain.entities import ExampleEntity
+from {{ cookiecutter.project_slug|replace('-', '_') }}.infrastructure.config import Settings
+
+
+@pytest.fixture
+def sharded() -> ShardedExampleRepository:
+    """Provide a fresh sharded repository."""
+    return ShardedExampleRepository(shards=4)
+
+
+@pytest.fixture
+def fast_switching() -> Iterator[None]:
+    """Switch threads as often as possible, to surface races."""
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
+
+
+class TestShardedExampleRepository:
+    """Tests for ShardedExampleRepository."""
+
+    def test_shard_count_rounds_up_to_power_of_two(self) -> None:
+        """Shard counts are powers of two so a mask selects the shard."""
+        assert ShardedExampleRepository(shards=1).shard_count == 1
+        assert ShardedExampleRepository(shards=5).shard_count == 8
+        with pytest.raises(ValueError):
+            ShardedExampleRepository(shards=0)
+
+    async def test_crud(self, sharded: ShardedExampleRepository) -> None:
+        """Entities are stored, retrieved and removed across shards."""
+        entities = await sharded.save_many([ExampleEntity(name=f"E{i}") for i in range(20)])
+
+        assert await sharded.get_by_id(entities[0].id) == entities[0]
+        assert await sharded.get_many([e.id for e in entities]) == {e.id: e for e in entities}
+        assert await sharded.delete(entities[0].id) is True
+        assert await sharded.delete(entities[0].id) is False
+        assert await sharded.delete_many([e.id for e in entities[:5]]) == {
+            e.id for e in entities[1:5]
+        }
+        assert len(sharded) == 15
+
+    async def test_listing_matches_object_layout(self, sharded: ShardedExampleRepository) -> None:
+        """Merged shard pages match the single-dict repository exactly."""
+        rng = random.Random(7)
+        base = datetime(2024, 1, 1, tzinfo=UTC)
+        objects = InMemoryExampleRepository()
+        entities = [
+            ExampleEntity(name=f"E{i}", created_at=base + timedelta(seconds=rng.randrange(20)))
+            for i in range(100)
+        ]
+        await sharded.save_many(entities)
+        await objects.save_many(entities)
+        moved = replace(entities[10], created_at=base - timedelta(seconds=1))
+        await sharded.save(moved)
+        await objects.save(moved)
+
+        after = None
+        while page := await objects.list_page(7, after):
+            assert await sharded.list_page(7, after) == page
+            after = (page[-1].created_at, page[-1].id)
+        assert [e async for e in sharded.iterate(9)] == await objects.list_page(1000)
+        by_id = await objects.list_page_by_id(1000)
+        assert await sharded.list_page_by_id(7, by_id[20].id) == by_id[21:28]
+
+    def test_compare_and_save(self, sharded: ShardedExampleRepository) -> None:
+        """Saves only succeed against the expected stored version."""
+        entity = ExampleEntity(name="v1")
+        assert sharded.compare_and_save_sync(entity, None) is True
+        assert sharded.compare_and_save_sync(entity, None) is False
+
+        updated = replace(entity, name="v2")
+        assert sharded.compare_and_save_sync(updated, entity) is True
+        assert sharded.compare_and_save_sync(replace(entity, name="v3"), entity) is False
+        assert sharded.get_sync(entity.id) == updated
+
+    def test_compare_and_delete(self, sharded: ShardedExampleRepository) -> None:
+        """Deletes only succeed against the expected stored version."""
+        entity = sharded.save_sync(ExampleEntity(name="v1"))
+
+        assert sharded.compare_and_delete_sync(replace(entity, name="stale")) is False
+        assert sharded.compare_and_delete_sync(entity) is True
+        assert sharded.compare_and_delete_sync(entity) is False
+        assert sharded.get_sync(entity.id) is None
+
+    async def test_compare_by_version(self, sharded: ShardedExampleRepository) -> None:
+        """The async conditional writes compare the stored version."""
+        entity = sharded.save_sync(ExampleEntity(name="v1"))
+        updated = replace(entity, name="v2", updated_at=entity.created_at + timedelta(seconds=1))
+
+        assert await sharded.compare_and_save(updated, entity.version) is True
+        assert await sharded.compare_and_save(entity, entity.version) is False
+        assert await sharded.compare_and_delete(entity.id, entity.version) is False
+        assert await sharded.compare_and_delete(entity.id, updated.version) is True
+        assert sharded.get_sync(entity.id) is None
+
+    @pytest.mark.usefixtures("fast_switching")
+    def test_concurrent_compare_and_save_loses_no_updates(self) -> None:
+        """Threads incrementing shared counters by CAS never lose an increment."""
+        repository = ShardedExampleRepository(shards=4)
+        counters = [repository.save_sync(ExampleEntity(name="0")) for _ in range(8)]
+        threads, increments = 8, 300
+        start = threading.Barrier(threads)
+
+        def worker(index: int) -> None:
+            rng = random.Random(index)
+            start.wait()
+            for _ in range(increments):
+                entity_id = rng.choice(counters).id
+                while True:
+                    current = repository.get_sync(entity_id)
+                    assert current is not None
+                    if repository.compare_and_save_sync(
+                        replace(current, name=str(int(current.name) + 1)), current
+                    ):
+                        break
+
+        pool = [threading.Thread(target=worker, args=(index,)) for index in range(threads)]
+        for thread in pool:
+            thread.start()
+        for thread in pool:
+            thread.join()
+
+        total = sum(int(entity.name) for entity in repository.list_sync(100))
+        assert total == threads * increments
+
+    @pytest.mark.usefixtures("fast_switching")
+    def test_concurrent_writers_keep_index_consistent(self) -> None:
+        """Concurrent saves, moves and deletes leave the index matching the data."""
+        repository = ShardedExampleRepository(shards=4)
+        base = datetime(2024, 1, 1, tzinfo=UTC)
+        ids = [uuid4() for _ in range(64)]
+        claimed = [0] * len(ids)
+        lock = threading.Lock()
+        start = threading.Barrier(6)
+
+        def worker(seed: int) -> None:
+            rng = random.Random(seed)
+            start.wait()
+            for step in range(500):
+                entity_id = rng.choice(ids)
+                if rng.random() < 0.3:
+                    current = repository.get_sync(entity_id)
+                    if current is not None and repository.compare_and_delete_sync(current):
+                        with lock:
+                            claimed[ids.index(entity_id)] -= 1
+                    continue
+                created = base + timedelta(seconds=rng.randrange(100))
+                entity = ExampleEntity(id=entity_id, name=f"{seed}-{step}", created_at=created)
+                if repository.compare_and_save_sync(entity, None):
+                    with lock:
+                        claimed[ids.index(entity_id)] += 1
+                elif (current := repository.get_sync(entity_id)) is not None:
+                    # Moves only succeed on the version just read
+                    repository.compare_and_save_sync(entity, current)
+
+        pool = [threading.Thread(target=worker, args=(seed,)) for seed in range(6)]
+        for thread in pool:
+            thread.start()
+        for thread in pool:
+            thread.join()
+
+        listed = repository.list_sync(1000)
+        keys = [(entity.created_at, entity.id) for entity in listed]
+        assert keys == sorted(keys)
+        assert [entity.id for entity in repository.list_by_id_sync(1000)] == sorted(
+            key[1] for key in keys
+        )
+        assert len(listed) == len(repository) == sum(claimed)
+        assert all(count in (0, 1) for count in claimed)
+        assert {entity.id for entity in listed} == {
+            ids[i] for i, count in enumerate(claimed) if count
+        }
+
+    def test_selected_by_settings(self) -> None:
+        """memory_layout=sharded selects the sharded backend."""
+        repository = create_repository(
+            Settings(
+                database_url=None,
+                memory_layout="sharded",
+                memory_shards=32,
+                cache_enabled=False,
+                search_enabled=False,
+                metrics_enabled=False,
+            )
+        )
+
+        assert isinstance(repository, ShardedExampleRepository)
+        assert repository.shard_count == 32
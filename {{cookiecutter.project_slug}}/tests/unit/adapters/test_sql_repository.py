@@ -0,0 +1,264 @@
+"""Tests for the SQL repository against a local SQLite file."""
+
+from __future__ import annotations
+
+from collections.abc import AsyncGenerator
+from dataclasses import replace
+from datetime import UTC, datetime
+from pathlib import Path
+from uuid import uuid4
+
+import pytest
+
+from {{ cookiecutter.project_slug|replace('-', '_') }}.adapters.repositories import (
+    CachedExampleRepository,
+    InMemoryExampleRepository,
+    create_repository,
+    is_process_shared,
+)
+from {{ cookiecutter.project_slug|replace('-', '_') }}.adapters.repositories.sql import SqlExampleRepository
+from {{ cookiecutter.project_slug|replace('-', '_') }}.domain.entities import ExampleEntity, uuid7
+from {{ cookiecutter.project_slug|replace('-', '_') }}.infrastructure.config import Settings
+from {{ cookiecutter.project_slug|replace('-', '_') }}.infrastructure.database import async_database_url
+
+
+def sqlite_settings(path: Path) -> Settings:
+    """Settings pointing at a SQLite file standing in for PostgreSQL."""
+    return Settings(
+        database_url=f"sqlite:///{path}",
+        database_pool_size=2,
+        cache_enabled=False,
+        search_enabled=False,
+        coalesce_reads=False,
+        metrics_enabled=False,
+    )
+
+
+@pytest.fixture
+async def sql_repository(tmp_path: Path) -> AsyncGenerator[SqlExampleRepository, None]:
+    """Provide an opened SQL repository on a fresh SQLite file."""
+    repository = create_repository(sqlite_settings(tmp_path / "test.db"))
+    assert isinstance(repository, SqlExampleRepository)
+    await repository.open()
+    yield repository
+    await repository.close()
+
+
+class TestSqlExampleRepository:
+    """Tests for SqlExampleRepository."""
+
+    async def test_save_and_get(self, sql_repository: SqlExampleRepository) -> None:
+        """Saved entity round-trips with identity and timestamps intact."""
+        entity = ExampleEntity(name="Test", description="A test entity")
+        await sql_repository.save(entity)
+
+        loaded = await sql_repository.get_by_id(entity.id)
+
+        assert loaded == entity
+
+    async def test_get_unknown_returns_none(self, sql_repository: SqlExampleRepository) -> None:
+        """Unknown ID returns None."""
+        assert await sql_repository.get_by_id(uuid4()) is None
+
+    async def test_save_updates_existing(self, sql_repository: SqlExampleRepository) -> None:
+        """Saving an existing ID updates it in place."""
+        entity = ExampleEntity(name="Before")
+        await sql_repository.save(entity)
+        await sql_repository.save(
+            ExampleEntity(id=entity.id, created_at=entity.created_at, name="After")
+        )
+
+        loaded = await sql_repository.get_by_id(entity.id)
+
+        assert loaded is not None
+        assert loaded.name == "After"
+
+    async def test_get_version(self, sql_repository: SqlExampleRepository) -> None:
+        """The version is read without loading the entity."""
+        entity = await sql_repository.save(ExampleEntity(name="Versioned"))
+        assert await sql_repository.get_version(entity.id) == entity.created_at
+
+        updated = await sql_repository.save(replace(entity, updated_at=datetime.now(UTC)))
+
+        assert await sql_repository.get_version(entity.id) == updated.updated_at
+        assert await sql_repository.get_version(uuid4()) is None
+
+    async def test_delete(self, sql_repository: SqlExampleRepository) -> None:
+        """Delete reports whether a row was removed."""
+        entity = await sql_repository.save(ExampleEntity(name="To Delete"))
+
+        assert await sql_repository.delete(entity.id) is True
+        assert await sql_repository.delete(entity.id) is False
+        assert await sql_repository.get_by_id(entity.id) is None
+
+    async def test_compare_and_save_and_delete(self, sql_repository: SqlExampleRepository) -> None:
+        """Conditional writes only match a row still at the expected version."""
+        entity = await sql_repository.save(ExampleEntity(name="v1"))
+        updated = replace(entity, name="v2", updated_at=datetime.now(UTC))
+
+        assert await sql_repository.compare_and_save(updated, entity.version) is True
+        assert (
+            await sql_repository.compare_and_save(replace(entity, name="v3"), entity.version)
+            is False
+        )
+        assert await sql_repository.get_by_id(entity.id) == updated
+        assert await sql_repository.compare_and_delete(entity.id, entity.version) is False
+        assert await sql_repository.compare_and_delete(entity.id, updated.version) is True
+        assert await sql_repository.compare_and_save(updated, updated.version) is False
+
+    async def test_data_survives_reopen(self, tmp_path: Path) -> None:
+        """Entities persist across repository (process) restarts."""
+        settings = sqlite_settings(tmp_path / "persist.db")
+        first = create_repository(settings)
+        await first.open()
+        entity = await first.save(ExampleEntity(name="Durable"))
+        await first.close()
+
+        second = create_repository(settings)
+        await second.open()
+        try:
+            assert await second.get_by_id(entity.id) == entity
+        finally:
+            await second.close()
+
+    async def test_file_database_uses_wal(self, sql_repository: SqlExampleRepository) -> None:
+        """SQLite files use write-ahead logging so processes can share them."""
+        from sqlalchemy import text
+
+        async with sql_repository.engine.connect() as conn:
+            mode = (await conn.execute(text("PRAGMA journal_mode"))).scalar()
+
+        assert mode == "wal"
+
+    async def test_engines_share_one_file(self, tmp_path: Path) -> None:
+        """Writes through one engine (worker) are seen by another at once."""
+        settings = sqlite_settings(tmp_path / "shared.db")
+        first, second = create_repository(settings), create_repository(settings)
+        await first.open()
+        await second.open()
+        try:
+            entity = await first.save(ExampleEntity(name="Shared"))
+            assert await second.get_by_id(entity.id) == entity
+            await second.delete(entity.id)
+            assert await first.get_by_id(entity.id) is None
+        finally:
+            await first.close()
+            await second.close()
+
+
+class TestCreateRepository:
+    """Tests for repository selection by URL scheme."""
+
+    def test_no_url_selects_memory(self) -> None:
+        """Without DATABASE_URL the in-memory repository is used."""
+        repository = create_repository(
+            Settings(
+                database_url=None,
+                cache_enabled=False,
+                search_enabled=False,
+                metrics_enabled=False,
+            )
+        )
+
+        assert isinstance(repository, InMemoryExampleRepository)
+
+    def test_unknown_scheme_raises(self) -> None:
+        """Unsupported schemes are rejected."""
+        with pytest.raises(ValueError, match="Unsupported"):
+            create_repository(Settings(database_url="mongodb://localhost/db"))
+
+    def test_plain_urls_use_async_drivers(self) -> None:
+        """Plain URLs are mapped onto async drivers."""
+        assert async_database_url("postgresql://u:p@db/app") == "postgresql+asyncpg://u:p@db/app"
+        assert async_database_url("sqlite:///app.db") == "sqlite+aiosqlite:///app.db"
+
+    def test_process_shared_storage(self) -> None:
+        """Only databases outside the process are shared between workers."""
+        assert not is_process_shared(Settings(database_url=None))
+        assert not is_process_shared(Settings(database_url="sqlite://"))
+        assert is_process_shared(Settings(database_url="sqlite:///app.db"))
+        assert is_process_shared(Settings(database_url="postgresql://u:p@db/app"))
+
+    def test_multiple_workers_cache_only_with_ttl(self, tmp_path: Path) -> None:
+        """Workers skip the cache unless a TTL bounds cross-worker staleness."""
+        url = f"sqlite:///{tmp_path / 'app.db'}"
+        settings = Settings(
+            database_url=url, workers=4, coalesce_reads=False, metrics_enabled=False
+        )
+
+        uncached = create_repository(settings)
+        cached = create_repository(settings.model_copy(update={"cache_ttl_seconds": 1.0}))
+
+        assert isinstance(uncached, SqlExampleRepository)
+        assert isinstance(cached, CachedExampleRepository)
+
+
+class TestSqlExampleRepositoryBatch:
+    """Tests for SqlExampleRepository batch operations."""
+
+    async def test_save_many_and_get_many(self, sql_repository: SqlExampleRepository) -> None:
+        """Batches larger than one statement round-trip completely."""
+        from {{ cookiecutter.project_slug|replace('-', '_') }}.adapters.repositories.sql import BATCH_ROWS
+
+        entities = [ExampleEntity(name=f"Entity {i}") for i in range(BATCH_ROWS + 10)]
+        await sql_repository.save_many(entities)
+
+        found = await sql_repository.get_many([entity.id for entity in entities] + [uuid4()])
+
+        assert found == {entity.id: entity for entity in entities}
+
+    async def test_save_many_keeps_last_duplicate(
+        self, sql_repository: SqlExampleRepository
+    ) -> None:
+        """Repeated IDs in one batch resolve to the last version."""
+        entity = ExampleEntity(name="First")
+        updated = ExampleEntity(id=entity.id, created_at=entity.created_at, name="Second")
+
+        await sql_repository.save_many([entity, updated])
+
+        assert await sql_repository.get_by_id(entity.id) == updated
+
+    async def test_delete_many(self, sql_repository: SqlExampleRepository) -> None:
+        """Batch delete returns only the IDs that existed."""
+        entities = await sql_repository.save_many(
+            [ExampleEntity(name="A"), ExampleEntity(name="B")]
+        )
+        unknown = uuid4()
+
+        deleted = await sql_repository.delete_many([entities[0].id, unknown])
+
+        assert deleted == {entities[0].id}
+        assert await sql_repository.get_many([e.id for e in entities]) == {
+            entities[1].id: entities[1]
+        }
+
+    async def test_list_page_seeks_past_key(self, sql_repository: SqlExampleRepository) -> None:
+        """Pages are ordered by (created_at, id) and start after the given key."""
+        entities = await sql_repository.save_many([ExampleEntity(name=f"E{i}") for i in range(5)])
+        ordered = sorted(entities, key=lambda entity: (entity.created_at, entity.id))
+
+        first = await sql_repository.list_page(2)
+        rest = await sql_repository.list_page(10, (first[-1].created_at, first[-1].id))
+
+        assert first + rest == ordered
+
+    async def test_list_page_by_id_seeks_past_id(
+        self, sql_repository: SqlExampleRepository
+    ) -> None:
+        """ID-ordered pages follow UUID order, for random and time-ordered IDs alike."""
+        entities = await sql_repository.save_many(
+            [ExampleEntity(name=f"E{i}", id=uuid4() if i % 2 else uuid7()) for i in range(8)]
+        )
+        ordered = sorted(entities, key=lambda entity: entity.id)
+
+        first = await sql_repository.list_page_by_id(3)
+        rest = await sql_repository.list_page_by_id(10, first[-1].id)
+
+        assert first + rest == ordered
+
+    async def test_iterate_in_batches(self, sql_repository: SqlExampleRepository) -> None:
+        """Iteration returns every row once, in keyset order."""
+        entities = await sql_repository.save_many([ExampleEntity(name=f"E{i}") for i in range(5)])
+        ordered = sorted(entities, key=lambda entity: (entity.created_at, entity.id))
+
+        assert [entity async for entity in sql_repository.iterate(batch_size=2)] == ordered
@@ -0,0 +1,211 @@
+"""Tests for the write-behind buffering layer."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Sequence
+from dataclasses import replace
+from datetime import timedelta
+from uuid import UUID
+
+import pytest
+
+from {{ cookiecutter.project_slug|replace('-', '_') }}.adapters.repositories import (
+    InMemoryExampleRepository,
+    WriteBehindExampleRepository,
+    create_repository,
+    find_layer,
+)
+from {{ cookiecutter.project_slug|replace('-', '_') }}.domain.entities import ExampleEntity
+from {{ cookiecutter.project_slug|replace('-', '_') }}.infrastructure.config import Settings
+from {{ cookiecutter.project_slug|replace('-', '_') }}.infrastructure.metrics import MetricsRegistry
+
+_SECOND = timedelta(seconds=1)
+
+
+class RecordingRepository(InMemoryExampleRepository):
+    """Repository recording the batches written to it, optionally failing."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.batches: list[list[UUID]] = []
+        self.failing = False
+
+    async def save_many(self, entities: Sequence[ExampleEntity]) -> list[ExampleEntity]:
+        if self.failing:
+            raise RuntimeError("storage down")
+        self.batches.append([entity.id for entity in entities])
+        return await super().save_many(entities)
+
+
+@pytest.fixture
+def inner() -> RecordingRepository:
+    return RecordingRepository()
+
+
+@pytest.fixture
+def registry() -> MetricsRegistry:
+    return MetricsRegistry()
+
+
+@pytest.fixture
+def buffered(inner: RecordingRepository, registry: MetricsRegistry) -> WriteBehindExampleRepository:
+    """Write-behind layer that only flushes when asked (or when full)."""
+    return WriteBehindExampleRepository(
+        inner, flush_size=3, flush_interval=3600, max_pending=5, registry=registry
+    )
+
+
+class TestWriteBehindExampleRepository:
+    """Tests for WriteBehindExampleRepository."""
+
+    async def test_writes_are_acknowledged_then_flushed(
+        self, inner: RecordingRepository, buffered: WriteBehindExampleRepository
+    ) -> None:
+        """Saves return before storage sees them; reads see them at once."""
+        entity = await buffered.save(ExampleEntity(name="Buffered"))
+
+        assert await inner.get_by_id(entity.id) is None
+        assert await buffered.get_by_id(entity.id) == entity
+        assert await buffered.get_many([entity.id]) == {entity.id: entity}
+        assert buffered.depth() == 1
+
+        await buffered.flush()
+
+        assert await inner.get_by_id(entity.id) == entity
+        assert buffered.stats().depth == 0
+
+    async def test_repeated_saves_coalesce(
+        self, inner: RecordingRepository, buffered: WriteBehindExampleRepository
+    ) -> None:
+        """Only the latest version of an entity is written."""
+        entity = ExampleEntity(name="v1")
+        await buffered.save(entity)
+        latest = ExampleEntity(id=entity.id, created_at=entity.created_at, name="v2")
+        await buffered.save(latest)
+
+        await buffered.flush()
+
+        assert inner.batches == [[entity.id]]
+        assert await inner.get_by_id(entity.id) == latest
+
+    async def test_buffered_delete(
+        self, inner: RecordingRepository, buffered: WriteBehindExampleRepository
+    ) -> None:
+        """Deletes hide buffered and stored entities alike."""
+        stored = await inner.save(ExampleEntity(name="Stored"))
+        pending = await buffered.save(ExampleEntity(name="Pending"))
+
+        assert await buffered.delete(stored.id) is True
+        assert await buffered.delete_many([pending.id, stored.id]) == {pending.id}
+        assert await buffered.get_by_id(stored.id) is None
+        assert await buffered.get_by_id(pending.id) is None
+
+        await buffered.flush()
+
+        assert await inner.get_by_id(stored.id) is None
+        assert await inner.get_by_id(pending.id) is None
+
+    async def test_compare_and_save(
+        self, inner: RecordingRepository, buffered: WriteBehindExampleRepository
+    ) -> None:
+        """Buffered entities are compared in the buffer, others by storage."""
+        stored = await inner.save(ExampleEntity(name="Stored"))
+        pending = await buffered.save(ExampleEntity(name="Pending"))
+        changed = replace(pending, name="Changed", updated_at=pending.created_at + _SECOND)
+
+        assert await buffered.compare_and_save(changed, pending.version) is True
+        assert await buffered.compare_and_save(pending, pending.version) is False
+        assert await buffered.get_by_id(pending.id) == changed
+        assert await buffered.compare_and_delete(stored.id, stored.version) is True
+        assert await inner.get_by_id(stored.id) is None
+        assert await buffered.compare_and_delete(pending.id, changed.version) is True
+        assert await buffered.get_by_id(pending.id) is None
+
+    async def test_listing_includes_buffered_writes(
+        self, buffered: WriteBehindExampleRepository
+    ) -> None:
+        """Listing and iteration flush first."""
+        entity = await buffered.save(ExampleEntity(name="Listed"))
+
+        assert await buffered.list_page(10) == [entity]
+        assert [item async for item in buffered.iterate()] == [entity]
+
+    async def test_flush_by_size_and_interval(self, inner: RecordingRepository) -> None:
+        """The background flusher writes full batches promptly and stragglers on time."""
+        repository = WriteBehindExampleRepository(
+            inner, flush_size=3, flush_interval=0.05, registry=MetricsRegistry()
+        )
+        await repository.open()
+        try:
+            await repository.save_many([ExampleEntity(name=f"E{i}") for i in range(3)])
+            await asyncio.sleep(0.01)
+            assert len(inner.batches) == 1
+
+            await repository.save(ExampleEntity(name="Straggler"))
+            await asyncio.sleep(0.1)
+            assert len(inner.batches) == 2
+        finally:
+            await repository.close()
+
+    async def test_close_drains(self, inner: RecordingRepository) -> None:
+        """Nothing acknowledged is lost on shutdown."""
+        repository = WriteBehindExampleRepository(
+            inner, flush_interval=3600, registry=MetricsRegistry()
+        )
+        await repository.open()
+        entities = [await repository.save(ExampleEntity(name=f"E{i}")) for i in range(10)]
+
+        await repository.close()
+
+        assert await inner.get_many([entity.id for entity in entities]) == {
+            entity.id: entity for entity in entities
+        }
+
+    async def test_failed_flush_keeps_batch(
+        self,
+        inner: RecordingRepository,
+        buffered: WriteBehindExampleRepository,
+        registry: MetricsRegistry,
+    ) -> None:
+        """A failed batch stays buffered, under newer writes, for the next flush."""
+        entity = await buffered.save(ExampleEntity(name="v1"))
+        inner.failing = True
+        with pytest.raises(RuntimeError):
+            await buffered.flush()
+        latest = await buffered.save(
+            ExampleEntity(id=entity.id, created_at=entity.created_at, name="v2")
+        )
+
+        inner.failing = False
+        await buffered.flush()
+
+        assert await inner.get_by_id(entity.id) == latest
+        assert buffered.stats().errors == 1
+        assert "repository_write_buffer_flush_errors_total 1" in registry.render()
+
+    async def test_full_buffer_applies_backpressure(
+        self, inner: RecordingRepository, buffered: WriteBehindExampleRepository
+    ) -> None:
+        """Writers flush themselves rather than exceed max_pending."""
+        for i in range(6):
+            await buffered.save(ExampleEntity(name=f"E{i}"))
+
+        assert inner.batches and len(inner.batches[0]) == 5
+        assert buffered.depth() == 1
+
+    async def test_depth_gauge(
+        self, buffered: WriteBehindExampleRepository, registry: MetricsRegistry
+    ) -> None:
+        """Queue depth is exported as a gauge."""
+        await buffered.save(ExampleEntity(name="Queued"))
+
+        assert "repository_write_buffer_depth 1" in registry.render()
+
+    def test_create_repository_opt_in(self) -> None:
+        """Write-behind is off unless enabled."""
+        default = create_repository(Settings(metrics_enabled=False))
+        enabled = create_repository(Settings(write_behind_enabled=True, metrics_enabled=False))
+
+        assert find_layer(default, WriteBehindExampleRepository) is None
+        assert find_layer(enabled, WriteBehindExampleRepository) is not None
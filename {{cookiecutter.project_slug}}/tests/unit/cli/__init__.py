@@ -0,0 +1 @@
+"""Unit tests for CLI presentation layer."""
@@ -0,0 +1,94 @@
+"""Tests for the load generator behind the loadtest command."""
+
+from __future__ import annotations
+
+import random
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from {{ cookiecutter.project_slug|replace('-', '_') }}.api.main import app
+from {{ cookiecutter.project_slug|replace('-', '_') }}.cli.loadtest import (
+    LatencyHistogram,
+    LoadGenerator,
+    parse_mix,
+    run_closed_loop,
+    run_open_loop,
+)
+
+
+class TestParseMix:
+    """Tests for parse_mix."""
+
+    def test_parses_weights(self) -> None:
+        """Each operation maps to its weight."""
+        assert parse_mix("create=1, get=8,delete=0.5") == {"create": 1.0, "get": 8.0, "delete": 0.5}
+
+    @pytest.mark.parametrize("spec", ["update=1", "get=x", "get=-1", "get=0,create=0"])
+    def test_rejects_invalid_mix(self, spec: str) -> None:
+        """Unknown operations, bad weights and all-zero mixes are rejected."""
+        with pytest.raises(ValueError):
+            parse_mix(spec)
+
+
+class TestLatencyHistogram:
+    """Tests for LatencyHistogram."""
+
+    def test_percentiles(self) -> None:
+        """Percentiles pick the sample at the matching rank."""
+        histogram = LatencyHistogram()
+        for millis in range(1, 1001):
+            histogram.record(millis / 1000)
+
+        assert histogram.percentile(50) == 0.5
+        assert histogram.percentile(99) == 0.99
+        assert histogram.percentile(99.9) == 0.999
+        assert histogram.percentile(100) == 1.0
+
+    def test_values_keep_three_significant_digits(self) -> None:
+        """Samples are rounded up to three significant digits."""
+        histogram = LatencyHistogram()
+        histogram.record(1.23456)
+
+        assert histogram.percentile(50) == 1.24
+
+    def test_correction_backfills_stalls(self) -> None:
+        """A stall of ten intervals adds the nine suppressed samples."""
+        histogram = LatencyHistogram()
+        for _ in range(90):
+            histogram.record(0.001)
+        histogram.record(0.010)
+
+        corrected = histogram.corrected(expected_interval=0.001)
+
+        assert histogram.percentile(95) == 0.001
+        assert corrected.count == 100
+        assert corrected.percentile(95) == 0.005
+
+
+class TestLoadModes:
+    """Tests for closed- and open-loop runs against the app."""
+
+    async def test_closed_loop(self) -> None:
+        """Every request completes and the mix is honoured."""
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            generator = LoadGenerator(client, {"create": 1, "get": 1}, rng=random.Random(1))
+            await generator.seed(5)
+            report = await run_closed_loop(generator, users=4, duration=0.2)
+
+        assert report.requests > 0
+        assert report.errors == 0
+        assert set(report.operations) == {"create", "get"}
+        assert set(report.statuses) <= {200, 201}
+        assert report.response_time.count >= report.requests
+
+    async def test_open_loop(self) -> None:
+        """The schedule sets the number of requests."""
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            generator = LoadGenerator(client, {"create": 1, "delete": 1}, rng=random.Random(1))
+            report = await run_open_loop(generator, rate=200, duration=0.25)
+
+        assert report.requests == 50
+        assert report.response_time.count == 50
+        assert report.errors == 0
+        assert report.response_time.percentile(50) >= report.service_time.percentile(50)
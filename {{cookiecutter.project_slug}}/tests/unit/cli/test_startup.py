@@ -0,0 +1,63 @@
+"""Cold-start cost of the CLI.
+
+Each command runs in a fresh interpreter under ``python -X importtime`` so the
+measurement covers everything the console script imports.
+"""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+PACKAGE = "{{ cookiecutter.project_slug|replace('-', '_') }}"
+
+# Import-time budgets in milliseconds, several times the typical cost so that
+# only a real regression (e.g. an eager import of the web stack) trips them
+BUDGET_MS = {"version": 250.0, "config": 1000.0}
+
+# Modules that cheap commands must not load
+HEAVY_MODULES = (
+    "rich.console",
+    "pydantic_settings",
+    "fastapi",
+    "uvicorn",
+    "sqlalchemy",
+    f"{PACKAGE}.adapters",
+    f"{PACKAGE}.services",
+)
+
+
+def import_profile(*args: str) -> dict[str, float]:
+    """Run the CLI under ``-X importtime`` and return self time (ms) per module."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", f"{PACKAGE}.cli.main", *args],
+        capture_output=True,
+        text=True,
+        check=True,
+        env={**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)},
+    )
+    profile: dict[str, float] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line.removeprefix("import time:").split("|")
+        profile[name.strip()] = int(self_us) / 1000
+    return profile
+
+
+def test_version_skips_heavy_imports() -> None:
+    """``version`` loads neither Rich, settings, the adapters nor the web stack."""
+    loaded = import_profile("version")
+
+    assert not [name for name in loaded if name.startswith(HEAVY_MODULES)]
+
+
+@pytest.mark.parametrize("command", sorted(BUDGET_MS))
+def test_startup_within_budget(command: str) -> None:
+    """Total import time stays within the command's budget (best of three)."""
+    best = min(sum(import_profile(command).values()) for _ in range(3))
+
+    assert best <= BUDGET_MS[command], f"{command} imports took {best:.0f} ms"
@@ -2,7 +2,19 @@
 
 from __future__ import annotations
 
-from {{ cookiecutter.project_slug|replace('-', '_') }}.domain.entities import ExampleEntity
+from datetime import UTC, datetime, timedelta
+from uuid import UUID
+
+import pytest
+
+from {{ cookiecutter.project_slug|replace('-', '_') }}.domain import entities
+from {{ cookiecutter.project_slug|replace('-', '_') }}.domain.entities import (
+    ID_FACTORIES,
+    ExampleEntity,
+    min_uuid7,
+    set_id_factory,
+    uuid7,
+)
 
 
 class TestExampleEntity:
@@ -37,3 +49,72 @@ class TestExampleEntity:
         """Entity without name should be invalid."""
         entity = ExampleEntity(name="")
         assert entity.is_valid() is False
+
+
+@pytest.fixture
+def frozen_clock(monkeypatch: pytest.MonkeyPatch) -> list[int]:
+    """Make ``uuid7`` read the time from a list the test can change, in ms."""
+    now = [1_700_000_000_000]
+    monkeypatch.setattr(entities.time, "time_ns", lambda: now[0] * 1_000_000)
+    monkeypatch.setattr(entities, "_clock", entities._Uuid7Clock())
+    return now
+
+
+class TestUuid7:
+    """Tests for time-ordered entity IDs."""
+
+    def test_layout(self) -> None:
+        """IDs carry version 7, the RFC variant and the current millisecond."""
+        before = datetime.now(UTC)
+        generated = uuid7()
+
+        assert generated.version == 7
+        assert generated.variant == "specified in RFC 4122"
+        millis = generated.int >> 80
+        assert abs(millis - before.timestamp() * 1000) < 1000
+
+    def test_strictly_increasing(self) -> None:
+        """IDs generated in a burst never repeat and sort in generation order."""
+        generated = [uuid7() for _ in range(10_000)]
+
+        assert generated == sorted(generated)
+        assert len(set(generated)) == len(generated)
+
+    @pytest.mark.usefixtures("frozen_clock")
+    def test_increasing_within_one_millisecond(self) -> None:
+        """Within a millisecond the counter orders IDs; overflow borrows the next one."""
+        generated = [uuid7() for _ in range(5000)]
+
+        assert generated == sorted(generated)
+        assert {identifier.int >> 80 for identifier in generated} <= {
+            1_700_000_000_000 + n for n in range(3)
+        }
+
+    def test_increasing_when_clock_steps_back(self, frozen_clock: list[int]) -> None:
+        """A clock stepping backwards does not make IDs go backwards."""
+        first = uuid7()
+        frozen_clock[0] -= 5000
+
+        assert uuid7() > first
+
+    def test_min_uuid7_bounds_later_ids(self, frozen_clock: list[int]) -> None:
+        """min_uuid7 sorts before IDs from that millisecond on, after earlier ones."""
+        earlier = uuid7()
+        frozen_clock[0] += 1
+        later = uuid7()
+        bound = min_uuid7(datetime.fromtimestamp(frozen_clock[0] / 1000, UTC))
+
+        assert earlier < bound < later
+        assert min_uuid7(datetime(1970, 1, 1, tzinfo=UTC) + timedelta(milliseconds=1)) == UUID(
+            int=1 << 80
+        )
+
+    def test_entities_use_configured_factory(self) -> None:
+        """New entities take their IDs from the configured factory."""
+        assert ExampleEntity(name="ordered").id.version == 7
+
+        previous = set_id_factory(ID_FACTORIES[4])
+        try:
+            assert ExampleEntity(name="random").id.version == 4
+        finally:
+            set_id_factory(previous)
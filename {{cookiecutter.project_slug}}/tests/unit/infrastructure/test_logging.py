@@ -0,0 +1,112 @@
+"""Tests for the JSON log writer and logging configuration."""
+
+from __future__ import annotations
+
+import io
+import json
+import logging
+import threading
+from collections.abc import Generator
+
+import pytest
+import structlog
+
+from {{ cookiecutter.project_slug|replace('-', '_') }}.infrastructure.config import Settings
+from {{ cookiecutter.project_slug|replace('-', '_') }}.infrastructure.logging import LogWriter, QueueHandler, configure_logging
+
+
+@pytest.fixture(autouse=True)
+def restore_logging() -> Generator[None, None, None]:
+    """Undo ``configure_logging`` after each test."""
+    yield
+    structlog.reset_defaults()
+    root = logging.getLogger()
+    for handler in [handler for handler in root.handlers if isinstance(handler, QueueHandler)]:
+        root.removeHandler(handler)
+    root.setLevel(logging.WARNING)
+
+
+class BlockedStream(io.StringIO):
+    """Stream whose writes wait until released, as a stuck pipe would."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.writing = threading.Event()
+        self.release = threading.Event()
+
+    def write(self, text: str) -> int:
+        self.writing.set()
+        self.release.wait(5)
+        return super().write(text)
+
+
+class TestLogWriter:
+    """Tests for LogWriter."""
+
+    def test_writes_json_lines_in_order(self) -> None:
+        """Queued events come out as one JSON object per line, in order."""
+        stream = io.StringIO()
+        writer = LogWriter(stream)
+        for index in range(3):
+            writer.put({"event": "e", "index": index, "timestamp": 0.0})
+        writer.close()
+
+        lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+        assert [line["index"] for line in lines] == [0, 1, 2]
+        assert lines[0]["timestamp"] == "1970-01-01T00:00:00Z"
+
+    def test_full_queue_drops_instead_of_blocking(self) -> None:
+        """With the writer stuck, events beyond the queue are dropped and counted."""
+        stream = BlockedStream()
+        writer = LogWriter(stream, max_queued=1)
+        writer.put({"event": "first"})
+        assert stream.writing.wait(5)
+
+        for index in range(3):
+            writer.put({"event": "later", "index": index})
+        assert writer.dropped == 2
+
+        stream.release.set()
+        writer.close()
+        assert [json.loads(line)["event"] for line in stream.getvalue().splitlines()] == [
+            "first",
+            "later",
+        ]
+
+
+class TestConfigureLogging:
+    """Tests for configure_logging."""
+
+    def test_level_filters_structlog_and_stdlib(self) -> None:
+        """Events below the configured level are not written, whichever API logs them."""
+        stream = io.StringIO()
+        writer = configure_logging(Settings(log_level="warning"), stream)
+        structlog.get_logger().info("quiet")
+        structlog.get_logger().warning("loud", answer=42)
+        logging.getLogger("library").info("quiet")
+        logging.getLogger("library").error("loud too")
+        writer.close()
+
+        lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+        assert [(line["event"], line["level"]) for line in lines] == [
+            ("loud", "warning"),
+            ("loud too", "error"),
+        ]
+        assert lines[0]["answer"] == 42
+
+    def test_bound_context_is_included(self) -> None:
+        """Context variables appear on every event logged while bound."""
+        stream = io.StringIO()
+        writer = configure_logging(Settings(), stream)
+        with structlog.contextvars.bound_contextvars(request_id="r1"):
+            structlog.get_logger().info("bound")
+        structlog.get_logger().info("unbound")
+        writer.close()
+
+        lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+        assert [line.get("request_id") for line in lines] == ["r1", None]
+
+    def test_unknown_level_is_rejected(self) -> None:
+        """A misspelt LOG_LEVEL fails at startup rather than logging everything."""
+        with pytest.raises(ValueError, match="log level"):
+            configure_logging(Settings(log_level="verbose"))
@@ -0,0 +1,77 @@
+"""Tests for the metrics registry and its Prometheus exposition."""
+
+from __future__ import annotations
+
+import pytest
+
+from {{ cookiecutter.project_slug|replace('-', '_') }}.infrastructure.metrics import MetricsRegistry, _Metric
+
+
+class TestMetricsRegistry:
+    """Tests for MetricsRegistry."""
+
+    def test_counter_renders_labelled_series(self) -> None:
+        """Counters render HELP/TYPE headers and one line per series."""
+        registry = MetricsRegistry()
+        counter = registry.counter("jobs_total", "Jobs run.", ["status"])
+        counter.inc("ok")
+        counter.inc("ok")
+        counter.inc('say "hi"')
+
+        lines = registry.render().splitlines()
+
+        assert lines[:2] == ["# HELP jobs_total Jobs run.", "# TYPE jobs_total counter"]
+        assert 'jobs_total{status="ok"} 2' in lines
+        assert 'jobs_total{status="say \\"hi\\""} 1' in lines
+
+    def test_gauge_goes_up_and_down(self) -> None:
+        """Gauges track a current value."""
+        registry = MetricsRegistry()
+        gauge = registry.gauge("in_flight", "In flight.")
+        gauge.inc()
+        gauge.inc()
+        gauge.dec()
+
+        assert "in_flight 1" in registry.render().splitlines()
+
+    def test_histogram_buckets_are_cumulative(self) -> None:
+        """Bucket counts include every smaller bucket; bounds are inclusive."""
+        registry = MetricsRegistry()
+        histogram = registry.histogram("latency_seconds", "Latency.", ["op"], buckets=[0.1, 1.0])
+        for value in (0.05, 0.1, 0.5, 3.0):
+            histogram.observe(value, "read")
+
+        lines = registry.render().splitlines()
+
+        assert 'latency_seconds_bucket{op="read",le="0.1"} 2' in lines
+        assert 'latency_seconds_bucket{op="read",le="1"} 3' in lines
+        assert 'latency_seconds_bucket{op="read",le="+Inf"} 4' in lines
+        assert 'latency_seconds_sum{op="read"} 3.65' in lines
+        assert 'latency_seconds_count{op="read"} 4' in lines
+
+    def test_registering_twice_returns_same_metric(self) -> None:
+        """Modules can declare the same metric independently."""
+        registry = MetricsRegistry()
+
+        first = registry.counter("hits_total", "Hits.", ["route"])
+        second = registry.counter("hits_total", "Hits.", ["route"])
+
+        assert first is second
+        with pytest.raises(ValueError, match="already registered"):
+            registry.gauge("hits_total", "Hits.", ["route"])
+
+    def test_histogram_rejects_wrong_label_count(self) -> None:
+        """Series must supply every label."""
+        histogram = MetricsRegistry().histogram("h", "H.", ["a", "b"])
+
+        with pytest.raises(ValueError, match="expects labels"):
+            histogram.labels("only-one")
+
+    def test_metric_without_render_cannot_be_created(self) -> None:
+        """A metric kind must implement rendering to be constructed at all."""
+
+        class Unrendered(_Metric):
+            kind = "untyped"
+
+        with pytest.raises(TypeError, match="render"):
+            Unrendered("u", "U.")
@@ -0,0 +1,66 @@
+"""Tests for saving and summarising profiles."""
+
+from __future__ import annotations
+
+import cProfile
+import os
+from pathlib import Path
+
+import pytest
+
+from {{ cookiecutter.project_slug|replace('-', '_') }}.infrastructure.profiling import ProfileStore, format_top
+
+
+def busy() -> int:
+    """Function with a recognisable name to find in profiles."""
+    return sum(range(1000))
+
+
+def make_profile() -> cProfile.Profile:
+    profile = cProfile.Profile()
+    with profile:
+        busy()
+    return profile
+
+
+class TestProfileStore:
+    """Tests for ProfileStore."""
+
+    def test_save_sanitises_name(self, tmp_path: Path) -> None:
+        """Path separators and other unsafe characters never reach the file name."""
+        store = ProfileStore(tmp_path / "profiles")
+
+        path = store.save(make_profile(), "GET /entities/../x")
+
+        assert path.parent == tmp_path / "profiles"
+        assert path.name == "GET_entities_.._x.prof"
+        assert path.exists()
+
+    def test_oldest_profiles_are_pruned(self, tmp_path: Path) -> None:
+        """Only the most recent ``max_files`` profiles are kept."""
+        store = ProfileStore(tmp_path, max_files=2)
+        for index in range(4):
+            path = store.save(make_profile(), f"p{index}")
+            os.utime(path, (index, index))
+        store.prune()
+
+        assert sorted(path.name for path in tmp_path.iterdir()) == ["p2.prof", "p3.prof"]
+
+    def test_max_files_must_be_positive(self, tmp_path: Path) -> None:
+        """A store that keeps nothing is a configuration error."""
+        with pytest.raises(ValueError, match="max_files"):
+            ProfileStore(tmp_path, max_files=0)
+
+
+class TestFormatTop:
+    """Tests for format_top."""
+
+    def test_formats_profiler_and_saved_file(self, tmp_path: Path) -> None:
+        """Live profilers and saved profiles render the same listing."""
+        profile = make_profile()
+        path = ProfileStore(tmp_path).save(profile, "busy")
+
+        for source in (profile, path):
+            text = format_top(source, limit=5, sort="tottime")
+            assert "busy" in text
+            assert "Ordered by: internal time" in text
@@ -0,0 +1,97 @@
+"""Tests for request traces, spans and the trace buffer."""
+
+from __future__ import annotations
+
+import time
+
+import pytest
+
+from {{ cookiecutter.project_slug|replace('-', '_') }}.infrastructure.tracing import (
+    MAX_SPANS,
+    Trace,
+    TraceBuffer,
+    current_trace,
+    end_trace,
+    start_trace,
+    traced,
+)
+
+
+@traced("service.answer")
+async def answer() -> int:
+    """Traced coroutine to call inside and outside traces."""
+    return 42
+
+
+class TestTrace:
+    """Tests for Trace."""
+
+    def test_layers_sum_their_spans(self) -> None:
+        """Server-Timing gives the total, then each layer's summed time in order of first use."""
+        trace = Trace("GET", "/entities", sampled=False, started=0.0)
+        trace.add("api.list_entities", 0.001, 0.004)
+        trace.add("repository.list_page", 0.002, 0.0025)
+        trace.add("repository.get_many", 0.003, 0.0035)
+
+        assert trace.server_timing(0.005) == "total;dur=5.000, api;dur=3.000, repository;dur=1.000"
+        assert trace.spans == []
+
+    def test_sampled_traces_keep_spans_up_to_cap(self) -> None:
+        """Every span is kept for sampled traces, up to MAX_SPANS; totals count them all."""
+        trace = Trace("GET", "/entities", sampled=True, started=0.0)
+        for _ in range(MAX_SPANS + 10):
+            trace.add("repository.get_by_id", 0.0, 0.001)
+
+        assert len(trace.spans) == MAX_SPANS
+        assert trace.layers["repository"] == pytest.approx((MAX_SPANS + 10) * 0.001)
+
+
+class TestTraced:
+    """Tests for the traced decorator and the current trace."""
+
+    async def test_records_only_inside_a_trace(self) -> None:
+        """Calls outside a trace record nothing; inside, they become spans of it."""
+        assert await answer() == 42
+        assert current_trace() is None
+
+        trace = Trace("GET", "/", sampled=True)
+        token = start_trace(trace)
+        try:
+            assert current_trace() is trace
+            assert await answer() == 42
+        finally:
+            end_trace(token)
+
+        assert current_trace() is None
+        assert [name for name, _, _ in trace.spans] == ["service.answer"]
+
+    async def test_ended_trace_ignores_late_spans(self) -> None:
+        """Work outliving the request does not change its finished trace."""
+        trace = Trace("GET", "/", sampled=True)
+        end_trace(start_trace(trace))
+        trace.add("repository.save", 0.0, 1.0)
+
+        assert trace.spans == [] and trace.layers == {}
+
+
+class TestTraceBuffer:
+    """Tests for TraceBuffer."""
+
+    def test_keeps_newest_traces(self) -> None:
+        """Beyond its size the buffer drops the oldest traces and lists the newest first."""
+        buffer = TraceBuffer(max_traces=2)
+        for index in range(3):
+            trace = Trace("GET", f"/{index}", sampled=True)
+            trace.add("api.root", trace.started, trace.started + 0.002)
+            buffer.add(trace, f"t{index}", "/", 200, time.perf_counter())
+
+        recent = buffer.recent()
+        assert [record.trace_id for record in recent] == ["t2", "t1"]
+        assert [record.trace_id for record in buffer.recent(1)] == ["t2"]
+        span = recent[0].spans[0]
+        assert (span.name, span.start_ms, span.duration_ms) == ("api.root", 0.0, pytest.approx(2.0))
+
+    def test_size_must_be_positive(self) -> None:
+        """A buffer that keeps nothing is a configuration error."""
+        with pytest.raises(ValueError, match="max_traces"):
+            TraceBuffer(max_traces=0)
@@ -0,0 +1,110 @@
+"""Tests for the bulk importer."""
+
+from __future__ import annotations
+
+import io
+import json
+
+import pytest
+
+from {{ cookiecutter.project_slug|replace('-', '_') }}.adapters.repositories import InMemoryExampleRepository
+from {{ cookiecutter.project_slug|replace('-', '_') }}.services import ExampleService
+from {{ cookiecutter.project_slug|replace('-', '_') }}.services.bulk_import import (
+    ImportReject,
+    bulk_import,
+    read_rows,
+)
+
+
+def ndjson(*records: object) -> io.StringIO:
+    """Build an NDJSON stream from records."""
+    return io.StringIO("".join(json.dumps(record) + "\n" for record in records))
+
+
+class TestReadRows:
+    """Tests for input parsing."""
+
+    def test_ndjson_reports_unparseable_lines(self) -> None:
+        """Bad lines become error strings; blank lines are skipped."""
+        stream = io.StringIO('{"name": "A"}\n\nnot json\n[1]\n')
+
+        rows = list(read_rows(stream, "ndjson"))
+
+        assert rows[0] == {"name": "A"}
+        assert rows[1].startswith("Invalid JSON")  # type: ignore[union-attr]
+        assert rows[2] == "Expected a JSON object"
+
+    def test_csv_uses_header_row(self) -> None:
+        """CSV rows are keyed by the header."""
+        stream = io.StringIO("name,description\nA,first\nB,\n")
+
+        rows = list(read_rows(stream, "csv"))
+
+        assert rows == [{"name": "A", "description": "first"}, {"name": "B", "description": ""}]
+
+
+class TestBulkImport:
+    """Tests for bulk_import."""
+
+    async def test_imports_all_rows_in_batches(self, service: ExampleService) -> None:
+        """Every valid row is stored and the checkpoint covers the input."""
+        stream = ndjson(*({"name": f"Entity {i}"} for i in range(25)))
+
+        report = await bulk_import(
+            service, read_rows(stream, "ndjson"), batch_size=4, concurrency=3
+        )
+
+        assert (report.read, report.imported, report.rejected) == (25, 25, 0)
+        assert report.checkpoint == 25
+        assert len((await service.list_page(limit=100)).items) == 25
+
+    async def test_reports_rejects_by_row(self, service: ExampleService) -> None:
+        """Parse and validation failures are reported with their row number."""
+        rejects: list[ImportReject] = []
+        stream = ndjson({"name": "ok"}, {"name": ""}, "text", {"name": "fine"})
+
+        report = await bulk_import(
+            service, read_rows(stream, "ndjson"), batch_size=2, on_reject=rejects.append
+        )
+
+        assert report.imported == 2
+        assert sorted(reject.row for reject in rejects) == [1, 2]
+
+    async def test_skip_resumes_from_checkpoint(self, service: ExampleService) -> None:
+        """Skipped rows are not imported but count towards the checkpoint."""
+        stream = ndjson(*({"name": f"Entity {i}"} for i in range(10)))
+
+        report = await bulk_import(service, read_rows(stream, "ndjson"), batch_size=3, skip=6)
+
+        names = [entity.name for entity in (await service.list_page(limit=100)).items]
+        assert names == [f"Entity {i}" for i in range(6, 10)]
+        assert report.checkpoint == 10
+
+    async def test_failed_batch_leaves_checkpoint_before_it(self) -> None:
+        """A storage failure stops the import at the last contiguous batch."""
+        progress: list[int] = []
+
+        class FailingRepository(InMemoryExampleRepository):
+            async def save_many(self, entities):  # type: ignore[no-untyped-def]
+                if any(entity.name == "boom" for entity in entities):
+                    raise RuntimeError("storage down")
+                return await super().save_many(entities)
+
+        service = ExampleService(FailingRepository())
+        stream = ndjson({"name": "a"}, {"name": "b"}, {"name": "boom"}, {"name": "c"})
+
+        with pytest.raises(RuntimeError):
+            await bulk_import(
+                service,
+                read_rows(stream, "ndjson"),
+                batch_size=2,
+                concurrency=1,
+                on_progress=lambda report: progress.append(report.checkpoint),
+            )
+
+        assert progress == [2]
+
+    async def test_rejects_invalid_settings(self, service: ExampleService) -> None:
+        """Batch size and concurrency must be positive."""
+        with pytest.raises(ValueError, match="at least 1"):
+            await bulk_import(service, iter([]), batch_size=0)
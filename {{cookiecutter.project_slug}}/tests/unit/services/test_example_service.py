@@ -2,9 +2,29 @@
 
 from __future__ import annotations
 
+import asyncio
+from uuid import UUID, uuid4
+
 import pytest
 
-from {{ cookiecutter.project_slug|replace('-', '_') }}.services import ExampleService
+from {{ cookiecutter.project_slug|replace('-', '_') }}.adapters.repositories import (
+    InMemoryExampleRepository,
+    SearchIndexedExampleRepository,
+)
+from {{ cookiecutter.project_slug|replace('-', '_') }}.domain.entities import ExampleEntity
+from {{ cookiecutter.project_slug|replace('-', '_') }}.services import (
+    ExampleService,
+    SearchUnavailableError,
+    VersionConflictError,
+)
+
+
+class YieldingRepository(InMemoryExampleRepository):
+    """In-memory repository letting other tasks run during every read."""
+
+    async def get_by_id(self, entity_id: UUID) -> ExampleEntity | None:
+        await asyncio.sleep(0)
+        return await super().get_by_id(entity_id)
 
 
 class TestExampleService:
@@ -64,3 +84,222 @@ class TestExampleService:
 
         result = await service.delete(uuid4())
         assert result is False
+
+
+class TestExampleServiceVersions:
+    """Tests for updates and optimistic concurrency."""
+
+    async def test_update_moves_version_forward(self, service: ExampleService) -> None:
+        """Every update gets a later version, even within one clock tick."""
+        entity = await service.create("v1")
+
+        first = await service.update(entity.id, " v2 ", "changed")
+        second = await service.update(entity.id, "v3")
+
+        assert first is not None and second is not None
+        assert first.name == "v2"
+        assert entity.version < first.version < second.version
+        assert await service.get_version(entity.id) == second.version
+        assert await service.get_by_id(entity.id) == second
+
+    async def test_update_unknown_or_invalid(self, service: ExampleService) -> None:
+        """Unknown entities give None; empty names are rejected."""
+        entity = await service.create("kept")
+
+        assert await service.update(uuid4(), "name") is None
+        assert await service.get_version(uuid4()) is None
+        with pytest.raises(ValueError, match="cannot be empty"):
+            await service.update(entity.id, "  ")
+
+    async def test_stale_expected_version_conflicts(self, service: ExampleService) -> None:
+        """Updates and deletes against an old version are refused."""
+        entity = await service.create("v1")
+        updated = await service.update(entity.id, "v2", precondition=entity.version.__eq__)
+        assert updated is not None
+
+        with pytest.raises(VersionConflictError):
+            await service.update(entity.id, "v3", precondition=entity.version.__eq__)
+        with pytest.raises(VersionConflictError):
+            await service.delete(entity.id, precondition=entity.version.__eq__)
+        assert await service.delete(entity.id, precondition=updated.version.__eq__) is True
+        assert await service.delete(entity.id, precondition=updated.version.__eq__) is False
+
+    async def test_concurrent_conditional_updates_conflict(self) -> None:
+        """Of two updates that both read the same version, only one is written."""
+        service = ExampleService(YieldingRepository())
+        entity = await service.create("v1")
+
+        results = await asyncio.gather(
+            service.update(entity.id, "a", precondition=entity.version.__eq__),
+            service.update(entity.id, "b", precondition=entity.version.__eq__),
+            return_exceptions=True,
+        )
+
+        assert sum(isinstance(result, VersionConflictError) for result in results) == 1
+
+
+class TestExampleServiceBatch:
+    """Tests for ExampleService batch operations."""
+
+    async def test_create_many_reports_invalid_items(self, service: ExampleService) -> None:
+        """Valid items are created; invalid ones are reported by index."""
+        result = await service.create_many([("One", ""), ("  ", ""), ("Three", "third")])
+
+        assert [entity.name for entity in result.created] == ["One", "Three"]
+        assert [error.index for error in result.errors] == [1]
+        assert "cannot be empty" in result.errors[0].error
+        assert await service.get_by_id(result.created[1].id) == result.created[1]
+
+    async def test_get_many_omits_unknown(self, service: ExampleService) -> None:
+        """Batch get returns only the IDs that exist."""
+        from uuid import uuid4
+
+        created = (await service.create_many([("A", ""), ("B", "")])).created
+        unknown = uuid4()
+
+        found = await service.get_many([created[0].id, unknown, created[1].id])
+
+        assert set(found) == {created[0].id, created[1].id}
+
+    async def test_delete_many_returns_deleted_ids(self, service: ExampleService) -> None:
+        """Batch delete reports which IDs were removed."""
+        from uuid import uuid4
+
+        entity = await service.create("Doomed", "")
+
+        deleted = await service.delete_many([entity.id, uuid4()])
+
+        assert deleted == {entity.id}
+        assert await service.get_by_id(entity.id) is None
+
+    async def test_import_records_validates_fields(self, service: ExampleService) -> None:
+        """Imported records are validated like created ones."""
+        result = await service.import_records(
+            [{"name": "Kept"}, {"name": ""}, {"name": 3}, {"name": "Bad", "id": "nope"}]
+        )
+
+        assert [entity.name for entity in result.created] == ["Kept"]
+        assert [error.index for error in result.errors] == [1, 2, 3]
+
+    async def test_import_records_preserves_identity(self, service: ExampleService) -> None:
+        """Records written by an export keep their ID and timestamps."""
+        from {{ cookiecutter.project_slug|replace('-', '_') }}.services.ndjson import entity_record
+
+        original = await service.create("Round trip", "desc")
+        record = entity_record(original)
+
+        result = await service.import_records([record])
+
+        assert result.created == [original]
+
+
+class TestExampleServiceListing:
+    """Tests for ExampleService keyset pagination."""
+
+    async def test_pages_cover_all_entities_in_order(self, service: ExampleService) -> None:
+        """Following cursors visits every entity once, in creation order."""
+        created = (await service.create_many([(f"E{i}", "") for i in range(7)])).created
+        expected = sorted(created, key=lambda entity: (entity.created_at, entity.id))
+
+        seen = []
+        cursor = None
+        while True:
+            page = await service.list_page(limit=3, cursor=cursor)
+            seen.extend(page.items)
+            if page.next_cursor is None:
+                break
+            cursor = page.next_cursor
+
+        assert seen == expected
+
+    async def test_pages_stay_stable_across_deletes(self, service: ExampleService) -> None:
+        """Deleting an already-listed entity does not shift later pages."""
+        created = (await service.create_many([(f"E{i}", "") for i in range(4)])).created
+        ordered = sorted(created, key=lambda entity: (entity.created_at, entity.id))
+
+        first = await service.list_page(limit=2)
+        await service.delete(ordered[0].id)
+        second = await service.list_page(limit=2, cursor=first.next_cursor)
+
+        assert second.items == ordered[2:]
+
+    async def test_id_order_pages_by_id(self, service: ExampleService) -> None:
+        """ID order follows time-ordered IDs, and random ones by UUID order."""
+        created = (await service.create_many([(f"E{i}", "") for i in range(5)])).created
+        imported = (await service.import_records([{"id": str(uuid4()), "name": "old"}])).created
+
+        first = await service.list_page(limit=3, order="id")
+        second = await service.list_page(limit=3, cursor=first.next_cursor, order="id")
+
+        assert first.items + second.items == sorted(
+            created + imported, key=lambda entity: entity.id
+        )
+        assert [entity for entity in first.items + second.items if entity in created] == created
+        assert second.next_cursor is None
+
+    async def test_invalid_cursor_raises(self, service: ExampleService) -> None:
+        """Malformed cursors are rejected."""
+        with pytest.raises(ValueError, match="Invalid cursor"):
+            await service.list_page(cursor="not-a-cursor")
+        with pytest.raises(ValueError, match="Invalid cursor"):
+            await service.list_page(cursor="not-a-cursor", order="id")
+
+    async def test_limit_out_of_range_raises(self, service: ExampleService) -> None:
+        """Limits outside the allowed range are rejected."""
+        with pytest.raises(ValueError, match="Limit"):
+            await service.list_page(limit=0)
+
+    async def test_iterate_yields_everything_in_order(self, service: ExampleService) -> None:
+        """Iteration crosses batch boundaries without gaps or repeats."""
+        created = (await service.create_many([(f"E{i}", "") for i in range(7)])).created
+        expected = sorted(created, key=lambda entity: (entity.created_at, entity.id))
+
+        assert [entity async for entity in service.iterate(batch_size=3)] == expected
+
+    async def test_workload_leaves_repository_empty(self, service: ExampleService) -> None:
+        """The synthetic workload touches every operation and cleans up after itself."""
+        from {{ cookiecutter.project_slug|replace('-', '_') }}.services.workload import run_workload
+
+        report = await run_workload(service, entities=25, page_size=10)
+
+        assert (report.created, report.read, report.listed, report.deleted) == (25, 50, 25, 25)
+        assert (await service.list_page()).items == []
+
+
+class TestExampleServiceSearch:
+    """Tests for ExampleService full-text search."""
+
+    @pytest.fixture
+    def searchable(self) -> ExampleService:
+        """Provide a service over an indexed repository."""
+        return ExampleService(SearchIndexedExampleRepository(InMemoryExampleRepository()))
+
+    async def test_pages_cover_all_matches_in_rank_order(self, searchable: ExampleService) -> None:
+        """Following cursors visits every match once, best first."""
+        await searchable.create_many([(f"Lamp {i}", "") for i in range(5)])
+        await searchable.create_many([(f"Shade {i}", "for a lamp") for i in range(3)])
+        await searchable.create("Chair", "not a match")
+
+        seen = []
+        cursor = None
+        while True:
+            page = await searchable.search("lamp", limit=3, cursor=cursor)
+            seen.extend(page.items)
+            if page.next_cursor is None:
+                break
+            cursor = page.next_cursor
+
+        assert len(seen) == len({entity.id for entity in seen}) == 8
+        assert [entity.name.split()[0] for entity in seen] == ["Lamp"] * 5 + ["Shade"] * 3
+
+    async def test_invalid_input_raises(self, searchable: ExampleService) -> None:
+        """Queries without words and malformed cursors are rejected."""
+        with pytest.raises(ValueError, match="at least one word"):
+            await searchable.search("--")
+        with pytest.raises(ValueError, match="Invalid cursor"):
+            await searchable.search("lamp", cursor="not-a-cursor")
+
+    async def test_unindexed_repository_raises(self, service: ExampleService) -> None:
+        """Searching without an index reports that search is unavailable."""
+        with pytest.raises(SearchUnavailableError):
+            await service.search("lamp")
@@ -0,0 +1,257 @@
+"""Tests for background jobs and their stores."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncGenerator, Mapping, Sequence
+from dataclasses import replace
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from {{ cookiecutter.project_slug|replace('-', '_') }}.adapters.jobs import FileJobStore, InMemoryJobStore
+from {{ cookiecutter.project_slug|replace('-', '_') }}.adapters.repositories import InMemoryExampleRepository
+from {{ cookiecutter.project_slug|replace('-', '_') }}.domain.jobs import Job
+from {{ cookiecutter.project_slug|replace('-', '_') }}.services import BatchCreateResult, ExampleService
+from {{ cookiecutter.project_slug|replace('-', '_') }}.services.jobs import JobQueueFullError, JobRunner
+
+
+class GatedService(ExampleService):
+    """Service whose batch calls wait for a gate, to hold jobs mid-run."""
+
+    def __init__(self, repository: InMemoryExampleRepository) -> None:
+        super().__init__(repository)
+        self.gate = asyncio.Event()
+        self.gate.set()
+        self.calls = 0
+
+    async def import_records(self, records: Sequence[Mapping[str, Any]]) -> BatchCreateResult:
+        self.calls += 1
+        await self.gate.wait()
+        return await super().import_records(records)
+
+
+class SlowJobStore(InMemoryJobStore):
+    """Job store taking a while to persist new jobs."""
+
+    async def create(self, job: Job, items: Sequence[Mapping[str, str]]) -> None:
+        await asyncio.sleep(0.01)
+        await super().create(job, items)
+
+
+@pytest.fixture
+def gated(repository: InMemoryExampleRepository) -> GatedService:
+    """Provide a service whose creates can be paused."""
+    return GatedService(repository)
+
+
+@pytest.fixture
+async def runner(gated: GatedService) -> AsyncGenerator[JobRunner, None]:
+    """Provide a started runner with small chunks."""
+    runner = JobRunner(gated, InMemoryJobStore(), workers=2, max_queued=2, chunk_size=2)
+    await runner.start()
+    yield runner
+    await runner.stop()
+
+
+async def wait_finished(runner: JobRunner, job: Job) -> Job:
+    """Poll a job until it has finished."""
+    for _ in range(200):
+        current = await runner.get(job.id)
+        assert current is not None
+        if current.finished:
+            return current
+        await asyncio.sleep(0.005)
+    raise AssertionError(f"job {job.id} did not finish")
+
+
+class TestJobRunner:
+    """Tests for JobRunner."""
+
+    async def test_create_job_reports_progress_and_errors(
+        self, runner: JobRunner, service: ExampleService
+    ) -> None:
+        """Create jobs store the valid items and report the invalid ones by position."""
+        items = [{"name": f"E{i}", "description": ""} for i in range(5)]
+        items[3]["name"] = " "
+
+        job = await runner.submit("create", items)
+        assert job.status == "queued"
+        done = await wait_finished(runner, job)
+
+        assert (done.status, done.processed, done.succeeded, done.failed) == ("succeeded", 5, 4, 1)
+        assert [error.index for error in done.errors] == [3]
+        assert len((await service.list_page(10)).items) == 4
+
+    async def test_delete_job_reports_missing(
+        self, runner: JobRunner, service: ExampleService
+    ) -> None:
+        """Delete jobs remove entities and report unknown IDs."""
+        entity = await service.create("doomed")
+        missing = "00000000-0000-4000-8000-000000000000"
+
+        job = await runner.submit("delete", [{"id": str(entity.id)}, {"id": missing}])
+        done = await wait_finished(runner, job)
+
+        assert (done.succeeded, done.failed) == (1, 1)
+        assert done.errors[0].error == "Entity not found"
+        assert await service.get_by_id(entity.id) is None
+
+    async def test_cancel_running_job_stops_after_chunk(
+        self, runner: JobRunner, gated: GatedService
+    ) -> None:
+        """A running job keeps the chunks done before it was cancelled."""
+        gated.gate.clear()
+        job = await runner.submit(
+            "create", [{"name": f"E{i}", "description": ""} for i in range(6)]
+        )
+        while gated.calls == 0:
+            await asyncio.sleep(0.001)
+
+        cancelled = await runner.cancel(job.id)
+        assert cancelled is not None and cancelled.status == "running"
+        gated.gate.set()
+        done = await wait_finished(runner, job)
+
+        assert (done.status, done.processed, done.succeeded) == ("cancelled", 2, 2)
+
+    async def test_cancel_queued_job_is_immediate(self, gated: GatedService) -> None:
+        """A job still waiting for a worker is cancelled at once and never runs."""
+        runner = JobRunner(gated, InMemoryJobStore(), workers=1, chunk_size=2)
+        await runner.start()
+        try:
+            gated.gate.clear()
+            busy = await runner.submit("create", [{"name": "busy", "description": ""}])
+            waiting = await runner.submit("create", [{"name": "waiting", "description": ""}])
+
+            cancelled = await runner.cancel(waiting.id)
+            gated.gate.set()
+            await wait_finished(runner, busy)
+
+            assert cancelled is not None and cancelled.status == "cancelled"
+            assert gated.calls == 1
+        finally:
+            await runner.stop()
+
+    async def test_full_queue_refuses_jobs(self, runner: JobRunner, gated: GatedService) -> None:
+        """Submissions beyond the queue bound fail fast."""
+        gated.gate.clear()
+        items = [{"name": "E", "description": ""}]
+        for _ in range(4):
+            await runner.submit("create", items)
+            await asyncio.sleep(0.01)
+
+        with pytest.raises(JobQueueFullError):
+            await runner.submit("create", items)
+        gated.gate.set()
+
+    async def test_concurrent_submissions_respect_the_bound(self, gated: GatedService) -> None:
+        """Submissions racing while jobs are persisted never overfill the queue."""
+        runner = JobRunner(gated, SlowJobStore(), max_queued=2)
+        items = [{"name": "E", "description": ""}]
+
+        results = await asyncio.gather(
+            *(runner.submit("create", items) for _ in range(5)), return_exceptions=True
+        )
+
+        assert sum(isinstance(result, Job) for result in results) == 2
+        assert sum(isinstance(result, JobQueueFullError) for result in results) == 3
+
+    async def test_prune_deletes_old_finished_jobs(self) -> None:
+        """Only finished jobs last updated before the cutoff are pruned."""
+        store = InMemoryJobStore()
+        now = datetime.now(UTC)
+        old = replace(
+            Job(kind="delete", total=0), status="succeeded", updated_at=now - timedelta(days=2)
+        )
+        recent = replace(Job(kind="delete", total=0), status="failed", updated_at=now)
+        queued = Job(kind="delete", total=0, created_at=now - timedelta(days=2))
+        for job in (old, recent, queued):
+            await store.create(job, [])
+
+        assert await store.prune(now - timedelta(days=1)) == 1
+        assert await store.get(old.id) is None
+        assert await store.get(recent.id) == recent
+        assert await store.get(queued.id) == queued
+
+    async def test_unknown_job(self, runner: JobRunner) -> None:
+        """Unknown jobs are None for both get and cancel."""
+        job = Job(kind="delete", total=0)
+
+        assert await runner.get(job.id) is None
+        assert await runner.cancel(job.id) is None
+
+
+class TestFileJobStore:
+    """Tests for the file-backed job store."""
+
+    async def test_job_resumes_after_restart(self, tmp_path: Path, gated: GatedService) -> None:
+        """A job interrupted by shutdown continues where it stopped, creating nothing twice."""
+        runner = JobRunner(gated, FileJobStore(tmp_path), workers=1, chunk_size=2)
+        await runner.start()
+        gated.gate.clear()
+        job = await runner.submit(
+            "create", [{"name": f"E{i}", "description": ""} for i in range(5)]
+        )
+        while gated.calls == 0:
+            await asyncio.sleep(0.001)
+        await runner.stop()
+
+        stored = await FileJobStore(tmp_path).get(job.id)
+        assert stored is not None and stored.status == "running"
+
+        gated.gate.set()
+        restarted = JobRunner(gated, FileJobStore(tmp_path), workers=1, chunk_size=2)
+        await restarted.start()
+        try:
+            done = await wait_finished(restarted, job)
+        finally:
+            await restarted.stop()
+
+        assert (done.status, done.succeeded) == ("succeeded", 5)
+        assert len((await gated.list_page(10)).items) == 5
+        assert sorted(path.name for path in tmp_path.iterdir()) == [f"{job.id}.job.json"]
+
+    async def test_prune_deletes_job_files(self, tmp_path: Path) -> None:
+        """Pruning removes a finished job's files and leaves running jobs alone."""
+        store = FileJobStore(tmp_path)
+        await store.open()
+        now = datetime.now(UTC)
+        done = Job(kind="delete", total=1)
+        running = Job(kind="delete", total=1)
+        for job in (done, running):
+            await store.create(job, [{"id": str(job.id)}])
+        await store.save(replace(done, status="succeeded", updated_at=now - timedelta(days=2)))
+        await store.save(replace(running, status="running", updated_at=now - timedelta(days=2)))
+
+        assert await store.prune(now - timedelta(days=1)) == 1
+        assert await store.get(done.id) is None
+        assert sorted(path.name for path in tmp_path.iterdir()) == [
+            f"{running.id}.items.json",
+            f"{running.id}.job.json",
+        ]
+
+    async def test_claims_are_exclusive_across_stores(self, tmp_path: Path) -> None:
+        """Two stores on one directory, as two processes would have, never both hold a job."""
+        first, second = FileJobStore(tmp_path), FileJobStore(tmp_path)
+        job = Job(kind="delete", total=0)
+        await first.open()
+
+        assert await first.claim(job.id) is True
+        assert await second.claim(job.id) is False
+        await first.release(job.id)
+        assert await second.claim(job.id) is True
+        await second.close()
+
+    async def test_concurrent_claims_in_one_store_are_exclusive(self, tmp_path: Path) -> None:
+        """Claims taken off the event loop still hand a job to only one caller."""
+        store = FileJobStore(tmp_path)
+        job = Job(kind="delete", total=0)
+        await store.open()
+
+        claims = await asyncio.gather(*(store.claim(job.id) for _ in range(5)))
+
+        assert sorted(claims) == [False] * 4 + [True]
+        await store.close()